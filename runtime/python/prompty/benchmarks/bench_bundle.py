@@ -0,0 +1,97 @@
+"""Cold start with 500 prompts: ``load()`` every file vs. ``load_bundle()``.
+
+Each prompt has a small frontmatter, a ``${file:}`` include of a shared
+tools list and a ``${env:}`` connection key. The agent cache is cleared
+before every ``load()`` round so each measures a cold start.
+
+Usage::
+
+    uv run python benchmarks/bench_bundle.py [--prompts N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import timeit
+from pathlib import Path
+
+from prompty import clear_agent_cache, compile_bundle, load, load_bundle
+
+_TOOLS = (
+    '[{"name": "lookup", "kind": "function", "description": "Look up an order",'
+    ' "parameters": [{"name": "order_id", "kind": "string"}]}]'
+)
+
+_PROMPT = """---
+name: prompt-{i}
+description: Benchmark prompt {i}
+model:
+  id: gpt-4o
+  provider: openai
+  connection:
+    kind: key
+    apiKey: ${{env:BENCH_API_KEY}}
+  options:
+    temperature: 0.2
+    maxOutputTokens: 512
+inputs:
+  - name: question
+    kind: string
+    required: true
+tools: ${{file:tools.json}}
+---
+system:
+You are support agent #{i}. Answer briefly.
+
+user:
+{{{{question}}}}
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    os.environ.setdefault("BENCH_API_KEY", "bench-key")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "tools.json").write_text(_TOOLS, encoding="utf-8")
+        paths = []
+        for i in range(args.prompts):
+            path = root / f"prompt_{i:04d}.prompty"
+            path.write_text(_PROMPT.format(i=i), encoding="utf-8")
+            paths.append(path)
+        bundle_path = root / "prompts.promptyb"
+        compile_bundle(root, bundle_path)
+
+        def load_all() -> None:
+            clear_agent_cache()
+            for path in paths:
+                load(path)
+
+        def open_bundle() -> None:
+            load_bundle(bundle_path).close()
+
+        def bundle_all() -> None:
+            with load_bundle(bundle_path) as bundle:
+                for name in bundle:
+                    bundle[name]
+
+        rows = [
+            ("load() x N", load_all),
+            ("load_bundle() open", open_bundle),
+            ("load_bundle() + all", bundle_all),
+        ]
+        print(f"{args.prompts} prompts, bundle {bundle_path.stat().st_size / 1024:.0f} KB")
+        print(f"{'startup':<22}  {'ms':>9}")
+        for label, fn in rows:
+            best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print(f"{label:<22}  {best * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Chat parsing of large rendered prompts: per-line regex vs. offset scan.
+
+Compares ``PromptyChatParser._parse_lines`` (``splitlines()`` plus a
+``_BOUNDARY_RE`` match per stripped line, then a ``"\\n".join`` per message —
+the previous implementation, now the fallback for irregular line breaks) with
+``PromptyChatParser.parse`` (one scan for role-marker lines, message bodies
+sliced by offset) on 1 MB and 10 MB prompts made of a few messages around a
+large block of retrieved context.
+
+Usage::
+
+    uv run python benchmarks/bench_chat_parser.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from prompty.model import Agent
+from prompty.parsers import PromptyChatParser
+
+
+def _prompt(size: int) -> str:
+    line = "[doc {i}] Revenue in region {i}: up 4% quarter over quarter; costs flat.\n"
+    lines: list[str] = []
+    length = 0
+    while length < size:
+        lines.append(line.format(i=len(lines)))
+        length += len(lines[-1])
+    return (
+        "system:\nAnswer using only these documents.\n\n"
+        + "".join(lines)
+        + "\nuser:\nWhich regions grew?\n\nassistant:\nLet me check.\n\nuser:\nThanks.\n"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    chat = PromptyChatParser()
+    agent = Agent.load({"name": "bench", "model": "gpt-4o"})
+
+    def by_lines(text: str) -> list:
+        return list(chat._parse_lines(text, None, None))
+
+    print(f"{'size':>6}  {'per-line ms':>12}  {'offset ms':>10}  {'speedup':>8}")
+    for label, size in (("1 MB", 1_000_000), ("10 MB", 10_000_000)):
+        text = _prompt(size)
+        expected = [(m.role, m.text) for m in by_lines(text)]
+        assert [(m.role, m.text) for m in chat.parse(agent, text)] == expected
+        number = max(1, 10_000_000 // size)
+        old = min(timeit.repeat(lambda: by_lines(text), number=number, repeat=args.repeat)) / number
+        new = min(timeit.repeat(lambda: chat.parse(agent, text), number=number, repeat=args.repeat)) / number
+        print(f"{label:>6}  {old * 1000:>12.2f}  {new * 1000:>10.2f}  {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
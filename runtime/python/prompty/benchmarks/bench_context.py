@@ -0,0 +1,55 @@
+"""Cost of ``trim_to_context_window`` over 10, 1k and 10k-message histories.
+
+Usage::
+
+    uv run python benchmarks/bench_context.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from prompty import Message, TextPart
+from prompty.core.context import estimate_chars, trim_to_context_window
+
+
+def _history(size: int) -> list[Message]:
+    messages = [Message(role="system", parts=[TextPart(value="You are a helpful agent.")])]
+    for i in range(size - 1):
+        if i % 2:
+            messages.append(Message(role="tool", parts=[TextPart(value="result " * 20)]))
+        else:
+            messages.append(
+                Message(
+                    role="assistant",
+                    parts=[TextPart(value="thinking " * 10)],
+                    metadata={"tool_calls": [{"id": f"call_{i}", "name": "lookup", "arguments": '{"q": "x"}'}]},
+                )
+            )
+    return messages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'messages':>10}  {'estimate ms':>12}  {'trim ms':>10}  {'dropped':>8}")
+    for size in (10, 1_000, 10_000):
+        history = _history(size)
+        # Keep roughly the newest 10% so every run has to find a cut point
+        budget = max(200, estimate_chars(history) // 10)
+        dropped = 0
+
+        def run() -> None:
+            nonlocal dropped
+            dropped, _ = trim_to_context_window(list(history), budget)
+
+        estimate = min(timeit.repeat(lambda: estimate_chars(history), number=1, repeat=args.repeat))
+        trim = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        print(f"{size:>10}  {estimate * 1e3:>12.3f}  {trim * 1e3:>10.3f}  {dropped:>8}")
+
+
+if __name__ == "__main__":
+    main()
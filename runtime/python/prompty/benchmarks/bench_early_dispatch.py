@@ -0,0 +1,132 @@
+"""Streamed tool calls: dispatch after the stream vs. as each call completes.
+
+A fake OpenAI stream delivers 4 tool calls, each spread over 5 chunks
+10 ms apart (~200 ms of streaming); the first tool takes 200 ms (say, a web
+search) and the others 50 ms. "after"
+consumes the whole stream, then dispatches (the previous behaviour);
+"early" starts each call as soon as the processor yields it, overlapping
+tool work with the rest of the stream. Measured for ``turn()``'s threaded
+parallel mode and ``turn_async()``'s sequential mode; results are asserted
+identical and in model order.
+
+Usage::
+
+    uv run python benchmarks/bench_early_dispatch.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from types import SimpleNamespace
+from typing import Any
+
+from prompty.core.pipeline import (
+    _AsyncStreamingToolDispatch,
+    _consume_stream,
+    _consume_stream_async,
+    _dispatch_tools_with_extensions,
+    _dispatch_tools_with_extensions_async,
+    _PooledToolDispatch,
+)
+from prompty.core.types import AsyncPromptyStream, PromptyStream
+from prompty.model import Agent
+
+CALLS = 4
+CHUNKS_PER_CALL = 5
+CHUNK_DELAY = 0.010
+TOOL_TIMES = (0.200, 0.050, 0.050, 0.050)
+
+
+def _chunk(index: int, call_id: str | None, name: str | None, arguments: str) -> Any:
+    function = SimpleNamespace(name=name, arguments=arguments)
+    delta = SimpleNamespace(
+        content=None, refusal=None, tool_calls=[SimpleNamespace(index=index, id=call_id, function=function)]
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _fragments() -> list[Any]:
+    chunks = []
+    for i in range(CALLS):
+        parts = ['{"call": ', f"{i}", ', "city": "Sea', 'ttle"', "}"]
+        assert len(parts) == CHUNKS_PER_CALL
+        for j, part in enumerate(parts):
+            chunks.append(_chunk(i, f"call_{i}" if j == 0 else None, "weather" if j == 0 else None, part))
+    return chunks
+
+
+def _slow_stream() -> Iterator[Any]:
+    for chunk in _fragments():
+        time.sleep(CHUNK_DELAY)
+        yield chunk
+
+
+async def _slow_stream_async() -> AsyncIterator[Any]:
+    for chunk in _fragments():
+        await asyncio.sleep(CHUNK_DELAY)
+        yield chunk
+
+
+def weather(call: int, city: str) -> str:
+    time.sleep(TOOL_TIMES[call])
+    return f"Sunny in {city} #{call}"
+
+
+async def weather_async(call: int, city: str) -> str:
+    await asyncio.sleep(TOOL_TIMES[call])
+    return f"Sunny in {city} #{call}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    agent = Agent.load({"name": "bench", "model": {"id": "gpt-4o", "provider": "openai"}})
+    tools = {"weather": weather}
+    async_tools = {"weather": weather_async}
+
+    def after() -> list[str]:
+        calls, _ = _consume_stream(agent, PromptyStream("bench", _slow_stream()))
+        return _dispatch_tools_with_extensions(calls, tools, agent, {}, parallel=True)
+
+    def early() -> list[str]:
+        dispatch = _PooledToolDispatch(tools, agent, {})
+        _consume_stream(agent, PromptyStream("bench", _slow_stream()), on_tool_call=dispatch.submit)
+        return dispatch.results()
+
+    async def after_async() -> list[str]:
+        calls, _ = await _consume_stream_async(agent, AsyncPromptyStream("bench", _slow_stream_async()))
+        return await _dispatch_tools_with_extensions_async(calls, async_tools, agent, {})
+
+    async def early_async() -> list[str]:
+        dispatch = _AsyncStreamingToolDispatch(async_tools, agent, {})
+        stream = AsyncPromptyStream("bench", _slow_stream_async())
+        await _consume_stream_async(agent, stream, on_tool_call=dispatch.submit)
+        return await dispatch.results()
+
+    def best(fn: Any) -> tuple[float, list[str]]:
+        times, result = [], []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    print(f"{'mode':>22}  {'after ms':>9}  {'early ms':>9}  {'speedup':>8}")
+    rows = (
+        ("turn() parallel", after, early),
+        ("turn_async() sequential", lambda: asyncio.run(after_async()), lambda: asyncio.run(early_async())),
+    )
+    for label, old_fn, new_fn in rows:
+        old, expected = best(old_fn)
+        new, result = best(new_fn)
+        assert result == expected == [f"Sunny in Seattle #{i}" for i in range(CALLS)]
+        print(f"{label:>22}  {old * 1000:>9.1f}  {new * 1000:>9.1f}  {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Frontmatter parsing: regex + pure-Python YAML vs. line scan + libyaml.
+
+Compares :func:`prompty.core.utils.parse` with the previous implementation
+(a ``re.S | re.M`` search over the whole file and ``yaml.safe_load``) on
+1 KB, 100 KB and 5 MB prompts. Half of each prompt is frontmatter (a large
+inline ``tools`` list, as from an expanded ``${file:}`` include) and half
+is body.
+
+Usage::
+
+    uv run python benchmarks/bench_frontmatter.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import timeit
+from typing import Any
+
+import yaml
+
+from prompty.core.utils import _SafeLoader, parse
+
+_legacy_regex = re.compile(
+    r"^\s*" + r"(?:---|\+\+\+)" + r"(.*?)" + r"(?:---|\+\+\+)" + r"\s*(.+)$",
+    re.S | re.M,
+)
+
+
+def legacy_parse(contents: str) -> dict[str, Any] | str:
+    if re.match(r"^\s*(?:---)", contents) is None:
+        return yaml.safe_load(contents)
+    result = _legacy_regex.search(contents)
+    if not result:
+        raise ValueError("Invalid Markdown format: Missing or malformed frontmatter.")
+    content = yaml.safe_load(result.group(1)) or {}
+    content["instructions"] = result.group(2)
+    return content
+
+
+def _prompt(size: int) -> str:
+    tool = (
+        "  - name: tool_{i}\n"
+        "    kind: function\n"
+        "    description: Looks things up in system {i}\n"
+        "    parameters:\n"
+        "      - name: query\n"
+        "        kind: string\n"
+    )
+    header = "---\nname: bench\nmodel:\n  id: gpt-4o\n  provider: openai\ntools:\n"
+    tools: list[str] = []
+    length = len(header)
+    while length < size // 2:
+        tools.append(tool.format(i=len(tools)))
+        length += len(tools[-1])
+    body_line = "user:\nSummarize the following paragraph about item {{item}} in one sentence.\n"
+    body = body_line * max(1, (size // 2) // len(body_line))
+    return header + "".join(tools) + "---\n" + body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"YAML loader: {_SafeLoader.__name__}")
+    print(f"{'size':>8}  {'legacy ms':>10}  {'current ms':>11}  {'speedup':>8}")
+    for label, size in (("1 KB", 1_000), ("100 KB", 100_000), ("5 MB", 5_000_000)):
+        contents = _prompt(size)
+        assert parse(contents) == legacy_parse(contents)
+        number = max(1, 200_000 // size)
+        legacy = min(timeit.repeat(lambda: legacy_parse(contents), number=number, repeat=args.repeat)) / number
+        current = min(timeit.repeat(lambda: parse(contents), number=number, repeat=args.repeat)) / number
+        print(f"{label:>8}  {legacy * 1000:>10.2f}  {current * 1000:>11.2f}  {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Cold ``import`` cost of the lazily exported packages.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+and reports the best cumulative time. ``--budget-ms`` turns the run into a
+check (non-zero exit when ``import prompty`` is over budget), for use on a
+quiet machine rather than in the shared test suite.
+
+Usage::
+
+    uv run python benchmarks/bench_import.py [--repeat N] [--budget-ms MS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+_MODULES = ("prompty", "prompty.core", "prompty.model")
+
+
+def _cumulative_us(module: str) -> int:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    ).stderr
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, _, cumulative, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if name == module:
+            return int(cumulative)
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    print(f"{'import':<16}  {'ms':>9}")
+    results = {}
+    for module in _MODULES:
+        # Best of N absorbs a cold filesystem cache
+        best = min(_cumulative_us(module) for _ in range(args.repeat))
+        results[module] = best / 1000
+        print(f"{module:<16}  {results[module]:>9.2f}")
+
+    if args.budget_ms is not None and results["prompty"] > args.budget_ms:
+        sys.exit(f"import prompty took {results['prompty']:.2f} ms (budget {args.budget_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()
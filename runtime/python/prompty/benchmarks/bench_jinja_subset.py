@@ -0,0 +1,68 @@
+"""Jinja subset rendering: AST interpreter vs. compiled closures.
+
+Renders the same templates with :func:`prompty.jinja_subset.evaluator.render_segments`
+(re-parses and walks the dict AST on every call) and
+:func:`prompty.jinja_subset.render_segments` (compiled once, cached by source).
+Outputs are asserted identical before timing.
+
+Usage::
+
+    uv run python benchmarks/bench_jinja_subset.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any
+
+from prompty.jinja_subset import evaluator, render_segments
+
+_CHAT = """system:
+You are a support agent for {{ company | default('Contoso') }}.
+{% if customer.vip %}This customer is a VIP; be extra courteous.{% endif %}
+
+{% for turn in history %}{{ turn.role }}:
+{{ turn.content | trim }}
+{% endfor %}
+user:
+{{ question }}
+"""
+
+_TABLE = """{% for row in rows %}{{ loop.index }}. {{ row.name | upper }} — {{ row.tags | join(', ') }}\
+{% if row.score >= 50 and not row.hidden %} (top){% elif row.score > 10 %} (mid){% else %} (low){% endif %}\
+{% if not loop.last %}
+{% endif %}{% endfor %}"""
+
+
+def _cases() -> list[tuple[str, str, dict[str, Any]]]:
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"  message {i}  "} for i in range(20)]
+    rows = [
+        {"name": f"item{i}", "tags": ["a", "b", str(i)], "score": i % 100, "hidden": i % 7 == 0} for i in range(200)
+    ]
+    return [
+        ("scalar", "Hello {{ name }}!", {"name": "Jane"}),
+        ("chat, 20 turns", _CHAT, {"customer": {"vip": True}, "history": history, "question": "Where is my order?"}),
+        ("table, 200 rows", _TABLE, {"rows": rows}),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'template':<16}  {'interp µs':>10}  {'compiled µs':>12}  {'speedup':>8}")
+    for label, template, inputs in _cases():
+        assert render_segments(template, inputs) == evaluator.render_segments(template, inputs)
+        number = 2000 if len(template) < 100 else 200
+        interp = min(
+            timeit.repeat(lambda: evaluator.render_segments(template, inputs), number=number, repeat=args.repeat)
+        )
+        compiled = min(timeit.repeat(lambda: render_segments(template, inputs), number=number, repeat=args.repeat))
+        interp, compiled = interp / number, compiled / number
+        print(f"{label:<16}  {interp * 1e6:>10.1f}  {compiled * 1e6:>12.1f}  {interp / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
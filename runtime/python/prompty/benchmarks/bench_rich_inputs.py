@@ -0,0 +1,94 @@
+"""Rich-input placement in ``prepare()``: per-nonce search vs. one marker scan.
+
+Times the step after parsing that swaps nonce markers for rich inputs, with
+1, 10 and 100 ``image`` inputs (one per ~2 KB user message) plus a
+200-message ``thread`` history. "legacy" is the previous two-stage code: each
+message is searched once per nonce (``marker in text``) to inject a marker,
+then a second pass expands the markers. "current" is
+:func:`prompty.core.pipeline._finalize_messages`, which finds all markers in
+one scan per message and splices inputs directly. Outputs are asserted
+identical before timing.
+
+Usage::
+
+    uv run python benchmarks/bench_rich_inputs.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any
+
+from prompty.core.pipeline import _expand_thread_markers, _finalize_messages
+from prompty.core.types import Message, TextPart, ThreadMarker
+from prompty.renderers._common import THREAD_NONCE_PREFIX
+
+_NOTES = "Inspector notes: corrosion on the north beam, paint flaking near joints. " * 28
+
+
+def legacy_inject(messages: list[Message], nonces: dict[str, str], rich_inputs: dict[str, str]) -> list[Any]:
+    result: list[Any] = []
+    for msg in messages:
+        text = msg.text
+        found = None
+        for marker, name in nonces.items():
+            if marker in text:
+                found = (marker, name)
+                break
+        if found is None:
+            result.append(msg)
+            continue
+        marker, name = found
+        before, _, after = text.partition(marker)
+        if before.strip():
+            result.append(Message(role=msg.role, parts=[TextPart(value=before.strip())], metadata=dict(msg.metadata)))
+        result.append(ThreadMarker(name=name, kind=rich_inputs.get(name, "thread")))
+        if after.strip():
+            result.append(Message(role=msg.role, parts=[TextPart(value=after.strip())], metadata=dict(msg.metadata)))
+    return result
+
+
+def _case(n: int) -> tuple[Any, dict[str, str], dict[str, Any], dict[str, str]]:
+    nonces = {f"{THREAD_NONCE_PREFIX}{i:08x}_image_{i}__": f"image_{i}" for i in range(n)}
+    nonces[f"{THREAD_NONCE_PREFIX}ffffffff_history__"] = "history"
+    markers = {name: marker for marker, name in nonces.items()}
+    rich_inputs = {name: "image" for name in markers}
+    rich_inputs["history"] = "thread"
+    inputs: dict[str, Any] = {f"image_{i}": f"https://example.com/{i}.png" for i in range(n)}
+    inputs["history"] = [{"role": "user" if i % 2 else "assistant", "content": f"turn {i}"} for i in range(200)]
+
+    def parsed() -> list[Message]:
+        messages = [Message(role="system", parts=[TextPart(value="Describe each picture.\n" + markers["history"])])]
+        for i in range(n):
+            text = f"Picture {i}, taken on site {i}:\n{_NOTES}\n{markers[f'image_{i}']}"
+            messages.append(Message(role="user", parts=[TextPart(value=text)]))
+        return messages
+
+    return parsed, nonces, inputs, rich_inputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rich inputs':>11}  {'legacy ms':>10}  {'current ms':>11}  {'speedup':>8}")
+    for n in (1, 10, 100):
+        parsed, nonces, inputs, rich = _case(n)
+
+        def legacy() -> list[Message]:
+            return _expand_thread_markers(legacy_inject(parsed(), nonces, rich), inputs, rich)
+
+        def current() -> list[Message]:
+            return _finalize_messages(parsed(), nonces, inputs, rich)
+
+        assert legacy() == current()
+        number = 20
+        old = min(timeit.repeat(legacy, number=number, repeat=args.repeat)) / number
+        new = min(timeit.repeat(current, number=number, repeat=args.repeat)) / number
+        print(f"{n:>11}  {old * 1000:>10.2f}  {new * 1000:>11.2f}  {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""``prepare()`` with large interpolated RAG context: flat string vs. segments.
+
+Compares ``format: jinja2`` (render to a string with a strict-mode nonce
+template, re-split it line by line, then scan for rich-input markers) with
+``format: jinja_subset`` (render to provenance-tagged segments and build
+messages from them directly). Both prompts are strict and take a ``thread``
+input; outputs are asserted identical before timing.
+
+Usage::
+
+    uv run python benchmarks/bench_segments.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from prompty import prepare
+from prompty.model import Agent
+
+_TEMPLATE = """system:
+You answer questions using only the documents below.
+
+# Documents
+{{ context }}
+
+{{ history }}
+
+user:
+{{ question }}
+"""
+
+
+def _agent(kind: str) -> Agent:
+    return Agent.load(
+        {
+            "name": "rag",
+            "model": "gpt-4o",
+            "instructions": _TEMPLATE,
+            "inputs": [
+                {"name": "context", "kind": "string"},
+                {"name": "history", "kind": "thread"},
+                {"name": "question", "kind": "string"},
+            ],
+            "template": {"format": {"kind": kind, "strict": True}, "parser": {"kind": "prompty"}},
+        }
+    )
+
+
+def _context(size: int) -> str:
+    line = "Doc {i}: The quarterly report notes revenue grew in region {i} while costs held flat.\n"
+    lines: list[str] = []
+    length = 0
+    while length < size:
+        lines.append(line.format(i=len(lines)))
+        length += len(lines[-1])
+    return "".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    flat_agent, segment_agent = _agent("jinja2"), _agent("jinja_subset")
+    history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello! Ask away."}]
+
+    print(f"{'context':>8}  {'flat ms':>9}  {'segments ms':>12}  {'speedup':>8}")
+    for label, size in (("10 KB", 10_000), ("1 MB", 1_000_000), ("10 MB", 10_000_000)):
+        inputs = {"context": _context(size), "history": history, "question": "Which region grew?"}
+        flat = prepare(flat_agent, inputs)
+        segments = prepare(segment_agent, inputs)
+        assert [(m.role, m.text) for m in flat] == [(m.role, m.text) for m in segments]
+        number = max(1, 1_000_000 // size)
+        t_flat = min(timeit.repeat(lambda: prepare(flat_agent, inputs), number=number, repeat=args.repeat)) / number
+        t_seg = min(timeit.repeat(lambda: prepare(segment_agent, inputs), number=number, repeat=args.repeat)) / number
+        print(f"{label:>8}  {t_flat * 1000:>9.2f}  {t_seg * 1000:>12.2f}  {t_flat / t_seg:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
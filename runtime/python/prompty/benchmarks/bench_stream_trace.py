@@ -0,0 +1,110 @@
+"""Stream tracing: keep and serialize every chunk vs. incremental summary.
+
+Streams N OpenAI ``ChatCompletionChunk`` objects (one short text delta each,
+plus a final usage chunk) through a stream wrapper with
+:class:`~prompty.tracing.tracer.PromptyTracer` registered. "chunks" keeps
+every chunk and traces them all when the stream ends (the previous
+``PromptyStream`` behaviour); "summary" is the current ``PromptyStream``,
+which folds chunks into a :class:`~prompty.tracing.stream.StreamSummary`.
+Reports wall time and peak traced memory (both with ``tracemalloc`` running)
+and the size of the written ``.tracy`` file; the streamed text is
+asserted identical.
+
+Usage::
+
+    uv run python benchmarks/bench_stream_trace.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from openai.types.chat import ChatCompletionChunk
+
+from prompty.core.types import PromptyStream
+from prompty.tracing.tracer import PromptyTracer, Tracer
+
+
+class _ChunkListStream:
+    """The previous PromptyStream: every chunk kept and traced."""
+
+    def __init__(self, name: str, iterator: Iterator[Any]) -> None:
+        self.name = name
+        self.iterator = iterator
+        self.items: list[Any] = []
+
+    def __iter__(self) -> _ChunkListStream:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            item = next(self.iterator)
+            self.items.append(item)
+            return item
+        except StopIteration:
+            if self.items:
+                with Tracer.start("PromptyStream") as t:
+                    t("signature", f"{self.name}.PromptyStream")
+                    t("inputs", "None")
+                    t("result", self.items)
+            raise
+
+
+def _chunks(n: int) -> Iterator[ChatCompletionChunk]:
+    base = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o"}
+    for i in range(n):
+        yield ChatCompletionChunk.model_validate(
+            {**base, "choices": [{"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}]}
+        )
+    yield ChatCompletionChunk.model_validate(
+        {**base, "choices": [], "usage": {"prompt_tokens": 20, "completion_tokens": n, "total_tokens": n + 20}}
+    )
+
+
+def _run(wrap: Callable[[str, Iterator[Any]], Any], n: int, out: Path) -> tuple[float, int, int, str]:
+    for f in out.glob("*.tracy"):
+        f.unlink()
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = "".join(c.choices[0].delta.content for c in wrap("Bench", _chunks(n)) if c.choices)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = sum(f.stat().st_size for f in out.glob("*.tracy"))
+    return elapsed, peak, size, text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        Tracer.add("bench", PromptyTracer(output_dir=tmp).tracer)
+        try:
+            print(f"{'chunks':>7}  {'mode':>8}  {'ms':>8}  {'peak KB':>9}  {'.tracy KB':>10}")
+            for n in (500, 5000):
+                rows = {}
+                for label, wrap in (("chunks", _ChunkListStream), ("summary", PromptyStream)):
+                    runs = [_run(wrap, n, out) for _ in range(args.repeat)]
+                    rows[label] = (min(r[0] for r in runs), runs[0][1], runs[0][2], runs[0][3])
+                    elapsed, peak, size, _ = rows[label]
+                    print(f"{n:>7}  {label:>8}  {elapsed * 1000:>8.1f}  {peak / 1024:>9.0f}  {size / 1024:>10.1f}")
+                assert rows["chunks"][3] == rows["summary"][3]
+                old, new = rows["chunks"], rows["summary"]
+                print(
+                    f"{'':>7}  {'ratio':>8}  {old[0] / new[0]:>7.1f}x  {old[1] / new[1]:>8.1f}x  {old[2] / new[2]:>9.1f}x"
+                )
+        finally:
+            Tracer.remove("bench")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Repeated tool calls across an agent loop: no cache vs. ``@tool(cache_ttl=...)``.
+
+A 30-iteration loop dispatches 2 tool calls per iteration drawn from 8
+distinct search queries (the model re-asking the same question), each
+costing ~10 ms (``time.sleep``, standing in for a search API or a file
+read). "uncached" is the previous behaviour; "cached" declares the tool
+with ``@tool(cache_ttl=300)`` so repeats are served from the in-memory
+store. Reports wall time and real tool executions; results are asserted
+identical.
+
+Usage::
+
+    uv run python benchmarks/bench_tool_cache.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from prompty.core.pipeline import _dispatch_tools_with_extensions
+from prompty.core.tool_cache import clear_tool_cache
+from prompty.core.tool_decorator import tool
+
+ITERATIONS = 30
+CALLS = 2
+QUERIES = 8
+COST = 0.010
+
+_executions = 0
+
+
+def _search(query: str) -> str:
+    global _executions
+    _executions += 1
+    time.sleep(COST)
+    return f"results for {query}"
+
+
+uncached = tool(name="search", register=False)(_search)
+cached = tool(name="search", register=False, cache_ttl=300)(_search)
+
+_LOOP = [
+    [
+        SimpleNamespace(id=f"c{i}_{j}", name="search", arguments=f'{{"query": "q{(i * 3 + j) % QUERIES}"}}')
+        for j in range(CALLS)
+    ]
+    for i in range(ITERATIONS)
+]
+
+
+def _run(fn: Callable[..., str]) -> tuple[float, int, list[list[str]]]:
+    global _executions
+    _executions = 0
+    clear_tool_cache()
+    start = time.perf_counter()
+    results: list[Any] = [_dispatch_tools_with_extensions(calls, {"search": fn}, None, {}) for calls in _LOOP]
+    return time.perf_counter() - start, _executions, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = {}
+    for label, fn in (("uncached", uncached), ("cached", cached)):
+        runs = [_run(fn) for _ in range(args.repeat)]
+        rows[label] = (min(r[0] for r in runs), runs[0][1], runs[0][2])
+
+    assert rows["uncached"][2] == rows["cached"][2]
+    print(f"{'mode':>9}  {'wall ms':>8}  {'executions':>10}")
+    for label, (elapsed, executions, _) in rows.items():
+        print(f"{label:>9}  {elapsed * 1000:>8.1f}  {executions:>10}")
+    print(f"{'speedup':>9}  {rows['uncached'][0] / rows['cached'][0]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Per-round tool overhead of an agent loop: rebuild every round vs. tool index.
+
+One "round" is what the loop does around each LLM call: build the Chat
+Completions ``tools`` payload and resolve the definition and bindings of 5
+tool calls. "rebuild" converts every tool schema again and scans
+``agent.tools`` linearly per call (the previous behaviour); "indexed" uses
+the per-agent :func:`prompty.core.tool_index.tool_index`. Toolsets of 10, 50
+and 200 function tools with 6 parameters each.
+
+Usage::
+
+    uv run python benchmarks/bench_tool_index.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any
+
+from prompty.core.pipeline import _resolve_bindings
+from prompty.core.tool_dispatch import _find_tool_by_name
+from prompty.model import Agent
+from prompty.providers.openai.executor import _chat_tools_to_wire, _tools_to_wire
+
+_INPUTS = {"tenant": "contoso"}
+
+
+def _agent(n: int) -> Agent:
+    params = [
+        {"name": "query", "kind": "string", "description": "Search text", "required": True},
+        {"name": "limit", "kind": "integer", "description": "Max results"},
+        {"name": "filters", "kind": "object", "properties": [{"name": "tag", "kind": "string"}]},
+        {"name": "fields", "kind": "array", "items": {"kind": "string"}},
+        {"name": "exact", "kind": "boolean"},
+        {"name": "tenant", "kind": "string"},
+    ]
+    tools = [
+        {
+            "name": f"tool_{i}",
+            "kind": "function",
+            "description": f"Look things up in system {i}",
+            "parameters": params,
+            "bindings": [{"name": "tenant", "input": "tenant"}],
+        }
+        for i in range(n)
+    ]
+    return Agent.load({"name": "bench", "model": "gpt-4o", "tools": tools})
+
+
+def _linear_lookup(agent: Agent, name: str) -> Any:
+    for tool in agent.tools or []:
+        if tool.name == name:
+            return tool
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tools':>6}  {'rebuild µs':>11}  {'indexed µs':>11}  {'speedup':>8}")
+    for n in (10, 50, 200):
+        agent = _agent(n)
+        calls = [f"tool_{i * n // 5}" for i in range(5)]
+
+        def rebuild() -> list[dict[str, Any]]:
+            wire = _chat_tools_to_wire(tuple(agent.tools))
+            for name in calls:
+                tool = _linear_lookup(agent, name)
+                merged = {"query": "q"}
+                for b in tool.bindings or []:
+                    merged[b.name] = _INPUTS[b.input]
+            return wire
+
+        def indexed() -> list[dict[str, Any]]:
+            wire = _tools_to_wire(agent)
+            for name in calls:
+                _find_tool_by_name(agent, name)
+                _resolve_bindings(agent, name, {"query": "q"}, _INPUTS)
+            return wire
+
+        assert rebuild() == indexed()
+        number = max(1, 20_000 // n)
+        old = min(timeit.repeat(rebuild, number=number, repeat=args.repeat)) / number
+        new = min(timeit.repeat(indexed, number=number, repeat=args.repeat)) / number
+        print(f"{n:>6}  {old * 1e6:>11.1f}  {new * 1e6:>11.1f}  {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
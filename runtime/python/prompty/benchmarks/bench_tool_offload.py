@@ -0,0 +1,84 @@
+"""Async dispatch of blocking sync tools: inline on the loop vs. tool executor.
+
+Eight concurrent ``dispatch_tool_async`` calls each hit a synchronous tool
+that blocks for 50 ms (``time.sleep``, standing in for ``requests`` or a DB
+driver) — e.g. ``parallel_tool_calls`` under ``asyncio.gather``, or eight
+concurrent ``turn_async()`` requests. "inline" calls the tool on the event
+loop (the previous behaviour, ``configure_tool_executor(offload=False)``);
+"offload" runs it on the shared thread pool. A 1 ms heartbeat task measures
+event-loop lag (how late it wakes up): the p50/max lag shows what every
+other coroutine in the process experiences while the tools run. Results are
+asserted identical.
+
+Usage::
+
+    uv run python benchmarks/bench_tool_offload.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from prompty.core.tool_dispatch import dispatch_tool_async
+from prompty.core.tool_executor import configure_tool_executor, shutdown_tool_executor
+
+CALLS = 8
+BLOCK = 0.050
+TICK = 0.001
+
+
+def lookup(key: int) -> str:
+    time.sleep(BLOCK)
+    return f"row {key}"
+
+
+async def _round() -> tuple[float, list[float], list[str]]:
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def heartbeat() -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    monitor = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(dispatch_tool_async("lookup", f'{{"key": {i}}}', {"lookup": lookup}, None, {}) for i in range(CALLS))
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return elapsed, lags, list(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    configure_tool_executor(max_workers=CALLS)
+    rows = {}
+    for label, offload in (("inline", False), ("offload", True)):
+        configure_tool_executor(offload=offload)
+        runs = [asyncio.run(_round()) for _ in range(args.repeat)]
+        elapsed = min(r[0] for r in runs)
+        lags = [lag for r in runs for lag in r[1]]
+        rows[label] = (elapsed, statistics.median(lags), max(lags), runs[0][2])
+    shutdown_tool_executor()
+
+    assert rows["inline"][3] == rows["offload"][3] == [f"row {i}" for i in range(CALLS)]
+    print(f"{'mode':>8}  {'wall ms':>8}  {'lag p50 ms':>11}  {'lag max ms':>11}")
+    for label, (elapsed, p50, worst, _) in rows.items():
+        print(f"{label:>8}  {elapsed * 1000:>8.1f}  {p50 * 1000:>11.2f}  {worst * 1000:>11.1f}")
+    old, new = rows["inline"], rows["offload"]
+    print(f"{'speedup':>8}  {old[0] / new[0]:>7.1f}x  {'':>11}  {old[2] / new[2]:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
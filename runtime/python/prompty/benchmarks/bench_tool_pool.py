@@ -0,0 +1,107 @@
+"""Parallel tool calls in ``turn()``: a thread pool per iteration vs. the shared pool.
+
+16 threads stand in for concurrent ``turn()`` requests; each runs 50
+agent-loop iterations that dispatch 3 parallel tool calls of ~1 ms (a
+cache or DB lookup). "per-iteration" creates and joins a new
+``ThreadPoolExecutor()`` for every iteration (the previous behaviour);
+"shared" dispatches through
+:func:`prompty.core.pipeline._dispatch_tools_with_extensions`, which uses
+the process-wide tool executor (``max_workers=16``). Reports wall time,
+worker threads used and peak concurrently running tool calls; results are
+asserted identical.
+
+Usage::
+
+    uv run python benchmarks/bench_tool_pool.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any
+
+from prompty.core.pipeline import _dispatch_tool_call, _dispatch_tools_with_extensions
+from prompty.core.tool_executor import configure_tool_executor, shutdown_tool_executor
+
+REQUESTS = 16
+ITERATIONS = 50
+CALLS = 3
+
+_lock = threading.Lock()
+_running = 0
+_peak = 0
+_threads: set[str] = set()
+
+
+def lookup(key: int) -> str:
+    global _running, _peak
+    with _lock:
+        _running += 1
+        _peak = max(_peak, _running)
+        _threads.add(threading.current_thread().name)
+    time.sleep(0.001)
+    with _lock:
+        _running -= 1
+    return f"row {key}"
+
+
+_TOOLS = {"lookup": lookup}
+_CALLS = [SimpleNamespace(id=f"c{i}", name="lookup", arguments=f'{{"key": {i}}}') for i in range(CALLS)]
+
+
+def per_iteration(calls: list[Any]) -> list[str]:
+    with ThreadPoolExecutor() as pool:
+        futures = [pool.submit(_dispatch_tool_call, tc, _TOOLS, None, {}, None, None, None) for tc in calls]
+        return [f.result() for f in futures]
+
+
+def shared(calls: list[Any]) -> list[str]:
+    return _dispatch_tools_with_extensions(calls, _TOOLS, None, {}, parallel=True)
+
+
+def _load(dispatch: Callable[[list[Any]], list[str]]) -> tuple[float, int, int, list[str]]:
+    global _peak
+    _peak = 0
+    _threads.clear()
+    results: list[list[str]] = []
+
+    def request() -> None:
+        for _ in range(ITERATIONS):
+            results.append(dispatch(_CALLS))
+
+    clients = [threading.Thread(target=request) for _ in range(REQUESTS)]
+    start = time.perf_counter()
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, len(_threads), _peak, results[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    configure_tool_executor(max_workers=16)
+    rows = {}
+    for label, dispatch in (("per-iteration", per_iteration), ("shared", shared)):
+        runs = [_load(dispatch) for _ in range(args.repeat)]
+        rows[label] = (min(r[0] for r in runs), max(r[1] for r in runs), max(r[2] for r in runs), runs[0][3])
+    shutdown_tool_executor()
+
+    assert rows["per-iteration"][3] == rows["shared"][3] == [f"row {i}" for i in range(CALLS)]
+    print(f"{'mode':>14}  {'wall ms':>8}  {'worker threads':>14}  {'peak running':>12}")
+    for label, (elapsed, threads, peak, _) in rows.items():
+        print(f"{label:>14}  {elapsed * 1000:>8.1f}  {threads:>14}  {peak:>12}")
+    print(f"{'speedup':>14}  {rows['per-iteration'][0] / rows['shared'][0]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Per-call overhead of ``@trace`` with 0, 1 and 3 registered backends.
+
+Usage::
+
+    uv run python benchmarks/bench_trace.py [--number N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import timeit
+
+from prompty import Message, TextPart
+from prompty.tracing.tracer import Tracer, trace
+
+
+@contextlib.contextmanager
+def _null_backend(name: str):
+    yield lambda key, value: None
+
+
+def _plain(messages: list[Message], temperature: float = 0.0) -> int:
+    return len(messages)
+
+
+_traced = trace(_plain)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    messages = [Message(role="user", parts=[TextPart(value="hello " * 20)]) for _ in range(20)]
+
+    def measure(fn) -> float:
+        fn(messages)  # warm up
+        return timeit.timeit(lambda: fn(messages), number=args.number) / args.number
+
+    rows: list[tuple[str, float]] = []
+    for count in (0, 1, 3):
+        Tracer.clear()
+        for i in range(count):
+            Tracer.add(f"null{i}", _null_backend)
+        rows.append((str(count), measure(_traced)))
+    Tracer.clear()
+    baseline = measure(_plain)
+
+    print(f"{'backends':>10}  {'us/call':>10}  {'overhead us':>12}")
+    print(f"{'untraced':>10}  {baseline * 1e6:>10.2f}  {0:>12.2f}")
+    for label, per_call in rows:
+        print(f"{label:>10}  {per_call * 1e6:>10.2f}  {(per_call - baseline) * 1e6:>12.2f}")
+    Tracer.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Message conversion over an agent loop: convert everything vs. per-message memo.
+
+Simulates a 50-iteration tool loop: a system prompt, a ~4 KB user message and
+20 history turns, then per iteration an assistant ``tool_calls`` message and
+a tool result are appended before the next LLM call. "rebuild" converts the
+whole list with ``_message_to_wire`` every iteration (the previous
+behaviour); "memo" goes through :func:`prompty.core.wire_cache.cached_wire`,
+so only the two new messages are converted. Timed per full loop, for the
+OpenAI Chat Completions and Anthropic converters.
+
+Usage::
+
+    uv run python benchmarks/bench_wire_cache.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from prompty.core.types import Message, TextPart
+from prompty.core.wire_cache import cached_wire
+from prompty.providers.anthropic.executor import _message_to_wire as anthropic_wire
+from prompty.providers.openai.executor import _message_to_wire as openai_wire
+
+ITERATIONS = 50
+
+
+def _text(role: str, text: str, **metadata: Any) -> Message:
+    return Message(role=role, parts=[TextPart(value=text)], metadata=metadata)
+
+
+def _loop(convert: Callable[[list[Message]], list[Any]]) -> list[Any]:
+    messages = [_text("system", "You are a research assistant with many tools.")]
+    messages.append(_text("user", "Compare the quarterly filings below.\n" + "Revenue grew in every region. " * 140))
+    for i in range(20):
+        messages.append(_text("user" if i % 2 else "assistant", f"History turn {i}: " + "details " * 30))
+    wire: list[Any] = []
+    for i in range(ITERATIONS):
+        wire = convert(messages)
+        call = {"id": f"call_{i}", "type": "function", "function": {"name": "lookup", "arguments": '{"q": "x"}'}}
+        messages.append(_text("assistant", "", tool_calls=[call]))
+        messages.append(_text("tool", f"Result {i}: " + "row " * 60, tool_call_id=f"call_{i}", name="lookup"))
+    return wire
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'provider':>10}  {'rebuild ms':>11}  {'memo ms':>8}  {'speedup':>8}")
+    for label, to_wire, key in (("openai", openai_wire, "openai.chat"), ("anthropic", anthropic_wire, "anthropic")):
+
+        def rebuild(messages: list[Message], to_wire: Callable[[Message], Any] = to_wire) -> list[Any]:
+            return [to_wire(m) for m in messages]
+
+        def memo(messages: list[Message], to_wire: Callable[[Message], Any] = to_wire, key: str = key) -> list[Any]:
+            return [cached_wire(m, key, to_wire) for m in messages]
+
+        assert _loop(rebuild) == _loop(memo)
+        number = 10
+        old = min(timeit.repeat(lambda: _loop(rebuild), number=number, repeat=args.repeat)) / number
+        new = min(timeit.repeat(lambda: _loop(memo), number=number, repeat=args.repeat)) / number
+        print(f"{label:>10}  {old * 1000:>11.2f}  {new * 1000:>8.2f}  {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_exports
 from ._version import VERSION
 
 __version__ = VERSION
@@ -9,12 +12,27 @@ __all__ = [
     "VERSION",
     "__version__",
     # Connections
+    "ClientPoolStats",
     "clear_connections",
+    "client_pool_stats",
+    "close_all_clients",
+    "configure_client_pool",
     "get_connection",
     "register_connection",
+    # Invoker registry
+    "register_executor",
+    "register_parser",
+    "register_processor",
+    "register_renderer",
     # Loader
     "load",
     "load_async",
+    "agent_cache_info",
+    "clear_agent_cache",
+    "configure_agent_cache",
+    "Bundle",
+    "compile_bundle",
+    "load_bundle",
     # Message types
     "RICH_KINDS",
     "ROLES",
@@ -35,10 +53,16 @@ __all__ = [
     "RendererProtocol",
     "invoke",
     "invoke_async",
+    "invoke_many_async",
+    "InvokeResult",
+    "RateLimiter",
+    "retry_after",
     "parse",
     "parse_async",
     "prepare",
     "prepare_async",
+    "prepare_many",
+    "PreparedItem",
     "process",
     "process_async",
     "render",
@@ -47,6 +71,8 @@ __all__ = [
     "run_async",
     "turn",
     "turn_async",
+    "turn_stream",
+    "turn_stream_async",
     "validate_inputs",
     # Model types
     "AnonymousConnection",
@@ -103,9 +129,19 @@ __all__ = [
     "CancelledError",
     "ExecuteError",
     "estimate_chars",
+    "estimate_tokens",
     "format_dropped_messages",
     "summarize_dropped",
     "trim_to_context_window",
+    "ApproximateTokenizer",
+    "TiktokenTokenizer",
+    "Tokenizer",
+    "get_tokenizer",
+    "ResultChunk",
+    "ToolCallCompleteChunk",
+    "ToolCallStartChunk",
+    "ToolResultChunk",
+    "TurnChunk",
     "GuardrailError",
     "GuardrailResult",
     "Guardrails",
@@ -126,6 +162,11 @@ __all__ = [
     "cast",
     "bind_tools",
     "tool",
+    "configure_tool_executor",
+    "shutdown_tool_executor",
+    "clear_tool_cache",
+    "configure_tool_cache",
+    "tool_cache_info",
     # Backward-compat aliases
     "AzureExecutor",
     "AzureProcessor",
@@ -135,129 +176,296 @@ __all__ = [
     "ModelInfo",
 ]
 
-# Re-export generated model types
-# Connection registry
-# Agent loop extensions (§13)
-from .core.agent_events import AgentEvent, EventCallback, emit_event
-from .core.cancellation import CancellationToken, CancelledError
-from .core.connections import clear_connections, get_connection, register_connection
-from .core.context import estimate_chars, format_dropped_messages, summarize_dropped, trim_to_context_window
-from .core.guardrails import GuardrailError, GuardrailResult, Guardrails
+# Exports load on first access (PEP 562), so ``import prompty`` does not pull
+# in the generated model package, providers or tracing until they are used.
+_LAZY_IMPORTS: dict[str, tuple[str, ...]] = {
+    ".core.agent_events": ("AgentEvent", "EventCallback", "emit_event"),
+    ".core.batch": ("InvokeResult", "PreparedItem", "invoke_many_async", "prepare_many"),
+    ".core.bundle": ("Bundle", "compile_bundle", "load_bundle"),
+    ".core.cancellation": ("CancellationToken", "CancelledError"),
+    ".core.client_pool": ("ClientPoolStats", "client_pool_stats", "close_all_clients", "configure_client_pool"),
+    ".core.connections": ("clear_connections", "get_connection", "register_connection"),
+    ".core.context": (
+        "estimate_chars",
+        "estimate_tokens",
+        "format_dropped_messages",
+        "summarize_dropped",
+        "trim_to_context_window",
+    ),
+    ".core.discovery": ("register_executor", "register_parser", "register_processor", "register_renderer"),
+    ".core.guardrails": ("GuardrailError", "GuardrailResult", "Guardrails"),
+    ".core.loader": ("agent_cache_info", "clear_agent_cache", "configure_agent_cache", "load", "load_async"),
+    ".core.pipeline": ("ExecuteError",),
+    ".core.rate_limit": ("RateLimiter", "retry_after"),
+    ".core.steering": ("Steering",),
+    ".core.structured": ("StructuredResult", "cast"),
+    ".core.tokenizers": ("ApproximateTokenizer", "TiktokenTokenizer", "Tokenizer", "get_tokenizer"),
+    ".core.tool_decorator": ("bind_tools", "tool"),
+    ".core.tool_cache": ("clear_tool_cache", "configure_tool_cache", "tool_cache_info"),
+    ".core.tool_executor": ("configure_tool_executor", "shutdown_tool_executor"),
+    ".core.turn_stream": (
+        "ResultChunk",
+        "ToolCallCompleteChunk",
+        "ToolCallStartChunk",
+        "ToolResultChunk",
+        "TurnChunk",
+        "turn_stream",
+        "turn_stream_async",
+    ),
+    ".core.types": (
+        "RICH_KINDS",
+        "ROLES",
+        "AsyncPromptyStream",
+        "AudioPart",
+        "ContentPart",
+        "FilePart",
+        "ImagePart",
+        "Message",
+        "PromptyStream",
+        "TextPart",
+        "ThreadMarker",
+    ),
+    ".harness": (
+        "AllowAllPermissionResolver",
+        "CollectingEventSink",
+        "DenyAllPermissionResolver",
+        "FunctionHostToolExecutor",
+        "InMemoryCheckpointStore",
+        "JsonlEventJournalWriter",
+        "ReferenceReplayVerifier",
+        "ReferenceTurnRunner",
+        "RunTurnRequest",
+        "RunTurnResult",
+        "TurnModelRequest",
+        "TurnModelResponse",
+    ),
+    ".invoker": (
+        "ExecutorProtocol",
+        "InvokerError",
+        "ParserProtocol",
+        "ProcessorProtocol",
+        "RendererProtocol",
+        "invoke",
+        "invoke_async",
+        "parse",
+        "parse_async",
+        "prepare",
+        "prepare_async",
+        "process",
+        "process_async",
+        "render",
+        "render_async",
+        "run",
+        "run_async",
+        "turn",
+        "turn_async",
+        "validate_inputs",
+    ),
+    ".model": (
+        "Agent",
+        "AnonymousConnection",
+        "ApiKeyConnection",
+        "ArrayProperty",
+        "Binding",
+        "Connection",
+        "CustomTool",
+        "FormatConfig",
+        "FoundryConnection",
+        "FunctionTool",
+        "LoadContext",
+        "McpApprovalMode",
+        "McpTool",
+        "Model",
+        "ModelInfo",
+        "ModelOptions",
+        "OAuthConnection",
+        "ObjectProperty",
+        "OpenApiTool",
+        "ParserConfig",
+        "Property",
+        "ReferenceConnection",
+        "RemoteConnection",
+        "SaveContext",
+        "Template",
+        "Tool",
+    ),
+    ".parsers": ("PromptyChatParser",),
+    ".providers.anthropic.executor": ("AnthropicExecutor",),
+    ".providers.anthropic.processor": ("AnthropicProcessor",),
+    ".providers.foundry.executor": ("FoundryExecutor",),
+    ".providers.foundry.processor": ("FoundryProcessor",),
+    ".providers.openai.executor": ("OpenAIExecutor",),
+    ".providers.openai.processor": ("OpenAIProcessor", "ToolCall"),
+    ".renderers": ("Jinja2Renderer", "MustacheRenderer"),
+    ".tracing.tracer": (
+        "PromptyTracer",
+        "Tracer",
+        "console_tracer",
+        "sanitize",
+        "to_dict",
+        "trace",
+        "trace_span",
+        "verbose_trace",
+    ),
+}
 
-# Loader
-from .core.loader import load, load_async
-from .core.pipeline import ExecuteError
-from .core.steering import Steering
-from .core.structured import StructuredResult, cast
-from .core.tool_decorator import bind_tools, tool
+# Backward-compat aliases (will be removed in a future version)
+_ALIASES = {
+    "AzureExecutor": "FoundryExecutor",
+    "AzureProcessor": "FoundryProcessor",
+    "PromptAgent": "Agent",
+    "AgentDefinition": "Agent",
+}
 
-# Abstract message types
-from .core.types import (
-    RICH_KINDS,
-    ROLES,
-    AsyncPromptyStream,
-    AudioPart,
-    ContentPart,
-    FilePart,
-    ImagePart,
-    Message,
-    PromptyStream,
-    TextPart,
-    ThreadMarker,
-)
-from .harness import (
-    AllowAllPermissionResolver,
-    CollectingEventSink,
-    DenyAllPermissionResolver,
-    FunctionHostToolExecutor,
-    InMemoryCheckpointStore,
-    JsonlEventJournalWriter,
-    ReferenceReplayVerifier,
-    ReferenceTurnRunner,
-    RunTurnRequest,
-    RunTurnResult,
-    TurnModelRequest,
-    TurnModelResponse,
-)
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS, _ALIASES)
 
-# Pipeline (via backward-compat shim)
-from .invoker import (
-    ExecutorProtocol,
-    InvokerError,
-    ParserProtocol,
-    ProcessorProtocol,
-    RendererProtocol,
-    invoke,
-    invoke_async,
-    parse,
-    parse_async,
-    prepare,
-    prepare_async,
-    process,
-    process_async,
-    render,
-    render_async,
-    run,
-    run_async,
-    turn,
-    turn_async,
-    validate_inputs,
-)
-from .model import (
-    Agent,
-    AnonymousConnection,
-    ApiKeyConnection,
-    ArrayProperty,
-    Binding,
-    Connection,
-    CustomTool,
-    FormatConfig,
-    FoundryConnection,
-    FunctionTool,
-    LoadContext,
-    McpApprovalMode,
-    McpTool,
-    Model,
-    ModelInfo,
-    ModelOptions,
-    OAuthConnection,
-    ObjectProperty,
-    OpenApiTool,
-    ParserConfig,
-    Property,
-    ReferenceConnection,
-    RemoteConnection,
-    SaveContext,
-    Template,
-    Tool,
-)
+if TYPE_CHECKING:
+    # Re-export generated model types
+    # Connection registry
+    # Agent loop extensions (§13)
+    from .core.agent_events import AgentEvent, EventCallback, emit_event
+    from .core.batch import InvokeResult, PreparedItem, invoke_many_async, prepare_many
+    from .core.bundle import Bundle, compile_bundle, load_bundle
+    from .core.cancellation import CancellationToken, CancelledError
+    from .core.client_pool import ClientPoolStats, client_pool_stats, close_all_clients, configure_client_pool
+    from .core.connections import clear_connections, get_connection, register_connection
+    from .core.context import (
+        estimate_chars,
+        estimate_tokens,
+        format_dropped_messages,
+        summarize_dropped,
+        trim_to_context_window,
+    )
+    from .core.discovery import register_executor, register_parser, register_processor, register_renderer
+    from .core.guardrails import GuardrailError, GuardrailResult, Guardrails
 
-# Concrete invokers
-from .parsers import PromptyChatParser
+    # Loader
+    from .core.loader import agent_cache_info, clear_agent_cache, configure_agent_cache, load, load_async
+    from .core.pipeline import ExecuteError
+    from .core.rate_limit import RateLimiter, retry_after
+    from .core.steering import Steering
+    from .core.structured import StructuredResult, cast
+    from .core.tokenizers import ApproximateTokenizer, TiktokenTokenizer, Tokenizer, get_tokenizer
+    from .core.tool_cache import clear_tool_cache, configure_tool_cache, tool_cache_info
+    from .core.tool_decorator import bind_tools, tool
+    from .core.tool_executor import configure_tool_executor, shutdown_tool_executor
+    from .core.turn_stream import (
+        ResultChunk,
+        ToolCallCompleteChunk,
+        ToolCallStartChunk,
+        ToolResultChunk,
+        TurnChunk,
+        turn_stream,
+        turn_stream_async,
+    )
 
-# Provider implementations
-from .providers.anthropic.executor import AnthropicExecutor
-from .providers.anthropic.processor import AnthropicProcessor
-from .providers.foundry.executor import FoundryExecutor
-from .providers.foundry.processor import FoundryProcessor
-from .providers.openai.executor import OpenAIExecutor
-from .providers.openai.processor import OpenAIProcessor, ToolCall
-from .renderers import Jinja2Renderer, MustacheRenderer
+    # Abstract message types
+    from .core.types import (
+        RICH_KINDS,
+        ROLES,
+        AsyncPromptyStream,
+        AudioPart,
+        ContentPart,
+        FilePart,
+        ImagePart,
+        Message,
+        PromptyStream,
+        TextPart,
+        ThreadMarker,
+    )
+    from .harness import (
+        AllowAllPermissionResolver,
+        CollectingEventSink,
+        DenyAllPermissionResolver,
+        FunctionHostToolExecutor,
+        InMemoryCheckpointStore,
+        JsonlEventJournalWriter,
+        ReferenceReplayVerifier,
+        ReferenceTurnRunner,
+        RunTurnRequest,
+        RunTurnResult,
+        TurnModelRequest,
+        TurnModelResponse,
+    )
 
-# Tracing
-from .tracing.tracer import (
-    PromptyTracer,
-    Tracer,
-    console_tracer,
-    sanitize,
-    to_dict,
-    trace,
-    trace_span,
-    verbose_trace,
-)
+    # Pipeline (via backward-compat shim)
+    from .invoker import (
+        ExecutorProtocol,
+        InvokerError,
+        ParserProtocol,
+        ProcessorProtocol,
+        RendererProtocol,
+        invoke,
+        invoke_async,
+        parse,
+        parse_async,
+        prepare,
+        prepare_async,
+        process,
+        process_async,
+        render,
+        render_async,
+        run,
+        run_async,
+        turn,
+        turn_async,
+        validate_inputs,
+    )
+    from .model import (
+        Agent,
+        AnonymousConnection,
+        ApiKeyConnection,
+        ArrayProperty,
+        Binding,
+        Connection,
+        CustomTool,
+        FormatConfig,
+        FoundryConnection,
+        FunctionTool,
+        LoadContext,
+        McpApprovalMode,
+        McpTool,
+        Model,
+        ModelInfo,
+        ModelOptions,
+        OAuthConnection,
+        ObjectProperty,
+        OpenApiTool,
+        ParserConfig,
+        Property,
+        ReferenceConnection,
+        RemoteConnection,
+        SaveContext,
+        Template,
+        Tool,
+    )
 
-# Backward-compat aliases (will be removed in a future version)
-AzureExecutor = FoundryExecutor
-AzureProcessor = FoundryProcessor
-PromptAgent = Agent
-AgentDefinition = Agent
+    # Concrete invokers
+    from .parsers import PromptyChatParser
+
+    # Provider implementations
+    from .providers.anthropic.executor import AnthropicExecutor
+    from .providers.anthropic.processor import AnthropicProcessor
+    from .providers.foundry.executor import FoundryExecutor
+    from .providers.foundry.processor import FoundryProcessor
+    from .providers.openai.executor import OpenAIExecutor
+    from .providers.openai.processor import OpenAIProcessor, ToolCall
+    from .renderers import Jinja2Renderer, MustacheRenderer
+
+    # Tracing
+    from .tracing.tracer import (
+        PromptyTracer,
+        Tracer,
+        console_tracer,
+        sanitize,
+        to_dict,
+        trace,
+        trace_span,
+        verbose_trace,
+    )
+
+    # Backward-compat aliases (will be removed in a future version)
+    AzureExecutor = FoundryExecutor
+    AzureProcessor = FoundryProcessor
+    PromptAgent = Agent
+    AgentDefinition = Agent
@@ -0,0 +1,50 @@
+"""Command-line entry point: ``python -m prompty <command>``.
+
+Commands
+--------
+compile
+    Compile ``.prompty`` files into a bundle for :func:`prompty.load_bundle`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="prompty")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_cmd = commands.add_parser("compile", help="compile .prompty files into a bundle")
+    compile_cmd.add_argument("sources", nargs="+", help=".prompty files or directories (searched recursively)")
+    compile_cmd.add_argument("-o", "--output", required=True, help="bundle file to write")
+    compile_cmd.add_argument("--root", help="directory bundle names are relative to")
+    compile_cmd.add_argument(
+        "--allow-root",
+        action="append",
+        dest="allowed_file_roots",
+        help="extra directory ${file:...} references may read from (repeatable)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "compile":
+        from .core.bundle import compile_bundle
+
+        try:
+            names = compile_bundle(
+                args.sources,
+                args.output,
+                root=args.root,
+                allowed_file_roots=args.allowed_file_roots,
+            )
+        except (OSError, ValueError) as e:
+            print(f"prompty compile: {e}", file=sys.stderr)
+            return 1
+        print(f"Compiled {len(names)} agent(s) into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""PEP 562 lazy exports for package ``__init__`` modules.
+
+A package lists where each public name lives; the defining module is only
+imported when the name is first accessed, and the value is then cached in
+the package namespace so later lookups are plain attribute reads.
+
+Usage (in a package ``__init__.py``)::
+
+    __getattr__, __dir__ = lazy_exports(__name__, globals(), {".core.loader": ("load", "load_async")})
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable, Mapping
+from typing import Any
+
+__all__ = ["lazy_exports"]
+
+
+def lazy_exports(
+    package: str,
+    namespace: dict[str, Any],
+    imports: Mapping[str, tuple[str, ...]],
+    aliases: Mapping[str, str] | None = None,
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build the module-level ``__getattr__`` and ``__dir__`` for *package*.
+
+    Parameters
+    ----------
+    package:
+        The package's ``__name__``; relative module names resolve against it.
+    namespace:
+        The package's ``globals()``, where resolved values are cached.
+    imports:
+        ``{module: (name, ...)}`` — where each exported name is defined.
+    aliases:
+        ``{alias: name}`` — extra names bound to another export.
+    """
+    where = {name: module for module, names in imports.items() for name in names}
+    aliases = dict(aliases or {})
+
+    def __getattr__(name: str) -> Any:
+        module = where.get(name)
+        if module is not None:
+            value = getattr(importlib.import_module(module, package), name)
+        elif name in aliases:
+            value = __getattr__(aliases[name])
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *where, *aliases})
+
+    return __getattr__, __dir__
@@ -2,65 +2,315 @@
 
 from __future__ import annotations
 
-from .agent_events import AgentEvent, EventCallback, emit_event
-from .cancellation import CancellationToken, CancelledError
-from .connections import clear_connections, get_connection, register_connection
-from .context import estimate_chars, format_dropped_messages, summarize_dropped, trim_to_context_window
-from .discovery import (
-    InvokerError,
-    clear_cache,
-    get_executor,
-    get_parser,
-    get_processor,
-    get_renderer,
-)
-from .guardrails import GuardrailError, GuardrailResult, Guardrails
-from .loader import default_save_context, load, load_async
-from .pipeline import (
-    ExecuteError,
-    invoke,
-    invoke_async,
-    prepare,
-    prepare_async,
-    process,
-    process_async,
-    run,
-    run_async,
-    turn,
-    turn_async,
-    validate_inputs,
-)
-from .protocols import (
-    ExecutorProtocol,
-    ParserProtocol,
-    ProcessorProtocol,
-    RendererProtocol,
-)
-from .steering import Steering
-from .structured import StructuredResult, cast
-from .tool_decorator import bind_tools, tool
-from .tool_dispatch import (
-    ToolHandler,
-    ToolHandlerError,
-    clear_tool_handlers,
-    clear_tools,
-    dispatch_tool,
-    dispatch_tool_async,
-    get_tool,
-    get_tool_handler,
-    register_tool,
-    register_tool_handler,
-)
-from .types import (
-    RICH_KINDS,
-    ROLES,
-    AsyncPromptyStream,
-    AudioPart,
-    ContentPart,
-    FilePart,
-    ImagePart,
-    Message,
-    PromptyStream,
-    TextPart,
-    ThreadMarker,
-)
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+__all__ = [
+    "AgentEvent",
+    "EventCallback",
+    "emit_event",
+    "InvokeResult",
+    "PreparedItem",
+    "invoke_many_async",
+    "prepare_many",
+    "Bundle",
+    "compile_bundle",
+    "load_bundle",
+    "CancellationToken",
+    "CancelledError",
+    "ClientPoolStats",
+    "client_pool_stats",
+    "close_all_clients",
+    "configure_client_pool",
+    "clear_connections",
+    "get_connection",
+    "register_connection",
+    "estimate_chars",
+    "estimate_tokens",
+    "format_dropped_messages",
+    "summarize_dropped",
+    "trim_to_context_window",
+    "InvokerError",
+    "clear_cache",
+    "get_executor",
+    "get_parser",
+    "get_processor",
+    "get_renderer",
+    "clear_registrations",
+    "configure_discovery",
+    "refresh_index",
+    "register_executor",
+    "register_parser",
+    "register_processor",
+    "register_renderer",
+    "GuardrailError",
+    "GuardrailResult",
+    "Guardrails",
+    "agent_cache_info",
+    "clear_agent_cache",
+    "configure_agent_cache",
+    "default_save_context",
+    "load",
+    "load_async",
+    "ExecuteError",
+    "invoke",
+    "invoke_async",
+    "prepare",
+    "prepare_async",
+    "process",
+    "process_async",
+    "run",
+    "run_async",
+    "turn",
+    "turn_async",
+    "validate_inputs",
+    "ExecutorProtocol",
+    "ParserProtocol",
+    "ProcessorProtocol",
+    "RendererProtocol",
+    "RateLimiter",
+    "retry_after",
+    "Steering",
+    "StructuredResult",
+    "cast",
+    "ApproximateTokenizer",
+    "TiktokenTokenizer",
+    "Tokenizer",
+    "context_window",
+    "get_tokenizer",
+    "bind_tools",
+    "tool",
+    "configure_tool_executor",
+    "shutdown_tool_executor",
+    "clear_tool_cache",
+    "configure_tool_cache",
+    "tool_cache_info",
+    "ToolHandler",
+    "ToolHandlerError",
+    "clear_tool_handlers",
+    "clear_tools",
+    "dispatch_tool",
+    "dispatch_tool_async",
+    "get_tool",
+    "get_tool_handler",
+    "register_tool",
+    "register_tool_handler",
+    "ResultChunk",
+    "ToolCallCompleteChunk",
+    "ToolCallStartChunk",
+    "ToolResultChunk",
+    "TurnChunk",
+    "turn_stream",
+    "turn_stream_async",
+    "RICH_KINDS",
+    "ROLES",
+    "AsyncPromptyStream",
+    "AudioPart",
+    "ContentPart",
+    "FilePart",
+    "ImagePart",
+    "Message",
+    "PromptyStream",
+    "TextPart",
+    "ThreadMarker",
+]
+
+# Exports load on first access (PEP 562); see prompty/__init__.py.
+_LAZY_IMPORTS: dict[str, tuple[str, ...]] = {
+    ".agent_events": ("AgentEvent", "EventCallback", "emit_event"),
+    ".batch": ("InvokeResult", "PreparedItem", "invoke_many_async", "prepare_many"),
+    ".bundle": ("Bundle", "compile_bundle", "load_bundle"),
+    ".cancellation": ("CancellationToken", "CancelledError"),
+    ".client_pool": ("ClientPoolStats", "client_pool_stats", "close_all_clients", "configure_client_pool"),
+    ".connections": ("clear_connections", "get_connection", "register_connection"),
+    ".context": (
+        "estimate_chars",
+        "estimate_tokens",
+        "format_dropped_messages",
+        "summarize_dropped",
+        "trim_to_context_window",
+    ),
+    ".discovery": (
+        "InvokerError",
+        "clear_cache",
+        "clear_registrations",
+        "configure_discovery",
+        "get_executor",
+        "get_parser",
+        "get_processor",
+        "get_renderer",
+        "refresh_index",
+        "register_executor",
+        "register_parser",
+        "register_processor",
+        "register_renderer",
+    ),
+    ".guardrails": ("GuardrailError", "GuardrailResult", "Guardrails"),
+    ".loader": (
+        "agent_cache_info",
+        "clear_agent_cache",
+        "configure_agent_cache",
+        "default_save_context",
+        "load",
+        "load_async",
+    ),
+    ".pipeline": (
+        "ExecuteError",
+        "invoke",
+        "invoke_async",
+        "prepare",
+        "prepare_async",
+        "process",
+        "process_async",
+        "run",
+        "run_async",
+        "turn",
+        "turn_async",
+        "validate_inputs",
+    ),
+    ".protocols": ("ExecutorProtocol", "ParserProtocol", "ProcessorProtocol", "RendererProtocol"),
+    ".rate_limit": ("RateLimiter", "retry_after"),
+    ".steering": ("Steering",),
+    ".structured": ("StructuredResult", "cast"),
+    ".tokenizers": ("ApproximateTokenizer", "TiktokenTokenizer", "Tokenizer", "context_window", "get_tokenizer"),
+    ".tool_decorator": ("bind_tools", "tool"),
+    ".tool_cache": ("clear_tool_cache", "configure_tool_cache", "tool_cache_info"),
+    ".tool_executor": ("configure_tool_executor", "shutdown_tool_executor"),
+    ".tool_dispatch": (
+        "ToolHandler",
+        "ToolHandlerError",
+        "clear_tool_handlers",
+        "clear_tools",
+        "dispatch_tool",
+        "dispatch_tool_async",
+        "get_tool",
+        "get_tool_handler",
+        "register_tool",
+        "register_tool_handler",
+    ),
+    ".turn_stream": (
+        "ResultChunk",
+        "ToolCallCompleteChunk",
+        "ToolCallStartChunk",
+        "ToolResultChunk",
+        "TurnChunk",
+        "turn_stream",
+        "turn_stream_async",
+    ),
+    ".types": (
+        "RICH_KINDS",
+        "ROLES",
+        "AsyncPromptyStream",
+        "AudioPart",
+        "ContentPart",
+        "FilePart",
+        "ImagePart",
+        "Message",
+        "PromptyStream",
+        "TextPart",
+        "ThreadMarker",
+    ),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from .agent_events import AgentEvent, EventCallback, emit_event
+    from .batch import InvokeResult, PreparedItem, invoke_many_async, prepare_many
+    from .bundle import Bundle, compile_bundle, load_bundle
+    from .cancellation import CancellationToken, CancelledError
+    from .client_pool import ClientPoolStats, client_pool_stats, close_all_clients, configure_client_pool
+    from .connections import clear_connections, get_connection, register_connection
+    from .context import (
+        estimate_chars,
+        estimate_tokens,
+        format_dropped_messages,
+        summarize_dropped,
+        trim_to_context_window,
+    )
+    from .discovery import (
+        InvokerError,
+        clear_cache,
+        clear_registrations,
+        configure_discovery,
+        get_executor,
+        get_parser,
+        get_processor,
+        get_renderer,
+        refresh_index,
+        register_executor,
+        register_parser,
+        register_processor,
+        register_renderer,
+    )
+    from .guardrails import GuardrailError, GuardrailResult, Guardrails
+    from .loader import (
+        agent_cache_info,
+        clear_agent_cache,
+        configure_agent_cache,
+        default_save_context,
+        load,
+        load_async,
+    )
+    from .pipeline import (
+        ExecuteError,
+        invoke,
+        invoke_async,
+        prepare,
+        prepare_async,
+        process,
+        process_async,
+        run,
+        run_async,
+        turn,
+        turn_async,
+        validate_inputs,
+    )
+    from .protocols import (
+        ExecutorProtocol,
+        ParserProtocol,
+        ProcessorProtocol,
+        RendererProtocol,
+    )
+    from .rate_limit import RateLimiter, retry_after
+    from .steering import Steering
+    from .structured import StructuredResult, cast
+    from .tokenizers import ApproximateTokenizer, TiktokenTokenizer, Tokenizer, context_window, get_tokenizer
+    from .tool_cache import clear_tool_cache, configure_tool_cache, tool_cache_info
+    from .tool_decorator import bind_tools, tool
+    from .tool_dispatch import (
+        ToolHandler,
+        ToolHandlerError,
+        clear_tool_handlers,
+        clear_tools,
+        dispatch_tool,
+        dispatch_tool_async,
+        get_tool,
+        get_tool_handler,
+        register_tool,
+        register_tool_handler,
+    )
+    from .tool_executor import configure_tool_executor, shutdown_tool_executor
+    from .turn_stream import (
+        ResultChunk,
+        ToolCallCompleteChunk,
+        ToolCallStartChunk,
+        ToolResultChunk,
+        TurnChunk,
+        turn_stream,
+        turn_stream_async,
+    )
+    from .types import (
+        RICH_KINDS,
+        ROLES,
+        AsyncPromptyStream,
+        AudioPart,
+        ContentPart,
+        FilePart,
+        ImagePart,
+        Message,
+        PromptyStream,
+        TextPart,
+        ThreadMarker,
+    )
@@ -0,0 +1,473 @@
+"""Batch APIs — run one agent over many inputs.
+
+:func:`prepare_many` is the bulk counterpart of
+:func:`~prompty.core.pipeline.prepare`. Everything that only depends on the
+agent is done once per batch instead of once per item:
+
+- the input schema (defaults / required names) and rich-input names,
+- format / parser resolution and invoker discovery,
+- ``pre_render()`` — so every item renders the same sanitized template and
+  the renderer's compiled-template cache hits,
+
+and results are streamed lazily in input order. A failing item is
+reported in its :class:`PreparedItem` instead of aborting the batch.
+
+:func:`invoke_many_async` is the bulk counterpart of
+:func:`~prompty.core.pipeline.invoke_async`: bounded concurrency, a shared
+:class:`~prompty.core.rate_limit.RateLimiter` and ``Retry-After`` aware
+retries, with throughput and latency stats on its trace span.
+
+Usage::
+
+    for item in prompty.prepare_many(agent, rows):
+        if item.error is not None:
+            log.warning("row %d failed: %s", item.index, item.error)
+            continue
+        send(item.messages)
+
+    async for item in prompty.invoke_many_async(agent, rows, concurrency=16, requests_per_minute=600):
+        print(item.index, item.error or item.result)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from ..model import Agent
+from ..renderers._common import _thread_nonces_local
+from ..tracing.tracer import Tracer
+from .context import estimate_tokens
+from .discovery import get_parser, get_renderer
+from .pipeline import (
+    _finalize_messages,
+    _get_rich_input_names,
+    _invoke_executor_async,
+    _prepare_from_segments,
+    _resolve_prepare_config,
+    _segment_capable,
+    process_async,
+)
+from .rate_limit import RateLimiter, retry_after
+from .structured import cast
+from .tokenizers import get_tokenizer
+from .types import Message
+
+__all__ = [
+    "InvokeResult",
+    "PreparedItem",
+    "invoke_many_async",
+    "prepare_many",
+]
+
+
+class PreparedItem(NamedTuple):
+    """One result of :func:`prepare_many`.
+
+    Exactly one of *messages* / *error* is set.
+    """
+
+    index: int
+    inputs: dict[str, Any]
+    messages: list[Message] | None
+    error: Exception | None
+
+
+class InvokeResult(NamedTuple):
+    """One result of :func:`invoke_many_async`.
+
+    *result* is the processed (or raw) response when *error* is ``None``.
+    *attempts* counts executor calls and *latency_ms* spans the first call
+    to the last, including retries.
+    """
+
+    index: int
+    inputs: dict[str, Any]
+    result: Any
+    error: Exception | None
+    attempts: int
+    latency_ms: float
+
+
+class _PreparePlan:
+    """The per-agent half of :func:`~prompty.core.pipeline.prepare`, resolved once.
+
+    Strict mode's ``pre_render()`` nonce is shared by every item in the
+    batch; a fresh one is drawn for each batch.
+    """
+
+    def __init__(self, agent: Agent) -> None:
+        self.agent = agent
+        self.defaults: dict[str, Any] = {}
+        self.required: list[str] = []
+        self.has_schema = bool(agent.inputs)
+        for prop in agent.inputs or []:
+            if prop.default is not None:
+                self.defaults[prop.name] = prop.default
+            elif prop.required:
+                self.required.append(prop.name)
+        self.rich_inputs = _get_rich_input_names(agent)
+
+        format_kind, parser_kind, is_strict = _resolve_prepare_config(agent)
+        self.parser = get_parser(parser_kind)
+        self.renderer = get_renderer(format_kind)
+        self.template = agent.instructions or ""
+        self.is_strict = is_strict
+        self.segments = _segment_capable(self.renderer, self.parser)
+        self.parse_context: dict[str, Any] = {}
+        if is_strict and not self.segments and hasattr(self.parser, "pre_render"):
+            self.template, self.parse_context = self.parser.pre_render(self.template)  # type: ignore[union-attr]
+
+    def validate(self, inputs: dict[str, Any]) -> dict[str, Any]:
+        """Same contract as :func:`~prompty.core.pipeline.validate_inputs`."""
+        result = dict(inputs)
+        if not self.has_schema:
+            return result
+        for name, value in self.defaults.items():
+            result.setdefault(name, value)
+        for name in self.required:
+            if name not in result:
+                raise ValueError(f"Required input '{name}' not provided and has no default value.")
+        return result
+
+    def prepare(self, inputs: dict[str, Any] | None) -> list[Message]:
+        inputs = self.validate(inputs or {})
+        if self.segments:
+            return _prepare_from_segments(
+                self.agent, self.renderer, self.parser, inputs, self.rich_inputs, self.is_strict
+            )
+        rendered = self.renderer.render(self.agent, self.template, inputs)
+
+        thread_nonces: dict[str, str] = getattr(_thread_nonces_local, "nonces", {})
+        _thread_nonces_local.nonces = {}
+
+        messages = self.parser.parse(self.agent, rendered, **self.parse_context)
+        return _finalize_messages(messages, thread_nonces, inputs, self.rich_inputs)
+
+    def run(self, index: int, inputs: dict[str, Any] | None) -> PreparedItem:
+        try:
+            return PreparedItem(index, inputs or {}, self.prepare(inputs), None)
+        except Exception as e:  # noqa: BLE001 — reported per item, the batch continues
+            return PreparedItem(index, inputs or {}, None, e)
+
+
+# ---------------------------------------------------------------------------
+# Process-pool workers — one plan per worker process
+# ---------------------------------------------------------------------------
+
+_worker_plan: _PreparePlan | None = None
+
+
+def _init_worker(agent: Agent, template: str, parse_context: dict[str, Any]) -> None:
+    global _worker_plan
+    plan = _PreparePlan(agent)
+    # Render exactly what the parent sanitized, so every worker shares its nonce
+    plan.template = template
+    plan.parse_context = parse_context
+    _worker_plan = plan
+
+
+def _run_in_worker(index: int, inputs: dict[str, Any] | None) -> PreparedItem:
+    assert _worker_plan is not None
+    return _worker_plan.run(index, inputs)
+
+
+def _pool_item(index: int, inputs: dict[str, Any] | None, future: Future[PreparedItem]) -> PreparedItem:
+    try:
+        return future.result()
+    except Exception as e:  # noqa: BLE001 — pickling failures and a broken pool fail the item, not the batch
+        return PreparedItem(index, inputs or {}, None, e)
+
+
+def _run_pool(plan: _PreparePlan, items: Iterable[dict[str, Any]], workers: int) -> Iterator[PreparedItem]:
+    """Render across processes, keeping a bounded window of work in flight."""
+    window = workers * 4
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(plan.agent, plan.template, plan.parse_context),
+    ) as pool:
+        pending: deque[tuple[int, dict[str, Any] | None, Future[PreparedItem]]] = deque()
+        for index, inputs in enumerate(items):
+            try:
+                future = pool.submit(_run_in_worker, index, inputs)
+            except Exception as e:  # noqa: BLE001 — e.g. BrokenProcessPool, reported on the item
+                future = Future()
+                future.set_exception(e)
+            pending.append((index, inputs, future))
+            if len(pending) >= window:
+                yield _pool_item(*pending.popleft())
+        while pending:
+            yield _pool_item(*pending.popleft())
+
+
+def prepare_many(
+    agent: Agent,
+    inputs_iter: Iterable[dict[str, Any]],
+    *,
+    workers: int | None = None,
+) -> Iterator[PreparedItem]:
+    """Prepare *agent* for every inputs dict in *inputs_iter*.
+
+    Parameters
+    ----------
+    agent:
+        A loaded ``Agent``.
+    inputs_iter:
+        Input dicts, consumed lazily — it may be a generator over a large
+        dataset.
+    workers:
+        ``None`` (default) prepares in the calling thread. A positive number
+        renders across that many worker processes, for CPU-bound templates;
+        ``0`` uses ``os.cpu_count()``. The agent must be picklable and
+        custom invokers importable in the workers; an item whose inputs
+        cannot be pickled, or that a crashed worker leaves unfinished, is
+        reported in its *error*.
+
+    Yields
+    ------
+    PreparedItem
+        ``(index, inputs, messages, error)`` in input order. A failing item
+        carries its exception in *error*; the batch continues.
+    """
+    if workers is not None and workers < 0:
+        raise ValueError("workers must be >= 0")
+    plan = _PreparePlan(agent)
+    count = 0
+    errors = 0
+    with Tracer.start("prepare_many") as t:
+        t("type", "batch")
+        t("inputs", {"workers": workers})
+        if workers is None:
+            results: Iterator[PreparedItem] = (plan.run(i, inputs) for i, inputs in enumerate(inputs_iter))
+        else:
+            results = _run_pool(plan, inputs_iter, workers or os.cpu_count() or 1)
+        for item in results:
+            count += 1
+            if item.error is not None:
+                errors += 1
+            yield item
+        t("result", {"count": count, "errors": errors})
+
+
+# ---------------------------------------------------------------------------
+# invoke_many_async — concurrent, rate-limited bulk invoke
+# ---------------------------------------------------------------------------
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with jitter, capped at 60s — as in the turn() loop (§9.10)."""
+    return min(2**attempt + random.random(), 60)
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+async def _aenumerate(items: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]]) -> AsyncIterator[Any]:
+    index = 0
+    if isinstance(items, AsyncIterable):
+        async for inputs in items:
+            yield index, inputs
+            index += 1
+    else:
+        for inputs in items:
+            yield index, inputs
+            index += 1
+
+
+class _InvokePlan:
+    """Per-batch state shared by every :func:`invoke_many_async` worker."""
+
+    def __init__(
+        self,
+        agent: Agent,
+        limiter: RateLimiter | None,
+        max_retries: int,
+        raw: bool,
+        target_type: type | None,
+    ) -> None:
+        self.prepare_plan = _PreparePlan(agent)
+        self.agent = agent
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.raw = raw
+        self.target_type = target_type
+        options = agent.model.options
+        self.reserved_tokens = (options.max_output_tokens if options is not None else None) or 0
+        self.tokenizer = (
+            get_tokenizer(agent.model.id, agent.model.provider)
+            if limiter is not None and limiter.limits_tokens
+            else None
+        )
+        self.retries = 0
+
+    async def run(self, index: int, inputs: dict[str, Any] | None) -> InvokeResult:
+        inputs = inputs or {}
+        attempts = 0
+        start = time.perf_counter()
+        try:
+            messages = self.prepare_plan.prepare(inputs)
+            tokens = 0
+            if self.tokenizer is not None:
+                tokens = estimate_tokens(messages, self.tokenizer) + self.reserved_tokens
+            start = time.perf_counter()
+            while True:
+                if self.limiter is not None:
+                    await self.limiter.acquire(tokens)
+                attempts += 1
+                try:
+                    response = await _invoke_executor_async(self.agent, messages)
+                    break
+                except Exception as e:
+                    if attempts > self.max_retries:
+                        raise
+                    self.retries += 1
+                    delay = retry_after(e)
+                    if delay is None:
+                        await asyncio.sleep(_backoff(attempts))
+                    elif self.limiter is not None:
+                        # The quota is shared — hold back every worker, not just this one
+                        self.limiter.pause(delay)
+                    else:
+                        await asyncio.sleep(delay)
+            result = response if self.raw else await process_async(self.agent, response)
+            if self.target_type is not None and not self.raw:
+                result = cast(result, self.target_type)
+        except Exception as e:  # noqa: BLE001 — reported per item, the batch continues
+            return InvokeResult(index, inputs, None, e, attempts, (time.perf_counter() - start) * 1000)
+        return InvokeResult(index, inputs, result, None, attempts, (time.perf_counter() - start) * 1000)
+
+
+async def invoke_many_async(
+    agent: Agent,
+    inputs_iter: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+    *,
+    concurrency: int = 8,
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
+    limiter: RateLimiter | None = None,
+    max_retries: int = 3,
+    ordered: bool = False,
+    raw: bool = False,
+    target_type: type | None = None,
+) -> AsyncIterator[InvokeResult]:
+    """Invoke *agent* for every inputs dict in *inputs_iter*, concurrently.
+
+    Parameters
+    ----------
+    agent:
+        A loaded ``Agent``. Each item is prepared (see :func:`prepare_many`),
+        sent through the provider's executor and processed.
+    inputs_iter:
+        Input dicts (sync or async iterable), consumed lazily — only as many
+        items as are in flight are read ahead.
+    concurrency:
+        Maximum number of calls in flight.
+    requests_per_minute, tokens_per_minute:
+        Client-side quota, enforced with a token bucket. Token cost is the
+        prompt estimate (see :func:`~prompty.core.context.estimate_tokens`)
+        plus ``maxOutputTokens``.
+    limiter:
+        A :class:`~prompty.core.rate_limit.RateLimiter` to share with other
+        batches on the same deployment; overrides the two limits above.
+    max_retries:
+        Retries per item after a failed call. A provider ``Retry-After``
+        pauses the whole batch for that long; other errors back off
+        exponentially.
+    ordered:
+        Yield in input order instead of completion order. Completed items
+        wait for earlier ones, bounded at ``4 * concurrency`` outstanding.
+    raw, target_type:
+        As for :func:`~prompty.core.pipeline.invoke_async`.
+
+    Yields
+    ------
+    InvokeResult
+        ``(index, inputs, result, error, attempts, latency_ms)``. A failing
+        item carries its exception in *error*; the batch continues.
+
+    The ``invoke_many`` trace span reports count, errors, retries,
+    throughput (items/s) and p50/p95 latency.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    if max_retries < 0:
+        raise ValueError("max_retries must be >= 0")
+    if limiter is None and (requests_per_minute is not None or tokens_per_minute is not None):
+        limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    plan = _InvokePlan(agent, limiter, max_retries, raw, target_type)
+
+    window = concurrency * 4 if ordered else concurrency
+    source = _aenumerate(inputs_iter)
+    exhausted = False
+    running: set[asyncio.Task[InvokeResult]] = set()
+    buffered: dict[int, InvokeResult] = {}
+    next_index = 0
+    latencies: list[float] = []
+    errors = 0
+    started = time.perf_counter()
+
+    with Tracer.start("invoke_many") as t:
+        t("type", "batch")
+        t(
+            "inputs",
+            {
+                "concurrency": concurrency,
+                "requestsPerMinute": requests_per_minute,
+                "tokensPerMinute": tokens_per_minute,
+                "ordered": ordered,
+            },
+        )
+        try:
+            while True:
+                while not exhausted and len(running) < concurrency and len(running) + len(buffered) < window:
+                    try:
+                        index, inputs = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    running.add(asyncio.ensure_future(plan.run(index, inputs)))
+                if not running:
+                    break
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda task: task.result().index):
+                    item = task.result()
+                    latencies.append(item.latency_ms)
+                    if item.error is not None:
+                        errors += 1
+                    if not ordered:
+                        yield item
+                        continue
+                    buffered[item.index] = item
+                    while next_index in buffered:
+                        yield buffered.pop(next_index)
+                        next_index += 1
+        finally:
+            for task in running:
+                task.cancel()
+            await source.aclose()
+
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        t(
+            "result",
+            {
+                "count": len(latencies),
+                "errors": errors,
+                "retries": plan.retries,
+                "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+                "latencyP50Ms": _percentile(latencies, 50),
+                "latencyP95Ms": _percentile(latencies, 95),
+            },
+        )
@@ -0,0 +1,234 @@
+"""Precompiled prompt bundles — fast cold start for many ``.prompty`` files.
+
+:func:`compile_bundle` parses a set of ``.prompty`` files ahead of time and
+writes their definitions, with every ``${file:...}`` include already
+inlined, into one versioned bundle file. ``${env:...}`` references are kept
+and resolved when an agent is first used, so one bundle serves every
+environment.
+
+:func:`load_bundle` memory-maps the bundle and reads only its index; each
+``Agent`` is built on first access.
+
+Usage::
+
+    prompty.compile_bundle("prompts/", "prompts.promptyb")   # build step
+    # or: python -m prompty compile prompts/ -o prompts.promptyb
+
+    bundle = prompty.load_bundle("prompts.promptyb")         # worker start
+    agent = bundle["support/triage"]
+
+Layout (little-endian)::
+
+    magic    8 bytes   b"PRMPTYB\\0"
+    version  uint32
+    index    uint32 length + UTF-8 JSON  {name: [offset, length, source, roots]}
+    payload  UTF-8 JSON per agent, at index offsets relative to payload start
+
+Payloads are JSON rather than pickle: loading a bundle never executes code.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from ..model import Agent
+from .loader import _build_agent
+from .utils import load_prompty
+
+__all__ = [
+    "BUNDLE_VERSION",
+    "Bundle",
+    "compile_bundle",
+    "load_bundle",
+]
+
+BUNDLE_VERSION = 1
+_MAGIC = b"PRMPTYB\0"
+_HEADER = struct.Struct("<8sII")
+
+
+def _collect(sources: str | Path | Iterable[str | Path], root: Path | None) -> tuple[list[Path], Path]:
+    """Expand *sources* (files and directories) into sorted ``.prompty`` paths."""
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+    files: set[Path] = set()
+    dirs: list[Path] = []
+    for source in sources:
+        path = Path(source).resolve()
+        if path.is_dir():
+            dirs.append(path)
+            files.update(p.resolve() for p in path.rglob("*.prompty"))
+        elif path.exists():
+            files.add(path)
+        else:
+            raise FileNotFoundError(f"Prompty file not found: {path}")
+    if root is None:
+        if len(dirs) == 1:
+            root = dirs[0]
+        elif files:
+            root = Path(os.path.commonpath([f.parent for f in files]))
+        else:
+            root = Path.cwd()
+    return sorted(files), root.resolve()
+
+
+def _bundle_name(path: Path, root: Path) -> str:
+    try:
+        relative = path.relative_to(root)
+    except ValueError:
+        relative = Path(path.name)
+    return relative.with_suffix("").as_posix()
+
+
+def compile_bundle(
+    sources: str | Path | Iterable[str | Path],
+    output: str | Path,
+    *,
+    root: str | Path | None = None,
+    allowed_file_roots: Sequence[str | Path] | None = None,
+) -> list[str]:
+    """Compile ``.prompty`` files into a bundle at *output*.
+
+    Parameters
+    ----------
+    sources:
+        ``.prompty`` files and/or directories (searched recursively).
+    output:
+        Bundle file to write.
+    root:
+        Directory that bundle names are relative to. Defaults to the single
+        source directory, or the common parent of all files.
+    allowed_file_roots:
+        As for :func:`~prompty.core.loader.load`.
+
+    Returns
+    -------
+    list[str]
+        The bundled agent names — the relative path without ``.prompty``,
+        e.g. ``"support/triage"``.
+    """
+    files, root_path = _collect(sources, Path(root) if root is not None else None)
+    roots = [str(r) for r in allowed_file_roots] if allowed_file_roots else None
+
+    index: dict[str, list[Any]] = {}
+    payloads: list[bytes] = []
+    offset = 0
+    for path in files:
+        name = _bundle_name(path, root_path)
+        if name in index:
+            raise ValueError(f"Duplicate bundle name '{name}' for {path}")
+        data = load_prompty(path)
+        if isinstance(data, str):
+            data = {"instructions": data}
+        if not isinstance(data, dict):
+            data = {}
+        # Validates the definition and inlines ${file:...} includes into data
+        _build_agent(data, path, allowed_file_roots=allowed_file_roots, resolve_env=False)
+        try:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        except TypeError as e:
+            raise ValueError(f"{path} cannot be bundled: {e}") from e
+        index[name] = [offset, len(payload), str(path), roots]
+        payloads.append(payload)
+        offset += len(payload)
+
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    output = Path(output)
+    tmp = output.with_name(output.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, BUNDLE_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for payload in payloads:
+            f.write(payload)
+    tmp.replace(output)
+    return list(index)
+
+
+class Bundle(Mapping[str, Agent]):
+    """A read-only, memory-mapped mapping of bundle names to agents.
+
+    Agents are built on first access, so ``${env:...}`` references are
+    resolved at that moment. Like :func:`~prompty.load`, every lookup returns
+    a fresh copy, so mutating one agent never leaks into the next lookup.
+    Use :meth:`close` (or a ``with`` block) to release the mapping.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, index_len = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"Not a prompty bundle: {self.path}") from None
+        if magic != _MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a prompty bundle: {self.path}")
+        if version != BUNDLE_VERSION:
+            self._mm.close()
+            raise ValueError(
+                f"Unsupported bundle version {version} in {self.path} (expected {BUNDLE_VERSION}); "
+                "recompile it with this version of prompty."
+            )
+        start = _HEADER.size
+        self._index: dict[str, list[Any]] = json.loads(self._mm[start : start + index_len])
+        self._base = start + index_len
+        self._agents: dict[str, Agent] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Agent:
+        agent = self._agents.get(name)
+        if agent is not None:
+            return copy.deepcopy(agent)
+        offset, length, source, roots = self._index[name]
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                begin = self._base + offset
+                data = json.loads(self._mm[begin : begin + length])
+                agent = _build_agent(data, Path(source), allowed_file_roots=roots)
+                self._agents[name] = agent
+        return copy.deepcopy(agent)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def source(self, name: str) -> str:
+        """Return the path *name* was compiled from."""
+        return self._index[name][2]
+
+    def close(self) -> None:
+        """Release the memory map. Agents already built stay usable."""
+        self._mm.close()
+
+    def __enter__(self) -> Bundle:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"Bundle({str(self.path)!r}, agents={len(self)})"
+
+
+def load_bundle(path: str | Path) -> Bundle:
+    """Open a bundle written by :func:`compile_bundle`.
+
+    Only the index is read up front; see :class:`Bundle`.
+    """
+    return Bundle(path)
@@ -0,0 +1,174 @@
+"""Bounded, thread-safe LRU cache with hit/miss/eviction counters.
+
+Shared by the runtime's hot-path caches (compiled templates, SDK clients,
+parsed agents, ...). Each cache owns its own lock so a singleton invoker
+can be used concurrently from multiple threads.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, NamedTuple, TypeVar
+
+__all__ = [
+    "CacheInfo",
+    "LRUCache",
+]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    """Snapshot of cache statistics, in the spirit of ``functools.lru_cache``."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[K, V]):
+    """A least-recently-used mapping with a fixed maximum size.
+
+    Parameters
+    ----------
+    maxsize:
+        Maximum number of entries. ``0`` disables caching entirely —
+        every lookup is a miss and nothing is stored.
+    on_evict:
+        Optional callback ``(key, value) → None`` invoked (outside the
+        lock) for every entry that is evicted or cleared. Useful for
+        closing resources held by cached values.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        *,
+        on_evict: Callable[[K, V], Any] | None = None,
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self._on_evict = on_evict
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K, *, is_valid: Callable[[V], bool] | None = None) -> V | None:
+        """Return the cached value for *key* (marking it most recent), or ``None``.
+
+        If *is_valid* is given and returns false for the cached value, the
+        entry is evicted and the lookup counts as a miss.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if is_valid is None or is_valid(value):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+            self.misses += 1
+            self.evictions += 1
+        self._notify([(key, value)])
+        return None
+
+    def put(self, key: K, value: V) -> None:
+        """Insert or replace *key*, evicting the least recently used entries."""
+        if self.maxsize == 0:
+            return
+        evicted: list[tuple[K, V]] = []
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False))
+                self.evictions += 1
+        self._notify(evicted)
+
+    def get_or_create(self, key: K, factory: Callable[[], V]) -> V:
+        """Return the cached value for *key*, building it with *factory* on a miss.
+
+        The factory runs outside the lock; if two threads race on the same
+        key, the first stored value wins and is returned to both.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        created = factory()
+        if self.maxsize == 0:
+            return created
+        with self._lock:
+            existing = self._data.get(key)
+            if existing is not None:
+                self._data.move_to_end(key)
+                return existing
+        self.put(key, created)
+        return created
+
+    def pop(self, key: K) -> V | None:
+        """Remove *key* without counting it as an eviction. Returns the value, if any."""
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def evict(self, key: K) -> V | None:
+        """Remove *key*, counting it as an eviction and firing ``on_evict``."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            value = self._data.pop(key)
+            self.evictions += 1
+        self._notify([(key, value)])
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            evicted = list(self._data.items())
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+        self._notify(evicted)
+
+    def values(self) -> list[V]:
+        """Return a snapshot of the cached values (least recent first)."""
+        with self._lock:
+            return list(self._data.values())
+
+    def items(self) -> list[tuple[K, V]]:
+        """Return a snapshot of the cached entries (least recent first)."""
+        with self._lock:
+            return list(self._data.items())
+
+    def info(self) -> CacheInfo:
+        """Return a :class:`CacheInfo` snapshot of the counters."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def _notify(self, evicted: list[tuple[K, V]]) -> None:
+        if self._on_evict is None:
+            return
+        for key, value in evicted:
+            try:
+                self._on_evict(key, value)
+            except Exception:  # noqa: BLE001 — eviction hooks must not break callers
+                import logging
+
+                logging.getLogger("prompty.cache").debug("on_evict callback failed for %r", key, exc_info=True)
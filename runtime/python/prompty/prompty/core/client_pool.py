@@ -0,0 +1,344 @@
+"""Process-wide pool of reusable SDK clients.
+
+Executors build an SDK client (``OpenAI``, ``AzureOpenAI``, ``Anthropic``,
+...) for every connection that is not ``kind: reference``. Each client owns
+its own ``httpx`` connection pool, so building one per call throws away
+keep-alive connections and pays a fresh TLS handshake every time.
+
+The pool caches clients by *(provider, client class, endpoint, credential
+identity, sync/async, event loop)* so key-based ``.prompty`` files get
+connection reuse without hand-wiring :func:`~prompty.register_connection`.
+Credentials are never stored in the key — only a short digest of them.
+When the SDK reads its key or endpoint from the environment (e.g.
+``OPENAI_API_KEY``), the variables' current values are part of that digest,
+so a rotated key builds a fresh client.
+
+Every :meth:`ClientPool.get_or_create` checks the client out; executors
+hand it back with :meth:`ClientPool.release` — or
+:meth:`ClientPool.release_after` for a response stream, once it ends. A
+client evicted by size or idleness is closed immediately if nothing holds
+it, otherwise when its last call or stream finishes. Async clients are
+closed on their own event loop.
+
+Usage::
+
+    import prompty
+
+    prompty.configure_client_pool(max_size=64, idle_timeout=600)
+    ...
+    prompty.client_pool_stats()   # ClientPoolStats(created=1, reused=41, ...)
+    prompty.close_all_clients()   # e.g. at shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from .cache import LRUCache
+from .types import AsyncPromptyStream, PromptyStream
+
+__all__ = [
+    "ClientPool",
+    "ClientPoolStats",
+    "client_pool_stats",
+    "close_all_clients",
+    "configure_client_pool",
+    "get_client_pool",
+]
+
+logger = logging.getLogger("prompty.client_pool")
+
+# Defaults — a handful of providers/endpoints per process is typical.
+DEFAULT_MAX_SIZE = 32
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+class ClientPoolStats(NamedTuple):
+    """Connection-reuse counters for the client pool."""
+
+    created: int
+    reused: int
+    evicted: int
+    size: int
+    max_size: int
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    loop: asyncio.AbstractEventLoop | None
+    last_used: float
+    leases: int = 0
+    evicted: bool = False
+
+
+def _credential_id(credential: Any) -> str:
+    """Return a short, non-reversible identity for a credential.
+
+    Strings (API keys) are hashed; any other object (e.g. a token provider
+    callable) is identified by ``id()``.
+    """
+    if credential is None:
+        return ""
+    if isinstance(credential, str):
+        return hashlib.sha256(credential.encode("utf-8")).hexdigest()[:16]
+    return f"obj:{id(credential)}"
+
+
+def _env_id(names: tuple[str, ...]) -> str:
+    """Digest of the current values of the environment variables *names*."""
+    if not names:
+        return ""
+    return _credential_id("\0".join(f"{name}={os.environ.get(name, '')}" for name in names))
+
+
+def _close_client(client: Any, loop: asyncio.AbstractEventLoop | None) -> None:
+    """Best-effort close of a sync or async SDK client.
+
+    An async client's ``close()`` is scheduled on the event loop that owns
+    its connections, from whichever thread evicts it.
+    """
+    close = getattr(client, "close", None)
+    if close is None:
+        return
+    try:
+        result = close()
+        if not inspect.isawaitable(result):
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is not None and running is loop:
+            loop.create_task(result)  # type: ignore[arg-type]
+        elif loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(result, loop)  # type: ignore[arg-type]
+        elif loop is not None and not loop.is_closed() and running is None:
+            loop.run_until_complete(result)
+        else:
+            # The owning loop is gone — nothing can await the close.
+            result.close()  # type: ignore[union-attr]
+    except Exception:  # noqa: BLE001 — closing is best-effort
+        logger.debug("Failed to close pooled client %r", client, exc_info=True)
+
+
+class ClientPool:
+    """Bounded LRU of SDK clients with idle eviction.
+
+    Parameters
+    ----------
+    max_size:
+        Maximum number of pooled clients. ``0`` disables pooling — every
+        call builds a new client, as before.
+    idle_timeout:
+        Seconds after which an unused client is closed and dropped.
+        ``0`` keeps clients until they are evicted by size.
+
+    A client that is checked out when it is evicted is closed when the last
+    holder releases it.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self._entries: LRUCache[tuple[Any, ...], _PooledClient] = LRUCache(max_size, on_evict=self._on_evict)
+        self._lock = threading.RLock()
+        self._created = 0
+        # Pooled and evicted-but-still-held clients, by id(client)
+        self._live: dict[int, _PooledClient] = {}
+
+    @property
+    def max_size(self) -> int:
+        return self._entries.maxsize
+
+    def get_or_create(
+        self,
+        provider: str,
+        client_cls: Any,
+        factory: Callable[[], Any],
+        *,
+        endpoint: str | None = None,
+        credential: Any = None,
+        is_async: bool = False,
+        env: tuple[str, ...] = (),
+    ) -> Any:
+        """Check out a pooled client, building it with ``factory()`` on a miss.
+
+        Hand the client back with :meth:`release` (or :meth:`release_after`)
+        when the call that uses it is done.
+
+        Parameters
+        ----------
+        provider:
+            Provider name (``"openai"``, ``"foundry"``, ``"anthropic"``).
+        client_cls:
+            The SDK client class. It is part of the key, so different client
+            classes for the same endpoint never collide.
+        factory:
+            Zero-argument callable that builds the client.
+        endpoint:
+            The endpoint / base URL the client talks to.
+        credential:
+            The API key or token provider — hashed into the key.
+        is_async:
+            Async clients are additionally keyed by the running event loop,
+            because their connection pools are bound to it.
+        env:
+            Environment variables the SDK reads in place of an explicit
+            credential or endpoint; their current values are hashed into
+            the key.
+        """
+        loop: asyncio.AbstractEventLoop | None = None
+        if is_async:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+
+        key = (provider, client_cls, endpoint or "", _credential_id(credential), _env_id(env), is_async, loop)
+        now = time.monotonic()
+        self._sweep(now)
+
+        # Construction is cheap (no network I/O) — holding the lock across
+        # it keeps concurrent first calls from building duplicate clients.
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PooledClient(factory(), loop, now)
+                self._created += 1
+                if self._entries.maxsize == 0:
+                    return entry.client
+                self._live[id(entry.client)] = entry
+                self._entries.put(key, entry)
+            entry.last_used = now
+            entry.leases += 1
+            return entry.client
+
+    def release(self, client: Any) -> None:
+        """Hand back a client checked out with :meth:`get_or_create`.
+
+        Closes it if it was evicted while held and this was the last holder.
+        Clients the pool does not track (e.g. registered connections) are
+        ignored.
+        """
+        with self._lock:
+            entry = self._live.get(id(client))
+            if entry is None or entry.client is not client or entry.leases == 0:
+                return
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if not (entry.evicted and entry.leases == 0):
+                return
+            del self._live[id(client)]
+        _close_client(entry.client, entry.loop)
+
+    def release_after(self, client: Any, response: Any) -> Any:
+        """Release *client* once *response* is done with it, and return *response*.
+
+        A :class:`~prompty.core.types.PromptyStream` /
+        :class:`~prompty.core.types.AsyncPromptyStream` keeps the client until
+        it is exhausted, fails or is garbage-collected; anything else
+        releases it immediately.
+        """
+        if isinstance(response, (PromptyStream, AsyncPromptyStream)):
+            response.add_done_callback(weakref.finalize(response, self.release, client))
+        else:
+            self.release(client)
+        return response
+
+    def _on_evict(self, _key: tuple[Any, ...], entry: _PooledClient) -> None:
+        with self._lock:
+            entry.evicted = True
+            if entry.leases > 0:
+                return
+            self._live.pop(id(entry.client), None)
+        _close_client(entry.client, entry.loop)
+
+    def _sweep(self, now: float) -> None:
+        """Evict idle clients and async clients whose event loop has closed."""
+        for key, entry in self._entries.items():
+            idle = self.idle_timeout > 0 and entry.leases == 0 and now - entry.last_used > self.idle_timeout
+            dead_loop = entry.loop is not None and entry.loop.is_closed()
+            if idle or dead_loop:
+                self._entries.evict(key)
+
+    def configure(self, *, max_size: int | None = None, idle_timeout: float | None = None) -> None:
+        """Update pool limits; ``None`` leaves a limit unchanged.
+
+        Shrinking *max_size* evicts the least recently used surplus clients.
+        """
+        if idle_timeout is not None:
+            self.idle_timeout = idle_timeout
+        if max_size is not None:
+            if max_size < 0:
+                raise ValueError("max_size must be >= 0")
+            self._entries.maxsize = max_size
+            for key, _ in self._entries.items()[: max(0, len(self._entries) - max_size)]:
+                self._entries.evict(key)
+
+    def close_all(self) -> None:
+        """Close and drop every pooled client and reset the counters.
+
+        Clients still checked out are closed when they are released.
+        """
+        self._entries.clear()
+        with self._lock:
+            self._created = 0
+
+    def stats(self) -> ClientPoolStats:
+        """Return a :class:`ClientPoolStats` snapshot."""
+        info = self._entries.info()
+        with self._lock:
+            created = self._created
+        return ClientPoolStats(
+            created=created,
+            reused=info.hits,
+            evicted=info.evictions,
+            size=info.currsize,
+            max_size=info.maxsize,
+        )
+
+
+_pool = ClientPool()
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide :class:`ClientPool` used by the built-in executors."""
+    return _pool
+
+
+def configure_client_pool(*, max_size: int | None = None, idle_timeout: float | None = None) -> None:
+    """Configure the process-wide client pool.
+
+    Parameters
+    ----------
+    max_size:
+        Maximum number of pooled clients (``0`` disables pooling).
+    idle_timeout:
+        Seconds of inactivity before a client is closed (``0`` disables
+        idle eviction).
+    """
+    _pool.configure(max_size=max_size, idle_timeout=idle_timeout)
+
+
+def close_all_clients() -> None:
+    """Close every pooled SDK client (e.g. at application shutdown)."""
+    _pool.close_all()
+
+
+def client_pool_stats() -> ClientPoolStats:
+    """Return connection-reuse counters for the process-wide client pool."""
+    return _pool.stats()
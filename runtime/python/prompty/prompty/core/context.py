@@ -2,14 +2,21 @@
 
 When agent loop conversations grow too long, this module trims older
 non-system messages and produces a compact summary to preserve context.
+Budgets are in characters by default, or in tokens when a
+:class:`~prompty.core.tokenizers.Tokenizer` is supplied.
 """
 
 from __future__ import annotations
 
-from .types import Message, TextPart
+import json
+from typing import Any
+
+from .tokenizers import Tokenizer
+from .types import AudioPart, FilePart, ImagePart, Message, TextPart
 
 __all__ = [
     "estimate_chars",
+    "estimate_tokens",
     "format_dropped_messages",
     "summarize_dropped",
     "trim_to_context_window",
@@ -22,8 +29,6 @@ def format_dropped_messages(messages: list[Message]) -> str:
     Each message is rendered as ``[role]: text`` with tool calls shown
     as ``Called: name(args)``.
     """
-    import json
-
     lines: list[str] = []
     for msg in messages:
         text = msg.text.strip() if msg.text else ""
@@ -40,28 +45,109 @@ def format_dropped_messages(messages: list[Message]) -> str:
     return "\n".join(lines)
 
 
+def _tool_calls_cost(msg: Message) -> int:
+    """JSON length of ``metadata["tool_calls"]``.
+
+    Deliberately not memoized across calls: ``Message`` carries no content
+    version, tool-call dicts can be edited in place, and any identity-based
+    key would then return a stale cost. Each :func:`trim_to_context_window`
+    call costs every message exactly once; :func:`_message_tokens` keeps
+    its (much costlier) tokenizer result cached against the same JSON.
+    """
+    tool_calls = msg.metadata.get("tool_calls")
+    if not tool_calls:
+        return 0
+    return len(json.dumps(tool_calls, default=str))
+
+
+def _message_cost(msg: Message) -> int:
+    """Character cost of a single message (see :func:`estimate_chars`)."""
+    total = len(msg.role) + 4
+    for part in msg.parts:
+        if isinstance(part, TextPart):
+            total += len(part.value)
+        else:
+            total += 200
+    return total + _tool_calls_cost(msg)
+
+
 def estimate_chars(messages: list[Message]) -> int:
     """Estimate the character cost of a message list.
 
     Per spec §13.3: role + 4 overhead per message, text parts by length,
     non-text parts at a fixed 200-char estimate, tool_calls by JSON length.
     """
-    import json
+    return sum(_message_cost(msg) for msg in messages)
 
-    total = 0
-    for msg in messages:
-        total += len(msg.role) + 4
-        for part in msg.parts:
-            if isinstance(part, TextPart):
-                total += len(part.value)
-            else:
-                total += 200
-        tool_calls = msg.metadata.get("tool_calls")
-        if tool_calls:
-            total += len(json.dumps(tool_calls, default=str))
+
+# Token estimates for non-text parts. An image is billed as one high-detail
+# 512px tile plus base cost on OpenAI models; audio and files vary widely.
+_IMAGE_TOKENS = 765
+_AUDIO_TOKENS = 500
+_FILE_TOKENS = 1000
+_OTHER_PART_TOKENS = 200
+
+# Per-message framing overhead (role and separators) in chat formats.
+_MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def _part_tokens(part: Any, tokenizer: Tokenizer) -> int:
+    if isinstance(part, TextPart):
+        return tokenizer.count(part.value)
+    if isinstance(part, ImagePart):
+        return _IMAGE_TOKENS
+    if isinstance(part, AudioPart):
+        return _AUDIO_TOKENS
+    if isinstance(part, FilePart):
+        return _FILE_TOKENS
+    return _OTHER_PART_TOKENS
+
+
+def _token_fingerprint(msg: Message, tool_calls_json: str) -> tuple[Any, ...]:
+    """Values a message's token count depends on, compared by identity or equality.
+
+    Tool calls enter as their serialized JSON, so in-place edits to the
+    (mutable) call dicts change the fingerprint.
+    """
+    values = tuple(p.value if isinstance(p, TextPart) else p for p in msg.parts)
+    return (msg.role, tool_calls_json, *values)
+
+
+def _message_tokens(msg: Message, tokenizer: Tokenizer) -> int:
+    """Token count of a single message, memoized per tokenizer on the message."""
+    tool_calls = msg.metadata.get("tool_calls")
+    tool_calls_json = json.dumps(tool_calls, default=str) if tool_calls else ""
+    fingerprint = _token_fingerprint(msg, tool_calls_json)
+    memo = msg.__dict__.get("_token_cost")
+    if (
+        memo is not None
+        and memo[0] is tokenizer
+        and len(memo[1]) == len(fingerprint)
+        and all(a is b or a == b for a, b in zip(memo[1], fingerprint))
+    ):
+        return memo[2]
+    total = _MESSAGE_TOKEN_OVERHEAD + sum(_part_tokens(p, tokenizer) for p in msg.parts)
+    if tool_calls_json:
+        total += tokenizer.count(tool_calls_json)
+    msg.__dict__["_token_cost"] = (tokenizer, fingerprint, total)
     return total
 
 
+def estimate_tokens(messages: list[Message], tokenizer: Tokenizer | None = None) -> int:
+    """Estimate the token cost of a message list.
+
+    Text parts and tool calls are counted with *tokenizer* (default: the
+    bundled :class:`~prompty.core.tokenizers.ApproximateTokenizer`); images,
+    audio and files use fixed per-part estimates. Per-message counts are
+    cached on the message until its content changes.
+    """
+    if tokenizer is None:
+        from .tokenizers import get_tokenizer
+
+        tokenizer = get_tokenizer()
+    return sum(_message_tokens(msg, tokenizer) for msg in messages)
+
+
 def _truncate(text: str, max_len: int = 200) -> str:
     """Truncate a string to at most *max_len* characters."""
     if len(text) <= max_len:
@@ -107,8 +193,10 @@ def summarize_dropped(messages: list[Message]) -> str:
 def trim_to_context_window(
     messages: list[Message],
     budget_chars: int,
+    *,
+    tokenizer: Tokenizer | None = None,
 ) -> tuple[int, list[Message]]:
-    """Trim messages to fit within a character budget.
+    """Trim messages to fit within a character (or token) budget.
 
     Strategy per spec §13.3:
     1. Keep system messages at the front
@@ -116,12 +204,23 @@ def trim_to_context_window(
     3. Drop oldest non-system messages until within budget
     4. Summarize dropped messages and insert after system messages
 
+    When *tokenizer* is given, *budget_chars* is a token budget, messages
+    are costed with :func:`estimate_tokens`, and the summary reserve is
+    ~1250 tokens or 5% of the budget.
+
     Returns
     -------
     tuple[int, list[Message]]
         (count of dropped messages, the dropped messages themselves)
     """
-    if estimate_chars(messages) <= budget_chars:
+    if tokenizer is None:
+        costs = [_message_cost(msg) for msg in messages]
+        summary_reserve = 5000
+    else:
+        costs = [_message_tokens(msg, tokenizer) for msg in messages]
+        summary_reserve = 1250
+    total = sum(costs)
+    if total <= budget_chars:
         return 0, []
 
     # Partition: leading system messages vs rest
@@ -134,14 +233,17 @@ def trim_to_context_window(
         system_end = len(messages)
 
     system_msgs = messages[:system_end]
-    rest = messages[system_end:]
 
-    summary_budget = min(5000, int(budget_chars * 0.05))
+    summary_budget = min(summary_reserve, int(budget_chars * 0.05))
 
-    # Drop oldest non-system messages
-    dropped: list[Message] = []
-    while estimate_chars(system_msgs + rest) > (budget_chars - summary_budget) and len(rest) > 2:
-        dropped.append(rest.pop(0))
+    # Drop oldest non-system messages — one pass over the per-message costs
+    limit = budget_chars - summary_budget
+    cut = system_end
+    while total > limit and len(messages) - cut > 2:
+        total -= costs[cut]
+        cut += 1
+    dropped = messages[system_end:cut]
+    rest = messages[cut:]
 
     dropped_count = len(dropped)
 
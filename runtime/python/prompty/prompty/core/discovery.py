@@ -11,11 +11,29 @@ packages register their implementations in ``pyproject.toml``:
 
     [project.entry-points."prompty.executors"]
     openai = "prompty.openai:OpenAIExecutor"
+
+All four ``prompty.*`` groups are indexed in a single metadata scan on first
+use, and the index is kept until :func:`refresh_index`. Set
+``PROMPTY_DISCOVERY_CACHE`` (or call :func:`configure_discovery`) to persist
+that index on disk, keyed by a fingerprint of ``sys.path``, so later
+processes skip the scan entirely.
+
+Deployments that know their invokers can skip metadata altogether::
+
+    from prompty import register_executor
+    register_executor("openai", OpenAIExecutor)
 """
 
 from __future__ import annotations
 
+import hashlib
 import importlib.metadata
+import json
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
 from typing import Any
 
 from .protocols import (
@@ -32,6 +50,13 @@ __all__ = [
     "get_executor",
     "get_processor",
     "clear_cache",
+    "clear_registrations",
+    "configure_discovery",
+    "refresh_index",
+    "register_executor",
+    "register_parser",
+    "register_processor",
+    "register_renderer",
 ]
 
 
@@ -62,12 +87,103 @@ class InvokerError(Exception):
 # Entry point discovery
 # ---------------------------------------------------------------------------
 
+_GROUPS = ("prompty.renderers", "prompty.parsers", "prompty.executors", "prompty.processors")
+_CACHE_FORMAT = 1
+
+_logger = logging.getLogger("prompty.discovery")
+
 # Module-level cache: (group, key) → loaded object
 _cache: dict[tuple[str, str], Any] = {}
+# Explicit registrations: (group, key) → class or instance; never evicted by clear_cache()
+_registered: dict[tuple[str, str], Any] = {}
+# group → {name → entry point}, built once per process; dropped only by refresh_index()
+_index: dict[str, dict[str, importlib.metadata.EntryPoint]] | None = None
+_index_lock = threading.Lock()
+_cache_path: Path | None = (
+    Path(os.environ["PROMPTY_DISCOVERY_CACHE"]) if os.environ.get("PROMPTY_DISCOVERY_CACHE") else None
+)
+
+
+def _fingerprint() -> str:
+    """Identify the installed distributions: ``sys.path`` entries and their mtimes.
+
+    Installing or removing a package adds or removes a ``*.dist-info``
+    directory, which changes the mtime of its ``site-packages`` directory.
+    """
+    h = hashlib.sha256(sys.version.encode())
+    for entry in sys.path:
+        try:
+            mtime = os.stat(entry or ".").st_mtime_ns
+        except OSError:
+            mtime = 0
+        h.update(f"{entry}\0{mtime}\0".encode())
+    return h.hexdigest()
+
+
+def _scan() -> dict[str, dict[str, importlib.metadata.EntryPoint]]:
+    """Index every ``prompty.*`` group in one pass over installed metadata."""
+    everything = importlib.metadata.entry_points()
+    index: dict[str, dict[str, importlib.metadata.EntryPoint]] = {}
+    for group in _GROUPS:
+        names = index[group] = {}
+        for ep in everything.select(group=group):
+            # First distribution wins, as with entry_points(group=, name=)[0]
+            names.setdefault(ep.name, ep)
+    return index
+
+
+def _read_cached_index(path: Path, fingerprint: str) -> dict[str, dict[str, importlib.metadata.EntryPoint]] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("format") != _CACHE_FORMAT or data.get("fingerprint") != fingerprint:
+        return None
+    return {
+        group: {
+            name: importlib.metadata.EntryPoint(name=name, value=value, group=group)
+            for name, value in data.get("groups", {}).get(group, {}).items()
+        }
+        for group in _GROUPS
+    }
+
+
+def _write_cached_index(
+    path: Path, fingerprint: str, index: dict[str, dict[str, importlib.metadata.EntryPoint]]
+) -> None:
+    data = {
+        "format": _CACHE_FORMAT,
+        "fingerprint": fingerprint,
+        "groups": {group: {name: ep.value for name, ep in eps.items()} for group, eps in index.items()},
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        _logger.debug("Could not write discovery cache %s", path, exc_info=True)
+
+
+def _get_index() -> dict[str, dict[str, importlib.metadata.EntryPoint]]:
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            path = _cache_path
+            fingerprint = _fingerprint() if path is not None else ""
+            index = _read_cached_index(path, fingerprint) if path is not None else None
+            if index is None:
+                index = _scan()
+                if path is not None:
+                    _write_cached_index(path, fingerprint, index)
+            _index = index
+    return _index
 
 
 def _discover(group: str, key: str) -> Any:
-    """Lazily discover and cache an invoker via entry points.
+    """Resolve and cache an invoker: explicit registrations first, then entry points.
 
     Parameters
     ----------
@@ -83,19 +199,19 @@ def _discover(group: str, key: str) -> Any:
     Raises
     ------
     InvokerError
-        If no entry point matches ``(group, key)``.
+        If no registration or entry point matches ``(group, key)``.
     """
     cache_key = (group, key)
     if cache_key in _cache:
         return _cache[cache_key]
 
-    eps = importlib.metadata.entry_points(group=group, name=key)
-    ep_list = list(eps) if not isinstance(eps, list) else eps
-
-    if not ep_list:
-        raise InvokerError(group, key)
-
-    loaded = ep_list[0].load()
+    if cache_key in _registered:
+        loaded = _registered[cache_key]
+    else:
+        ep = _get_index().get(group, {}).get(key)
+        if ep is None:
+            raise InvokerError(group, key)
+        loaded = ep.load()
     # If it's a class, instantiate it (protocols expect instances)
     if isinstance(loaded, type):
         loaded = loaded()
@@ -124,6 +240,71 @@ def get_processor(key: str) -> ProcessorProtocol:
     return _discover("prompty.processors", key)
 
 
+def _register(group: str, key: str, invoker: Any) -> None:
+    _registered[(group, key)] = invoker
+    _cache.pop((group, key), None)
+
+
+def register_renderer(key: str, renderer: type | RendererProtocol) -> None:
+    """Register a renderer for format kind *key*, bypassing entry points.
+
+    *renderer* may be a class (instantiated on first use) or an instance.
+    """
+    _register("prompty.renderers", key, renderer)
+
+
+def register_parser(key: str, parser: type | ParserProtocol) -> None:
+    """Register a parser for parser kind *key*, bypassing entry points."""
+    _register("prompty.parsers", key, parser)
+
+
+def register_executor(key: str, executor: type | ExecutorProtocol) -> None:
+    """Register an executor for provider *key*, bypassing entry points."""
+    _register("prompty.executors", key, executor)
+
+
+def register_processor(key: str, processor: type | ProcessorProtocol) -> None:
+    """Register a processor for provider *key*, bypassing entry points."""
+    _register("prompty.processors", key, processor)
+
+
+def clear_registrations() -> None:
+    """Remove every ``register_*()`` registration."""
+    for cache_key in _registered:
+        _cache.pop(cache_key, None)
+    _registered.clear()
+
+
+def configure_discovery(*, cache_path: str | Path | None) -> None:
+    """Persist the entry-point index at *cache_path* (``None`` disables).
+
+    Equivalent to setting ``PROMPTY_DISCOVERY_CACHE``. The file is rebuilt
+    whenever the ``sys.path`` fingerprint changes (e.g. a package is
+    installed or removed).
+    """
+    global _cache_path
+    _cache_path = Path(cache_path) if cache_path is not None else None
+    refresh_index()
+
+
 def clear_cache() -> None:
-    """Clear the discovery cache (useful for testing)."""
+    """Clear the loaded invokers (useful for testing).
+
+    The entry-point index is kept, so the next lookup does not rescan
+    package metadata; see :func:`refresh_index`. Explicit registrations are
+    kept; see :func:`clear_registrations`.
+    """
     _cache.clear()
+
+
+def refresh_index() -> None:
+    """Drop the entry-point index and the loaded invokers.
+
+    The next lookup rescans package metadata (or rereads the
+    ``PROMPTY_DISCOVERY_CACHE`` file). Call it after installing or removing
+    a provider package in a running process.
+    """
+    global _index
+    with _index_lock:
+        _cache.clear()
+        _index = None
@@ -3,22 +3,123 @@
 The loader splits frontmatter (YAML) from the markdown body, resolves
 ``${protocol:value}`` references (env vars, file includes), and
 delegates to ``Agent.load()`` from the generated model package.
+
+Loaded agents are cached per resolved path and ``allowed_file_roots``.
+An entry is reused only while the prompt file and every ``${file:...}``
+include keep their (mtime, size, inode) and every ``${env:...}`` variable
+keeps its value; callers always receive their own deep copy.
 """
 
 from __future__ import annotations
 
+import copy
 import json
 import os
 from collections.abc import Callable, Sequence
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import Any, NamedTuple
 
 from ..model import Agent, LoadContext, SaveContext
-from .utils import load_prompty, load_prompty_async
+from .cache import CacheInfo, LRUCache
+from .utils import load_prompty, load_prompty_async, load_yaml
 
-__all__ = ["load", "load_async", "default_save_context"]
+__all__ = [
+    "load",
+    "load_async",
+    "default_save_context",
+    "agent_cache_info",
+    "clear_agent_cache",
+    "configure_agent_cache",
+]
+
+
+# ---------------------------------------------------------------------------
+# Parsed-agent cache
+# ---------------------------------------------------------------------------
+
+_FileStamp = tuple[int, int, int] | None
+
+
+class _Dependencies:
+    """Files and environment variables read while building one agent."""
+
+    __slots__ = ("env", "files")
+
+    def __init__(self) -> None:
+        self.files: dict[str, _FileStamp] = {}
+        self.env: dict[str, str | None] = {}
+
+
+class _CachedAgent(NamedTuple):
+    stamp: _FileStamp
+    files: tuple[tuple[str, _FileStamp], ...]
+    env: tuple[tuple[str, str | None], ...]
+    agent: Agent
+
+
+_DEFAULT_AGENT_CACHE_SIZE = 128
+_agent_cache: LRUCache[tuple[str, tuple[str, ...]], _CachedAgent] = LRUCache(_DEFAULT_AGENT_CACHE_SIZE)
+
+
+def _stamp(path: str | Path) -> _FileStamp:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _cache_key(path: Path, allowed_file_roots: Sequence[str | Path] | None) -> tuple[str, tuple[str, ...]]:
+    roots = tuple(sorted({str(Path(root).resolve()) for root in allowed_file_roots or ()}))
+    return (str(path), roots)
+
+
+def _is_fresh(stamp: _FileStamp) -> Callable[[_CachedAgent], bool]:
+    def check(entry: _CachedAgent) -> bool:
+        return (
+            entry.stamp == stamp
+            and all(_stamp(file) == file_stamp for file, file_stamp in entry.files)
+            and all(os.environ.get(name) == value for name, value in entry.env)
+        )
+
+    return check
+
+
+def _cached(key: tuple[str, tuple[str, ...]], stamp: _FileStamp) -> Agent | None:
+    entry = _agent_cache.get(key, is_valid=_is_fresh(stamp))
+    return copy.deepcopy(entry.agent) if entry is not None else None
+
+
+def _store(key: tuple[str, tuple[str, ...]], stamp: _FileStamp, deps: _Dependencies, agent: Agent) -> Agent:
+    if _agent_cache.maxsize and stamp is not None:
+        entry = _CachedAgent(stamp, tuple(deps.files.items()), tuple(deps.env.items()), copy.deepcopy(agent))
+        _agent_cache.put(key, entry)
+    return agent
+
+
+def configure_agent_cache(*, max_size: int | None = None) -> None:
+    """Configure the process-wide parsed-agent cache.
+
+    Parameters
+    ----------
+    max_size:
+        Maximum number of cached agents (``0`` disables caching). Changing
+        the size clears the cache.
+    """
+    global _agent_cache
+    if max_size is not None:
+        _agent_cache.clear()
+        _agent_cache = LRUCache(max_size)
+
+
+def agent_cache_info() -> CacheInfo:
+    """Return hit/miss/eviction counters for the parsed-agent cache."""
+    return _agent_cache.info()
+
+
+def clear_agent_cache() -> None:
+    """Drop every cached agent and reset the counters."""
+    _agent_cache.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -44,24 +145,38 @@ def load(path: str | Path, *, allowed_file_roots: Sequence[str | Path] | None =
         Fully typed prompt definition.
     """
     path = Path(path).resolve()
-    if not path.exists():
+    stamp = _stamp(path)
+    if stamp is None:
         raise FileNotFoundError(f"Prompty file not found: {path}")
+    key = _cache_key(path, allowed_file_roots)
+    agent = _cached(key, stamp)
+    if agent is not None:
+        return agent
 
     # 1. Split frontmatter + body
     data = load_prompty(path)
 
     # 2–7 shared pipeline
-    return _build_agent(data, path, allowed_file_roots=allowed_file_roots)
+    deps = _Dependencies()
+    agent = _build_agent(data, path, allowed_file_roots=allowed_file_roots, deps=deps)
+    return _store(key, stamp, deps, agent)
 
 
 async def load_async(path: str | Path, *, allowed_file_roots: Sequence[str | Path] | None = None) -> Agent:
     """Async variant of :func:`load`."""
     path = Path(path).resolve()
-    if not path.exists():
+    stamp = _stamp(path)
+    if stamp is None:
         raise FileNotFoundError(f"Prompty file not found: {path}")
+    key = _cache_key(path, allowed_file_roots)
+    agent = _cached(key, stamp)
+    if agent is not None:
+        return agent
 
     data = await load_prompty_async(path)
-    return _build_agent(data, path, allowed_file_roots=allowed_file_roots)
+    deps = _Dependencies()
+    agent = _build_agent(data, path, allowed_file_roots=allowed_file_roots, deps=deps)
+    return _store(key, stamp, deps, agent)
 
 
 def default_save_context(**kwargs: Any) -> SaveContext:
@@ -95,8 +210,15 @@ def _build_agent(
     path: Path,
     *,
     allowed_file_roots: Sequence[str | Path] | None = None,
+    deps: _Dependencies | None = None,
+    resolve_env: bool = True,
 ) -> Agent:
-    """Shared pipeline that transforms raw frontmatter dict into a Agent."""
+    """Shared pipeline that transforms raw frontmatter dict into a Agent.
+
+    ``${file:...}`` references are replaced in *data* in place, so after the
+    call *data* holds the file-resolved definition (see
+    :func:`~prompty.core.bundle.compile_bundle`).
+    """
 
     # Handle body-only files (no frontmatter — parse returns a string)
     if isinstance(data, str):
@@ -105,7 +227,9 @@ def _build_agent(
         data = {}
 
     # 2. Load via Agent.load() with pre_process for ${protocol:value} expansion
-    ctx = LoadContext(pre_process=_pre_process(path, allowed_file_roots=allowed_file_roots))
+    ctx = LoadContext(
+        pre_process=_pre_process(path, allowed_file_roots=allowed_file_roots, deps=deps, resolve_env=resolve_env)
+    )
     agent = Agent.load(data, ctx)
 
     # Store source path for relative reference resolution (e.g. ${file:...})
@@ -127,6 +251,8 @@ def _pre_process(
     agent_file: Path,
     *,
     allowed_file_roots: Sequence[str | Path] | None = None,
+    deps: _Dependencies | None = None,
+    resolve_env: bool = True,
 ) -> Callable[[Any], Any]:
     """Return a ``pre_process`` callback that resolves ``${protocol:value}``
     references in every dict the loader visits.
@@ -139,6 +265,10 @@ def _pre_process(
 
     File references are limited to the prompt directory by default. Callers may
     provide additional allowed roots via ``allowed_file_roots``.
+
+    Every file and environment variable read is recorded in *deps*, if
+    given, for cache invalidation. With ``resolve_env=False``, ``${env:...}``
+    references are left as-is.
     """
 
     def process(data: Any) -> Any:
@@ -158,9 +288,13 @@ def _pre_process(
             protocol = protocol.lower()
 
             if protocol == "env":
+                if not resolve_env:
+                    continue
                 # Support ${env:VAR:default}
                 var_name, _, default = val.partition(":")
                 env_val = os.environ.get(var_name)
+                if deps is not None:
+                    deps.env[var_name] = env_val
                 if env_val is None:
                     if default:
                         data[key] = default
@@ -171,6 +305,8 @@ def _pre_process(
 
             elif protocol == "file":
                 file_path = _resolve_file_reference(agent_file, val, allowed_file_roots)
+                if deps is not None:
+                    deps.files[str(file_path)] = _stamp(file_path)
                 if not file_path.exists():
                     raise FileNotFoundError(
                         f"Referenced file '{val}' not found for key '{key}' (resolved to {file_path})"
@@ -240,6 +376,6 @@ def _load_file_content(path: Path) -> Any:
         if path.suffix == ".json":
             return json.load(f)
         elif path.suffix in (".yml", ".yaml"):
-            return yaml.safe_load(f)
+            return load_yaml(f)
         else:
             return f.read()
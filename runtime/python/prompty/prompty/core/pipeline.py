@@ -27,14 +27,15 @@ import asyncio
 import inspect
 import json
 import random
+import threading
 import time
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable, Iterator
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from ..model import Agent
-from ..renderers._common import _thread_nonces_local
+from ..renderers._common import _MarkerIndex, _thread_nonces_local
 from ..tracing.tracer import trace
 from .agent_events import EventCallback, emit_event
 from .cancellation import CancellationToken, CancelledError
@@ -49,7 +50,10 @@ from .discovery import (
 from .guardrails import GuardrailError, Guardrails
 from .steering import Steering
 from .structured import cast
-from .tool_dispatch import dispatch_tool, dispatch_tool_async
+from .tokenizers import Tokenizer, context_window, get_tokenizer
+from .tool_dispatch import dispatch_tool, dispatch_tool_async, get_tool
+from .tool_executor import ToolFuture, ToolOptions, ToolTimeoutError, get_tool_executor, get_tool_options
+from .tool_index import tool_index
 from .types import RICH_KINDS, ContentPart, Message, TextPart, ThreadMarker
 
 __all__ = [
@@ -166,7 +170,8 @@ def _inject_thread_markers(
     When a rich-kind input appears as ``{{var}}`` in the template,
     the renderer substitutes a nonce marker string. After parsing, that
     marker ends up inside a ``Message``'s ``TextPart`` content. This
-    function finds those markers and:
+    function finds those markers — any number per message, all nonces in
+    one pass over each message's text — and splits the message around them:
 
     - For ``thread`` kind: inserts a ``ThreadMarker`` at the correct position.
     - For ``image``/``file``/``audio`` kinds: inserts a ``RichMarker`` that
@@ -187,56 +192,80 @@ def _inject_thread_markers(
     list[Message | ThreadMarker]
         Messages with markers injected at nonce positions.
     """
-    from .types import TextPart
+    if not nonces:
+        return list(messages)
 
+    index = _MarkerIndex(nonces)
     result: list[Message | ThreadMarker] = []
-
     for msg in messages:
         text = msg.text
-        # Check if any nonce marker appears in this message's text
-        found_marker = None
-        for marker, name in nonces.items():
-            if marker in text:
-                found_marker = (marker, name)
-                break
-
-        if found_marker is None:
+        found = index.find(text)
+        if found:
+            result.extend(_split_at_markers(msg, text, found, rich_inputs))
+        else:
             result.append(msg)
-            continue
-
-        marker, name = found_marker
-        kind = rich_inputs.get(name, "thread")
+    return result
 
-        # Split the message text at the nonce marker
-        before, _, after = text.partition(marker)
-        before = before.strip()
-        after = after.strip()
 
+def _split_at_markers(
+    msg: Message,
+    text: str,
+    found: list[tuple[int, int, str]],
+    rich_inputs: dict[str, str],
+) -> Iterator[Message | ThreadMarker]:
+    """Yield the stripped, non-empty text around each marker and the markers themselves."""
+    pos = 0
+    for start, end, name in found:
+        before = text[pos:start].strip()
         if before:
-            result.append(
-                Message(
-                    role=msg.role,
-                    parts=[TextPart(value=before)],
-                    metadata=dict(msg.metadata),
-                )
-            )
+            yield Message(role=msg.role, parts=[TextPart(value=before)], metadata=dict(msg.metadata))
+        yield ThreadMarker(name=name, kind=rich_inputs.get(name, "thread"))
+        pos = end
+    after = text[pos:].strip()
+    if after:
+        yield Message(role=msg.role, parts=[TextPart(value=after)], metadata=dict(msg.metadata))
 
-        if kind == "thread":
-            result.append(ThreadMarker(name=name))
-        else:
-            # image/file/audio — insert a RichMarker with the kind
-            result.append(ThreadMarker(name=name, kind=kind))
-
-        if after:
-            result.append(
-                Message(
-                    role=msg.role,
-                    parts=[TextPart(value=after)],
-                    metadata=dict(msg.metadata),
-                )
-            )
 
-    return result
+def _extend_thread(expanded: list[Message], thread: Any) -> None:
+    """Append a thread input's messages (``Message`` or dict) to *expanded*."""
+    if not isinstance(thread, list):
+        return  # skip non-list thread values
+    for msg in thread:
+        if isinstance(msg, Message):
+            expanded.append(msg)
+        elif isinstance(msg, dict):
+            expanded.append(_dict_to_message(msg))
+
+
+def _splice_rich_input(expanded: list[Message], name: str, kind: str, inputs: dict[str, Any]) -> None:
+    """Resolve one marker into *expanded* with the input's actual content.
+
+    - ``thread`` markers expand to ``Message[]`` from conversation history.
+    - ``image``/``file``/``audio`` markers resolve to the appropriate
+      ``ContentPart``, attached to the preceding user message or a new one.
+    """
+    from .types import AudioPart, FilePart, ImagePart
+
+    value = inputs.get(name)
+    if kind == "thread":
+        _extend_thread(expanded, value)
+        return
+    part_type = {"image": ImagePart, "file": FilePart, "audio": AudioPart}.get(kind)
+    if part_type is None:
+        return
+    part = part_type(source=str(value) if value else "")
+    # Attach to preceding message if same role, else create new
+    if expanded and expanded[-1].role == "user":
+        expanded[-1].parts.append(part)
+    else:
+        expanded.append(Message(role="user", parts=[part]))
+
+
+def _append_unplaced_threads(expanded: list[Message], inputs: dict[str, Any], rich_inputs: dict[str, str]) -> None:
+    """With no markers in the prompt, thread inputs go at the end."""
+    for name, kind in rich_inputs.items():
+        if kind == "thread" and name in inputs:
+            _extend_thread(expanded, inputs[name])
 
 
 def _expand_thread_markers(
@@ -250,8 +279,6 @@ def _expand_thread_markers(
     - ``image``/``file``/``audio`` markers resolve to the appropriate
       ``ContentPart`` inserted into the surrounding message.
     """
-    from .types import AudioPart, FilePart, ImagePart
-
     expanded: list[Message] = []
     marker_found = False
 
@@ -259,54 +286,12 @@ def _expand_thread_markers(
         if isinstance(item, ThreadMarker):
             marker_found = True
             kind = getattr(item, "kind", None) or rich_inputs.get(item.name, "thread")
-            value = inputs.get(item.name)
-
-            if kind == "thread":
-                # Thread: expand to Message[]
-                if isinstance(value, list):
-                    for msg in value:
-                        if isinstance(msg, Message):
-                            expanded.append(msg)
-                        elif isinstance(msg, dict):
-                            expanded.append(_dict_to_message(msg))
-                # else: skip non-list thread values
-            elif kind == "image":
-                # Image: insert as ImagePart in a user message
-                source = str(value) if value else ""
-                part = ImagePart(source=source)
-                # Attach to preceding message if same role, else create new
-                if expanded and expanded[-1].role == "user":
-                    expanded[-1].parts.append(part)
-                else:
-                    expanded.append(Message(role="user", parts=[part]))
-            elif kind == "file":
-                source = str(value) if value else ""
-                part = FilePart(source=source)
-                if expanded and expanded[-1].role == "user":
-                    expanded[-1].parts.append(part)
-                else:
-                    expanded.append(Message(role="user", parts=[part]))
-            elif kind == "audio":
-                source = str(value) if value else ""
-                part = AudioPart(source=source)
-                if expanded and expanded[-1].role == "user":
-                    expanded[-1].parts.append(part)
-                else:
-                    expanded.append(Message(role="user", parts=[part]))
+            _splice_rich_input(expanded, item.name, kind, inputs)
         else:
             expanded.append(item)
 
-    # If no markers but thread inputs exist, append at end
     if not marker_found:
-        for name, kind in rich_inputs.items():
-            if kind == "thread" and name in inputs:
-                thread_data = inputs[name]
-                if isinstance(thread_data, list):
-                    for msg in thread_data:
-                        if isinstance(msg, Message):
-                            expanded.append(msg)
-                        elif isinstance(msg, dict):
-                            expanded.append(_dict_to_message(msg))
+        _append_unplaced_threads(expanded, inputs, rich_inputs)
 
     return expanded
 
@@ -400,17 +385,64 @@ def _resolve_prepare_config(
     return format_kind, parser_kind, is_strict
 
 
+def _segment_capable(renderer: Any, parser: Any) -> bool:
+    """True when *renderer* and *parser* can skip the flat-string round trip."""
+    return hasattr(renderer, "render_segments") and hasattr(parser, "parse_segments")
+
+
+def _prepare_from_segments(
+    agent: Agent,
+    renderer: Any,
+    parser: Any,
+    inputs: dict[str, Any],
+    rich_inputs: dict[str, str],
+    is_strict: bool,
+) -> list[Message]:
+    """Render to segments and build messages from them directly.
+
+    Role boundaries come from segment provenance rather than a nonce in the
+    template, and rich inputs arrive as positional segments, so neither
+    ``pre_render()`` nor the marker scan in :func:`_inject_thread_markers`
+    is needed.
+    """
+    segments = renderer.render_segments(agent, agent.instructions or "", inputs)
+    messages = parser.parse_segments(agent, segments, strict=is_strict)
+    return _expand_thread_markers(messages, inputs, rich_inputs)
+
+
 def _finalize_messages(
     messages: list[Message],
     nonces: dict[str, str],
     inputs: dict[str, Any],
     rich_inputs: dict[str, str],
 ) -> list[Message]:
-    """Inject rich-kind markers and expand them with actual content."""
-    expanded: list[Message | ThreadMarker] = list(messages)
-    if nonces:
-        expanded = _inject_thread_markers(messages, nonces, rich_inputs)
-    return _expand_thread_markers(expanded, inputs, rich_inputs)
+    """Place rich-kind inputs at their nonce markers and expand them.
+
+    Equivalent to :func:`_inject_thread_markers` followed by
+    :func:`_expand_thread_markers`, in one pass and without the
+    intermediate marker list.
+    """
+    expanded: list[Message] = []
+    marker_found = False
+    index = _MarkerIndex(nonces) if nonces else None
+
+    for msg in messages:
+        if index is not None:
+            text = msg.text
+            found = index.find(text)
+            if found:
+                marker_found = True
+                for item in _split_at_markers(msg, text, found, rich_inputs):
+                    if isinstance(item, ThreadMarker):
+                        _splice_rich_input(expanded, item.name, item.kind, inputs)
+                    else:
+                        expanded.append(item)
+                continue
+        expanded.append(msg)
+
+    if not marker_found:
+        _append_unplaced_threads(expanded, inputs, rich_inputs)
+    return expanded
 
 
 # ---------------------------------------------------------------------------
@@ -530,6 +562,10 @@ def prepare(
         4. Call ``parser.parse()``
         5. Expand thread markers with structured messages from inputs
 
+    When the renderer has ``render_segments()`` and the parser has
+    ``parse_segments()``, steps 2–4 are replaced by building messages
+    directly from the rendered segments.
+
     Parameters
     ----------
     agent:
@@ -548,12 +584,14 @@ def prepare(
     template = agent.instructions or ""
 
     parser = get_parser(parser_kind)
+    renderer = get_renderer(format_kind)
+    if _segment_capable(renderer, parser):
+        return _prepare_from_segments(agent, renderer, parser, inputs, rich_inputs, is_strict)
 
     parse_context: dict[str, Any] = {}
     if is_strict and hasattr(parser, "pre_render"):
         template, parse_context = parser.pre_render(template)  # type: ignore[union-attr]
 
-    renderer = get_renderer(format_kind)
     rendered = renderer.render(agent, template, inputs)
 
     thread_nonces: dict[str, str] = getattr(_thread_nonces_local, "nonces", {})
@@ -575,12 +613,14 @@ async def prepare_async(
     template = agent.instructions or ""
 
     parser = get_parser(parser_kind)
+    renderer = get_renderer(format_kind)
+    if _segment_capable(renderer, parser):
+        return _prepare_from_segments(agent, renderer, parser, inputs, rich_inputs, is_strict)
 
     parse_context: dict[str, Any] = {}
     if is_strict and hasattr(parser, "pre_render"):
         template, parse_context = parser.pre_render(template)  # type: ignore[union-attr]
 
-    renderer = get_renderer(format_kind)
     rendered = await renderer.render_async(agent, template, inputs)
 
     thread_nonces: dict[str, str] = getattr(_thread_nonces_local, "nonces", {})
@@ -888,6 +928,32 @@ _DEFAULT_MAX_ITERATIONS = 10
 _DEFAULT_MAX_LLM_RETRIES = 3
 
 
+def _resolve_context_budget(
+    agent: Agent,
+    context_budget: int | str | None,
+    tokenizer: Tokenizer | None,
+) -> tuple[int | None, Tokenizer | None]:
+    """Resolve ``context_budget`` / ``tokenizer`` into a concrete budget.
+
+    ``"auto"`` budgets in tokens: the model's context window (from the
+    capability dataset) minus ``maxOutputTokens``, counted with the best
+    available tokenizer for the model unless one is given.
+    """
+    if context_budget != "auto":
+        return context_budget, tokenizer  # type: ignore[return-value]
+    model_id = agent.model.id
+    provider = agent.model.provider
+    window = context_window(model_id, provider)
+    if window is None:
+        raise ValueError(
+            f"context_budget='auto' needs a known context window, but none is known for "
+            f"model '{model_id}' (provider '{provider}'). Pass an explicit token budget instead."
+        )
+    options = agent.model.options
+    reserve = (options.max_output_tokens if options is not None else None) or 0
+    return max(0, window - reserve), tokenizer or get_tokenizer(model_id, provider)
+
+
 def _emit_failed_turn_end(
     on_event: EventCallback | None,
     exc: BaseException,
@@ -902,6 +968,94 @@ def _emit_failed_turn_end(
     emit_event(on_event, "turn_end", payload)
 
 
+# ---------------------------------------------------------------------------
+# Agent loop steps — shared by turn(), turn_async() and turn_stream()
+# ---------------------------------------------------------------------------
+
+
+def _check_cancelled(cancel: CancellationToken | None, on_event: EventCallback | None, iteration: int) -> None:
+    """§13.2 — raise :class:`CancelledError` (after ``cancelled`` / ``turn_end``) if cancelled."""
+    if cancel is not None and cancel.is_cancelled:
+        emit_event(on_event, "cancelled", {})
+        _emit_failed_turn_end(on_event, CancelledError(), iterations=iteration)
+        raise CancelledError()
+
+
+def _drain_steering(messages: list[Message], steering: Steering | None, on_event: EventCallback | None) -> None:
+    """Append pending steering messages to *messages*."""
+    if steering is None:
+        return
+    pending = steering.drain()
+    if pending:
+        messages.extend(pending)
+        emit_event(on_event, "messages_updated", {"messages": messages})
+        emit_event(on_event, "status", {"message": f"Injected {len(pending)} steering message(s)"})
+
+
+def _trim_context(
+    messages: list[Message],
+    context_budget: int | None,
+    tokenizer: Tokenizer | None,
+    on_event: EventCallback | None,
+) -> list[Message]:
+    """Trim *messages* to the budget in place; return the dropped messages (for compaction)."""
+    if context_budget is None:
+        return []
+    dropped_count, dropped = trim_to_context_window(messages, context_budget, tokenizer=tokenizer)
+    if dropped_count == 0:
+        return []
+    emit_event(on_event, "messages_updated", {"messages": messages})
+    emit_event(on_event, "status", {"message": f"Trimmed {dropped_count} messages for context budget"})
+    return dropped
+
+
+def _guard_input(
+    messages: list[Message], guardrails: Guardrails | None, on_event: EventCallback | None, iteration: int
+) -> list[Message]:
+    """§13.4 — run the input guardrail; return *messages* or their rewrite."""
+    if guardrails is None:
+        return messages
+    gr = guardrails.check_input(messages)
+    if not gr.allowed:
+        emit_event(on_event, "error", {"message": f"Input guardrail denied: {gr.reason}"})
+        error = GuardrailError(gr.reason or "Input guardrail denied")
+        _emit_failed_turn_end(on_event, error, iterations=iteration)
+        raise error
+    if gr.rewrite is not None:
+        emit_event(on_event, "messages_updated", {"messages": gr.rewrite})
+        return gr.rewrite
+    return messages
+
+
+def _guard_output(content: str, guardrails: Guardrails | None, on_event: EventCallback | None, iteration: int) -> str:
+    """§13.4 — run the output guardrail on assistant *content*; return it or its rewrite."""
+    if guardrails is None:
+        return content
+    gr = guardrails.check_output(Message(role="assistant", parts=[TextPart(value=content)]))
+    if not gr.allowed:
+        emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
+        error = GuardrailError(gr.reason or "Output guardrail denied")
+        _emit_failed_turn_end(on_event, error, iterations=iteration, response=content)
+        raise error
+    return gr.rewrite if gr.rewrite is not None else content
+
+
+def _check_iterations(on_event: EventCallback | None, iteration: int, max_iterations: int) -> None:
+    """Raise ``ValueError`` (after a failed ``turn_end``) once *max_iterations* is exceeded."""
+    if iteration > max_iterations:
+        _emit_failed_turn_end(on_event, ValueError("Agent loop exceeded max_iterations"), iterations=iteration)
+        raise ValueError(
+            f"Agent loop exceeded max_iterations ({max_iterations}). "
+            f"The model kept requesting tool calls. Increase max_iterations or check your tools."
+        )
+
+
+def _emit_turn_done(on_event: EventCallback | None, response: Any, iteration: int, messages: list[Message]) -> None:
+    """Emit ``done`` and a successful ``turn_end``."""
+    emit_event(on_event, "done", {"response": response, "messages": messages})
+    emit_event(on_event, "turn_end", {"iterations": iteration, "status": "success", "response": response})
+
+
 @trace
 def turn(
     prompt: str | Agent,
@@ -912,7 +1066,8 @@ def turn(
     raw: bool = False,
     on_event: EventCallback | None = None,
     cancel: CancellationToken | None = None,
-    context_budget: int | None = None,
+    context_budget: int | Literal["auto"] | None = None,
+    tokenizer: Tokenizer | None = None,
     compaction: str | Path | Callable[..., Any] | None = None,
     guardrails: Guardrails | None = None,
     steering: Steering | None = None,
@@ -949,7 +1104,14 @@ def turn(
     cancel:
         Optional cancellation token for cooperative cancellation.
     context_budget:
-        Character budget for context window management. ``None`` = no trimming.
+        Budget for context window management. ``None`` = no trimming. An
+        ``int`` is a character budget, or a token budget when *tokenizer* is
+        given. ``"auto"`` uses the model's context window in tokens (minus
+        ``maxOutputTokens``), looked up from the bundled capability data.
+    tokenizer:
+        Optional :class:`~prompty.core.tokenizers.Tokenizer` that switches
+        *context_budget* to tokens. With ``"auto"`` it defaults to
+        :func:`~prompty.core.tokenizers.get_tokenizer` for the model.
     compaction:
         Optional compaction strategy for when messages are trimmed.  A string
         or :class:`~pathlib.Path` is treated as a ``.prompty`` file to invoke.
@@ -986,6 +1148,7 @@ def turn(
     from .loader import load
 
     agent = load(prompt) if isinstance(prompt, str) else prompt
+    context_budget, tokenizer = _resolve_context_budget(agent, context_budget, tokenizer)
     tools = tools or {}
     parent_inputs = inputs or {}
     messages = prepare(agent, inputs)
@@ -1041,42 +1204,15 @@ def turn(
         iteration = 0
 
         while True:
-            if cancel is not None and cancel.is_cancelled:
-                emit_event(on_event, "cancelled", {})
-                _emit_failed_turn_end(on_event, CancelledError(), iterations=iteration)
-                raise CancelledError()
-
-            if steering is not None:
-                pending = steering.drain()
-                if pending:
-                    messages.extend(pending)
-                    emit_event(on_event, "messages_updated", {"messages": messages})
-                    emit_event(on_event, "status", {"message": f"Injected {len(pending)} steering message(s)"})
-
-            if context_budget is not None:
-                dropped_count, dropped = trim_to_context_window(messages, context_budget)
-                if dropped_count > 0:
-                    emit_event(on_event, "messages_updated", {"messages": messages})
-                    emit_event(on_event, "status", {"message": f"Trimmed {dropped_count} messages for context budget"})
-                    if compaction is not None:
-                        _apply_compaction(compaction, dropped, messages, on_event, agent)
+            _check_cancelled(cancel, on_event, iteration)
 
-            if guardrails is not None:
-                gr_input = guardrails.check_input(messages)
-                if not gr_input.allowed:
-                    emit_event(on_event, "error", {"message": f"Input guardrail denied: {gr_input.reason}"})
-                    _emit_failed_turn_end(
-                        on_event, GuardrailError(gr_input.reason or "Input guardrail denied"), iterations=iteration
-                    )
-                    raise GuardrailError(gr_input.reason or "Input guardrail denied")
-                if gr_input.rewrite is not None:
-                    messages = gr_input.rewrite
-                    emit_event(on_event, "messages_updated", {"messages": messages})
+            _drain_steering(messages, steering, on_event)
+            dropped = _trim_context(messages, context_budget, tokenizer, on_event)
+            if dropped and compaction is not None:
+                _apply_compaction(compaction, dropped, messages, on_event, agent)
+            messages = _guard_input(messages, guardrails, on_event, iteration)
 
-            if cancel is not None and cancel.is_cancelled:
-                emit_event(on_event, "cancelled", {})
-                _emit_failed_turn_end(on_event, CancelledError(), iterations=iteration)
-                raise CancelledError()
+            _check_cancelled(cancel, on_event, iteration)
 
             # Call LLM (with retry per §9.10 in agent loop)
             emit_event(
@@ -1099,72 +1235,52 @@ def turn(
 
             # Streaming: consume through processor, extract tool calls
             if _is_stream(response):
+                # Start tools while the response is still streaming when nothing
+                # can veto them afterwards (output guardrail, max_iterations).
+                early = None
+                if parallel_tool_calls and guardrails is None and iteration < max_iterations:
+                    early = _PooledToolDispatch(tools, agent, parent_inputs, on_event=on_event, cancel=cancel)
                 try:
-                    streamed_tool_calls, content = _consume_stream(agent, response, on_event)
+                    streamed_tool_calls, content = _consume_stream(
+                        agent, response, on_event, on_tool_call=early.submit if early is not None else None
+                    )
                 except Exception as exc:
+                    if early is not None:
+                        early.close()
                     _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
                     raise
 
                 if not streamed_tool_calls:
-                    if guardrails is not None and content:
-                        assistant_msg = Message(role="assistant", parts=[TextPart(value=content)])
-                        gr = guardrails.check_output(assistant_msg)
-                        if not gr.allowed:
-                            emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-                            _emit_failed_turn_end(
-                                on_event,
-                                GuardrailError(gr.reason or "Output guardrail denied"),
-                                iterations=iteration,
-                                response=content,
-                            )
-                            raise GuardrailError(gr.reason or "Output guardrail denied")
-                        if gr.rewrite is not None:
-                            content = gr.rewrite
+                    if early is not None:
+                        early.close()
+                    if content:
+                        content = _guard_output(content, guardrails, on_event, iteration)
                     t("iterations", iteration)
                     t("result", content)
-                    emit_event(on_event, "done", {"response": content, "messages": messages})
-                    emit_event(
-                        on_event, "turn_end", {"iterations": iteration, "status": "success", "response": content}
-                    )
+                    _emit_turn_done(on_event, content, iteration, messages)
                     return content
 
-                if guardrails is not None and content:
-                    assistant_msg = Message(role="assistant", parts=[TextPart(value=content)])
-                    gr = guardrails.check_output(assistant_msg)
-                    if not gr.allowed:
-                        emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-                        _emit_failed_turn_end(
-                            on_event,
-                            GuardrailError(gr.reason or "Output guardrail denied"),
-                            iterations=iteration,
-                            response=content,
-                        )
-                        raise GuardrailError(gr.reason or "Output guardrail denied")
-                    if gr.rewrite is not None:
-                        content = gr.rewrite
+                if content:
+                    content = _guard_output(content, guardrails, on_event, iteration)
 
                 iteration += 1
-                if iteration > max_iterations:
-                    _emit_failed_turn_end(
-                        on_event, ValueError("Agent loop exceeded max_iterations"), iterations=iteration
-                    )
-                    raise ValueError(
-                        f"Agent loop exceeded max_iterations ({max_iterations}). "
-                        f"The model kept requesting tool calls. Increase max_iterations or check your tools."
-                    )
+                _check_iterations(on_event, iteration, max_iterations)
 
                 try:
-                    tool_messages = _build_tool_messages_from_calls_with_extensions(
-                        streamed_tool_calls,
-                        content,
-                        tools,
-                        agent,
-                        parent_inputs,
-                        on_event=on_event,
-                        cancel=cancel,
-                        guardrails=guardrails,
-                        parallel=parallel_tool_calls,
-                    )
+                    if early is not None:
+                        tool_messages = _format_tool_messages(agent, streamed_tool_calls, early.results(), content)
+                    else:
+                        tool_messages = _build_tool_messages_from_calls_with_extensions(
+                            streamed_tool_calls,
+                            content,
+                            tools,
+                            agent,
+                            parent_inputs,
+                            on_event=on_event,
+                            cancel=cancel,
+                            guardrails=guardrails,
+                            parallel=parallel_tool_calls,
+                        )
                 except Exception as exc:
                     _emit_failed_turn_end(on_event, exc, iterations=iteration, response=content)
                     raise
@@ -1177,29 +1293,12 @@ def turn(
                 break
 
             if guardrails is not None:
-                tool_calls_list, text_content = _extract_tool_info(response)
+                _, text_content = _extract_tool_info(response)
                 if text_content:
-                    assistant_msg = Message(role="assistant", parts=[TextPart(value=text_content)])
-                    gr = guardrails.check_output(assistant_msg)
-                    if not gr.allowed:
-                        emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-                        _emit_failed_turn_end(
-                            on_event,
-                            GuardrailError(gr.reason or "Output guardrail denied"),
-                            iterations=iteration,
-                            response=text_content,
-                        )
-                        raise GuardrailError(gr.reason or "Output guardrail denied")
-                    if gr.rewrite is not None:
-                        text_content = gr.rewrite
+                    _guard_output(text_content, guardrails, on_event, iteration)
 
             iteration += 1
-            if iteration > max_iterations:
-                _emit_failed_turn_end(on_event, ValueError("Agent loop exceeded max_iterations"), iterations=iteration)
-                raise ValueError(
-                    f"Agent loop exceeded max_iterations ({max_iterations}). "
-                    f"The model kept requesting tool calls. Increase max_iterations or check your tools."
-                )
+            _check_iterations(on_event, iteration, max_iterations)
 
             try:
                 tool_messages, _ = _build_tool_result_messages_with_extensions(
@@ -1223,30 +1322,16 @@ def turn(
 
     # Process final response (directly, not via run)
     if raw:
-        emit_event(on_event, "done", {"response": response, "messages": messages})
-        emit_event(on_event, "turn_end", {"iterations": iteration, "status": "success", "response": response})
+        _emit_turn_done(on_event, response, iteration, messages)
         return response
     try:
         processed_result = process(agent, response)
     except Exception as exc:
         _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
         raise
-    if guardrails is not None and isinstance(processed_result, str):
-        assistant_msg = Message(role="assistant", parts=[TextPart(value=processed_result)])
-        gr = guardrails.check_output(assistant_msg)
-        if not gr.allowed:
-            emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-            _emit_failed_turn_end(
-                on_event,
-                GuardrailError(gr.reason or "Output guardrail denied"),
-                iterations=iteration,
-                response=processed_result,
-            )
-            raise GuardrailError(gr.reason or "Output guardrail denied")
-        if gr.rewrite is not None:
-            processed_result = gr.rewrite
-    emit_event(on_event, "done", {"response": processed_result, "messages": messages})
-    emit_event(on_event, "turn_end", {"iterations": iteration, "status": "success", "response": processed_result})
+    if isinstance(processed_result, str):
+        processed_result = _guard_output(processed_result, guardrails, on_event, iteration)
+    _emit_turn_done(on_event, processed_result, iteration, messages)
     if target_type is not None:
         return cast(processed_result, target_type)
     return processed_result
@@ -1262,7 +1347,8 @@ async def turn_async(
     raw: bool = False,
     on_event: EventCallback | None = None,
     cancel: CancellationToken | None = None,
-    context_budget: int | None = None,
+    context_budget: int | Literal["auto"] | None = None,
+    tokenizer: Tokenizer | None = None,
     compaction: str | Path | Callable[..., Any] | None = None,
     guardrails: Guardrails | None = None,
     steering: Steering | None = None,
@@ -1278,6 +1364,7 @@ async def turn_async(
         agent = await load_async(prompt)
     else:
         agent = prompt
+    context_budget, tokenizer = _resolve_context_budget(agent, context_budget, tokenizer)
     tools = tools or {}
     parent_inputs = inputs or {}
     messages = await prepare_async(agent, inputs)
@@ -1333,42 +1420,15 @@ async def turn_async(
         iteration = 0
 
         while True:
-            if cancel is not None and cancel.is_cancelled:
-                emit_event(on_event, "cancelled", {})
-                _emit_failed_turn_end(on_event, CancelledError(), iterations=iteration)
-                raise CancelledError()
-
-            if steering is not None:
-                pending = steering.drain()
-                if pending:
-                    messages.extend(pending)
-                    emit_event(on_event, "messages_updated", {"messages": messages})
-                    emit_event(on_event, "status", {"message": f"Injected {len(pending)} steering message(s)"})
-
-            if context_budget is not None:
-                dropped_count, dropped = trim_to_context_window(messages, context_budget)
-                if dropped_count > 0:
-                    emit_event(on_event, "messages_updated", {"messages": messages})
-                    emit_event(on_event, "status", {"message": f"Trimmed {dropped_count} messages for context budget"})
-                    if compaction is not None:
-                        await _apply_compaction_async(compaction, dropped, messages, on_event, agent)
+            _check_cancelled(cancel, on_event, iteration)
 
-            if guardrails is not None:
-                gr_input = guardrails.check_input(messages)
-                if not gr_input.allowed:
-                    emit_event(on_event, "error", {"message": f"Input guardrail denied: {gr_input.reason}"})
-                    _emit_failed_turn_end(
-                        on_event, GuardrailError(gr_input.reason or "Input guardrail denied"), iterations=iteration
-                    )
-                    raise GuardrailError(gr_input.reason or "Input guardrail denied")
-                if gr_input.rewrite is not None:
-                    messages = gr_input.rewrite
-                    emit_event(on_event, "messages_updated", {"messages": messages})
+            _drain_steering(messages, steering, on_event)
+            dropped = _trim_context(messages, context_budget, tokenizer, on_event)
+            if dropped and compaction is not None:
+                await _apply_compaction_async(compaction, dropped, messages, on_event, agent)
+            messages = _guard_input(messages, guardrails, on_event, iteration)
 
-            if cancel is not None and cancel.is_cancelled:
-                emit_event(on_event, "cancelled", {})
-                _emit_failed_turn_end(on_event, CancelledError(), iterations=iteration)
-                raise CancelledError()
+            _check_cancelled(cancel, on_event, iteration)
 
             # Call LLM (with retry per §9.10 in agent loop)
             emit_event(
@@ -1391,72 +1451,53 @@ async def turn_async(
 
             # Streaming: consume through processor, extract tool calls
             if _is_stream(response):
+                # Start tools while the response is still streaming when nothing
+                # can veto them afterwards (output guardrail, max_iterations).
+                early = None
+                if guardrails is None and iteration < max_iterations:
+                    early = _AsyncStreamingToolDispatch(
+                        tools, agent, parent_inputs, on_event=on_event, cancel=cancel, parallel=parallel_tool_calls
+                    )
                 try:
-                    streamed_tool_calls, content = await _consume_stream_async(agent, response, on_event)
+                    streamed_tool_calls, content = await _consume_stream_async(
+                        agent, response, on_event, on_tool_call=early.submit if early is not None else None
+                    )
                 except Exception as exc:
+                    if early is not None:
+                        early.close()
                     _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
                     raise
 
                 if not streamed_tool_calls:
-                    if guardrails is not None and content:
-                        assistant_msg = Message(role="assistant", parts=[TextPart(value=content)])
-                        gr = guardrails.check_output(assistant_msg)
-                        if not gr.allowed:
-                            emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-                            _emit_failed_turn_end(
-                                on_event,
-                                GuardrailError(gr.reason or "Output guardrail denied"),
-                                iterations=iteration,
-                                response=content,
-                            )
-                            raise GuardrailError(gr.reason or "Output guardrail denied")
-                        if gr.rewrite is not None:
-                            content = gr.rewrite
+                    if content:
+                        content = _guard_output(content, guardrails, on_event, iteration)
                     t("iterations", iteration)
                     t("result", content)
-                    emit_event(on_event, "done", {"response": content, "messages": messages})
-                    emit_event(
-                        on_event, "turn_end", {"iterations": iteration, "status": "success", "response": content}
-                    )
+                    _emit_turn_done(on_event, content, iteration, messages)
                     return content
 
-                if guardrails is not None and content:
-                    assistant_msg = Message(role="assistant", parts=[TextPart(value=content)])
-                    gr = guardrails.check_output(assistant_msg)
-                    if not gr.allowed:
-                        emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-                        _emit_failed_turn_end(
-                            on_event,
-                            GuardrailError(gr.reason or "Output guardrail denied"),
-                            iterations=iteration,
-                            response=content,
-                        )
-                        raise GuardrailError(gr.reason or "Output guardrail denied")
-                    if gr.rewrite is not None:
-                        content = gr.rewrite
+                if content:
+                    content = _guard_output(content, guardrails, on_event, iteration)
 
                 iteration += 1
-                if iteration > max_iterations:
-                    _emit_failed_turn_end(
-                        on_event, ValueError("Agent loop exceeded max_iterations"), iterations=iteration
-                    )
-                    raise ValueError(
-                        f"Agent loop exceeded max_iterations ({max_iterations}). "
-                        f"The model kept requesting tool calls. Increase max_iterations or check your tools."
-                    )
+                _check_iterations(on_event, iteration, max_iterations)
 
                 try:
-                    tool_messages = await _build_tool_messages_from_calls_with_extensions_async(
-                        streamed_tool_calls,
-                        content,
-                        tools,
-                        agent,
-                        parent_inputs,
-                        on_event=on_event,
-                        cancel=cancel,
-                        guardrails=guardrails,
-                        parallel=parallel_tool_calls,
-                    )
+                    if early is not None:
+                        tool_results = await early.results()
+                        tool_messages = _format_tool_messages(agent, streamed_tool_calls, tool_results, content)
+                    else:
+                        tool_messages = await _build_tool_messages_from_calls_with_extensions_async(
+                            streamed_tool_calls,
+                            content,
+                            tools,
+                            agent,
+                            parent_inputs,
+                            on_event=on_event,
+                            cancel=cancel,
+                            guardrails=guardrails,
+                            parallel=parallel_tool_calls,
+                        )
                 except Exception as exc:
                     _emit_failed_turn_end(on_event, exc, iterations=iteration, response=content)
                     raise
@@ -1469,29 +1510,12 @@ async def turn_async(
                 break
 
             if guardrails is not None:
-                tool_calls_list, text_content = _extract_tool_info(response)
+                _, text_content = _extract_tool_info(response)
                 if text_content:
-                    assistant_msg = Message(role="assistant", parts=[TextPart(value=text_content)])
-                    gr = guardrails.check_output(assistant_msg)
-                    if not gr.allowed:
-                        emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-                        _emit_failed_turn_end(
-                            on_event,
-                            GuardrailError(gr.reason or "Output guardrail denied"),
-                            iterations=iteration,
-                            response=text_content,
-                        )
-                        raise GuardrailError(gr.reason or "Output guardrail denied")
-                    if gr.rewrite is not None:
-                        text_content = gr.rewrite
+                    _guard_output(text_content, guardrails, on_event, iteration)
 
             iteration += 1
-            if iteration > max_iterations:
-                _emit_failed_turn_end(on_event, ValueError("Agent loop exceeded max_iterations"), iterations=iteration)
-                raise ValueError(
-                    f"Agent loop exceeded max_iterations ({max_iterations}). "
-                    f"The model kept requesting tool calls. Increase max_iterations or check your tools."
-                )
+            _check_iterations(on_event, iteration, max_iterations)
 
             try:
                 tool_messages = await _build_tool_result_messages_with_extensions_async(
@@ -1515,30 +1539,16 @@ async def turn_async(
 
     # Process final response (directly, not via run)
     if raw:
-        emit_event(on_event, "done", {"response": response, "messages": messages})
-        emit_event(on_event, "turn_end", {"iterations": iteration, "status": "success", "response": response})
+        _emit_turn_done(on_event, response, iteration, messages)
         return response
     try:
         processed_result = await process_async(agent, response)
     except Exception as exc:
         _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
         raise
-    if guardrails is not None and isinstance(processed_result, str):
-        assistant_msg = Message(role="assistant", parts=[TextPart(value=processed_result)])
-        gr = guardrails.check_output(assistant_msg)
-        if not gr.allowed:
-            emit_event(on_event, "error", {"message": f"Output guardrail denied: {gr.reason}"})
-            _emit_failed_turn_end(
-                on_event,
-                GuardrailError(gr.reason or "Output guardrail denied"),
-                iterations=iteration,
-                response=processed_result,
-            )
-            raise GuardrailError(gr.reason or "Output guardrail denied")
-        if gr.rewrite is not None:
-            processed_result = gr.rewrite
-    emit_event(on_event, "done", {"response": processed_result, "messages": messages})
-    emit_event(on_event, "turn_end", {"iterations": iteration, "status": "success", "response": processed_result})
+    if isinstance(processed_result, str):
+        processed_result = _guard_output(processed_result, guardrails, on_event, iteration)
+    _emit_turn_done(on_event, processed_result, iteration, messages)
     if target_type is not None:
         return cast(processed_result, target_type)
     return processed_result
@@ -1640,21 +1650,10 @@ def _resolve_bindings(
 
     Returns a new dict — the original *fn_args* is not mutated.
     """
-    tools = getattr(agent, "tools", None)
-    if not tools or not parent_inputs:
+    if not getattr(agent, "tools", None) or not parent_inputs:
         return fn_args
 
-    # Find the tool definition matching fn_name
-    tool = None
-    for t in tools:
-        if getattr(t, "name", None) == fn_name:
-            tool = t
-            break
-
-    if tool is None:
-        return fn_args
-
-    bindings = getattr(tool, "bindings", None)
+    bindings = tool_index(agent).bindings(fn_name)
     if not bindings:
         return fn_args
 
@@ -1828,12 +1827,15 @@ def _consume_stream(
     agent: Agent,
     response: Any,
     on_event: EventCallback | None = None,
+    on_tool_call: Callable[[Any], None] | None = None,
 ) -> tuple[list[Any], str]:
     """Consume a streaming response through the processor.
 
     Returns (tool_calls, content) where tool_calls is a list of ToolCall
     objects and content is the accumulated text.
     Emits ``token`` events for each content chunk when *on_event* is provided.
+    *on_tool_call* is called with each ToolCall as soon as the processor
+    yields it, before the rest of the stream is read.
     """
     from ..providers.openai.processor import ToolCall
 
@@ -1846,6 +1848,8 @@ def _consume_stream(
         for item in processed:
             if isinstance(item, ToolCall):
                 tool_calls.append(item)
+                if on_tool_call is not None:
+                    on_tool_call(item)
             elif isinstance(item, str):
                 text_parts.append(item)
                 emit_event(on_event, "token", {"token": item})
@@ -1860,10 +1864,12 @@ async def _consume_stream_async(
     agent: Agent,
     response: Any,
     on_event: EventCallback | None = None,
+    on_tool_call: Callable[[Any], None] | None = None,
 ) -> tuple[list[Any], str]:
     """Async: consume a streaming response through the processor.
 
-    Emits ``token`` events for each content chunk when *on_event* is provided.
+    Emits ``token`` events for each content chunk when *on_event* is provided,
+    and calls *on_tool_call* with each ToolCall as it is yielded.
     """
     from ..providers.openai.processor import ToolCall
 
@@ -1876,6 +1882,8 @@ async def _consume_stream_async(
         async for item in processed:
             if isinstance(item, ToolCall):
                 tool_calls.append(item)
+                if on_tool_call is not None:
+                    on_tool_call(item)
             elif isinstance(item, str):
                 text_parts.append(item)
                 emit_event(on_event, "token", {"token": item})
@@ -1883,6 +1891,8 @@ async def _consume_stream_async(
         for item in processed:
             if isinstance(item, ToolCall):
                 tool_calls.append(item)
+                if on_tool_call is not None:
+                    on_tool_call(item)
             elif isinstance(item, str):
                 text_parts.append(item)
                 emit_event(on_event, "token", {"token": item})
@@ -2072,6 +2082,75 @@ async def _build_tool_messages_from_calls_with_extensions_async(
     return executor.format_tool_messages(None, tool_calls, tool_results, text_content)
 
 
+def _dispatch_tool_call(
+    tc: Any,
+    tools: dict[str, Callable[..., Any]],
+    agent: Agent,
+    parent_inputs: dict[str, Any],
+    on_event: EventCallback | None,
+    cancel: CancellationToken | None,
+    guardrails: Guardrails | None,
+) -> str:
+    """Dispatch one tool call with events, cancellation and the tool guardrail."""
+    name = getattr(tc, "name", "")
+    arguments = getattr(tc, "arguments", "{}")
+
+    # §13.2 — Check cancellation before each tool
+    if cancel is not None and cancel.is_cancelled:
+        emit_event(on_event, "cancelled", {})
+        raise CancelledError()
+
+    # §13.1 — Emit tool_call_start
+    emit_event(on_event, "tool_call_start", {"name": name, "arguments": arguments})
+    started = time.perf_counter()
+
+    # §13.4 — Tool guardrail
+    if guardrails is not None:
+        parsed_args = json.loads(arguments) if isinstance(arguments, str) else arguments
+        gr = guardrails.check_tool(name, parsed_args if isinstance(parsed_args, dict) else {})
+        if not gr.allowed:
+            denied_msg = f"Tool denied by guardrail: {gr.reason}"
+            emit_event(on_event, "tool_result", {"name": name, "result": denied_msg})
+            emit_event(
+                on_event,
+                "tool_call_complete",
+                {
+                    "name": name,
+                    "success": False,
+                    "result": denied_msg,
+                    "durationMs": (time.perf_counter() - started) * 1000,
+                    "errorKind": "guardrail_denied",
+                },
+            )
+            return denied_msg
+        if gr.rewrite is not None:
+            arguments = json.dumps(gr.rewrite) if isinstance(gr.rewrite, dict) else gr.rewrite
+
+    # Execute tool (with safety net per §9.9)
+    try:
+        result = dispatch_tool(name, arguments, tools, agent, parent_inputs, on_event=on_event)
+    except Exception as e:
+        result = f"Error: Tool '{name}' failed: {type(e).__name__}: {e}"
+        emit_event(on_event, "error", {"tool": name, "error": str(e)})
+    success = not result.startswith("Error:")
+    error_kind = None if success else "tool_error"
+
+    # §13.1 — Emit tool_result
+    emit_event(on_event, "tool_result", {"name": name, "result": result})
+    emit_event(
+        on_event,
+        "tool_call_complete",
+        {
+            "name": name,
+            "success": success,
+            "result": result,
+            "durationMs": (time.perf_counter() - started) * 1000,
+            "errorKind": error_kind,
+        },
+    )
+    return result
+
+
 def _dispatch_tools_with_extensions(
     tool_calls: list[Any],
     tools: dict[str, Callable[..., Any]],
@@ -2083,74 +2162,102 @@ def _dispatch_tools_with_extensions(
     guardrails: Guardrails | None = None,
     parallel: bool = False,
 ) -> list[str]:
-    """Dispatch tool calls with events, cancellation, guardrails, and optional parallelism."""
-
-    def _dispatch_one(tc: Any) -> str:
-        name = getattr(tc, "name", "")
-        arguments = getattr(tc, "arguments", "{}")
-
-        # §13.2 — Check cancellation before each tool
-        if cancel is not None and cancel.is_cancelled:
-            emit_event(on_event, "cancelled", {})
-            raise CancelledError()
-
-        # §13.1 — Emit tool_call_start
-        emit_event(on_event, "tool_call_start", {"name": name, "arguments": arguments})
-        started = time.perf_counter()
-
-        # §13.4 — Tool guardrail
-        if guardrails is not None:
-            parsed_args = json.loads(arguments) if isinstance(arguments, str) else arguments
-            gr = guardrails.check_tool(name, parsed_args if isinstance(parsed_args, dict) else {})
-            if not gr.allowed:
-                denied_msg = f"Tool denied by guardrail: {gr.reason}"
-                emit_event(on_event, "tool_result", {"name": name, "result": denied_msg})
-                emit_event(
-                    on_event,
-                    "tool_call_complete",
-                    {
-                        "name": name,
-                        "success": False,
-                        "result": denied_msg,
-                        "durationMs": (time.perf_counter() - started) * 1000,
-                        "errorKind": "guardrail_denied",
-                    },
-                )
-                return denied_msg
-            if gr.rewrite is not None:
-                arguments = json.dumps(gr.rewrite) if isinstance(gr.rewrite, dict) else gr.rewrite
+    """Dispatch tool calls with events, cancellation, guardrails, and optional parallelism.
 
-        # Execute tool (with safety net per §9.9)
-        try:
-            result = dispatch_tool(name, arguments, tools, agent, parent_inputs)
-        except Exception as e:
-            result = f"Error: Tool '{name}' failed: {type(e).__name__}: {e}"
-            emit_event(on_event, "error", {"tool": name, "error": str(e)})
-        success = not result.startswith("Error:")
-        error_kind = None if success else "tool_error"
+    Parallel calls, and calls of tools with a ``timeout`` or
+    ``max_concurrency``, run on the shared tool executor; the rest run
+    inline.
+    """
 
-        # §13.1 — Emit tool_result
-        emit_event(on_event, "tool_result", {"name": name, "result": result})
-        emit_event(
-            on_event,
-            "tool_call_complete",
-            {
-                "name": name,
-                "success": success,
-                "result": result,
-                "durationMs": (time.perf_counter() - started) * 1000,
-                "errorKind": error_kind,
-            },
-        )
-        return result
+    def _pooled() -> _PooledToolDispatch:
+        return _PooledToolDispatch(tools, agent, parent_inputs, on_event=on_event, cancel=cancel, guardrails=guardrails)
 
     # §13.6 — Parallel tool execution
     if parallel and len(tool_calls) > 1:
-        with ThreadPoolExecutor() as pool:
-            futures = [pool.submit(_dispatch_one, tc) for tc in tool_calls]
-            return [f.result() for f in futures]
-    else:
-        return [_dispatch_one(tc) for tc in tool_calls]
+        dispatch = _pooled()
+        for tc in tool_calls:
+            dispatch.submit(tc)
+        return dispatch.results()
+
+    results: list[str] = []
+    for tc in tool_calls:
+        options = _tool_options(tools, getattr(tc, "name", ""))
+        if options.timeout is None and options.max_concurrency is None:
+            results.append(_dispatch_tool_call(tc, tools, agent, parent_inputs, on_event, cancel, guardrails))
+        else:
+            dispatch = _pooled()
+            dispatch.submit(tc)
+            results.extend(dispatch.results())
+    return results
+
+
+async def _dispatch_tool_call_async(
+    tc: Any,
+    tools: dict[str, Callable[..., Any]],
+    agent: Agent,
+    parent_inputs: dict[str, Any],
+    on_event: EventCallback | None,
+    cancel: CancellationToken | None,
+    guardrails: Guardrails | None,
+) -> str:
+    """Async variant of :func:`_dispatch_tool_call`."""
+    name = getattr(tc, "name", "")
+    arguments = getattr(tc, "arguments", "{}")
+
+    # §13.2 — Check cancellation before each tool
+    if cancel is not None and cancel.is_cancelled:
+        emit_event(on_event, "cancelled", {})
+        raise CancelledError()
+
+    # §13.1 — Emit tool_call_start
+    emit_event(on_event, "tool_call_start", {"name": name, "arguments": arguments})
+    started = time.perf_counter()
+
+    # §13.4 — Tool guardrail
+    if guardrails is not None:
+        parsed_args = json.loads(arguments) if isinstance(arguments, str) else arguments
+        gr = guardrails.check_tool(name, parsed_args if isinstance(parsed_args, dict) else {})
+        if not gr.allowed:
+            denied_msg = f"Tool denied by guardrail: {gr.reason}"
+            emit_event(on_event, "tool_result", {"name": name, "result": denied_msg})
+            emit_event(
+                on_event,
+                "tool_call_complete",
+                {
+                    "name": name,
+                    "success": False,
+                    "result": denied_msg,
+                    "durationMs": (time.perf_counter() - started) * 1000,
+                    "errorKind": "guardrail_denied",
+                },
+            )
+            return denied_msg
+        if gr.rewrite is not None:
+            arguments = json.dumps(gr.rewrite) if isinstance(gr.rewrite, dict) else gr.rewrite
+
+    # Execute tool (with safety net per §9.9)
+    try:
+        result = await dispatch_tool_async(name, arguments, tools, agent, parent_inputs, on_event=on_event)
+    except Exception as e:
+        result = f"Error: Tool '{name}' failed: {type(e).__name__}: {e}"
+        emit_event(on_event, "error", {"tool": name, "error": str(e)})
+    success = not result.startswith("Error:")
+    error_kind = None if success else "tool_error"
+
+    # §13.1 — Emit tool_result
+    emit_event(on_event, "tool_result", {"name": name, "result": result})
+    emit_event(
+        on_event,
+        "tool_call_complete",
+        {
+            "name": name,
+            "success": success,
+            "result": result,
+            "durationMs": (time.perf_counter() - started) * 1000,
+            "errorKind": error_kind,
+        },
+    )
+    return result
 
 
 async def _dispatch_tools_with_extensions_async(
@@ -2167,63 +2274,7 @@ async def _dispatch_tools_with_extensions_async(
     """Async dispatch tool calls with events, cancellation, guardrails, and optional parallelism."""
 
     async def _dispatch_one(tc: Any) -> str:
-        name = getattr(tc, "name", "")
-        arguments = getattr(tc, "arguments", "{}")
-
-        # §13.2 — Check cancellation before each tool
-        if cancel is not None and cancel.is_cancelled:
-            emit_event(on_event, "cancelled", {})
-            raise CancelledError()
-
-        # §13.1 — Emit tool_call_start
-        emit_event(on_event, "tool_call_start", {"name": name, "arguments": arguments})
-        started = time.perf_counter()
-
-        # §13.4 — Tool guardrail
-        if guardrails is not None:
-            parsed_args = json.loads(arguments) if isinstance(arguments, str) else arguments
-            gr = guardrails.check_tool(name, parsed_args if isinstance(parsed_args, dict) else {})
-            if not gr.allowed:
-                denied_msg = f"Tool denied by guardrail: {gr.reason}"
-                emit_event(on_event, "tool_result", {"name": name, "result": denied_msg})
-                emit_event(
-                    on_event,
-                    "tool_call_complete",
-                    {
-                        "name": name,
-                        "success": False,
-                        "result": denied_msg,
-                        "durationMs": (time.perf_counter() - started) * 1000,
-                        "errorKind": "guardrail_denied",
-                    },
-                )
-                return denied_msg
-            if gr.rewrite is not None:
-                arguments = json.dumps(gr.rewrite) if isinstance(gr.rewrite, dict) else gr.rewrite
-
-        # Execute tool (with safety net per §9.9)
-        try:
-            result = await dispatch_tool_async(name, arguments, tools, agent, parent_inputs)
-        except Exception as e:
-            result = f"Error: Tool '{name}' failed: {type(e).__name__}: {e}"
-            emit_event(on_event, "error", {"tool": name, "error": str(e)})
-        success = not result.startswith("Error:")
-        error_kind = None if success else "tool_error"
-
-        # §13.1 — Emit tool_result
-        emit_event(on_event, "tool_result", {"name": name, "result": result})
-        emit_event(
-            on_event,
-            "tool_call_complete",
-            {
-                "name": name,
-                "success": success,
-                "result": result,
-                "durationMs": (time.perf_counter() - started) * 1000,
-                "errorKind": error_kind,
-            },
-        )
-        return result
+        return await _dispatch_tool_call_async(tc, tools, agent, parent_inputs, on_event, cancel, guardrails)
 
     # §13.6 — Parallel tool execution
     if parallel and len(tool_calls) > 1:
@@ -2234,3 +2285,154 @@ async def _dispatch_tools_with_extensions_async(
         for tc in tool_calls:
             results.append(await _dispatch_one(tc))
         return results
+
+
+def _tool_options(tools: dict[str, Callable[..., Any]], name: str) -> ToolOptions:
+    """Execution options of the callable *name* resolves to (see ``dispatch_tool``)."""
+    return get_tool_options(tools.get(name) or get_tool(name))
+
+
+def _unless_abandoned(on_event: EventCallback | None, abandoned: threading.Event) -> EventCallback | None:
+    """Forward events until the waiter gives up on the call (timeout)."""
+    if on_event is None:
+        return None
+
+    def forward(event_type: str, data: dict[str, Any]) -> None:
+        if not abandoned.is_set():
+            on_event(event_type, data)
+
+    return forward
+
+
+class _PooledToolDispatch:
+    """Run tool calls on the shared tool executor (``turn()``).
+
+    Used for parallel tool calls — including streamed calls submitted as
+    the processor yields them — and for tools with a ``timeout`` or
+    ``max_concurrency``. :meth:`results` returns the results in model
+    order; a call that exceeds its timeout becomes an error result, and
+    cancelling *cancel* drops calls that have not started.
+    """
+
+    def __init__(
+        self,
+        tools: dict[str, Callable[..., Any]],
+        agent: Agent,
+        parent_inputs: dict[str, Any],
+        *,
+        on_event: EventCallback | None = None,
+        cancel: CancellationToken | None = None,
+        guardrails: Guardrails | None = None,
+    ) -> None:
+        self._tools = tools
+        self._args = (tools, agent, parent_inputs)
+        self._on_event = on_event
+        self._cancel = cancel
+        self._guardrails = guardrails
+        self._executor = get_tool_executor()
+        self._calls: list[tuple[str, ToolOptions, ToolFuture, threading.Event]] = []
+
+    def submit(self, tc: Any) -> None:
+        name = getattr(tc, "name", "")
+        options = _tool_options(self._tools, name)
+        abandoned = threading.Event()
+        call = partial(
+            _dispatch_tool_call,
+            tc,
+            *self._args,
+            _unless_abandoned(self._on_event, abandoned),
+            self._cancel,
+            self._guardrails,
+        )
+        future = self._executor.submit(name, call, options=options, on_event=self._on_event)
+        self._calls.append((name, options, future, abandoned))
+
+    def results(self) -> list[str]:
+        try:
+            return [self._result(*call) for call in self._calls]
+        except BaseException:
+            self.close()
+            raise
+
+    def _result(self, name: str, options: ToolOptions, future: ToolFuture, abandoned: threading.Event) -> str:
+        try:
+            return self._executor.result(name, future, timeout=options.timeout, cancel=self._cancel)
+        except ToolTimeoutError as e:
+            abandoned.set()
+            result = f"Error calling '{name}': {type(e).__name__}: {e}"
+            emit_event(self._on_event, "tool_result", {"name": name, "result": result})
+            emit_event(
+                self._on_event,
+                "tool_call_complete",
+                {
+                    "name": name,
+                    "success": False,
+                    "result": result,
+                    "durationMs": (time.perf_counter() - (future.started or 0)) * 1000,
+                    "errorKind": "timeout",
+                },
+            )
+            return result
+        except CancelledError:
+            # A call that raised it itself has already reported the cancellation
+            if not future.done() or future.cancelled():
+                emit_event(self._on_event, "cancelled", {})
+            raise
+
+    def close(self) -> None:
+        """Drop calls that have not started; running ones finish in the background."""
+        for _, _, future, _ in self._calls:
+            future.cancel()
+
+
+class _AsyncStreamingToolDispatch:
+    """Start streamed tool calls as the processor yields them (``turn_async()``).
+
+    Each completed call becomes a task on the running loop while the rest of
+    the response is still streaming. Without *parallel*, each task waits for
+    the previous one, so tools still run one at a time in model order.
+    """
+
+    def __init__(
+        self,
+        tools: dict[str, Callable[..., Any]],
+        agent: Agent,
+        parent_inputs: dict[str, Any],
+        *,
+        on_event: EventCallback | None = None,
+        cancel: CancellationToken | None = None,
+        parallel: bool = False,
+    ) -> None:
+        self._args = (tools, agent, parent_inputs, on_event, cancel, None)
+        self._parallel = parallel
+        self._tasks: list[asyncio.Task[str]] = []
+
+    def submit(self, tc: Any) -> None:
+        previous = self._tasks[-1] if self._tasks and not self._parallel else None
+        self._tasks.append(asyncio.ensure_future(self._run(tc, previous)))
+
+    async def _run(self, tc: Any, previous: asyncio.Task[str] | None) -> str:
+        if previous is not None:
+            await previous
+        return await _dispatch_tool_call_async(tc, *self._args)
+
+    async def results(self) -> list[str]:
+        return list(await asyncio.gather(*self._tasks))
+
+    def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+
+def _format_tool_messages(
+    agent: Agent, tool_calls: list[Any], tool_results: list[str], text_content: str, response: Any = None
+) -> list[Message]:
+    """Format already-dispatched tool calls via the provider's executor.
+
+    *response* is the raw (non-streamed) response, or ``None`` for streamed
+    tool calls.
+    """
+    from .discovery import get_executor
+
+    executor = get_executor(agent.model.provider or "")
+    return executor.format_tool_messages(response, tool_calls, tool_results, text_content)
@@ -7,10 +7,11 @@ without inheriting from a base class.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any, Protocol, runtime_checkable
 
 from ..model import Agent
-from .types import Message
+from .types import Message, ThreadMarker
 
 __all__ = [
     "RendererProtocol",
@@ -18,6 +19,8 @@ __all__ = [
     "ExecutorProtocol",
     "ProcessorProtocol",
     "_PreRenderable",
+    "_SegmentRenderable",
+    "_SegmentParsable",
 ]
 
 
@@ -79,6 +82,28 @@ class _PreRenderable(Protocol):
     def pre_render(self, template: str) -> tuple[str, dict[str, Any]]: ...
 
 
+class _SegmentRenderable(Protocol):
+    """Optional mixin for renderers that emit provenance-tagged segments.
+
+    Segments have ``kind`` (``"literal"``, ``"interp"`` or ``"rich"``),
+    ``text`` and ``source``; see ``spec/jinja-grammar.md`` §7.
+    """
+
+    def render_segments(self, agent: Agent, template: str, inputs: dict[str, Any]) -> list[Any]: ...
+
+
+class _SegmentParsable(Protocol):
+    """Optional mixin for parsers that build messages from segments.
+
+    When both the renderer and the parser support segments, ``prepare()``
+    skips the flat-string round trip (and strict mode's ``pre_render()``).
+    """
+
+    def parse_segments(
+        self, agent: Agent, segments: Sequence[Any], *, strict: bool = False
+    ) -> list[Message | ThreadMarker]: ...
+
+
 @runtime_checkable
 class ExecutorProtocol(Protocol):
     """Calls an LLM provider with messages and returns the raw response.
@@ -0,0 +1,162 @@
+"""Client-side rate limiting for bulk calls.
+
+:class:`RateLimiter` is a pair of token buckets — requests per minute and
+(model) tokens per minute — shared by every worker of a batch, so a bulk run
+stays under a deployment's quota instead of discovering it through 429s.
+:func:`retry_after` reads the server's back-off hint from a provider
+exception.
+
+Usage::
+
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=90_000)
+    await limiter.acquire(tokens=estimated)
+    ...
+    except Exception as e:
+        if (delay := retry_after(e)) is not None:
+            limiter.pause(delay)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import time
+from typing import Any
+
+__all__ = [
+    "RateLimiter",
+    "retry_after",
+]
+
+
+class _Bucket:
+    """A token bucket refilled continuously at ``limit`` per minute.
+
+    The level may go negative: a request larger than the bucket is let
+    through once the bucket is full and its overdraft is paid back by the
+    requests after it, so the long-run rate is still ``limit``.
+    """
+
+    __slots__ = ("capacity", "level", "rate")
+
+    def __init__(self, per_minute: float, burst_seconds: float) -> None:
+        if per_minute <= 0:
+            raise ValueError("rate limits must be > 0")
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+
+    def refill(self, elapsed: float) -> None:
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+
+    def wait_for(self, cost: float) -> float:
+        """Seconds until *cost* may be taken (0 if it may be taken now)."""
+        needed = min(cost, self.capacity) - self.level
+        return needed / self.rate if needed > 0 else 0.0
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests/min and tokens/min.
+
+    Parameters
+    ----------
+    requests_per_minute:
+        Maximum request rate, or ``None`` for no limit.
+    tokens_per_minute:
+        Maximum model-token rate (prompt + reserved completion tokens), or
+        ``None`` for no limit.
+    burst_seconds:
+        Bucket size, in seconds of quota. Providers evaluate per-minute
+        quotas over short windows, so the default lets a batch start with
+        at most 10 seconds' worth of requests rather than a full minute.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        *,
+        burst_seconds: float = 10.0,
+    ) -> None:
+        if burst_seconds <= 0:
+            raise ValueError("burst_seconds must be > 0")
+        self._requests = _Bucket(requests_per_minute, burst_seconds) if requests_per_minute is not None else None
+        self._tokens = _Bucket(tokens_per_minute, burst_seconds) if tokens_per_minute is not None else None
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: asyncio.Lock | None = None
+
+    @property
+    def limits_tokens(self) -> bool:
+        """Whether a tokens-per-minute limit is set (token costs matter)."""
+        return self._tokens is not None
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        for bucket in (self._requests, self._tokens):
+            if bucket is not None:
+                bucket.refill(elapsed)
+        return now
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request of *tokens* model tokens may be sent.
+
+        Waiters are served first-come first-served.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = self._refill()
+                wait = self._paused_until - now
+                if self._requests is not None:
+                    wait = max(wait, self._requests.wait_for(1))
+                if self._tokens is not None:
+                    wait = max(wait, self._tokens.wait_for(tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self._requests is not None:
+                self._requests.level -= 1
+            if self._tokens is not None:
+                self._tokens.level -= tokens
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every acquisition for *seconds* (e.g. a ``Retry-After``)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """The back-off, in seconds, a provider asked for in *exc* — or ``None``.
+
+    Understands ``retry-after-ms`` and ``retry-after`` (seconds or an HTTP
+    date) on the ``response.headers`` of OpenAI / Anthropic / httpx errors,
+    and a plain ``retry_after`` attribute.
+    """
+    value: Any = getattr(exc, "retry_after", None)
+    if isinstance(value, (int, float)):
+        return max(0.0, float(value))
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms is not None:
+            return max(0.0, float(ms) / 1000.0)
+        raw = headers.get("retry-after")
+    except Exception:  # noqa: BLE001 — foreign header objects
+        return None
+    if raw is None:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(str(raw))
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
@@ -0,0 +1,162 @@
+"""Tokenizers for token-based context budgets.
+
+``turn(context_budget=...)`` counts characters by default. Passing a
+:class:`Tokenizer` (or ``context_budget="auto"``) switches the budget to
+tokens, which tracks the model's real context window far more closely.
+
+A tokenizer is anything with ``count(text) -> int``. Two are bundled:
+
+- :class:`TiktokenTokenizer` — exact counts for OpenAI model families when
+  the optional ``tiktoken`` package is installed (``prompty[tokens]``).
+- :class:`ApproximateTokenizer` — a dependency-free estimate (word and
+  punctuation aware) that works offline for any model.
+
+:func:`get_tokenizer` picks the best available one for a model, and
+:func:`context_window` looks up the model's window in the shared
+capability dataset (:func:`prompty.providers.discovery.match_capabilities`).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from typing import Protocol, runtime_checkable
+
+__all__ = [
+    "ApproximateTokenizer",
+    "TiktokenTokenizer",
+    "Tokenizer",
+    "context_window",
+    "get_tokenizer",
+]
+
+
+@runtime_checkable
+class Tokenizer(Protocol):
+    """Counts the tokens a model would see for a piece of text."""
+
+    def count(self, text: str) -> int: ...
+
+
+# Words (letters/digits/underscore) and single punctuation characters —
+# roughly how BPE vocabularies split text.
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+class ApproximateTokenizer:
+    """Offline token estimate for any model.
+
+    Each word costs one token per *chars_per_token* characters (at least
+    one), and each punctuation character costs one token. This tracks BPE
+    tokenizers much more closely than a flat ``len(text) / 4``, which
+    undercounts punctuation-heavy content such as JSON.
+
+    Parameters
+    ----------
+    chars_per_token:
+        Average characters per token inside a word.
+    """
+
+    def __init__(self, chars_per_token: float = 4.0) -> None:
+        if chars_per_token <= 0:
+            raise ValueError("chars_per_token must be > 0")
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        cpt = self.chars_per_token
+        total = 0
+        for piece in _PIECES.findall(text):
+            total += math.ceil(len(piece) / cpt) if len(piece) > 1 else 1
+        return total
+
+    def __repr__(self) -> str:
+        return f"ApproximateTokenizer(chars_per_token={self.chars_per_token})"
+
+
+class TiktokenTokenizer:
+    """Exact token counts via ``tiktoken``.
+
+    Parameters
+    ----------
+    encoding:
+        A ``tiktoken`` encoding name, e.g. ``"o200k_base"``.
+
+    Raises
+    ------
+    ImportError
+        If ``tiktoken`` is not installed.
+    """
+
+    def __init__(self, encoding: str = "o200k_base") -> None:
+        try:
+            import tiktoken
+        except ImportError as e:
+            raise ImportError(
+                "The tiktoken package is required for exact token counts. Install it with: uv pip install prompty[tokens]"
+            ) from e
+        self.encoding = encoding
+        self._enc = tiktoken.get_encoding(encoding)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._enc.encode(text, disallowed_special=()))
+
+    def __repr__(self) -> str:
+        return f"TiktokenTokenizer({self.encoding!r})"
+
+
+# Providers that serve OpenAI model families
+_OPENAI_PROVIDERS = frozenset({"openai", "foundry", "azure"})
+
+# Model-id prefixes tokenized with the older cl100k_base encoding; every
+# other OpenAI model (gpt-4o, gpt-4.1, gpt-5, o-series, ...) uses o200k_base.
+_CL100K_PREFIXES = ("gpt-4", "gpt-3.5", "text-embedding-")
+
+
+def _openai_encoding(model_id: str) -> str:
+    if model_id.startswith("gpt-4o") or model_id.startswith("gpt-4.1"):
+        return "o200k_base"
+    if model_id.startswith(_CL100K_PREFIXES):
+        return "cl100k_base"
+    return "o200k_base"
+
+
+@lru_cache(maxsize=64)
+def get_tokenizer(model_id: str | None = None, provider: str | None = None) -> Tokenizer:
+    """Return the best available tokenizer for a model.
+
+    OpenAI-family models (``openai``, ``foundry``, ``azure`` providers) get a
+    :class:`TiktokenTokenizer` when ``tiktoken`` is installed. Everything
+    else — or any model when ``tiktoken`` or its encoding data is
+    unavailable — gets the bundled
+    :class:`ApproximateTokenizer`. Results are cached per model.
+    """
+    if provider in _OPENAI_PROVIDERS:
+        try:
+            return TiktokenTokenizer(_openai_encoding(model_id or ""))
+        except Exception:  # noqa: BLE001 — not installed, or encoding data unavailable offline
+            pass
+    return ApproximateTokenizer()
+
+
+def context_window(model_id: str | None, provider: str | None) -> int | None:
+    """Return the model's context window in tokens, or ``None`` if unknown.
+
+    Uses the capability dataset shared with model discovery. Azure / Foundry
+    deployments of OpenAI models fall back to the ``openai`` entries.
+    """
+    if not model_id or not provider:
+        return None
+    from ..providers.discovery import match_capabilities
+
+    entry = match_capabilities(model_id, provider)
+    if entry is None and provider in _OPENAI_PROVIDERS:
+        entry = match_capabilities(model_id, "openai")
+    if entry is None:
+        return None
+    window = entry.get("contextWindow")
+    return window if isinstance(window, int) else None
@@ -0,0 +1,191 @@
+"""Opt-in result cache for idempotent tool calls.
+
+Models often re-issue the same tool call — the same search query, the same
+file read — across agent-loop iterations and across turns. A tool declared
+with ``@tool(cache_ttl=...)`` has its successful results memoized by
+``dispatch_tool()`` / ``dispatch_tool_async()`` for *cache_ttl* seconds::
+
+    @tool(cache_ttl=300)
+    def search(query: str) -> str: ...
+
+Entries are keyed by tool name, the function object itself and the
+canonical JSON of the arguments after binding resolution —
+``{"a": 1, "b": 2}`` and ``{"b": 2, "a": 1}`` share an entry. Two
+functions never share entries, even closures from one factory or one method
+bound to different instances, so per-tenant tools stay separate. Because of
+that, keys are only meaningful within the process that made them. Calls
+that raise and calls whose arguments are not JSON-serializable are never
+cached; a string the tool returns is cached as-is. The tool guardrail runs before dispatch, so a denied call never
+reads the cache and a rewrite changes the key; a cached result then flows
+through ``tool_result`` events, the conversation and the output guardrail
+exactly like a fresh one. Each lookup emits ``tool_cache_hit`` or
+``tool_cache_miss`` (``name``, ``key``).
+
+The default store is a process-wide in-memory LRU with per-entry expiry;
+any object implementing :class:`ToolCacheStore` can replace it. The cache is shared by every agent loop in the process —
+only opt in tools whose result depends on nothing but their arguments.
+
+Usage::
+
+    import prompty
+
+    prompty.configure_tool_cache(max_size=4096)
+    prompty.configure_tool_cache(store=MyRedisStore())
+    prompty.tool_cache_info()  # CacheInfo(hits=..., misses=..., ...)
+    prompty.clear_tool_cache()
+"""
+
+from __future__ import annotations
+
+import inspect
+import itertools
+import json
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from typing import Any, Protocol, runtime_checkable
+
+from .agent_events import EventCallback, emit_event
+from .cache import CacheInfo, LRUCache
+
+__all__ = [
+    "MemoryToolCache",
+    "ToolCacheStore",
+    "clear_tool_cache",
+    "configure_tool_cache",
+    "get_tool_cache",
+    "tool_cache_info",
+    "tool_cache_key",
+]
+
+
+@runtime_checkable
+class ToolCacheStore(Protocol):
+    """Storage backend for cached tool results."""
+
+    def get(self, key: str) -> str | None:
+        """Return the unexpired result for *key*, or ``None``."""
+        ...
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store *value* under *key* for *ttl* seconds."""
+        ...
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        ...
+
+
+class MemoryToolCache:
+    """In-memory :class:`ToolCacheStore`: bounded LRU with per-entry expiry."""
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self._cache: LRUCache[str, tuple[float, str]] = LRUCache(max_size)
+
+    def get(self, key: str) -> str | None:
+        """Return the unexpired result for *key*, or ``None``."""
+        now = time.monotonic()
+        entry = self._cache.get(key, is_valid=lambda e: e[0] > now)
+        return None if entry is None else entry[1]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store *value* under *key* for *ttl* seconds."""
+        self._cache.put(key, (time.monotonic() + ttl, value))
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._cache.clear()
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss/eviction counters (expired entries count as evictions)."""
+        return self._cache.info()
+
+
+_store: ToolCacheStore = MemoryToolCache()
+
+
+def configure_tool_cache(*, store: ToolCacheStore | None = None, max_size: int | None = None) -> None:
+    """Configure the process-wide tool result cache.
+
+    Parameters
+    ----------
+    store:
+        Replace the backend with a custom :class:`ToolCacheStore`.
+    max_size:
+        Replace the backend with a :class:`MemoryToolCache` of this size
+        (``0`` disables caching).
+    """
+    global _store
+    if store is not None and max_size is not None:
+        raise ValueError("pass either store or max_size, not both")
+    if store is not None:
+        _store = store
+    elif max_size is not None:
+        _store.clear()
+        _store = MemoryToolCache(max_size)
+
+
+def get_tool_cache() -> ToolCacheStore:
+    """Return the process-wide tool result store."""
+    return _store
+
+
+def tool_cache_info() -> CacheInfo | None:
+    """Return counters for the in-memory store (``None`` for custom stores)."""
+    return _store.info() if isinstance(_store, MemoryToolCache) else None
+
+
+def clear_tool_cache() -> None:
+    """Drop every cached tool result."""
+    _store.clear()
+
+
+_tokens: dict[int, int] = {}
+_pinned: list[Any] = []
+_token_ids = itertools.count(1)
+_token_lock = threading.Lock()
+
+
+def _token(obj: Any) -> int:
+    """Return a number unique to *obj* among the live objects of this process."""
+    key = id(obj)
+    with _token_lock:
+        token = _tokens.get(key)
+        if token is None:
+            token = _tokens[key] = next(_token_ids)
+            try:
+                weakref.finalize(obj, _tokens.pop, key, None)
+            except TypeError:
+                # Not weak-referenceable: keep it alive so its id() is never reused
+                _pinned.append(obj)
+        return token
+
+
+def tool_cache_key(tool_name: str, args: dict[str, Any], fn: Callable[..., Any] | None = None) -> str | None:
+    """Return the cache key for a call of *fn*, or ``None`` if *args* are not JSON-serializable.
+
+    The key is ``name[@module.qualname#token]:canonical-json-args``, where
+    *token* identifies the function object (for a bound method, the
+    function and its instance).
+    """
+    try:
+        canonical = json.dumps(args, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+    if fn is None:
+        return f"{tool_name}:{canonical}"
+    if inspect.ismethod(fn):
+        # A bound method is a new object on every attribute access
+        token = f"{_token(fn.__func__)}.{_token(fn.__self__)}"
+    else:
+        token = str(_token(fn))
+    namespace = f"{getattr(fn, '__module__', None)}.{getattr(fn, '__qualname__', type(fn).__qualname__)}"
+    return f"{tool_name}@{namespace}#{token}:{canonical}"
+
+
+def _cached_result(tool_name: str, key: str, on_event: EventCallback | None) -> str | None:
+    """Look *key* up in the store and emit ``tool_cache_hit`` / ``tool_cache_miss``."""
+    result = _store.get(key)
+    emit_event(on_event, "tool_cache_miss" if result is None else "tool_cache_hit", {"name": tool_name, "key": key})
+    return result
@@ -22,6 +22,20 @@ The decorator can also be called with arguments::
     def get_weather(city: str) -> str:
         ...
 
+Execution options for async dispatch (see :mod:`prompty.core.tool_executor`)::
+
+    @tool(timeout=10, max_concurrency=4)
+    def search(query: str) -> str:
+        ...
+
+    @tool(cpu_bound=True)  # runs on a process pool
+    def parse_pdf(path: str) -> str:
+        ...
+
+    @tool(cache_ttl=300)  # memoize results for 5 minutes (prompty.core.tool_cache)
+    def search(query: str) -> str:
+        ...
+
 """
 
 from __future__ import annotations
@@ -31,6 +45,7 @@ import inspect
 from typing import Any, overload
 
 from .tool_dispatch import register_tool
+from .tool_executor import ToolOptions
 
 __all__ = ["tool", "bind_tools"]
 
@@ -154,6 +169,10 @@ def tool(
     name: str | None = None,
     description: str | None = None,
     register: bool = True,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    cpu_bound: bool = False,
+    cache_ttl: float | None = None,
 ) -> Any: ...
 
 
@@ -164,6 +183,10 @@ def tool(
     name: str | None = None,
     description: str | None = None,
     register: bool = True,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    cpu_bound: bool = False,
+    cache_ttl: float | None = None,
 ) -> Any:
     """Decorator that creates a ``FunctionTool`` from a typed function.
 
@@ -180,26 +203,58 @@ def tool(
     register:
         If ``True`` (default), auto-register the function in the global
         tool name registry via ``register_tool()``.
+    timeout:
+        Seconds an async dispatch waits for a call before reporting a
+        timeout error to the model.
+    max_concurrency:
+        Maximum in-flight async dispatches of this tool per event loop.
+    cpu_bound:
+        Run on the tool executor's process pool instead of its thread pool
+        in async dispatch. The function must be picklable (module level).
+    cache_ttl:
+        Seconds to reuse a successful result for identical arguments (see
+        :mod:`prompty.core.tool_cache`). Only for idempotent tools.
 
     Returns
     -------
     The original function, with a ``__tool__`` attribute containing the
-    ``FunctionTool`` definition.
+    ``FunctionTool`` definition and a ``__tool_options__`` attribute
+    containing its :class:`~prompty.core.tool_executor.ToolOptions`.
     """
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be > 0")
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
+    if cache_ttl is not None and cache_ttl <= 0:
+        raise ValueError("cache_ttl must be > 0")
+    options = ToolOptions(timeout=timeout, max_concurrency=max_concurrency, cpu_bound=cpu_bound, cache_ttl=cache_ttl)
 
     def _decorate(func: Any) -> Any:
         tool_def = _build_function_tool(func, name=name, description=description)
         func.__tool__ = tool_def
+        func.__tool_options__ = options
 
-        if register:
-            register_tool(tool_def.name, func)
+        if inspect.iscoroutinefunction(func):
+            # Keep async tools recognizable as coroutine functions to dispatch
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await func(*args, **kwargs)
 
-        @functools.wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            return func(*args, **kwargs)
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                return func(*args, **kwargs)
 
         # Copy __tool__ to wrapper
         wrapper.__tool__ = tool_def  # type: ignore[attr-defined]
+        wrapper.__tool_options__ = options  # type: ignore[attr-defined]
+
+        # Register the wrapper: it is what the module attribute refers to, so
+        # cpu_bound tools pickle by reference for the process pool.
+        if register:
+            register_tool(tool_def.name, wrapper)
         return wrapper
 
     if fn is not None:
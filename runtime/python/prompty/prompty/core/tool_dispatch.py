@@ -28,6 +28,11 @@ import warnings
 from collections.abc import Callable
 from typing import Any, Protocol, runtime_checkable
 
+from .agent_events import EventCallback
+from .tool_cache import _cached_result, get_tool_cache, tool_cache_key
+from .tool_executor import get_tool_executor, get_tool_options
+from .tool_index import tool_index
+
 __all__ = [
     "ToolHandler",
     "ToolHandlerError",
@@ -371,6 +376,8 @@ def dispatch_tool(
     user_tools: dict[str, Callable[..., Any]],
     agent: Any,
     parent_inputs: dict[str, Any],
+    *,
+    on_event: EventCallback | None = None,
 ) -> str:
     """Dispatch a tool call synchronously.
 
@@ -378,7 +385,8 @@ def dispatch_tool(
 
     1. Parse *arguments_json* as JSON.
     2. Resolve bindings from *parent_inputs* into the parsed args.
-    3. Check *user_tools* for a matching function — if found, call it directly.
+    3. Check *user_tools* for a matching function — if found, call it directly
+       (or return its cached result, see :mod:`prompty.core.tool_cache`).
     4. Search ``agent.tools`` for a tool definition matching *tool_name*.
     5. Look up the handler via ``get_tool_handler(tool.kind)`` and delegate.
     6. If nothing matches, return an error string.
@@ -395,6 +403,9 @@ def dispatch_tool(
         The parent agent (carries tool definitions and metadata).
     parent_inputs:
         The original inputs to the parent agent (for binding resolution).
+    on_event:
+        Receives ``tool_cache_hit`` / ``tool_cache_miss`` events for tools
+        declared with ``@tool(cache_ttl=...)``.
 
     Returns
     -------
@@ -416,20 +427,14 @@ def dispatch_tool(
     if fn is not None:
         if inspect.iscoroutinefunction(fn):
             return f"Error: async tool '{tool_name}' cannot be called in sync mode"
-        try:
-            return str(fn(**args))
-        except Exception as e:
-            return f"Error calling '{tool_name}': {type(e).__name__}: {e}"
+        return _call_tool(tool_name, fn, args, on_event)
 
     # 4. Check global name registry (spec §11.2 Layer 1)
     registered_fn = get_tool(tool_name)
     if registered_fn is not None:
         if inspect.iscoroutinefunction(registered_fn):
             return f"Error: async tool '{tool_name}' cannot be called in sync mode"
-        try:
-            return str(registered_fn(**args))
-        except Exception as e:
-            return f"Error calling '{tool_name}': {type(e).__name__}: {e}"
+        return _call_tool(tool_name, registered_fn, args, on_event)
 
     # 5. Search agent.tools for a matching definition → kind handler (Layer 2)
     tool_def = _find_tool_by_name(agent, tool_name)
@@ -461,12 +466,15 @@ async def dispatch_tool_async(
     user_tools: dict[str, Callable[..., Any]],
     agent: Any,
     parent_inputs: dict[str, Any],
+    *,
+    on_event: EventCallback | None = None,
 ) -> str:
     """Async variant of :func:`dispatch_tool`.
 
     Same resolution order as the sync version, but awaits async user
-    functions and calls ``handler.execute_tool_async()`` for registered
-    handlers.
+    functions, runs synchronous ones on the shared tool executor (see
+    :mod:`prompty.core.tool_executor`) so they don't block the event loop,
+    and calls ``handler.execute_tool_async()`` for registered handlers.
     """
     # 1. Parse arguments (resilient per §9.8)
     parsed = _resilient_json_parse(arguments_json) if arguments_json else {}
@@ -481,24 +489,12 @@ async def dispatch_tool_async(
     # 3. Check user-provided tool functions first (per-call override)
     fn = user_tools.get(tool_name)
     if fn is not None:
-        try:
-            if inspect.iscoroutinefunction(fn):
-                return str(await fn(**args))
-            else:
-                return str(fn(**args))
-        except Exception as e:
-            return f"Error calling '{tool_name}': {type(e).__name__}: {e}"
+        return await _call_tool_async(tool_name, fn, args, on_event)
 
     # 4. Check global name registry (spec §11.2 Layer 1)
     registered_fn = get_tool(tool_name)
     if registered_fn is not None:
-        try:
-            if inspect.iscoroutinefunction(registered_fn):
-                return str(await registered_fn(**args))
-            else:
-                return str(registered_fn(**args))
-        except Exception as e:
-            return f"Error calling '{tool_name}': {type(e).__name__}: {e}"
+        return await _call_tool_async(tool_name, registered_fn, args, on_event)
 
     # 5. Search agent.tools for a matching definition → kind handler (Layer 2)
     tool_def = _find_tool_by_name(agent, tool_name)
@@ -528,15 +524,52 @@ async def dispatch_tool_async(
 # ---------------------------------------------------------------------------
 
 
+def _call_tool(
+    tool_name: str,
+    fn: Callable[..., Any],
+    args: dict[str, Any],
+    on_event: EventCallback | None,
+) -> str:
+    """Call a tool function, through the result cache if it declares ``cache_ttl``."""
+    ttl = get_tool_options(fn).cache_ttl
+    key = tool_cache_key(tool_name, args, fn) if ttl is not None else None
+    if key is not None and (cached := _cached_result(tool_name, key, on_event)) is not None:
+        return cached
+    try:
+        result = str(fn(**args))
+    except Exception as e:
+        # A failed call is never cached
+        return f"Error calling '{tool_name}': {type(e).__name__}: {e}"
+    if key is not None and ttl is not None:
+        get_tool_cache().set(key, result, ttl)
+    return result
+
+
+async def _call_tool_async(
+    tool_name: str,
+    fn: Callable[..., Any],
+    args: dict[str, Any],
+    on_event: EventCallback | None,
+) -> str:
+    """Async variant of :func:`_call_tool`, running *fn* on the tool executor."""
+    ttl = get_tool_options(fn).cache_ttl
+    key = tool_cache_key(tool_name, args, fn) if ttl is not None else None
+    if key is not None and (cached := _cached_result(tool_name, key, on_event)) is not None:
+        return cached
+    try:
+        result = str(await get_tool_executor().run_async(tool_name, fn, args))
+    except Exception as e:
+        return f"Error calling '{tool_name}': {type(e).__name__}: {e}"
+    if key is not None and ttl is not None:
+        get_tool_cache().set(key, result, ttl)
+    return result
+
+
 def _find_tool_by_name(agent: Any, tool_name: str) -> Any | None:
     """Find a tool on *agent* by name, or return ``None``."""
-    tools = getattr(agent, "tools", None)
-    if not tools:
+    if not getattr(agent, "tools", None):
         return None
-    for t in tools:
-        if getattr(t, "name", None) == tool_name:
-            return t
-    return None
+    return tool_index(agent).get(tool_name)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,412 @@
+"""Process-wide executor for tool calls.
+
+``dispatch_tool_async()`` used to call synchronous tools inline, so one
+blocking tool (an HTTP call via ``requests``, a DB query, file parsing)
+stalled the event loop — and with it every other concurrent
+``turn_async()`` in the process; ``asyncio.gather`` over parallel tool calls
+could not help. Synchronous tools now run on a process-wide executor: a
+thread pool by default, or a process pool for tools declared
+``@tool(cpu_bound=True)``.
+
+``turn()`` runs parallel tool calls (and calls of tools with a timeout or
+concurrency limit) on the same bounded thread pool via :meth:`ToolExecutor.submit`
+instead of a new ``ThreadPoolExecutor`` per iteration, so *max_workers*
+caps tool concurrency across every agent loop in the process. Calls of a
+tool at its ``max_concurrency`` wait in a per-tool queue without holding a
+worker thread.
+
+``@tool`` also takes per-tool limits, applied to sync and async tools::
+
+    @tool(timeout=10, max_concurrency=4)
+    def search(query: str) -> str: ...
+
+    @tool(cpu_bound=True)  # must be picklable: define it at module level
+    def parse_pdf(path: str) -> str: ...
+
+A call that runs longer than *timeout* is reported to the model as an
+error result; a worker thread cannot be interrupted, so it finishes in the
+background. *max_concurrency* caps in-flight calls of that tool —
+process-wide for ``turn()``, per event loop for ``turn_async()``; further
+calls wait for a slot.
+
+Usage::
+
+    import prompty
+
+    prompty.configure_tool_executor(max_workers=16, max_processes=4)
+    prompty.configure_tool_executor(offload=False)  # call sync tools inline again
+    prompty.shutdown_tool_executor()  # e.g. at application shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, NamedTuple
+
+from .agent_events import EventCallback, emit_event
+from .cancellation import CancellationToken, CancelledError
+
+__all__ = [
+    "ToolExecutor",
+    "ToolFuture",
+    "ToolOptions",
+    "ToolTimeoutError",
+    "configure_tool_executor",
+    "get_tool_executor",
+    "get_tool_options",
+    "shutdown_tool_executor",
+]
+
+
+class ToolOptions(NamedTuple):
+    """Execution options declared with ``@tool(...)``."""
+
+    timeout: float | None = None
+    max_concurrency: int | None = None
+    cpu_bound: bool = False
+    cache_ttl: float | None = None
+
+
+_DEFAULT_OPTIONS = ToolOptions()
+
+
+def get_tool_options(fn: Any) -> ToolOptions:
+    """Return the :class:`ToolOptions` of *fn* (defaults for plain callables)."""
+    options = getattr(fn, "__tool_options__", None)
+    return options if isinstance(options, ToolOptions) else _DEFAULT_OPTIONS
+
+
+class ToolTimeoutError(TimeoutError):
+    """A tool call ran longer than its ``@tool(timeout=...)``."""
+
+
+class ToolFuture(Future):
+    """Future of a :meth:`ToolExecutor.submit` call; ``started`` is its ``perf_counter()`` start."""
+
+    started: float | None = None
+
+
+class _ToolSlots:
+    """Per-tool concurrency limit: running count and calls waiting for a slot."""
+
+    __slots__ = ("limit", "active", "waiting")
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self.waiting: deque[Callable[[], None]] = deque()
+
+
+# How often a waiting thread re-checks its CancellationToken.
+_POLL_INTERVAL = 0.05
+
+# Set while a worker thread runs a submitted call (see ToolExecutor.submit).
+_worker = threading.local()
+
+
+class ToolExecutor:
+    """Runs tool calls on shared worker pools.
+
+    Parameters
+    ----------
+    max_workers:
+        Size of the thread pool for synchronous tools — the process-wide cap
+        on concurrently running tool calls (``None`` uses the
+        :class:`~concurrent.futures.ThreadPoolExecutor` default).
+    max_processes:
+        Size of the process pool for ``cpu_bound`` tools (``None`` uses the
+        :class:`~concurrent.futures.ProcessPoolExecutor` default).
+    offload:
+        ``False`` calls synchronous, non-``cpu_bound`` tools inline on the
+        event loop, as before.
+
+    Pools are created on first use.
+    """
+
+    def __init__(self, max_workers: int | None = None, max_processes: int | None = None, offload: bool = True) -> None:
+        self.max_workers = max_workers
+        self.max_processes = max_processes
+        self.offload = offload
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._slots: dict[str, _ToolSlots] = {}
+        self._queued = 0
+        self._running = 0
+        # event loop → tool name → semaphore; asyncio primitives are loop-bound
+        self._limits: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _pool(self, cpu_bound: bool) -> Executor:
+        with self._lock:
+            if cpu_bound:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.max_processes)
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prompty-tool")
+            return self._threads
+
+    def _limit(self, loop: asyncio.AbstractEventLoop, name: str, max_concurrency: int) -> asyncio.Semaphore:
+        with self._lock:
+            limits = self._limits.setdefault(loop, {})
+            semaphore = limits.get(name)
+            if semaphore is None:
+                semaphore = limits[name] = asyncio.Semaphore(max_concurrency)
+            return semaphore
+
+    async def run_async(self, name: str, fn: Callable[..., Any], args: dict[str, Any]) -> Any:
+        """Call ``fn(**args)`` honouring its :class:`ToolOptions`.
+
+        Coroutine functions are awaited on the loop; synchronous tools run
+        on the thread pool (or the process pool when ``cpu_bound``).
+
+        Raises
+        ------
+        ToolTimeoutError
+            If the call takes longer than the tool's ``timeout``.
+        """
+        options = get_tool_options(fn)
+        loop = asyncio.get_running_loop()
+        limit = (
+            self._limit(loop, name, options.max_concurrency)
+            if options.max_concurrency is not None
+            else contextlib.nullcontext()
+        )
+        async with limit:
+            if inspect.iscoroutinefunction(fn):
+                call = fn(**args)
+            elif options.cpu_bound:
+                call = loop.run_in_executor(self._pool(True), functools.partial(fn, **args))
+            elif self.offload:
+                # Like asyncio.to_thread: the tool sees the caller's contextvars (tracing spans)
+                context = contextvars.copy_context()
+                call = loop.run_in_executor(self._pool(False), functools.partial(context.run, fn, **args))
+            else:
+                return fn(**args)
+
+            if options.timeout is None:
+                return await call
+            deadline = asyncio.timeout(options.timeout)
+            try:
+                async with deadline:
+                    return await call
+            except TimeoutError:
+                # Only the deadline is a tool timeout; a tool's own TimeoutError propagates
+                if deadline.expired():
+                    raise ToolTimeoutError(f"tool '{name}' timed out after {options.timeout:g}s") from None
+                raise
+
+    # -- sync path (turn()) ---------------------------------------------------
+
+    def submit(
+        self,
+        name: str,
+        call: Callable[[], Any],
+        *,
+        options: ToolOptions = _DEFAULT_OPTIONS,
+        on_event: EventCallback | None = None,
+    ) -> ToolFuture:
+        """Schedule ``call()`` for tool *name* on the shared thread pool.
+
+        Honours the tool's ``max_concurrency``. When the call starts, a
+        ``tool_queue`` event reports how long it waited (``waitMs``) and how
+        many calls are still queued (``queueDepth``) or running
+        (``running``). Cancelling the returned future before the call
+        starts drops it.
+
+        Calls submitted from inside a running call (an agent tool whose
+        loop dispatches tools of its own) run inline, so nested loops can't
+        deadlock the bounded pool.
+        """
+        future = ToolFuture()
+        submitted = time.perf_counter()
+        if getattr(_worker, "active", False):
+            future.set_running_or_notify_cancel()
+            future.started = submitted
+            try:
+                future.set_result(call())
+            except BaseException as exc:  # noqa: BLE001 — re-raised by future.result()
+                future.set_exception(exc)
+            return future
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                with self._lock:
+                    self._queued -= 1
+                self._release(name, options)
+                return
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                depth, running = self._queued, self._running
+            future.started = time.perf_counter()
+            try:
+                emit_event(
+                    on_event,
+                    "tool_queue",
+                    {
+                        "name": name,
+                        "waitMs": (future.started - submitted) * 1000,
+                        "queueDepth": depth,
+                        "running": running,
+                    },
+                )
+                _worker.active = True
+                try:
+                    result = call()
+                except BaseException as exc:  # noqa: BLE001 — re-raised by future.result()
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+                finally:
+                    _worker.active = False
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._release(name, options)
+
+        with self._lock:
+            self._queued += 1
+            if options.max_concurrency is not None:
+                slots = self._slots.get(name)
+                if slots is None:
+                    slots = self._slots[name] = _ToolSlots(options.max_concurrency)
+                if slots.active >= slots.limit:
+                    slots.waiting.append(run)
+                    return future
+                slots.active += 1
+        self._pool(False).submit(run)
+        return future
+
+    def _release(self, name: str, options: ToolOptions) -> None:
+        """Hand a finished call's tool slot to the next waiting call."""
+        if options.max_concurrency is None:
+            return
+        with self._lock:
+            slots = self._slots[name]
+            if not slots.waiting:
+                slots.active -= 1
+                return
+            run = slots.waiting.popleft()
+        self._pool(False).submit(run)
+
+    def result(
+        self,
+        name: str,
+        future: ToolFuture,
+        *,
+        timeout: float | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> Any:
+        """Wait for a :meth:`submit` call.
+
+        *timeout* counts from when the call starts, not from submission.
+
+        Raises
+        ------
+        ToolTimeoutError
+            If the call runs longer than *timeout*; it is abandoned.
+        CancelledError
+            If *cancel* is cancelled while waiting; a call that has not
+            started yet is dropped.
+        """
+        while True:
+            if future.done():
+                return future.result()
+            if cancel is not None and cancel.is_cancelled:
+                future.cancel()
+                raise CancelledError()
+            step = _POLL_INTERVAL if cancel is not None else None
+            if timeout is not None:
+                if future.started is None:
+                    step = _POLL_INTERVAL
+                else:
+                    remaining = future.started + timeout - time.perf_counter()
+                    if remaining <= 0 and not future.done():
+                        raise ToolTimeoutError(f"tool '{name}' timed out after {timeout:g}s")
+                    step = remaining if step is None else min(step, remaining)
+            # Not future.result(timeout): a tool's own TimeoutError must propagate
+            wait([future], timeout=None if step is None else max(step, 0))
+
+    def configure(
+        self,
+        *,
+        max_workers: int | None = None,
+        max_processes: int | None = None,
+        offload: bool | None = None,
+    ) -> None:
+        """Update settings; ``None`` leaves a setting unchanged.
+
+        A resized pool is replaced; calls already running on the old one
+        finish normally.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if max_processes is not None and max_processes < 1:
+            raise ValueError("max_processes must be >= 1")
+        if offload is not None:
+            self.offload = offload
+        with self._lock:
+            if max_workers is not None and max_workers != self.max_workers:
+                self.max_workers = max_workers
+                if self._threads is not None:
+                    self._threads.shutdown(wait=False)
+                    self._threads = None
+            if max_processes is not None and max_processes != self.max_processes:
+                self.max_processes = max_processes
+                if self._processes is not None:
+                    self._processes.shutdown(wait=False)
+                    self._processes = None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down both pools; they are recreated on next use."""
+        with self._lock:
+            pools = [p for p in (self._threads, self._processes) if p is not None]
+            self._threads = self._processes = None
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+
+_executor = ToolExecutor()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """Return the process-wide :class:`ToolExecutor` used by ``dispatch_tool_async()``."""
+    return _executor
+
+
+def configure_tool_executor(
+    *,
+    max_workers: int | None = None,
+    max_processes: int | None = None,
+    offload: bool | None = None,
+) -> None:
+    """Configure the process-wide tool executor.
+
+    Parameters
+    ----------
+    max_workers:
+        Thread pool size for synchronous tools.
+    max_processes:
+        Process pool size for ``@tool(cpu_bound=True)`` tools.
+    offload:
+        ``False`` runs synchronous tools inline on the event loop.
+    """
+    _executor.configure(max_workers=max_workers, max_processes=max_processes, offload=offload)
+
+
+def shutdown_tool_executor(wait: bool = True) -> None:
+    """Shut down the tool executor's worker pools (e.g. at application shutdown)."""
+    _executor.shutdown(wait=wait)
@@ -0,0 +1,119 @@
+"""Per-agent tool table, built once and reused across agent-loop iterations.
+
+Every LLM round of an agent loop needs the same tool information: the
+provider wire schemas for the request, and a name → definition lookup (plus
+bindings) for each tool call in the response. :func:`tool_index` builds a
+:class:`ToolIndex` on first use and keeps it on the agent, so agents with
+hundreds of tools no longer rebuild JSON schemas or scan ``agent.tools``
+linearly on every round.
+
+The index is rebuilt automatically when ``agent.tools`` is replaced or
+entries are added, removed or swapped. Tool definitions are treated as
+immutable once loaded; after mutating a tool in place (e.g. editing its
+``parameters``), call :func:`invalidate_tool_index`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+__all__ = [
+    "ToolIndex",
+    "invalidate_tool_index",
+    "tool_index",
+]
+
+# Instance attribute holding the cached index. Agent is a plain (non-slotted)
+# dataclass, so an extra attribute is invisible to __eq__, asdict() and save().
+_ATTR = "_prompty_tool_index"
+
+_EMPTY: tuple[Any, ...] = ()
+
+
+class ToolIndex:
+    """Name-indexed view of one agent's tools with memoized wire schemas.
+
+    Parameters
+    ----------
+    tools:
+        The agent's tool definitions (``agent.tools``), or ``None``.
+    """
+
+    __slots__ = ("_tools", "_by_name", "_wire")
+
+    def __init__(self, tools: list[Any] | None) -> None:
+        self._tools: tuple[Any, ...] = tuple(tools) if tools else _EMPTY
+        by_name: dict[str, Any] = {}
+        for tool in self._tools:
+            # First definition wins, matching the linear scan it replaces.
+            by_name.setdefault(getattr(tool, "name", None), tool)
+        self._by_name = by_name
+        self._wire: dict[str, Any] = {}
+
+    @property
+    def tools(self) -> tuple[Any, ...]:
+        """The indexed tool definitions, in declaration order."""
+        return self._tools
+
+    def matches(self, tools: list[Any] | None) -> bool:
+        """Return ``True`` if *tools* holds exactly the indexed definitions."""
+        indexed = self._tools
+        if not tools:
+            return not indexed
+        if len(tools) != len(indexed):
+            return False
+        return all(a is b for a, b in zip(tools, indexed))
+
+    def get(self, name: str) -> Any | None:
+        """Return the first tool named *name*, or ``None``."""
+        return self._by_name.get(name)
+
+    def bindings(self, name: str) -> list[Any]:
+        """Return the bindings declared on tool *name* (empty if none)."""
+        tool = self._by_name.get(name)
+        if tool is None:
+            return []
+        return getattr(tool, "bindings", None) or []
+
+    def wire(self, key: str, build: Callable[[tuple[Any, ...]], Any]) -> Any:
+        """Return the wire representation cached under *key*.
+
+        *build* is called with the indexed tools the first time *key* is
+        requested (one key per provider wire format, e.g.
+        ``"openai.chat"``). Exceptions from *build* propagate and nothing
+        is cached. The cached value is shared: callers must not mutate it.
+        """
+        try:
+            return self._wire[key]
+        except KeyError:
+            pass
+        # setdefault: concurrent first calls agree on one value.
+        return self._wire.setdefault(key, build(self._tools))
+
+
+def tool_index(agent: Any) -> ToolIndex:
+    """Return the :class:`ToolIndex` for *agent*, building it if needed.
+
+    The index is stored on the agent and reused until ``agent.tools`` no
+    longer holds the same definitions. Objects that cannot hold attributes
+    get a fresh, uncached index.
+    """
+    tools = getattr(agent, "tools", None)
+    index = getattr(agent, _ATTR, None)
+    if isinstance(index, ToolIndex) and index.matches(tools):
+        return index
+    index = ToolIndex(tools)
+    try:
+        setattr(agent, _ATTR, index)
+    except (AttributeError, TypeError):
+        pass
+    return index
+
+
+def invalidate_tool_index(agent: Any) -> None:
+    """Drop the cached :class:`ToolIndex` for *agent*, if any."""
+    try:
+        delattr(agent, _ATTR)
+    except AttributeError:
+        pass
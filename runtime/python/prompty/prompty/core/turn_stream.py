@@ -0,0 +1,482 @@
+"""Streaming-first agent loop — :func:`turn_stream` / :func:`turn_stream_async`.
+
+:func:`~prompty.core.pipeline.turn` only returns once the whole agent loop
+has finished, and surfaces tokens through the ``on_event`` callback. The
+generators here run the same loop but *yield* typed chunks as they happen::
+
+    for chunk in prompty.turn_stream("agent.prompty", inputs, tools=tools):
+        if chunk.kind == "text":
+            send(chunk.value)               # forward tokens immediately
+        elif chunk.kind == "tool_result":
+            log(chunk.name, chunk.result)
+        elif chunk.kind == "result":
+            final = chunk.value
+
+Nothing runs ahead of the consumer: the next LLM call or tool dispatch only
+starts when the caller asks for the next chunk, so a slow client applies
+backpressure all the way to the provider stream.
+
+Chunks follow the ``kind``-discriminated :class:`~prompty.model.StreamChunk`
+contract. Text uses :class:`~prompty.model.TextChunk` itself; the loop-level
+kinds (tool calls, tool results, final result) are runtime dataclasses
+defined here.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+from ..model import Agent, ModelOptions, TextChunk
+from ..tracing.tracer import Tracer
+from .agent_events import EventCallback, emit_event
+from .cancellation import CancellationToken
+from .guardrails import Guardrails
+from .pipeline import (
+    _DEFAULT_MAX_ITERATIONS,
+    _DEFAULT_MAX_LLM_RETRIES,
+    _apply_compaction,
+    _apply_compaction_async,
+    _check_cancelled,
+    _check_iterations,
+    _dispatch_tools_with_extensions,
+    _dispatch_tools_with_extensions_async,
+    _drain_steering,
+    _emit_failed_turn_end,
+    _emit_turn_done,
+    _extract_tool_info,
+    _format_tool_messages,
+    _guard_input,
+    _guard_output,
+    _has_tool_calls,
+    _invoke_with_retry,
+    _invoke_with_retry_async,
+    _is_stream,
+    _resolve_context_budget,
+    _trim_context,
+    prepare,
+    prepare_async,
+    process,
+    process_async,
+)
+from .steering import Steering
+from .tokenizers import Tokenizer
+from .types import Message
+
+__all__ = [
+    "ResultChunk",
+    "ToolCallCompleteChunk",
+    "ToolCallStartChunk",
+    "ToolResultChunk",
+    "TurnChunk",
+    "turn_stream",
+    "turn_stream_async",
+]
+
+
+# ---------------------------------------------------------------------------
+# Chunk types
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ToolCallStartChunk:
+    """The model started a tool call."""
+
+    id: str = ""
+    name: str = ""
+    kind: str = field(default="tool_call_start")
+
+
+@dataclass
+class ToolCallCompleteChunk:
+    """A tool call is fully assembled and about to be dispatched."""
+
+    id: str = ""
+    name: str = ""
+    arguments: str = ""
+    kind: str = field(default="tool_call_complete")
+
+
+@dataclass
+class ToolResultChunk:
+    """A tool finished; *result* is the string sent back to the model."""
+
+    id: str = ""
+    name: str = ""
+    result: str = ""
+    kind: str = field(default="tool_result")
+
+
+@dataclass
+class ResultChunk:
+    """The loop finished. Always the last chunk of a successful turn."""
+
+    value: Any = None
+    iterations: int = 0
+    kind: str = field(default="result")
+
+
+TurnChunk = TextChunk | ToolCallStartChunk | ToolCallCompleteChunk | ToolResultChunk | ResultChunk
+
+
+# ---------------------------------------------------------------------------
+# Stream-specific steps (the loop steps themselves come from pipeline.py)
+# ---------------------------------------------------------------------------
+
+
+def _streaming_agent(agent: Agent) -> Agent:
+    """Return a shallow copy of *agent* with ``stream: true`` for chat calls."""
+    if (agent.model.api_type or "chat") != "chat":
+        return agent
+    options = copy.copy(agent.model.options) if agent.model.options is not None else ModelOptions()
+    options.additional_properties = {**(options.additional_properties or {}), "stream": True}
+    model = copy.copy(agent.model)
+    model.options = options
+    streaming = copy.copy(agent)
+    streaming.model = model
+    return streaming
+
+
+def _tool_call_chunks(tc: Any) -> Iterator[TurnChunk]:
+    """Start / complete chunks for one tool call.
+
+    Processors surface a tool call only once its arguments are fully
+    assembled, so there are no partial-argument chunks: the complete
+    arguments arrive on ``tool_call_complete``.
+    """
+    tc_id = getattr(tc, "id", "")
+    name = getattr(tc, "name", "")
+    yield ToolCallStartChunk(id=tc_id, name=name)
+    yield ToolCallCompleteChunk(id=tc_id, name=name, arguments=getattr(tc, "arguments", "") or "")
+
+
+async def _aiter_items(processed: Any) -> AsyncIterator[Any]:
+    """Iterate a processed stream that may be async, sync, or a plain string."""
+    if hasattr(processed, "__aiter__"):
+        async for item in processed:
+            yield item
+    elif isinstance(processed, str):
+        yield processed
+    else:
+        for item in processed:
+            yield item
+
+
+def _finish(
+    on_event: EventCallback | None, t: Callable[[str, Any], None], value: Any, iteration: int, messages: list[Message]
+) -> ResultChunk:
+    t("iterations", iteration)
+    t("result", value)
+    _emit_turn_done(on_event, value, iteration, messages)
+    return ResultChunk(value=value, iterations=iteration)
+
+
+# ---------------------------------------------------------------------------
+# turn_stream
+# ---------------------------------------------------------------------------
+
+
+def turn_stream(
+    prompt: str | Agent,
+    inputs: dict[str, Any] | None = None,
+    *,
+    tools: dict[str, Callable[..., Any]] | None = None,
+    max_iterations: int = _DEFAULT_MAX_ITERATIONS,
+    on_event: EventCallback | None = None,
+    cancel: CancellationToken | None = None,
+    context_budget: int | Literal["auto"] | None = None,
+    tokenizer: Tokenizer | None = None,
+    compaction: str | Path | Callable[..., Any] | None = None,
+    guardrails: Guardrails | None = None,
+    steering: Steering | None = None,
+    parallel_tool_calls: bool = False,
+    max_llm_retries: int = _DEFAULT_MAX_LLM_RETRIES,
+) -> Iterator[TurnChunk]:
+    """Run the agent loop, yielding chunks as they arrive.
+
+    Takes the same loop options as :func:`~prompty.core.pipeline.turn`.
+    Chat calls are always made with streaming enabled. Streamed text is
+    yielded as it arrives, before the output guardrail sees the whole
+    message; text from a non-streamed response is checked first.
+
+    Yields
+    ------
+    TurnChunk
+        ``text`` deltas, ``tool_call_start`` / ``tool_call_complete`` (with
+        the fully assembled arguments) for each requested tool,
+        ``tool_result`` after each tool runs, and finally one ``result``
+        chunk.
+
+    Raises
+    ------
+    CancelledError
+        If the cancellation token is triggered.
+    GuardrailError
+        If an input or output guardrail denies the operation.
+    ExecuteError
+        If LLM call retries are exhausted.
+    ValueError
+        If *max_iterations* is exceeded.
+    """
+    from .loader import load
+
+    agent = load(prompt) if isinstance(prompt, str) else prompt
+    context_budget, tokenizer = _resolve_context_budget(agent, context_budget, tokenizer)
+    agent = _streaming_agent(agent)
+    tools = tools or {}
+    parent_inputs = inputs or {}
+    messages = prepare(agent, inputs)
+    emit_event(
+        on_event,
+        "turn_start",
+        {"agent": getattr(agent, "name", None), "inputs": inputs or {}, "maxIterations": max_iterations},
+    )
+
+    iteration = 0
+    with Tracer.start("AgentLoop") as t:
+        t("type", "agent")
+        t("tools", list(tools.keys()))
+        while True:
+            _check_cancelled(cancel, on_event, iteration)
+            _drain_steering(messages, steering, on_event)
+            dropped = _trim_context(messages, context_budget, tokenizer, on_event)
+            if dropped and compaction is not None:
+                _apply_compaction(compaction, dropped, messages, on_event, agent)
+            messages = _guard_input(messages, guardrails, on_event, iteration)
+            _check_cancelled(cancel, on_event, iteration)
+
+            emit_event(
+                on_event,
+                "llm_start",
+                {
+                    "provider": agent.model.provider,
+                    "modelId": agent.model.id,
+                    "messageCount": len(messages),
+                    "attempt": 0,
+                    "iteration": iteration,
+                },
+            )
+            try:
+                response = _invoke_with_retry(agent, messages, max_llm_retries, on_event, cancel)
+            except Exception as exc:
+                _emit_failed_turn_end(on_event, exc, iterations=iteration)
+                raise
+            emit_event(on_event, "llm_complete", {"iteration": iteration})
+
+            tool_calls: list[Any] = []
+            raw_response = None
+            if _is_stream(response):
+                from ..providers.openai.processor import ToolCall
+
+                text_parts: list[str] = []
+                try:
+                    processed = process(agent, response)
+                    for item in [processed] if isinstance(processed, str) else processed:
+                        if isinstance(item, ToolCall):
+                            tool_calls.append(item)
+                            yield from _tool_call_chunks(item)
+                        elif isinstance(item, str):
+                            text_parts.append(item)
+                            emit_event(on_event, "token", {"token": item})
+                            yield TextChunk(value=item)
+                except Exception as exc:
+                    _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
+                    raise
+                content = "".join(text_parts)
+                if content:
+                    content = _guard_output(content, guardrails, on_event, iteration)
+            elif _has_tool_calls(response):
+                tool_calls, content = _extract_tool_info(response)
+                if content:
+                    content = _guard_output(content, guardrails, on_event, iteration)
+                    yield TextChunk(value=content)
+                for tc in tool_calls:
+                    yield from _tool_call_chunks(tc)
+                raw_response = response
+            else:
+                try:
+                    result = process(agent, response)
+                except Exception as exc:
+                    _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
+                    raise
+                if isinstance(result, str):
+                    result = _guard_output(result, guardrails, on_event, iteration)
+                    if result:
+                        yield TextChunk(value=result)
+                yield _finish(on_event, t, result, iteration, messages)
+                return
+
+            if not tool_calls:
+                yield _finish(on_event, t, content, iteration, messages)
+                return
+
+            iteration += 1
+            _check_iterations(on_event, iteration, max_iterations)
+
+            # Dispatch one at a time so each result is yielded as soon as it exists
+            batches = [tool_calls] if parallel_tool_calls else [[tc] for tc in tool_calls]
+            results: list[str] = []
+            try:
+                for batch in batches:
+                    batch_results = _dispatch_tools_with_extensions(
+                        batch,
+                        tools,
+                        agent,
+                        parent_inputs,
+                        on_event=on_event,
+                        cancel=cancel,
+                        guardrails=guardrails,
+                        parallel=parallel_tool_calls,
+                    )
+                    for tc, result in zip(batch, batch_results):
+                        yield ToolResultChunk(id=getattr(tc, "id", ""), name=getattr(tc, "name", ""), result=result)
+                    results.extend(batch_results)
+            except Exception as exc:
+                _emit_failed_turn_end(on_event, exc, iterations=iteration, response=content)
+                raise
+
+            messages.extend(_format_tool_messages(agent, tool_calls, results, content, raw_response))
+            emit_event(on_event, "messages_updated", {"messages": messages})
+
+
+async def turn_stream_async(
+    prompt: str | Agent,
+    inputs: dict[str, Any] | None = None,
+    *,
+    tools: dict[str, Callable[..., Any]] | None = None,
+    max_iterations: int = _DEFAULT_MAX_ITERATIONS,
+    on_event: EventCallback | None = None,
+    cancel: CancellationToken | None = None,
+    context_budget: int | Literal["auto"] | None = None,
+    tokenizer: Tokenizer | None = None,
+    compaction: str | Path | Callable[..., Any] | None = None,
+    guardrails: Guardrails | None = None,
+    steering: Steering | None = None,
+    parallel_tool_calls: bool = False,
+    max_llm_retries: int = _DEFAULT_MAX_LLM_RETRIES,
+) -> AsyncIterator[TurnChunk]:
+    """Async variant of :func:`turn_stream`."""
+    from .loader import load_async
+
+    agent = await load_async(prompt) if isinstance(prompt, str) else prompt
+    context_budget, tokenizer = _resolve_context_budget(agent, context_budget, tokenizer)
+    agent = _streaming_agent(agent)
+    tools = tools or {}
+    parent_inputs = inputs or {}
+    messages = await prepare_async(agent, inputs)
+    emit_event(
+        on_event,
+        "turn_start",
+        {"agent": getattr(agent, "name", None), "inputs": inputs or {}, "maxIterations": max_iterations},
+    )
+
+    iteration = 0
+    with Tracer.start("AgentLoop") as t:
+        t("type", "agent")
+        t("tools", list(tools.keys()))
+        while True:
+            _check_cancelled(cancel, on_event, iteration)
+            _drain_steering(messages, steering, on_event)
+            dropped = _trim_context(messages, context_budget, tokenizer, on_event)
+            if dropped and compaction is not None:
+                await _apply_compaction_async(compaction, dropped, messages, on_event, agent)
+            messages = _guard_input(messages, guardrails, on_event, iteration)
+            _check_cancelled(cancel, on_event, iteration)
+
+            emit_event(
+                on_event,
+                "llm_start",
+                {
+                    "provider": agent.model.provider,
+                    "modelId": agent.model.id,
+                    "messageCount": len(messages),
+                    "attempt": 0,
+                    "iteration": iteration,
+                },
+            )
+            try:
+                response = await _invoke_with_retry_async(agent, messages, max_llm_retries, on_event, cancel)
+            except Exception as exc:
+                _emit_failed_turn_end(on_event, exc, iterations=iteration)
+                raise
+            emit_event(on_event, "llm_complete", {"iteration": iteration})
+
+            tool_calls: list[Any] = []
+            raw_response = None
+            if _is_stream(response):
+                from ..providers.openai.processor import ToolCall
+
+                text_parts: list[str] = []
+                try:
+                    processed = await process_async(agent, response)
+                    async for item in _aiter_items(processed):
+                        if isinstance(item, ToolCall):
+                            tool_calls.append(item)
+                            for chunk in _tool_call_chunks(item):
+                                yield chunk
+                        elif isinstance(item, str):
+                            text_parts.append(item)
+                            emit_event(on_event, "token", {"token": item})
+                            yield TextChunk(value=item)
+                except Exception as exc:
+                    _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
+                    raise
+                content = "".join(text_parts)
+                if content:
+                    content = _guard_output(content, guardrails, on_event, iteration)
+            elif _has_tool_calls(response):
+                tool_calls, content = _extract_tool_info(response)
+                if content:
+                    content = _guard_output(content, guardrails, on_event, iteration)
+                    yield TextChunk(value=content)
+                for tc in tool_calls:
+                    for chunk in _tool_call_chunks(tc):
+                        yield chunk
+                raw_response = response
+            else:
+                try:
+                    result = await process_async(agent, response)
+                except Exception as exc:
+                    _emit_failed_turn_end(on_event, exc, iterations=iteration, response=response)
+                    raise
+                if isinstance(result, str):
+                    result = _guard_output(result, guardrails, on_event, iteration)
+                    if result:
+                        yield TextChunk(value=result)
+                yield _finish(on_event, t, result, iteration, messages)
+                return
+
+            if not tool_calls:
+                yield _finish(on_event, t, content, iteration, messages)
+                return
+
+            iteration += 1
+            _check_iterations(on_event, iteration, max_iterations)
+
+            batches = [tool_calls] if parallel_tool_calls else [[tc] for tc in tool_calls]
+            results: list[str] = []
+            try:
+                for batch in batches:
+                    batch_results = await _dispatch_tools_with_extensions_async(
+                        batch,
+                        tools,
+                        agent,
+                        parent_inputs,
+                        on_event=on_event,
+                        cancel=cancel,
+                        guardrails=guardrails,
+                        parallel=parallel_tool_calls,
+                    )
+                    for tc, result in zip(batch, batch_results):
+                        yield ToolResultChunk(id=getattr(tc, "id", ""), name=getattr(tc, "name", ""), result=result)
+                    results.extend(batch_results)
+            except Exception as exc:
+                _emit_failed_turn_end(on_event, exc, iterations=iteration, response=content)
+                raise
+
+            messages.extend(_format_tool_messages(agent, tool_calls, results, content, raw_response))
+            emit_event(on_event, "messages_updated", {"messages": messages})
@@ -16,7 +16,7 @@ provider-specific wire format (OpenAI, Anthropic, etc.).
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Iterator
+from collections.abc import AsyncIterator, Callable, Iterator
 from typing import Any
 
 # Re-export generated types — these are the canonical definitions.
@@ -129,62 +129,108 @@ def _part_to_dict(part: ContentPart) -> dict[str, Any]:
 class PromptyStream(Iterator):
     """Tracing-aware wrapper for synchronous LLM streaming responses.
 
-    Accumulates all chunks as they are yielded. When the iterator is
-    exhausted, the accumulated items are flushed to the tracer.
+    Folds each chunk into a :class:`~prompty.tracing.stream.StreamSummary`
+    as it is yielded; when the iterator is exhausted the summary (text,
+    tool calls, usage, time to first token, inter-token latency) is flushed
+    to the tracer. Raw chunks are kept in ``items`` only when full-chunk
+    capture is enabled (see
+    :func:`~prompty.tracing.stream.configure_stream_tracing`).
+
+    Callbacks registered with :meth:`add_done_callback` run once, when the
+    stream is exhausted or raises.
     """
 
     def __init__(self, name: str, iterator: Iterator) -> None:
+        from ..tracing.stream import StreamSummary, stream_capture_enabled
+
         self.name = name
         self.iterator = iterator
         self.items: list[Any] = []
+        self.summary = StreamSummary()
+        self._capture = stream_capture_enabled()
+        self._done_callbacks: list[Callable[[], Any]] = []
         self.__name__ = "PromptyStream"
 
     def __iter__(self) -> PromptyStream:
         return self
 
     def __next__(self) -> Any:
-        from ..tracing.tracer import Tracer, to_dict
-
         try:
             item = self.iterator.__next__()
-            self.items.append(item)
-            return item
         except StopIteration:
-            if self.items:
-                with Tracer.start("PromptyStream") as t:
-                    t("signature", f"{self.name}.PromptyStream")
-                    t("inputs", "None")
-                    t("result", [to_dict(s) for s in self.items])
+            _run_done_callbacks(self)
+            _trace_stream("PromptyStream", self)
+            raise
+        except BaseException:
+            _run_done_callbacks(self)
             raise
+        self.summary.add(item)
+        if self._capture:
+            self.items.append(item)
+        return item
+
+    def add_done_callback(self, callback: Callable[[], Any]) -> None:
+        """Run *callback* once when the stream ends (exhausted or failed)."""
+        self._done_callbacks.append(callback)
 
 
 class AsyncPromptyStream(AsyncIterator):
     """Tracing-aware wrapper for asynchronous LLM streaming responses.
 
-    Accumulates all chunks as they are yielded. When the async iterator
-    is exhausted, the accumulated items are flushed to the tracer.
+    The ``async for`` counterpart of :class:`PromptyStream`: chunks are
+    folded into ``summary`` as they arrive and the summary is flushed to
+    the tracer when the async iterator is exhausted.
     """
 
     def __init__(self, name: str, iterator: AsyncIterator) -> None:
+        from ..tracing.stream import StreamSummary, stream_capture_enabled
+
         self.name = name
         self.iterator = iterator
         self.items: list[Any] = []
+        self.summary = StreamSummary()
+        self._capture = stream_capture_enabled()
+        self._done_callbacks: list[Callable[[], Any]] = []
         self.__name__ = "AsyncPromptyStream"
 
     def __aiter__(self) -> AsyncPromptyStream:
         return self
 
     async def __anext__(self) -> Any:
-        from ..tracing.tracer import Tracer, to_dict
-
         try:
             item = await self.iterator.__anext__()
-            self.items.append(item)
-            return item
         except StopAsyncIteration:
-            if self.items:
-                with Tracer.start("AsyncPromptyStream") as t:
-                    t("signature", f"{self.name}.AsyncPromptyStream")
-                    t("inputs", "None")
-                    t("result", [to_dict(s) for s in self.items])
+            _run_done_callbacks(self)
+            _trace_stream("AsyncPromptyStream", self)
+            raise
+        except BaseException:
+            _run_done_callbacks(self)
             raise
+        self.summary.add(item)
+        if self._capture:
+            self.items.append(item)
+        return item
+
+    def add_done_callback(self, callback: Callable[[], Any]) -> None:
+        """Run *callback* once when the stream ends (exhausted or failed)."""
+        self._done_callbacks.append(callback)
+
+
+def _run_done_callbacks(stream: PromptyStream | AsyncPromptyStream) -> None:
+    callbacks, stream._done_callbacks = stream._done_callbacks, []
+    for callback in callbacks:
+        callback()
+
+
+def _trace_stream(kind: str, stream: PromptyStream | AsyncPromptyStream) -> None:
+    """Emit the trace frame of an exhausted stream (nothing for an empty one)."""
+    from ..tracing.tracer import Tracer
+
+    if not stream.summary.chunks or not Tracer.is_active():
+        return
+    with Tracer.start(kind) as t:
+        t("signature", f"{stream.name}.{kind}")
+        t("inputs", "None")
+        t("result", stream.summary.to_dict())
+        if stream._capture:
+            t("items", stream.items)
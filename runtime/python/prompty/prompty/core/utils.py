@@ -3,17 +3,16 @@
 from __future__ import annotations
 
 import json
-import re
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 import aiofiles
 import yaml
 
-_yaml_regex = re.compile(
-    r"^\s*" + r"(?:---|\+\+\+)" + r"(.*?)" + r"(?:---|\+\+\+)" + r"\s*(.+)$",
-    re.S | re.M,
-)
+# libyaml's C loader is several times faster; same safe constructors
+_SafeLoader: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_FENCES = ("---", "+++")
 
 
 def load_text(file_path: str | Path, encoding: str = "utf-8") -> str:
@@ -46,21 +45,48 @@ async def load_prompty_async(file_path: str | Path, encoding: str = "utf-8") ->
     return parse(contents)
 
 
+def load_yaml(stream: str | IO[str]) -> Any:
+    """``yaml.safe_load`` using libyaml when it is available."""
+    return yaml.load(stream, Loader=_SafeLoader)  # noqa: S506 — a safe loader
+
+
+def _split_frontmatter(contents: str, start: int) -> tuple[str, str] | None:
+    """Split ``---`` frontmatter (opening fence at *start*) from the body.
+
+    Scans line starts for the closing ``---`` / ``+++`` fence, so the body
+    is never searched. Returns ``None`` if there is no closing fence.
+    """
+    end = len(contents)
+    newline = contents.find("\n", start + 3)
+    while newline != -1:
+        line_start = newline + 1
+        newline = contents.find("\n", line_start)
+        line_end = end if newline == -1 else newline
+        if contents.startswith(_FENCES, line_start):
+            rest = contents[line_start + 3 : line_end]
+            if not rest or rest.isspace():
+                body_start = line_end
+                while body_start < end and contents[body_start].isspace():
+                    body_start += 1
+                return contents[start + 3 : line_start], contents[body_start:]
+    return None
+
+
 def parse(contents: str) -> dict[str, Any] | str:
-    is_markdown = re.match(r"^\s*(?:---)", contents) is not None
-
-    if is_markdown:
-        result = _yaml_regex.search(contents)
-        if result:
-            fmatter = result.group(1)
-            body = result.group(2)
-            content = yaml.safe_load(fmatter)
-            if content is None:
-                content = {}
-            content["instructions"] = body
-            return content
-        else:
+    start = 0
+    while start < len(contents) and contents[start].isspace():
+        start += 1
+
+    if contents.startswith("---", start):
+        split = _split_frontmatter(contents, start)
+        if split is None:
             raise ValueError("Invalid Markdown format: Missing or malformed frontmatter.")
+        fmatter, body = split
+        content = load_yaml(fmatter)
+        if content is None:
+            content = {}
+        content["instructions"] = body
+        return content
     else:
-        content = yaml.safe_load(contents)
+        content = load_yaml(contents)
         return content
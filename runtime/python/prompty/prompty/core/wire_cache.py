@@ -0,0 +1,51 @@
+"""Per-message memo of provider wire dicts across agent-loop iterations.
+
+``turn()`` re-sends the whole, growing conversation on every iteration, so
+converting each :class:`~prompty.core.types.Message` to wire format from
+scratch makes an N-iteration loop do O(N²) conversion work. Executors call
+:func:`cached_wire` instead: the converted dict is memoized on the message
+(like the token-cost memo in :mod:`prompty.core.context`) together with
+shallow copies of the message's role, parts and metadata, so only new or
+changed messages are converted.
+
+Replacing the list (guardrail rewrites, context trimming, compaction) needs
+no invalidation — new messages have no memo. Messages edited in place are
+converted again when a part is added, removed or replaced, or a metadata
+entry is added, removed or replaced. Mutating a part object itself (e.g.
+assigning ``TextPart.value``) is not detected: replace the part instead.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from .types import Message
+
+__all__ = ["cached_wire"]
+
+_ATTR = "_wire_cache"
+
+
+def cached_wire(msg: Message, key: str, convert: Callable[[Message], Any]) -> Any:
+    """Return ``convert(msg)``, memoized on *msg* per wire format *key*.
+
+    The memoized value is shared between calls: callers must not mutate it.
+    """
+    memo: dict[str, tuple[Any, ...]] | None = msg.__dict__.get(_ATTR)
+    if memo is None:
+        memo = msg.__dict__[_ATTR] = {}
+    else:
+        entry = memo.get(key)
+        # Shallow copies compare element-wise by identity first (in C), so a
+        # hit costs a fraction of the conversion it skips.
+        if entry is not None and entry[0] is msg.role and entry[1] == msg.parts and entry[2] == msg.metadata:
+            # Same ``tool_calls`` object per the dict compare; check it didn't grow in place.
+            size = entry[3]
+            if size < 0 or len(msg.metadata["tool_calls"]) == size:
+                return entry[4]
+    tool_calls = msg.metadata.get("tool_calls")
+    size = len(tool_calls) if isinstance(tool_calls, (list, dict)) else -1
+    wire = convert(msg)
+    memo[key] = (msg.role, list(msg.parts), dict(msg.metadata), size, wire)
+    return wire
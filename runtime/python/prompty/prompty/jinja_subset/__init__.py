@@ -16,23 +16,25 @@ Public surface:
 - :func:`parse_template` — template string → parse AST dict.
 - :func:`render` — template + inputs → flat rendered string.
 - :func:`render_segments` — template + inputs → provenance-tagged segments.
+- :func:`compile_template` — template string → cached :class:`CompiledTemplate`.
+
+``render``/``render_segments`` go through the closure compiler
+(:mod:`.compiler`); :mod:`.evaluator` keeps the AST-walking interpreter as the
+reference the compiled output is checked against.
 - :class:`Segment`, :class:`StrictViolation`, :data:`UNDEFINED`.
 """
 
 from __future__ import annotations
 
-from .evaluator import (
-    UNDEFINED,
-    Segment,
-    StrictViolation,
-    render,
-    render_segments,
-)
+from .compiler import CompiledTemplate, compile_template, render, render_segments
+from .evaluator import UNDEFINED, Segment, StrictViolation
 from .parser import parse_template
 from .tokenizer import TemplateSyntaxError, Token, tokenize
 
 __all__ = [
     "parse_template",
+    "compile_template",
+    "CompiledTemplate",
     "render",
     "render_segments",
     "tokenize",
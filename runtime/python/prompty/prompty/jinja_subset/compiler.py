@@ -0,0 +1,416 @@
+"""Prompty Jinja Subset — closure compiler.
+
+Turns the parse AST from :mod:`.parser` into a tree of Python closures once,
+so rendering does no AST dispatch: every ``kind``/``operator``/filter-name
+decision is made at compile time. Compiled templates are kept in an LRU keyed
+by template source, so repeated renders skip tokenizing and parsing too.
+
+:mod:`.evaluator` stays the reference interpreter; the compiled renderer must
+produce byte-identical segments (``tests/test_jinja_subset.py`` checks both
+against the conformance goldens).
+
+Differences in *how*, not *what*:
+
+- ``for`` bodies render into one child scope per loop, updated in place per
+  iteration, instead of a fresh copy of the whole scope per iteration. The
+  subset has no assignment, so nothing can observe the reuse.
+- Errors the interpreter raises lazily (unknown filter, ``replace`` without
+  arguments) are still raised at render time, only when reached.
+"""
+
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from functools import lru_cache
+
+from .evaluator import (
+    _ROLE_BOUNDARY,
+    UNDEFINED,
+    Segment,
+    StrictViolation,
+    _iter_seq,
+    _stringify,
+    _truthy,
+)
+from .parser import parse_template
+
+__all__ = [
+    "CompiledTemplate",
+    "compile_template",
+    "render",
+    "render_segments",
+]
+
+_Scope = dict[str, object]
+_Expr = Callable[[_Scope], object]
+_Emit = Callable[[_Scope, "set[str] | frozenset[str]", list[Segment]], None]
+
+_COMPILE_CACHE_SIZE = 256
+
+
+# --- expressions ------------------------------------------------------------
+
+
+def _compile_expr(expr: dict) -> _Expr:
+    kind = expr["kind"]
+    if kind == "lit":
+        value = expr["value"]
+        return lambda scope: value
+    if kind == "var":
+        return _compile_var(expr)
+    if kind == "filter":
+        return _compile_filter(expr)
+    if kind == "unary":
+        operand = _compile_expr(expr["operand"])
+        return lambda scope: not _truthy(operand(scope))
+    if kind == "binary":
+        return _compile_binary(expr)
+
+    def unknown(scope: _Scope) -> object:
+        raise ValueError(f"Unknown expression kind: {kind!r}")
+
+    return unknown
+
+
+def _compile_access(seg: dict) -> Callable[[object, _Scope], object]:
+    if seg["kind"] == "attr":
+        name = seg["name"]
+
+        def attr(value: object, scope: _Scope) -> object:
+            if type(value) is dict:
+                return value.get(name, UNDEFINED)
+            if value is UNDEFINED or value is None:
+                return UNDEFINED
+            if isinstance(value, Mapping):
+                return value[name] if name in value else UNDEFINED
+            return getattr(value, name, UNDEFINED)
+
+        return attr
+
+    index_expr = _compile_expr(seg["expr"])
+
+    def index(value: object, scope: _Scope) -> object:
+        if value is UNDEFINED or value is None:
+            return UNDEFINED
+        key = index_expr(scope)
+        try:
+            if isinstance(value, Mapping):
+                return value[key] if key in value else UNDEFINED
+            if isinstance(value, (list, tuple, str)):
+                return value[int(key)]  # type: ignore[call-overload]
+        except (KeyError, IndexError, TypeError, ValueError):
+            return UNDEFINED
+        return UNDEFINED
+
+    return index
+
+
+def _compile_var(expr: dict) -> _Expr:
+    root = expr["root"]
+    path = [_compile_access(seg) for seg in expr["path"]]
+    if not path:
+        return lambda scope: scope.get(root, UNDEFINED)
+    if len(path) == 1:
+        access = path[0]
+        return lambda scope: access(scope.get(root, UNDEFINED), scope)
+
+    def var(scope: _Scope) -> object:
+        value = scope.get(root, UNDEFINED)
+        for access in path:
+            value = access(value, scope)
+        return value
+
+    return var
+
+
+_EQUALITY: dict[str, Callable[[object, object], object]] = {"==": operator.eq, "!=": operator.ne}
+_ORDERING: dict[str, Callable[[object, object], object]] = {
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+
+
+def _compile_binary(expr: dict) -> _Expr:
+    op = expr["operator"]
+    left = _compile_expr(expr["left"])
+    right = _compile_expr(expr["right"])
+
+    if op == "and":
+
+        def and_(scope: _Scope) -> object:
+            value = left(scope)
+            return right(scope) if _truthy(value) else value
+
+        return and_
+    if op == "or":
+
+        def or_(scope: _Scope) -> object:
+            value = left(scope)
+            return value if _truthy(value) else right(scope)
+
+        return or_
+    if op == "in":
+
+        def in_(scope: _Scope) -> object:
+            needle = left(scope)
+            haystack = right(scope)
+            if isinstance(haystack, (Mapping, list, tuple, str)):
+                try:
+                    return needle in haystack
+                except TypeError:
+                    return False
+            return False
+
+        return in_
+    if op in _EQUALITY:
+        equals = _EQUALITY[op]
+
+        def equality(scope: _Scope) -> object:
+            lv = left(scope)
+            rv = right(scope)
+            return equals(None if lv is UNDEFINED else lv, None if rv is UNDEFINED else rv)
+
+        return equality
+    if op in _ORDERING:
+        compare = _ORDERING[op]
+
+        def ordering(scope: _Scope) -> object:
+            lv = left(scope)
+            rv = right(scope)
+            try:
+                return compare(None if lv is UNDEFINED else lv, None if rv is UNDEFINED else rv)
+            except TypeError:
+                return False
+
+        return ordering
+
+    def unknown(scope: _Scope) -> object:
+        left(scope)
+        right(scope)
+        raise ValueError(f"Unknown binary operator: {op!r}")
+
+    return unknown
+
+
+def _filter_join(value: object, args: list[object]) -> object:
+    sep = _stringify(args[0]) if args else ""
+    seq = value if isinstance(value, (list, tuple)) else []
+    return sep.join(_stringify(v) for v in seq)
+
+
+def _filter_length(value: object, args: list[object]) -> object:
+    if value is UNDEFINED or value is None:
+        return 0
+    try:
+        return len(value)  # type: ignore[arg-type]
+    except TypeError:
+        return 0
+
+
+def _filter_default(value: object, args: list[object]) -> object:
+    fallback = args[0] if args else ""
+    return fallback if (value is UNDEFINED or value is None) else value
+
+
+def _filter_replace(value: object, args: list[object]) -> object:
+    if len(args) < 2:
+        raise ValueError("replace filter requires (old, new) arguments")
+    return _stringify(value).replace(_stringify(args[0]), _stringify(args[1]))
+
+
+_FILTERS: dict[str, Callable[[object, list[object]], object]] = {
+    "upper": lambda value, args: _stringify(value).upper(),
+    "lower": lambda value, args: _stringify(value).lower(),
+    "trim": lambda value, args: _stringify(value).strip(),
+    "join": _filter_join,
+    "length": _filter_length,
+    "default": _filter_default,
+    "replace": _filter_replace,
+}
+
+
+def _compile_filter(expr: dict) -> _Expr:
+    name = expr["name"]
+    source = _compile_expr(expr["input"])
+    args = [_compile_expr(a) for a in expr["args"]]
+    apply = _FILTERS.get(name)
+    if apply is None:
+
+        def apply(value: object, args: list[object]) -> object:
+            raise ValueError(f"Unknown filter: {name!r}")
+
+    if not args:
+        return lambda scope: apply(source(scope), [])
+
+    def filter_(scope: _Scope) -> object:
+        value = source(scope)
+        return apply(value, [a(scope) for a in args])
+
+    return filter_
+
+
+def _text(value: object) -> str:
+    return value if type(value) is str else _stringify(value)
+
+
+# --- nodes ------------------------------------------------------------------
+
+
+def _noop(scope: _Scope, strict_props: set[str] | frozenset[str], out: list[Segment]) -> None:
+    return None
+
+
+def _compile_body(nodes: Sequence[dict]) -> _Emit:
+    emitters = [e for e in (_compile_node(node) for node in nodes) if e is not None]
+    if not emitters:
+        return _noop
+    if len(emitters) == 1:
+        return emitters[0]
+
+    def body(scope: _Scope, strict_props: set[str] | frozenset[str], out: list[Segment]) -> None:
+        for emit in emitters:
+            emit(scope, strict_props, out)
+
+    return body
+
+
+def _compile_node(node: dict) -> _Emit | None:
+    kind = node["kind"]
+    if kind == "text":
+        text = node["value"]
+        if not text:
+            return None
+        return lambda scope, strict_props, out: out.append(Segment("literal", text))
+    if kind == "interp":
+        return _compile_interp(node["expr"])
+    if kind == "if":
+        return _compile_if(node)
+    if kind == "for":
+        return _compile_for(node)
+
+    def unknown(scope: _Scope, strict_props: set[str] | frozenset[str], out: list[Segment]) -> None:
+        raise ValueError(f"Unknown node kind: {kind!r}")
+
+    return unknown
+
+
+def _compile_interp(expr: dict) -> _Emit:
+    value_of = _compile_expr(expr)
+    source = expr["root"] if expr["kind"] == "var" else None
+    if source is None:
+        return lambda scope, strict_props, out: out.append(Segment("interp", _text(value_of(scope))))
+
+    def interp(scope: _Scope, strict_props: set[str] | frozenset[str], out: list[Segment]) -> None:
+        text = _text(value_of(scope))
+        is_strict = source in strict_props
+        if is_strict and _ROLE_BOUNDARY.search(text):
+            raise StrictViolation(f"strict input {source!r} produced a forged role boundary: {text!r}")
+        out.append(Segment("interp", text, source=source, strict=is_strict))
+
+    return interp
+
+
+def _compile_if(node: dict) -> _Emit:
+    branches = [(_compile_expr(b["test"]), _compile_body(b["body"])) for b in node["branches"]]
+    else_body = _compile_body(node["elseBody"]) if "elseBody" in node else _noop
+
+    def if_(scope: _Scope, strict_props: set[str] | frozenset[str], out: list[Segment]) -> None:
+        for test, body in branches:
+            if _truthy(test(scope)):
+                body(scope, strict_props, out)
+                return
+        else_body(scope, strict_props, out)
+
+    return if_
+
+
+def _compile_for(node: dict) -> _Emit:
+    seq = _compile_expr(node["seq"])
+    loop_var = node["loopVar"]
+    body = _compile_body(node["body"])
+
+    def for_(scope: _Scope, strict_props: set[str] | frozenset[str], out: list[Segment]) -> None:
+        items = _iter_seq(seq(scope))
+        total = len(items)  # type: ignore[arg-type]
+        if not total:
+            return
+        child = dict(scope)
+        last = total - 1
+        for idx, item in enumerate(items):
+            child[loop_var] = item
+            child["loop"] = {
+                "index": idx + 1,
+                "index0": idx,
+                "first": idx == 0,
+                "last": idx == last,
+                "length": total,
+            }
+            body(child, strict_props, out)
+
+    return for_
+
+
+# --- public API ---------------------------------------------------------------
+
+
+class CompiledTemplate:
+    """A template compiled to closures; render it any number of times."""
+
+    __slots__ = ("source", "_emit")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._emit = _compile_body(parse_template(source)["nodes"])
+
+    def render_segments(
+        self,
+        inputs: Mapping[str, object] | None = None,
+        strict_props: Iterable[str] | None = None,
+    ) -> list[Segment]:
+        """Render into a provenance-tagged segment list (§7)."""
+        out: list[Segment] = []
+        self._emit(dict(inputs or {}), set(strict_props or ()), out)
+        return out
+
+    def render(
+        self,
+        inputs: Mapping[str, object] | None = None,
+        strict_props: Iterable[str] | None = None,
+    ) -> str:
+        """Render to the flat string (concatenated segment texts)."""
+        return "".join(seg.text for seg in self.render_segments(inputs, strict_props))
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.source[:40]!r})"
+
+
+@lru_cache(maxsize=_COMPILE_CACHE_SIZE)
+def compile_template(template: str) -> CompiledTemplate:
+    """Parse and compile ``template``, reusing a cached result for the same source.
+
+    Raises :class:`~.tokenizer.TemplateSyntaxError` for invalid templates
+    (failures are not cached). ``compile_template.cache_info()`` and
+    ``compile_template.cache_clear()`` expose the LRU.
+    """
+    return CompiledTemplate(template)
+
+
+def render_segments(
+    template: str,
+    inputs: Mapping[str, object] | None = None,
+    strict_props: Iterable[str] | None = None,
+) -> list[Segment]:
+    """Render ``template`` into a provenance-tagged segment list (§7)."""
+    return compile_template(template).render_segments(inputs, strict_props)
+
+
+def render(
+    template: str,
+    inputs: Mapping[str, object] | None = None,
+    strict_props: Iterable[str] | None = None,
+) -> str:
+    """Render ``template`` to the flat string (concatenated segment texts)."""
+    return compile_template(template).render(inputs, strict_props)
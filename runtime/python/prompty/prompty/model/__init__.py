@@ -4,204 +4,9 @@
 # DO NOT EDIT THIS FILE DIRECTLY
 # ANY EDITS WILL BE LOST
 ##########################################
-from ._Agent import Agent
-from ._CheckpointStore import CheckpointStore
-from ._context import LoadContext, SaveContext
-from ._DiscoveryConformance import DiscoveryConformance
-from ._EngineDurabilityPort import EngineDurabilityPort
-from ._EnginePermissionPort import EnginePermissionPort
-from ._EnginePostCommitPort import EnginePostCommitPort
-from ._EngineToolPort import EngineToolPort
-from ._EventJournalWriter import EventJournalWriter
-from ._EventSink import EventSink
-from ._Executor import Executor
-from ._HostToolExecutor import HostToolExecutor
-from ._LoadConformance import LoadConformance
-from ._ModelLister import ModelLister
-from ._Parser import Parser
-from ._PermissionResolver import PermissionResolver
-from ._Processor import Processor
-from ._Renderer import Renderer
-from ._TurnConformance import TurnConformance
-from ._WireConformance import WireConformance
-from .contracts.connectivity import (
-    AnonymousConnection,
-    ApiKeyConnection,
-    AuthorizationCodeFlow,
-    Connection,
-    DeviceAuthorization,
-    FoundryConnection,
-    OAuthConnection,
-    OAuthToken,
-    ReferenceConnection,
-    RemoteConnection,
-)
-from .contracts.conversation import (
-    AudioPart,
-    ContentPart,
-    FilePart,
-    ImagePart,
-    Message,
-    MessageHelpers,
-    TextPart,
-    ThreadMarker,
-    ToolCall,
-    ToolResult,
-    ToolResultHelpers,
-)
-from .contracts.core import (
-    ArrayProperty,
-    FileNotFoundError,
-    InvokerError,
-    ObjectProperty,
-    Property,
-    UnionProperty,
-    ValidationError,
-    ValidationResult,
-)
-from .contracts.events import (
-    Checkpoint,
-    CompactionCompletePayload,
-    CompactionFailedPayload,
-    CompactionStartPayload,
-    DoneEventPayload,
-    ErrorChunk,
-    ErrorEventPayload,
-    FailureChunk,
-    HarnessContext,
-    HookEndPayload,
-    HookStartPayload,
-    HostToolRequest,
-    HostToolResult,
-    LlmCompletePayload,
-    LlmStartPayload,
-    MessagesUpdatedPayload,
-    PermissionCompletedPayload,
-    PermissionDecision,
-    PermissionRequest,
-    PermissionRequestedPayload,
-    RedactedField,
-    RedactionMetadata,
-    RetryPayload,
-    SessionEndPayload,
-    SessionEvent,
-    SessionFileRef,
-    SessionRef,
-    SessionStartPayload,
-    SessionSummary,
-    SessionTrace,
-    SessionWarningPayload,
-    StatusEventPayload,
-    StreamChunk,
-    StreamFailure,
-    TextChunk,
-    ThinkingChunk,
-    ThinkingEventPayload,
-    TokenEventPayload,
-    ToolCallCompletePayload,
-    ToolCallStartPayload,
-    ToolChunk,
-    ToolExecutionCompletePayload,
-    ToolExecutionStartPayload,
-    ToolResultPayload,
-    TrajectoryEvent,
-    TurnEndPayload,
-    TurnEvent,
-    TurnStartPayload,
-    TurnSummary,
-    TurnTrace,
-    UsageChunk,
-)
-from .contracts.guardrails import (
-    GuardrailResult,
-)
-from .contracts.memory import (
-    MemoryEntry,
-    MemoryStore,
-)
-from .contracts.models import (
-    AiResourceInfo,
-    InvocationUsage,
-    Model,
-    ModelInfo,
-    ModelOptions,
-    ProjectInfo,
-    SubscriptionInfo,
-    TokenUsage,
-)
-from .contracts.pipeline import (
-    CompactionConfig,
-    ContextCandidate,
-    ContextRequest,
-    DelegatedStateReference,
-    EngineCheckpoint,
-    EngineEvent,
-    EnginePermissionDecision,
-    FinalOutputPolicyRequest,
-    FinalOutputPolicyResult,
-    HostPolicyRequest,
-    HostPolicyResult,
-    InvocationContextDecision,
-    InvocationContextState,
-    ModelInvocationContextSnapshot,
-    ModelInvocationRequest,
-    ModelInvocationResponse,
-    ModelReconciliationState,
-    ModelToolRequest,
-    ModelToolResult,
-    ReplayJournalRecord,
-    ReplayMismatch,
-    ReplayVerificationRequest,
-    ReplayVerificationResult,
-    ResumeContext,
-    RetryPolicyRequest,
-    RunTurnRequest,
-    RunTurnResult,
-    TurnCommit,
-    TurnEngineResult,
-    TurnModelRequest,
-    TurnModelResponse,
-    TurnOptions,
-)
-from .contracts.streaming import (
-    StreamOptions,
-)
-from .contracts.templates import (
-    FormatConfig,
-    ParserConfig,
-    Template,
-)
-from .contracts.tooling import (
-    Binding,
-    CustomTool,
-    FunctionTool,
-    McpApprovalMode,
-    McpTool,
-    OpenApiTool,
-    Tool,
-    ToolContext,
-    ToolDispatchResult,
-)
-from .contracts.tracing import (
-    TraceFile,
-    TraceSpan,
-    TraceTime,
-)
-from .operations.pipeline import (
-    RenderSegment,
-)
-from .wire.anthropic import (
-    AnthropicImageBlock,
-    AnthropicImageSource,
-    AnthropicMessagesRequest,
-    AnthropicMessagesResponse,
-    AnthropicTextBlock,
-    AnthropicToolDefinition,
-    AnthropicToolResultBlock,
-    AnthropicToolUseBlock,
-    AnthropicUsage,
-    AnthropicWireMessage,
-)
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
 
 __all__ = [
     "LoadContext",
@@ -376,3 +181,391 @@ __all__ = [
     "TurnConformance",
     "WireConformance",
 ]
+
+# Exports load on first access (PEP 562): importing one model type does not
+# import every generated contract module.
+_LAZY_IMPORTS: dict[str, tuple[str, ...]] = {
+    "._Agent": ("Agent",),
+    "._CheckpointStore": ("CheckpointStore",),
+    "._context": ("LoadContext", "SaveContext"),
+    "._DiscoveryConformance": ("DiscoveryConformance",),
+    "._EngineDurabilityPort": ("EngineDurabilityPort",),
+    "._EnginePermissionPort": ("EnginePermissionPort",),
+    "._EnginePostCommitPort": ("EnginePostCommitPort",),
+    "._EngineToolPort": ("EngineToolPort",),
+    "._EventJournalWriter": ("EventJournalWriter",),
+    "._EventSink": ("EventSink",),
+    "._Executor": ("Executor",),
+    "._HostToolExecutor": ("HostToolExecutor",),
+    "._LoadConformance": ("LoadConformance",),
+    "._ModelLister": ("ModelLister",),
+    "._Parser": ("Parser",),
+    "._PermissionResolver": ("PermissionResolver",),
+    "._Processor": ("Processor",),
+    "._Renderer": ("Renderer",),
+    "._TurnConformance": ("TurnConformance",),
+    "._WireConformance": ("WireConformance",),
+    ".contracts.connectivity": (
+        "AnonymousConnection",
+        "ApiKeyConnection",
+        "AuthorizationCodeFlow",
+        "Connection",
+        "DeviceAuthorization",
+        "FoundryConnection",
+        "OAuthConnection",
+        "OAuthToken",
+        "ReferenceConnection",
+        "RemoteConnection",
+    ),
+    ".contracts.conversation": (
+        "AudioPart",
+        "ContentPart",
+        "FilePart",
+        "ImagePart",
+        "Message",
+        "MessageHelpers",
+        "TextPart",
+        "ThreadMarker",
+        "ToolCall",
+        "ToolResult",
+        "ToolResultHelpers",
+    ),
+    ".contracts.core": (
+        "ArrayProperty",
+        "FileNotFoundError",
+        "InvokerError",
+        "ObjectProperty",
+        "Property",
+        "UnionProperty",
+        "ValidationError",
+        "ValidationResult",
+    ),
+    ".contracts.events": (
+        "Checkpoint",
+        "CompactionCompletePayload",
+        "CompactionFailedPayload",
+        "CompactionStartPayload",
+        "DoneEventPayload",
+        "ErrorChunk",
+        "ErrorEventPayload",
+        "FailureChunk",
+        "HarnessContext",
+        "HookEndPayload",
+        "HookStartPayload",
+        "HostToolRequest",
+        "HostToolResult",
+        "LlmCompletePayload",
+        "LlmStartPayload",
+        "MessagesUpdatedPayload",
+        "PermissionCompletedPayload",
+        "PermissionDecision",
+        "PermissionRequest",
+        "PermissionRequestedPayload",
+        "RedactedField",
+        "RedactionMetadata",
+        "RetryPayload",
+        "SessionEndPayload",
+        "SessionEvent",
+        "SessionFileRef",
+        "SessionRef",
+        "SessionStartPayload",
+        "SessionSummary",
+        "SessionTrace",
+        "SessionWarningPayload",
+        "StatusEventPayload",
+        "StreamChunk",
+        "StreamFailure",
+        "TextChunk",
+        "ThinkingChunk",
+        "ThinkingEventPayload",
+        "TokenEventPayload",
+        "ToolCallCompletePayload",
+        "ToolCallStartPayload",
+        "ToolChunk",
+        "ToolExecutionCompletePayload",
+        "ToolExecutionStartPayload",
+        "ToolResultPayload",
+        "TrajectoryEvent",
+        "TurnEndPayload",
+        "TurnEvent",
+        "TurnStartPayload",
+        "TurnSummary",
+        "TurnTrace",
+        "UsageChunk",
+    ),
+    ".contracts.guardrails": ("GuardrailResult",),
+    ".contracts.memory": ("MemoryEntry", "MemoryStore"),
+    ".contracts.models": (
+        "AiResourceInfo",
+        "InvocationUsage",
+        "Model",
+        "ModelInfo",
+        "ModelOptions",
+        "ProjectInfo",
+        "SubscriptionInfo",
+        "TokenUsage",
+    ),
+    ".contracts.pipeline": (
+        "CompactionConfig",
+        "ContextCandidate",
+        "ContextRequest",
+        "DelegatedStateReference",
+        "EngineCheckpoint",
+        "EngineEvent",
+        "EnginePermissionDecision",
+        "FinalOutputPolicyRequest",
+        "FinalOutputPolicyResult",
+        "HostPolicyRequest",
+        "HostPolicyResult",
+        "InvocationContextDecision",
+        "InvocationContextState",
+        "ModelInvocationContextSnapshot",
+        "ModelInvocationRequest",
+        "ModelInvocationResponse",
+        "ModelReconciliationState",
+        "ModelToolRequest",
+        "ModelToolResult",
+        "ReplayJournalRecord",
+        "ReplayMismatch",
+        "ReplayVerificationRequest",
+        "ReplayVerificationResult",
+        "ResumeContext",
+        "RetryPolicyRequest",
+        "RunTurnRequest",
+        "RunTurnResult",
+        "TurnCommit",
+        "TurnEngineResult",
+        "TurnModelRequest",
+        "TurnModelResponse",
+        "TurnOptions",
+    ),
+    ".contracts.streaming": ("StreamOptions",),
+    ".contracts.templates": ("FormatConfig", "ParserConfig", "Template"),
+    ".contracts.tooling": (
+        "Binding",
+        "CustomTool",
+        "FunctionTool",
+        "McpApprovalMode",
+        "McpTool",
+        "OpenApiTool",
+        "Tool",
+        "ToolContext",
+        "ToolDispatchResult",
+    ),
+    ".contracts.tracing": ("TraceFile", "TraceSpan", "TraceTime"),
+    ".operations.pipeline": ("RenderSegment",),
+    ".wire.anthropic": (
+        "AnthropicImageBlock",
+        "AnthropicImageSource",
+        "AnthropicMessagesRequest",
+        "AnthropicMessagesResponse",
+        "AnthropicTextBlock",
+        "AnthropicToolDefinition",
+        "AnthropicToolResultBlock",
+        "AnthropicToolUseBlock",
+        "AnthropicUsage",
+        "AnthropicWireMessage",
+    ),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
+
+if TYPE_CHECKING:
+    from ._Agent import Agent
+    from ._CheckpointStore import CheckpointStore
+    from ._context import LoadContext, SaveContext
+    from ._DiscoveryConformance import DiscoveryConformance
+    from ._EngineDurabilityPort import EngineDurabilityPort
+    from ._EnginePermissionPort import EnginePermissionPort
+    from ._EnginePostCommitPort import EnginePostCommitPort
+    from ._EngineToolPort import EngineToolPort
+    from ._EventJournalWriter import EventJournalWriter
+    from ._EventSink import EventSink
+    from ._Executor import Executor
+    from ._HostToolExecutor import HostToolExecutor
+    from ._LoadConformance import LoadConformance
+    from ._ModelLister import ModelLister
+    from ._Parser import Parser
+    from ._PermissionResolver import PermissionResolver
+    from ._Processor import Processor
+    from ._Renderer import Renderer
+    from ._TurnConformance import TurnConformance
+    from ._WireConformance import WireConformance
+    from .contracts.connectivity import (
+        AnonymousConnection,
+        ApiKeyConnection,
+        AuthorizationCodeFlow,
+        Connection,
+        DeviceAuthorization,
+        FoundryConnection,
+        OAuthConnection,
+        OAuthToken,
+        ReferenceConnection,
+        RemoteConnection,
+    )
+    from .contracts.conversation import (
+        AudioPart,
+        ContentPart,
+        FilePart,
+        ImagePart,
+        Message,
+        MessageHelpers,
+        TextPart,
+        ThreadMarker,
+        ToolCall,
+        ToolResult,
+        ToolResultHelpers,
+    )
+    from .contracts.core import (
+        ArrayProperty,
+        FileNotFoundError,
+        InvokerError,
+        ObjectProperty,
+        Property,
+        UnionProperty,
+        ValidationError,
+        ValidationResult,
+    )
+    from .contracts.events import (
+        Checkpoint,
+        CompactionCompletePayload,
+        CompactionFailedPayload,
+        CompactionStartPayload,
+        DoneEventPayload,
+        ErrorChunk,
+        ErrorEventPayload,
+        FailureChunk,
+        HarnessContext,
+        HookEndPayload,
+        HookStartPayload,
+        HostToolRequest,
+        HostToolResult,
+        LlmCompletePayload,
+        LlmStartPayload,
+        MessagesUpdatedPayload,
+        PermissionCompletedPayload,
+        PermissionDecision,
+        PermissionRequest,
+        PermissionRequestedPayload,
+        RedactedField,
+        RedactionMetadata,
+        RetryPayload,
+        SessionEndPayload,
+        SessionEvent,
+        SessionFileRef,
+        SessionRef,
+        SessionStartPayload,
+        SessionSummary,
+        SessionTrace,
+        SessionWarningPayload,
+        StatusEventPayload,
+        StreamChunk,
+        StreamFailure,
+        TextChunk,
+        ThinkingChunk,
+        ThinkingEventPayload,
+        TokenEventPayload,
+        ToolCallCompletePayload,
+        ToolCallStartPayload,
+        ToolChunk,
+        ToolExecutionCompletePayload,
+        ToolExecutionStartPayload,
+        ToolResultPayload,
+        TrajectoryEvent,
+        TurnEndPayload,
+        TurnEvent,
+        TurnStartPayload,
+        TurnSummary,
+        TurnTrace,
+        UsageChunk,
+    )
+    from .contracts.guardrails import (
+        GuardrailResult,
+    )
+    from .contracts.memory import (
+        MemoryEntry,
+        MemoryStore,
+    )
+    from .contracts.models import (
+        AiResourceInfo,
+        InvocationUsage,
+        Model,
+        ModelInfo,
+        ModelOptions,
+        ProjectInfo,
+        SubscriptionInfo,
+        TokenUsage,
+    )
+    from .contracts.pipeline import (
+        CompactionConfig,
+        ContextCandidate,
+        ContextRequest,
+        DelegatedStateReference,
+        EngineCheckpoint,
+        EngineEvent,
+        EnginePermissionDecision,
+        FinalOutputPolicyRequest,
+        FinalOutputPolicyResult,
+        HostPolicyRequest,
+        HostPolicyResult,
+        InvocationContextDecision,
+        InvocationContextState,
+        ModelInvocationContextSnapshot,
+        ModelInvocationRequest,
+        ModelInvocationResponse,
+        ModelReconciliationState,
+        ModelToolRequest,
+        ModelToolResult,
+        ReplayJournalRecord,
+        ReplayMismatch,
+        ReplayVerificationRequest,
+        ReplayVerificationResult,
+        ResumeContext,
+        RetryPolicyRequest,
+        RunTurnRequest,
+        RunTurnResult,
+        TurnCommit,
+        TurnEngineResult,
+        TurnModelRequest,
+        TurnModelResponse,
+        TurnOptions,
+    )
+    from .contracts.streaming import (
+        StreamOptions,
+    )
+    from .contracts.templates import (
+        FormatConfig,
+        ParserConfig,
+        Template,
+    )
+    from .contracts.tooling import (
+        Binding,
+        CustomTool,
+        FunctionTool,
+        McpApprovalMode,
+        McpTool,
+        OpenApiTool,
+        Tool,
+        ToolContext,
+        ToolDispatchResult,
+    )
+    from .contracts.tracing import (
+        TraceFile,
+        TraceSpan,
+        TraceTime,
+    )
+    from .operations.pipeline import (
+        RenderSegment,
+    )
+    from .wire.anthropic import (
+        AnthropicImageBlock,
+        AnthropicImageSource,
+        AnthropicMessagesRequest,
+        AnthropicMessagesResponse,
+        AnthropicTextBlock,
+        AnthropicToolDefinition,
+        AnthropicToolResultBlock,
+        AnthropicToolUseBlock,
+        AnthropicUsage,
+        AnthropicWireMessage,
+    )
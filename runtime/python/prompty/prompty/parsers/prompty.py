@@ -6,6 +6,10 @@ Supports nonce-based sanitization when ``FormatConfig.strict`` is enabled.
 Images should be passed via ``kind: image`` input properties rather than
 inline markdown syntax. Inline ``![alt](url)`` is preserved as literal text.
 
+Renderers that produce provenance-tagged segments (``render_segments()``)
+are parsed by :meth:`PromptyChatParser.parse_segments` instead of from the
+flat string; see :mod:`prompty.renderers.jinja_subset`.
+
 Registered as ``prompty`` in ``prompty.parsers``.
 """
 
@@ -13,13 +17,16 @@ from __future__ import annotations
 
 import re
 import secrets
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import Any
 
 from ..core.types import (
+    RICH_KINDS,
     ROLES,
     Message,
     TextPart,
+    ThreadMarker,
 )
 from ..model import Agent
 from ..tracing.tracer import trace
@@ -39,6 +46,60 @@ _BOUNDARY_RE = re.compile(
     r"(\[(?:\w++\s*+=\s*+(?:\"[^\"]*\"|[^\",\]]*+)\s*+,?+\s*+)+\])?\s*:\s*$"
 )
 
+# The same boundary, matched in place against one ``\n``-terminated line of a
+# larger text (``fullmatch(text, line_start, line_end)``): ``[^\S\n]`` stands
+# in for ``\s`` and attribute values may not cross a newline, so a match can
+# never leave its line.
+_BOUNDARY_LINE_RE = re.compile(
+    r"(?i)[^\S\n]*#?[^\S\n]*(" + _ROLE_NAMES + r")"
+    r"(\[(?:\w++[^\S\n]*+=[^\S\n]*+(?:\"[^\"\n]*\"|[^\",\]\n]*+)[^\S\n]*+,?+[^\S\n]*+)+\])?"
+    r"[^\S\n]*:[^\S\n]*"
+)
+
+# A role line ends in ``:``; finding those first is ~10x faster than
+# matching every line of large text.
+_LINE_END_COLON = re.compile(r":[^\S\n]*$", re.M)
+
+# Line breaks ``str.splitlines()`` honors besides ``\n`` (a lone ``\r`` counts,
+# ``\r\n`` does not). Text containing any of them is parsed line by line.
+_IRREGULAR_BREAKS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+# Characters ``str.splitlines()`` breaks on (as a set of last characters).
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+_ATTR_RE = re.compile(r'(\w+)\s*=\s*"?([^",]*)"?')
+
+_INJECTION_ERROR = (
+    "Role marker in interpolated input — possible prompt injection detected "
+    "(strict mode is enabled). A template variable may be injecting role markers."
+)
+
+
+def _has_irregular_breaks(text: str) -> bool:
+    # One substring scan per character is far faster than a character-class regex
+    if "\r" in text and text.count("\r") != text.count("\r\n"):
+        return True
+    return any(c in text for c in _IRREGULAR_BREAKS)
+
+
+def _iter_boundaries(text: str) -> Iterator[tuple[re.Match[str], int, int]]:
+    """Yield ``(match, line_start, line_end)`` for each role-marker line.
+
+    *text* must not contain irregular line breaks (``_has_irregular_breaks``);
+    ``line_end`` excludes the ``\n``.
+    """
+    for m in _LINE_END_COLON.finditer(text):
+        end = m.end()
+        start = text.rfind("\n", 0, m.start()) + 1
+        b = _BOUNDARY_LINE_RE.fullmatch(text, start, end)
+        if b is not None:
+            yield b, start, end
+
+
+def _has_role_line(text: str) -> bool:
+    """True if any ``\n``-separated line of *text* is a role marker."""
+    return next(_iter_boundaries(text), None) is not None
+
 
 class PromptyChatParser:
     """Parses rendered prompt text into a list of ``Message``.
@@ -60,6 +121,21 @@ class PromptyChatParser:
         the nonce for later validation in ``parse()``.
         """
         nonce = secrets.token_hex(8)
+        if _has_irregular_breaks(template):
+            return self._pre_render_lines(template, nonce), {"nonce": nonce}
+
+        pieces: list[str] = []
+        pos = 0
+        for b, start, end in _iter_boundaries(template):
+            pieces.append(template[pos:start])
+            # Inject nonce as an attribute (replacing the line and its newline)
+            pieces.append(f'{b.group(1).lower()}[nonce="{nonce}"]:\n')
+            pos = end + 1
+        pieces.append(template[pos:])
+        return "".join(pieces), {"nonce": nonce}
+
+    def _pre_render_lines(self, template: str, nonce: str) -> str:
+        """Line-by-line :meth:`pre_render` for text with irregular line breaks."""
         sanitized_lines: list[str] = []
 
         for line in template.splitlines(keepends=True):
@@ -73,7 +149,7 @@ class PromptyChatParser:
             else:
                 sanitized_lines.append(line)
 
-        return "".join(sanitized_lines), {"nonce": nonce}
+        return "".join(sanitized_lines)
 
     # ---- parse ----
 
@@ -120,6 +196,53 @@ class PromptyChatParser:
     ) -> list[Message]:
         return self._parse(agent, rendered, **context)
 
+    # ---- segment-native parse ----
+
+    @trace
+    def parse_segments(
+        self,
+        agent: Agent,
+        segments: Sequence[Any],
+        *,
+        strict: bool = False,
+    ) -> list[Message | ThreadMarker]:
+        """Build messages directly from rendered segments.
+
+        Produces the same messages as :meth:`parse` on the concatenated
+        text, except that structure comes from provenance, not from text:
+
+        - a role marker is only recognized on a line made up entirely of
+          ``literal`` (template) segments, so interpolated input can never
+          open a new message;
+        - each ``rich`` segment becomes a ``ThreadMarker`` at its position,
+          splitting the surrounding message.
+
+        Parameters
+        ----------
+        agent:
+            The loaded Agent (supplies rich input kinds and the base path).
+        segments:
+            Objects with ``kind`` (``"literal"``, ``"interp"`` or
+            ``"rich"``), ``text`` and ``source``, e.g.
+            :class:`prompty.jinja_subset.Segment`.
+        strict:
+            Raise ``ValueError`` when interpolated text contains a line that
+            would otherwise read as a role marker, matching the nonce check
+            :meth:`parse` performs in strict mode.
+
+        Returns
+        -------
+        list[Message | ThreadMarker]
+        """
+        rich_kinds = {p.name: p.kind for p in agent.inputs or [] if p.kind in RICH_KINDS}
+        reader = _SegmentReader(self, self._resolve_base_path(agent), rich_kinds, strict)
+        for seg in segments:
+            if seg.kind == "rich":
+                reader.add_marker(seg.source)
+            elif seg.text:
+                reader.add_text(seg.text, seg.kind == "literal")
+        return reader.finish()
+
     # ---- internal parsing ----
 
     def _resolve_base_path(self, agent: Agent) -> Path | None:
@@ -135,7 +258,43 @@ class PromptyChatParser:
         nonce: str | None,
         base_path: Path | None,
     ):
-        """Generator that yields Message / ThreadMarker from rendered text."""
+        """Generator that yields Message from rendered text.
+
+        Boundaries are found with one scan over *text* and message bodies
+        are sliced by offset. ``\r\n`` is normalized to ``\n`` first, as
+        the line-based parse does; text with other ``splitlines()`` breaks
+        goes through :meth:`_parse_lines`.
+        """
+        if _has_irregular_breaks(text):
+            yield from self._parse_lines(text, nonce, base_path)
+            return
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+
+        role = "system"  # default role if none specified
+        attrs: dict[str, Any] = {}
+        msg_nonce: str | None = None  # only checked on segments that start with a role marker
+        pos = 0
+
+        for b, start, end in _iter_boundaries(text):
+            if start > pos:
+                yield self._build_message(role, text[pos:start], attrs, msg_nonce, base_path)
+            role = b.group(1).lower()
+            raw_attrs = b.group(2)  # e.g. [name="Alice",nonce="abc"]
+            attrs = self._parse_attrs(raw_attrs) if raw_attrs else {}
+            msg_nonce = nonce
+            pos = end + 1
+
+        if pos < len(text):
+            yield self._build_message(role, text[pos:], attrs, msg_nonce, base_path)
+
+    def _parse_lines(
+        self,
+        text: str,
+        nonce: str | None,
+        base_path: Path | None,
+    ):
+        """Line-by-line :meth:`_parse_messages` for text with irregular line breaks."""
         content_buffer: list[str] = []
         role = "system"  # default role if none specified
         attrs: dict[str, Any] = {}
@@ -148,7 +307,9 @@ class PromptyChatParser:
             m = _BOUNDARY_RE.match(stripped)
             if m:
                 if content_buffer:
-                    yield self._build_message(role, content_buffer, attrs, nonce if has_boundary else None, base_path)
+                    yield self._build_message(
+                        role, "\n".join(content_buffer), attrs, nonce if has_boundary else None, base_path
+                    )
                     content_buffer = []
 
                 role = m.group(1).strip().lower()
@@ -161,19 +322,20 @@ class PromptyChatParser:
 
         # Flush remaining content
         if content_buffer:
-            yield self._build_message(role, content_buffer, attrs, nonce if has_boundary else None, base_path)
+            yield self._build_message(
+                role, "\n".join(content_buffer), attrs, nonce if has_boundary else None, base_path
+            )
 
     def _build_message(
         self,
         role: str,
-        lines: list[str],
+        content: str,
         attrs: dict[str, Any],
         nonce: str | None,
         base_path: Path | None,
     ) -> Message:
-        """Build a Message from accumulated content lines."""
+        """Build a Message from the content between two role markers."""
         # Strip leading/trailing blank lines from content
-        content = "\n".join(lines)
         content = content.strip("\n")
 
         # Validate nonce in strict mode
@@ -201,8 +363,7 @@ class PromptyChatParser:
 
         result: dict[str, Any] = {}
         # Match key=value pairs
-        pattern = r'(\w+)\s*=\s*"?([^",]*)"?'
-        for m in re.finditer(pattern, inner):
+        for m in _ATTR_RE.finditer(inner):
             key = m.group(1)
             val_str = m.group(2).strip()
             # Type coercion
@@ -218,3 +379,112 @@ class PromptyChatParser:
                         result[key] = val_str
 
         return result
+
+
+class _SegmentReader:
+    """Line state for :meth:`PromptyChatParser.parse_segments`.
+
+    Mirrors ``_parse_messages``: text is split with ``str.splitlines()``
+    semantics and message content is re-joined with ``"\n"``. Only lines
+    built solely from literal text are matched against ``_BOUNDARY_RE``;
+    interpolated text is appended line-wise without per-line work.
+    """
+
+    def __init__(
+        self,
+        parser: PromptyChatParser,
+        base_path: Path | None,
+        rich_kinds: dict[str, str],
+        strict: bool,
+    ) -> None:
+        self.parser = parser
+        self.base_path = base_path
+        self.rich_kinds = rich_kinds
+        self.strict = strict
+        self.out: list[Message | ThreadMarker] = []
+        self.role = "system"
+        self.attrs: dict[str, Any] = {}
+        # Current message: finished chunks (line lists) separated by markers
+        self.chunks: list[list[str] | ThreadMarker] = []
+        self.lines: list[str] = []
+        self.has_content = False
+        # Current, unfinished line
+        self.line: list[str] = []
+        self.line_literal = True
+
+    def add_text(self, text: str, literal: bool) -> None:
+        bodies = text.splitlines()
+        ends = text[-1] in _LINE_BREAKS
+        if literal:
+            last = len(bodies) - 1
+            for i, body in enumerate(bodies):
+                self.line.append(body)
+                if i < last or ends:
+                    self._end_line()
+            return
+
+        if self.strict and _has_role_line(text):
+            raise ValueError(_INJECTION_ERROR)
+        self.line.append(bodies[0])
+        self.line_literal = False
+        if len(bodies) == 1 and not ends:
+            return
+        self._end_line()
+        if ends:
+            self.lines.extend(bodies[1:])
+        else:
+            self.lines.extend(bodies[1:-1])
+            self.line.append(bodies[-1])
+            self.line_literal = False
+
+    def add_marker(self, name: str) -> None:
+        self.chunks.append(self.lines + ["".join(self.line)])
+        self.chunks.append(ThreadMarker(name=name, kind=self.rich_kinds.get(name, "thread")))
+        self.lines = []
+        self.line = []
+        self.line_literal = False
+        self.has_content = True
+
+    def finish(self) -> list[Message | ThreadMarker]:
+        if self.line:
+            self._end_line()
+        self._flush()
+        return self.out
+
+    def _end_line(self) -> None:
+        line = "".join(self.line)
+        self.line = []
+        if self.line_literal:
+            m = _BOUNDARY_RE.match(line.strip())
+            if m:
+                self._flush()
+                self.role = m.group(1).strip().lower()
+                raw_attrs = m.group(2)
+                self.attrs = self.parser._parse_attrs(raw_attrs) if raw_attrs else {}
+                return
+        elif self.strict and _BOUNDARY_RE.match(line.strip()):
+            # A marker assembled from template text plus interpolated text
+            raise ValueError(_INJECTION_ERROR)
+        self.line_literal = True
+        self.lines.append(line)
+        self.has_content = True
+
+    def _flush(self) -> None:
+        if not self.has_content:
+            return
+        if not self.chunks:
+            content = "\n".join(self.lines)
+            self.out.append(self.parser._build_message(self.role, content, self.attrs, None, self.base_path))
+        else:
+            metadata = {k: v for k, v in self.attrs.items() if k != "nonce"}
+            self.chunks.append(self.lines)
+            for chunk in self.chunks:
+                if isinstance(chunk, ThreadMarker):
+                    self.out.append(chunk)
+                    continue
+                text = "\n".join(chunk).strip()
+                if text:
+                    self.out.append(Message(role=self.role, parts=[TextPart(value=text)], metadata=dict(metadata)))
+        self.chunks = []
+        self.lines = []
+        self.has_content = False
@@ -14,7 +14,9 @@ from __future__ import annotations
 
 from typing import Any
 
+from ...core.client_pool import get_client_pool
 from ...core.connections import get_connection
+from ...core.tool_index import tool_index
 from ...core.types import (
     AsyncPromptyStream,
     ContentPart,
@@ -23,6 +25,7 @@ from ...core.types import (
     PromptyStream,
     TextPart,
 )
+from ...core.wire_cache import cached_wire
 from ...model import (
     Agent,
     ApiKeyConnection,
@@ -34,6 +37,9 @@ __all__ = ["AnthropicExecutor"]
 
 DEFAULT_MAX_TOKENS = 4096
 
+# Environment variables the Anthropic SDK falls back to; rotating them builds a fresh pooled client.
+_CLIENT_ENV = ("ANTHROPIC_API_KEY", "ANTHROPIC_AUTH_TOKEN", "ANTHROPIC_BASE_URL")
+
 
 # ---------------------------------------------------------------------------
 # Wire format mapping
@@ -238,12 +244,20 @@ def _schema_to_wire(properties: list[Any]) -> dict[str, Any]:
 
 
 def _tools_to_wire(agent: Agent) -> list[dict[str, Any]]:
-    """Convert agent tools to Anthropic format: {name, description, input_schema}."""
+    """Convert agent tools to Anthropic format: {name, description, input_schema}.
+
+    Built once per agent and reused from its :func:`~prompty.core.tool_index.tool_index`.
+    """
     if not agent.tools:
         return []
 
+    return list(tool_index(agent).wire("anthropic.messages", _function_tools_to_wire))
+
+
+def _function_tools_to_wire(tools: tuple[Any, ...]) -> list[dict[str, Any]]:
+    """Build Anthropic tool definitions for the ``kind: function`` tools."""
     result: list[dict[str, Any]] = []
-    for tool in agent.tools:
+    for tool in tools:
         if getattr(tool, "kind", None) != "function":
             continue
 
@@ -308,7 +322,7 @@ def _build_chat_args(agent: Agent, messages: list[Message]) -> dict[str, Any]:
         if msg.role == "system":
             system_parts.append(msg.text)
         else:
-            conversation.append(_message_to_wire(msg))
+            conversation.append(cached_wire(msg, "anthropic.messages", _message_to_wire))
 
     opts = _build_options(agent)
     if "max_tokens" not in opts:
@@ -353,6 +367,27 @@ class AnthropicExecutor:
     @trace
     def execute(self, agent: Agent, data: Any) -> Any:
         client = self._resolve_client(agent)
+        pool = get_client_pool()
+        try:
+            response = self._dispatch(client, agent, data)
+        except BaseException:
+            pool.release(client)
+            raise
+        return pool.release_after(client, response)
+
+    @trace
+    async def execute_async(self, agent: Agent, data: Any) -> Any:
+        client = self._resolve_client_async(agent)
+        pool = get_client_pool()
+        try:
+            response = await self._dispatch_async(client, agent, data)
+        except BaseException:
+            pool.release(client)
+            raise
+        return pool.release_after(client, response)
+
+    def _dispatch(self, client: Any, agent: Agent, data: Any) -> Any:
+        """Call the API for the agent's ``apiType`` with *client*."""
         api_type = agent.model.api_type or "chat"
 
         if api_type == "chat":
@@ -362,9 +397,8 @@ class AnthropicExecutor:
                 f"Unsupported apiType '{api_type}' for Anthropic. Anthropic only supports 'chat' (Messages API)."
             )
 
-    @trace
-    async def execute_async(self, agent: Agent, data: Any) -> Any:
-        client = self._resolve_client_async(agent)
+    async def _dispatch_async(self, client: Any, agent: Agent, data: Any) -> Any:
+        """Async counterpart of :meth:`_dispatch`."""
         api_type = agent.model.api_type or "chat"
 
         if api_type == "chat":
@@ -414,7 +448,15 @@ class AnthropicExecutor:
             return get_connection(conn.name)
 
         kwargs = self._client_kwargs(agent)
-        return Anthropic(**kwargs)
+        return get_client_pool().get_or_create(
+            "anthropic",
+            Anthropic,
+            lambda: Anthropic(**kwargs),
+            endpoint=kwargs.get("base_url"),
+            credential=kwargs.get("api_key"),
+            is_async=False,
+            env=_CLIENT_ENV,
+        )
 
     def _resolve_client_async(self, agent: Agent) -> Any:
         """Resolve the async Anthropic client from connection config."""
@@ -426,7 +468,15 @@ class AnthropicExecutor:
             return get_connection(conn.name)
 
         kwargs = self._client_kwargs(agent)
-        return AsyncAnthropic(**kwargs)
+        return get_client_pool().get_or_create(
+            "anthropic",
+            AsyncAnthropic,
+            lambda: AsyncAnthropic(**kwargs),
+            endpoint=kwargs.get("base_url"),
+            credential=kwargs.get("api_key"),
+            is_async=True,
+            env=_CLIENT_ENV,
+        )
 
     def _client_kwargs(self, agent: Agent) -> dict[str, Any]:
         kwargs: dict[str, Any] = {}
@@ -121,6 +121,55 @@ def _process_messages(agent: Any, content: list[Any], stop_reason: str | None) -
 # ---------------------------------------------------------------------------
 
 
+def _stream_event(event: Any, pending: dict[int, Any]) -> str | Any | None:
+    """Apply one streaming event to *pending* tool calls.
+
+    Returns the text of a ``text_delta``, the finished ``ToolCall`` when a
+    tool-use block's ``content_block_stop`` arrives, or ``None``.
+    """
+    from ..openai.processor import _PendingToolCall
+
+    e = event if isinstance(event, dict) else getattr(event, "__dict__", {})
+    event_type = e.get("type") if isinstance(e, dict) else getattr(event, "type", None)
+
+    if event_type == "content_block_delta":
+        delta = e.get("delta") if isinstance(e, dict) else getattr(event, "delta", None)
+        if not delta:
+            return None
+        delta_type = delta.get("type") if isinstance(delta, dict) else getattr(delta, "type", None)
+
+        if delta_type == "text_delta":
+            return delta.get("text") if isinstance(delta, dict) else getattr(delta, "text", "")
+        if delta_type == "input_json_delta":
+            idx = e.get("index") if isinstance(e, dict) else getattr(event, "index", 0)
+            call = pending.get(idx)
+            if call is not None:
+                partial = (
+                    delta.get("partial_json", "") if isinstance(delta, dict) else getattr(delta, "partial_json", "")
+                )
+                if partial:
+                    call.chunks.append(partial)
+
+    elif event_type == "content_block_start":
+        block = e.get("content_block") if isinstance(e, dict) else getattr(event, "content_block", None)
+        if not block:
+            return None
+        block_type = block.get("type") if isinstance(block, dict) else getattr(block, "type", None)
+        if block_type == "tool_use":
+            idx = e.get("index") if isinstance(e, dict) else getattr(event, "index", 0)
+            block_id = block.get("id", "") if isinstance(block, dict) else getattr(block, "id", "")
+            block_name = block.get("name", "") if isinstance(block, dict) else getattr(block, "name", "")
+            pending[idx] = _PendingToolCall(block_id, block_name)
+
+    elif event_type == "content_block_stop":
+        idx = e.get("index") if isinstance(e, dict) else getattr(event, "index", 0)
+        call = pending.pop(idx, None)
+        if call is not None:
+            return call.build()
+
+    return None
+
+
 def _stream_generator(response: Iterator) -> Iterator[str | Any]:
     """Yield content chunks from an Anthropic streaming response.
 
@@ -128,90 +177,29 @@ def _stream_generator(response: Iterator) -> Iterator[str | Any]:
     - ``content_block_delta`` with ``delta.type == "text_delta"`` → yield text
     - ``content_block_start`` with ``content_block.type == "tool_use"`` → accumulate tool call
     - ``input_json_delta`` → accumulate partial JSON for tool arguments
-    - Tool calls are yielded at the end of the stream.
+    - ``content_block_stop`` for a tool-use block → yield its ``ToolCall``
+      immediately, so callers can start executing it while the rest of the
+      response streams. Blocks never stopped are yielded at the end.
     """
-    from ..openai.processor import ToolCall
-
-    tool_call_acc: dict[int, dict[str, str]] = {}
+    pending: dict[int, Any] = {}
 
     for event in response:
-        e = event if isinstance(event, dict) else getattr(event, "__dict__", {})
-        event_type = e.get("type") if isinstance(e, dict) else getattr(event, "type", None)
-
-        if event_type == "content_block_delta":
-            delta = e.get("delta") if isinstance(e, dict) else getattr(event, "delta", None)
-            if not delta:
-                continue
-            delta_type = delta.get("type") if isinstance(delta, dict) else getattr(delta, "type", None)
-
-            if delta_type == "text_delta":
-                text = delta.get("text") if isinstance(delta, dict) else getattr(delta, "text", "")
-                yield text
-            elif delta_type == "input_json_delta":
-                idx = e.get("index") if isinstance(e, dict) else getattr(event, "index", 0)
-                acc = tool_call_acc.get(idx)
-                if acc:
-                    partial = (
-                        delta.get("partial_json", "") if isinstance(delta, dict) else getattr(delta, "partial_json", "")
-                    )
-                    acc["arguments"] += partial
-
-        elif event_type == "content_block_start":
-            block = e.get("content_block") if isinstance(e, dict) else getattr(event, "content_block", None)
-            if not block:
-                continue
-            block_type = block.get("type") if isinstance(block, dict) else getattr(block, "type", None)
-            if block_type == "tool_use":
-                idx = e.get("index") if isinstance(e, dict) else getattr(event, "index", 0)
-                block_id = block.get("id", "") if isinstance(block, dict) else getattr(block, "id", "")
-                block_name = block.get("name", "") if isinstance(block, dict) else getattr(block, "name", "")
-                tool_call_acc[idx] = {"id": block_id, "name": block_name, "arguments": ""}
-
-    # Yield accumulated tool calls at end of stream
-    for idx in sorted(tool_call_acc):
-        tc = tool_call_acc[idx]
-        yield ToolCall(id=tc["id"], name=tc["name"], arguments=tc["arguments"])
+        item = _stream_event(event, pending)
+        if item is not None:
+            yield item
+
+    for idx in sorted(pending):
+        yield pending[idx].build()
 
 
 async def _async_stream_generator(response: AsyncIterator) -> AsyncIterator[str | Any]:
     """Async variant of :func:`_stream_generator`."""
-    from ..openai.processor import ToolCall
-
-    tool_call_acc: dict[int, dict[str, str]] = {}
+    pending: dict[int, Any] = {}
 
     async for event in response:
-        e = event if isinstance(event, dict) else getattr(event, "__dict__", {})
-        event_type = e.get("type") if isinstance(e, dict) else getattr(event, "type", None)
-
-        if event_type == "content_block_delta":
-            delta = e.get("delta") if isinstance(e, dict) else getattr(event, "delta", None)
-            if not delta:
-                continue
-            delta_type = delta.get("type") if isinstance(delta, dict) else getattr(delta, "type", None)
-
-            if delta_type == "text_delta":
-                text = delta.get("text") if isinstance(delta, dict) else getattr(delta, "text", "")
-                yield text
-            elif delta_type == "input_json_delta":
-                idx = e.get("index") if isinstance(e, dict) else getattr(event, "index", 0)
-                acc = tool_call_acc.get(idx)
-                if acc:
-                    partial = (
-                        delta.get("partial_json", "") if isinstance(delta, dict) else getattr(delta, "partial_json", "")
-                    )
-                    acc["arguments"] += partial
-
-        elif event_type == "content_block_start":
-            block = e.get("content_block") if isinstance(e, dict) else getattr(event, "content_block", None)
-            if not block:
-                continue
-            block_type = block.get("type") if isinstance(block, dict) else getattr(block, "type", None)
-            if block_type == "tool_use":
-                idx = e.get("index") if isinstance(e, dict) else getattr(event, "index", 0)
-                block_id = block.get("id", "") if isinstance(block, dict) else getattr(block, "id", "")
-                block_name = block.get("name", "") if isinstance(block, dict) else getattr(block, "name", "")
-                tool_call_acc[idx] = {"id": block_id, "name": block_name, "arguments": ""}
-
-    for idx in sorted(tool_call_acc):
-        tc = tool_call_acc[idx]
-        yield ToolCall(id=tc["id"], name=tc["name"], arguments=tc["arguments"])
+        item = _stream_event(event, pending)
+        if item is not None:
+            yield item
+
+    for idx in sorted(pending):
+        yield pending[idx].build()
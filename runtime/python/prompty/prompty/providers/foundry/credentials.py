@@ -0,0 +1,215 @@
+"""Shared Entra ID credential and token cache for Foundry connections.
+
+Building a ``DefaultAzureCredential`` walks the whole credential chain, and
+``get_bearer_token_provider`` may fetch a fresh token on first use. Doing
+that per request adds hundreds of milliseconds to every call.
+
+This module keeps one credential per tenant and one :class:`TokenProvider`
+per *(scope, tenant, credential factory)*. A provider:
+
+- returns the cached token while it is comfortably valid,
+- starts a background refresh once the token is inside the refresh
+  window, still returning the current (valid) token,
+- blocks only when there is no valid token at all,
+- lets exactly one caller fetch at a time (single-flight) — concurrent
+  callers wait for that fetch instead of starting their own.
+
+Each acquisition is reported through the tracer as an ``EntraIdToken``
+span with its latency. The token value itself is never traced.
+
+Token providers are plain callables returning a bearer string, so they can
+be passed anywhere the ``openai`` SDK accepts ``api_key`` /
+``azure_ad_token_provider`` callables. Async clients that await their
+token callable use :meth:`TokenProvider.acall`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ...tracing.tracer import Tracer
+
+__all__ = [
+    "TokenProvider",
+    "clear_token_providers",
+    "get_credential",
+    "get_token_provider",
+]
+
+_logger = logging.getLogger("prompty.credentials")
+
+# Refresh tokens this many seconds before they expire.
+DEFAULT_REFRESH_MARGIN = 300.0
+
+
+class TokenProvider:
+    """Caching, self-refreshing bearer-token callable for one scope.
+
+    Parameters
+    ----------
+    credential:
+        Any ``azure.core.credentials.TokenCredential`` (an object with
+        ``get_token(*scopes, tenant_id=...)`` returning ``AccessToken``),
+        or a zero-argument callable that builds one on first use.
+    scope:
+        The OAuth scope to request.
+    tenant_id:
+        Optional tenant passed through to ``get_token``.
+    refresh_margin:
+        Seconds before expiry at which a background refresh starts.
+    """
+
+    def __init__(
+        self,
+        credential: Any,
+        scope: str,
+        tenant_id: str | None = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+    ) -> None:
+        self._credential = credential
+        self.scope = scope
+        self.tenant_id = tenant_id
+        self.refresh_margin = refresh_margin
+        self._token: str | None = None
+        self._expires_on: float = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    @property
+    def credential(self) -> Any:
+        """The underlying credential, built on first access when lazy."""
+        if callable(self._credential) and not hasattr(self._credential, "get_token"):
+            self._credential = self._credential()
+        return self._credential
+
+    def __call__(self) -> str:
+        now = time.time()
+        token = self._token
+        if token is not None and now < self._expires_on:
+            if self._expires_on - now <= self.refresh_margin:
+                self._start_background_refresh()
+            return token
+        return self._refresh_blocking()
+
+    async def acall(self) -> str:
+        """Async variant for SDKs that await their token callable.
+
+        A cached token is returned without leaving the event loop; a blocking
+        fetch runs in a worker thread.
+        """
+        if self._token is not None and time.time() < self._expires_on:
+            return self()  # never blocks while a token is still valid
+        return await asyncio.to_thread(self)
+
+    def _refresh_blocking(self) -> str:
+        with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._token is not None and time.time() < self._expires_on:
+                return self._token
+            return self._fetch()
+
+    def _start_background_refresh(self) -> None:
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name="prompty-token-refresh", daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            with self._lock:
+                if self._expires_on - time.time() > self.refresh_margin:
+                    return
+                self._fetch()
+        except Exception:  # noqa: BLE001 — the current token stays valid; next call retries
+            _logger.debug("Background token refresh failed", exc_info=True)
+        finally:
+            with self._refresh_lock:
+                self._refreshing = False
+
+    def _fetch(self) -> str:
+        """Acquire a new token. Caller must hold ``self._lock``."""
+        started = time.perf_counter()
+        with Tracer.start("EntraIdToken") as t:
+            t("type", "auth")
+            t("signature", "prompty.foundry.get_token")
+            t("inputs", {"scope": self.scope, "tenant_id": self.tenant_id})
+            kwargs = {"tenant_id": self.tenant_id} if self.tenant_id else {}
+            access = self.credential.get_token(self.scope, **kwargs)
+            if not access or not access.token:
+                raise ValueError("DefaultAzureCredential did not return an access token.")
+            self._token = access.token
+            self._expires_on = float(access.expires_on)
+            t("result", {"expires_on": self._expires_on, "durationMs": (time.perf_counter() - started) * 1000})
+        return access.token
+
+
+_lock = threading.Lock()
+_credentials: dict[str | None, Any] = {}
+_providers: dict[tuple[str, str | None, Callable[[str | None], Any] | None], TokenProvider] = {}
+
+
+def _default_tenant() -> str | None:
+    return os.environ.get("AZURE_TENANT_ID") or None
+
+
+def get_credential(tenant_id: str | None = None) -> Any:
+    """Return the shared ``DefaultAzureCredential`` for *tenant_id*.
+
+    A tenant is added to the credential's ``additionally_allowed_tenants``,
+    so the tenant-specific ``get_token(..., tenant_id=...)`` requests of a
+    :class:`TokenProvider` are honoured.
+    """
+    with _lock:
+        credential = _credentials.get(tenant_id)
+        if credential is None:
+            from azure.identity import DefaultAzureCredential
+
+            kwargs = {"additionally_allowed_tenants": [tenant_id]} if tenant_id else {}
+            credential = DefaultAzureCredential(**kwargs)
+            _credentials[tenant_id] = credential
+        return credential
+
+
+def get_token_provider(
+    scope: str,
+    tenant_id: str | None = None,
+    *,
+    credential_factory: Callable[[str | None], Any] | None = None,
+) -> TokenProvider:
+    """Return the shared :class:`TokenProvider` for *(scope, tenant_id, credential_factory)*.
+
+    Parameters
+    ----------
+    scope:
+        The OAuth scope (e.g. ``"https://ai.azure.com/.default"``).
+    tenant_id:
+        Tenant to request tokens for. Defaults to ``AZURE_TENANT_ID``.
+    credential_factory:
+        Builds the credential for this key. Defaults to :func:`get_credential`.
+        It is only called when the first token is actually needed. Providers
+        are shared per factory object, so pass the same factory to share one.
+    """
+    tenant_id = tenant_id or _default_tenant()
+    key = (scope, tenant_id, credential_factory)
+    factory = credential_factory or get_credential
+    with _lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = TokenProvider(lambda: factory(tenant_id), scope, tenant_id)
+            _providers[key] = provider
+        return provider
+
+
+def clear_token_providers() -> None:
+    """Drop all cached credentials and token providers (useful for testing)."""
+    with _lock:
+        _credentials.clear()
+        _providers.clear()
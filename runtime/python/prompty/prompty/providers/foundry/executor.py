@@ -7,7 +7,8 @@ Uses ``AzureOpenAI`` from the ``openai`` package. Supports three connection mode
   :func:`prompty.register_connection`.
 - ``kind: foundry`` — Entra ID (DefaultAzureCredential) authentication via
   ``azure-identity``. No API key required; uses token-based auth with scope
-  ``https://cognitiveservices.azure.com/.default``.
+  ``https://ai.azure.com/.default``. Credentials and tokens are shared
+  process-wide (see :mod:`.credentials`).
 
 Registered as ``foundry`` in ``prompty.executors``.
 """
@@ -18,6 +19,7 @@ from typing import Any
 from urllib.parse import urlsplit, urlunsplit
 
 from ..._version import VERSION
+from ...core.client_pool import get_client_pool
 from ...core.connections import get_connection
 from ...model import (
     Agent,
@@ -27,6 +29,7 @@ from ...model import (
 )
 from ...tracing.tracer import Tracer, trace
 from ..openai.executor import _BaseExecutor
+from .credentials import get_token_provider
 
 __all__ = ["FoundryExecutor"]
 
@@ -34,6 +37,9 @@ _FOUNDRY_TOKEN_SCOPE = "https://ai.azure.com/.default"
 _FOUNDRY_SERVICES_HOST_SUFFIX = ".services.ai.azure.com"
 _AZURE_OPENAI_HOST_SUFFIX = ".openai.azure.com"
 
+# Environment variables the OpenAI SDK falls back to; rotating them builds a fresh pooled client.
+_CLIENT_ENV = ("AZURE_OPENAI_ENDPOINT", "OPENAI_BASE_URL")
+
 
 def _to_openai_base_url(endpoint: str) -> str:
     """Convert a Foundry project endpoint to an OpenAI/v1 base URL."""
@@ -67,34 +73,24 @@ class FoundryExecutor(_BaseExecutor):
     @trace
     def execute(self, agent: Agent, data: Any) -> Any:
         client = self._resolve_client(agent)
-        api_type = agent.model.api_type or "chat"
-
-        if api_type == "chat":
-            return self._execute_chat(client, agent, data)
-        elif api_type == "embedding":
-            return self._execute_embedding(client, agent, data)
-        elif api_type == "image":
-            return self._execute_image(client, agent, data)
-        elif api_type == "responses":
-            return self._execute_responses(client, agent, data)
-        else:
-            raise ValueError(f"Unsupported apiType: {api_type}")
+        pool = get_client_pool()
+        try:
+            response = self._dispatch(client, agent, data)
+        except BaseException:
+            pool.release(client)
+            raise
+        return pool.release_after(client, response)
 
     @trace
     async def execute_async(self, agent: Agent, data: Any) -> Any:
         client = self._resolve_client_async(agent)
-        api_type = agent.model.api_type or "chat"
-
-        if api_type == "chat":
-            return await self._execute_chat_async(client, agent, data)
-        elif api_type == "embedding":
-            return await self._execute_embedding_async(client, agent, data)
-        elif api_type == "image":
-            return await self._execute_image_async(client, agent, data)
-        elif api_type == "responses":
-            return await self._execute_responses_async(client, agent, data)
-        else:
-            raise ValueError(f"Unsupported apiType: {api_type}")
+        pool = get_client_pool()
+        try:
+            response = await self._dispatch_async(client, agent, data)
+        except BaseException:
+            pool.release(client)
+            raise
+        return pool.release_after(client, response)
 
     def _resolve_client(self, agent: Agent) -> Any:
         """Resolve the sync Azure OpenAI client from connection config."""
@@ -149,17 +145,27 @@ class FoundryExecutor(_BaseExecutor):
         if conn.endpoint:
             kwargs["azure_endpoint"] = conn.endpoint
 
-        with Tracer.start("AzureOpenAI") as t:
-            t("type", "LLM")
-            t("signature", "AzureOpenAI.ctor")
-            client = AzureOpenAI(
-                default_headers={
-                    "User-Agent": f"prompty/{VERSION}",
-                    "x-ms-useragent": f"prompty/{VERSION}",
-                },
-                **kwargs,
-            )
-        return client
+        def build() -> Any:
+            with Tracer.start("AzureOpenAI") as t:
+                t("type", "LLM")
+                t("signature", "AzureOpenAI.ctor")
+                return AzureOpenAI(
+                    default_headers={
+                        "User-Agent": f"prompty/{VERSION}",
+                        "x-ms-useragent": f"prompty/{VERSION}",
+                    },
+                    **kwargs,
+                )
+
+        return get_client_pool().get_or_create(
+            "foundry",
+            AzureOpenAI,
+            build,
+            endpoint=conn.endpoint,
+            credential=conn.api_key,
+            is_async=False,
+            env=_CLIENT_ENV,
+        )
 
     def _build_async_client_from_key(self, conn: ApiKeyConnection) -> Any:
         """Build an async AsyncAzureOpenAI client from an ApiKeyConnection."""
@@ -180,66 +186,94 @@ class FoundryExecutor(_BaseExecutor):
         if conn.endpoint:
             kwargs["azure_endpoint"] = conn.endpoint
 
-        with Tracer.start("AsyncAzureOpenAI") as t:
-            t("type", "LLM")
-            t("signature", "AsyncAzureOpenAI.ctor")
-            client = AsyncAzureOpenAI(
-                default_headers={
-                    "User-Agent": f"prompty/{VERSION}",
-                    "x-ms-useragent": f"prompty/{VERSION}",
-                },
-                **kwargs,
-            )
-        return client
+        def build() -> Any:
+            with Tracer.start("AsyncAzureOpenAI") as t:
+                t("type", "LLM")
+                t("signature", "AsyncAzureOpenAI.ctor")
+                return AsyncAzureOpenAI(
+                    default_headers={
+                        "User-Agent": f"prompty/{VERSION}",
+                        "x-ms-useragent": f"prompty/{VERSION}",
+                    },
+                    **kwargs,
+                )
+
+        return get_client_pool().get_or_create(
+            "foundry",
+            AsyncAzureOpenAI,
+            build,
+            endpoint=conn.endpoint,
+            credential=conn.api_key,
+            is_async=True,
+            env=_CLIENT_ENV,
+        )
 
     def _build_client_from_entra(self, conn: FoundryConnection, agent: Agent) -> Any:
         """Build a sync AzureOpenAI client using Entra ID (DefaultAzureCredential)."""
-        from azure.identity import DefaultAzureCredential, get_bearer_token_provider
         from openai import OpenAI
 
-        credential = DefaultAzureCredential()
-        token_provider = get_bearer_token_provider(credential, _FOUNDRY_TOKEN_SCOPE)
-
-        kwargs: dict[str, Any] = {
-            "api_key": token_provider,
-        }
-        if conn.endpoint:
-            kwargs["base_url"] = _to_openai_base_url(conn.endpoint)
-
-        with Tracer.start("OpenAI(FoundryEntraID)") as t:
-            t("type", "LLM")
-            t("signature", "OpenAI.ctor(FoundryEntraID)")
-            client = OpenAI(
-                default_headers={
-                    "User-Agent": f"prompty/{VERSION}",
-                    "x-ms-useragent": f"prompty/{VERSION}",
-                },
-                **kwargs,
-            )
-        return client
+        base_url = _to_openai_base_url(conn.endpoint) if conn.endpoint else None
+        token_provider = get_token_provider(_FOUNDRY_TOKEN_SCOPE)
+
+        def build() -> Any:
+            kwargs: dict[str, Any] = {
+                "api_key": token_provider,
+            }
+            if base_url:
+                kwargs["base_url"] = base_url
+
+            with Tracer.start("OpenAI(FoundryEntraID)") as t:
+                t("type", "LLM")
+                t("signature", "OpenAI.ctor(FoundryEntraID)")
+                return OpenAI(
+                    default_headers={
+                        "User-Agent": f"prompty/{VERSION}",
+                        "x-ms-useragent": f"prompty/{VERSION}",
+                    },
+                    **kwargs,
+                )
+
+        return get_client_pool().get_or_create(
+            "foundry-entra",
+            OpenAI,
+            build,
+            endpoint=base_url,
+            credential=token_provider,
+            is_async=False,
+            env=_CLIENT_ENV,
+        )
 
     def _build_async_client_from_entra(self, conn: FoundryConnection, agent: Agent) -> Any:
         """Build an async AsyncAzureOpenAI client using Entra ID (DefaultAzureCredential)."""
-        from azure.identity import DefaultAzureCredential, get_bearer_token_provider
         from openai import AsyncOpenAI
 
-        credential = DefaultAzureCredential()
-        token_provider = get_bearer_token_provider(credential, _FOUNDRY_TOKEN_SCOPE)
-
-        kwargs: dict[str, Any] = {
-            "api_key": token_provider,
-        }
-        if conn.endpoint:
-            kwargs["base_url"] = _to_openai_base_url(conn.endpoint)
-
-        with Tracer.start("AsyncOpenAI(FoundryEntraID)") as t:
-            t("type", "LLM")
-            t("signature", "AsyncOpenAI.ctor(FoundryEntraID)")
-            client = AsyncOpenAI(
-                default_headers={
-                    "User-Agent": f"prompty/{VERSION}",
-                    "x-ms-useragent": f"prompty/{VERSION}",
-                },
-                **kwargs,
-            )
-        return client
+        base_url = _to_openai_base_url(conn.endpoint) if conn.endpoint else None
+        token_provider = get_token_provider(_FOUNDRY_TOKEN_SCOPE)
+
+        def build() -> Any:
+            kwargs: dict[str, Any] = {
+                "api_key": token_provider.acall,
+            }
+            if base_url:
+                kwargs["base_url"] = base_url
+
+            with Tracer.start("AsyncOpenAI(FoundryEntraID)") as t:
+                t("type", "LLM")
+                t("signature", "AsyncOpenAI.ctor(FoundryEntraID)")
+                return AsyncOpenAI(
+                    default_headers={
+                        "User-Agent": f"prompty/{VERSION}",
+                        "x-ms-useragent": f"prompty/{VERSION}",
+                    },
+                    **kwargs,
+                )
+
+        return get_client_pool().get_or_create(
+            "foundry-entra",
+            AsyncOpenAI,
+            build,
+            endpoint=base_url,
+            credential=token_provider,
+            is_async=True,
+            env=_CLIENT_ENV,
+        )
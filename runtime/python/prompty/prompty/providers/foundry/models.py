@@ -25,6 +25,7 @@ from ...model import (
     ModelInfo,
     ReferenceConnection,
 )
+from .credentials import get_token_provider
 
 __all__ = ["list_models", "list_models_async"]
 
@@ -45,11 +46,9 @@ def _build_sync_client(connection: Connection) -> Any:
         return get_connection(connection.name)
 
     if isinstance(connection, FoundryConnection):
-        from azure.identity import DefaultAzureCredential, get_bearer_token_provider
         from openai import AzureOpenAI
 
-        credential = DefaultAzureCredential()
-        token_provider = get_bearer_token_provider(credential, _COGNITIVE_SERVICES_SCOPE)
+        token_provider = get_token_provider(_COGNITIVE_SERVICES_SCOPE)
         kwargs: dict[str, Any] = {"azure_ad_token_provider": token_provider, "api_version": "2024-12-01-preview"}
         if connection.endpoint:
             kwargs["azure_endpoint"] = connection.endpoint
@@ -77,12 +76,10 @@ def _build_async_client(connection: Connection) -> Any:
         return get_connection(connection.name)
 
     if isinstance(connection, FoundryConnection):
-        from azure.identity.aio import DefaultAzureCredential, get_bearer_token_provider
         from openai import AsyncAzureOpenAI
 
-        credential = DefaultAzureCredential()
-        token_provider = get_bearer_token_provider(credential, _COGNITIVE_SERVICES_SCOPE)
-        kwargs: dict[str, Any] = {"azure_ad_token_provider": token_provider, "api_version": "2024-12-01-preview"}
+        token_provider = get_token_provider(_COGNITIVE_SERVICES_SCOPE)
+        kwargs: dict[str, Any] = {"azure_ad_token_provider": token_provider.acall, "api_version": "2024-12-01-preview"}
         if connection.endpoint:
             kwargs["azure_endpoint"] = connection.endpoint
         return AsyncAzureOpenAI(**kwargs)
@@ -190,17 +187,7 @@ def _list_foundry_deployments(project_endpoint: str, get_token: Callable[[], str
 def _build_foundry_deployment_client(connection: FoundryConnection) -> dict[str, Any]:
     if not connection.endpoint:
         raise ValueError("FoundryConnection requires a non-empty endpoint to list deployments.")
-    from azure.identity import DefaultAzureCredential
-
-    credential = DefaultAzureCredential()
-
-    def get_token() -> str:
-        token = credential.get_token(_AI_SCOPE)
-        if not token or not token.token:
-            raise ValueError("DefaultAzureCredential did not return an access token.")
-        return token.token
-
-    return {"project_endpoint": connection.endpoint, "get_token": get_token}
+    return {"project_endpoint": connection.endpoint, "get_token": get_token_provider(_AI_SCOPE)}
 
 
 def _map_model(m: Any) -> ModelInfo:
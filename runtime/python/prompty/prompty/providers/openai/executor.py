@@ -13,7 +13,9 @@ from __future__ import annotations
 from typing import Any
 
 from ..._version import VERSION
+from ...core.client_pool import get_client_pool
 from ...core.connections import get_connection
+from ...core.tool_index import tool_index
 from ...core.types import (
     AsyncPromptyStream,
     AudioPart,
@@ -24,6 +26,7 @@ from ...core.types import (
     PromptyStream,
     TextPart,
 )
+from ...core.wire_cache import cached_wire
 from ...model import (
     Agent,
     ApiKeyConnection,
@@ -33,6 +36,9 @@ from ...tracing.tracer import Tracer, trace
 
 __all__ = ["OpenAIExecutor", "_BaseExecutor"]
 
+# Environment variables the OpenAI SDK falls back to; rotating them builds a fresh pooled client.
+_CLIENT_ENV = ("OPENAI_API_KEY", "OPENAI_BASE_URL", "OPENAI_ORG_ID", "OPENAI_PROJECT_ID")
+
 
 # ---------------------------------------------------------------------------
 # Wire format mapping (shared with Azure executor)
@@ -100,13 +106,20 @@ def _audio_format(media_type: str | None) -> str:
 def _tools_to_wire(agent: Agent) -> list[dict[str, Any]] | None:
     """Convert agent tools to OpenAI function tool format.
 
-    Supports ``kind: function`` (direct schema).
+    Supports ``kind: function`` (direct schema). The schemas are built once
+    per agent and reused from its :func:`~prompty.core.tool_index.tool_index`.
     """
     if not agent.tools:
         return None
 
+    wire_tools = tool_index(agent).wire("openai.chat", _chat_tools_to_wire)
+    return list(wire_tools) if wire_tools else None
+
+
+def _chat_tools_to_wire(tools: tuple[Any, ...]) -> list[dict[str, Any]]:
+    """Build Chat Completions function tools (``{type, function: {...}}``)."""
     wire_tools: list[dict[str, Any]] = []
-    for tool in agent.tools:
+    for tool in tools:
         kind = getattr(tool, "kind", None)
 
         if kind == "function":
@@ -125,7 +138,7 @@ def _tools_to_wire(agent: Agent) -> list[dict[str, Any]] | None:
                     func_def["parameters"]["additionalProperties"] = False
             wire_tools.append({"type": "function", "function": func_def})
 
-    return wire_tools if wire_tools else None
+    return wire_tools
 
 
 def _schema_to_wire(properties: list, *, strict: bool = False) -> dict[str, Any]:
@@ -304,12 +317,19 @@ def _responses_tools_to_wire(agent: Agent) -> list[dict[str, Any]] | None:
 
     Unlike Chat Completions (``{type: "function", function: {...}}``),
     the Responses API uses a flat structure: ``{type: "function", name: ..., parameters: ...}``.
+    Cached per agent like :func:`_tools_to_wire`.
     """
     if not agent.tools:
         return None
 
+    wire_tools = tool_index(agent).wire("openai.responses", _flat_tools_to_wire)
+    return list(wire_tools) if wire_tools else None
+
+
+def _flat_tools_to_wire(tools: tuple[Any, ...]) -> list[dict[str, Any]]:
+    """Build Responses API function tools (``{type, name, parameters, ...}``)."""
     wire_tools: list[dict[str, Any]] = []
-    for tool in agent.tools:
+    for tool in tools:
         kind = getattr(tool, "kind", None)
 
         if kind == "function":
@@ -327,7 +347,7 @@ def _responses_tools_to_wire(agent: Agent) -> list[dict[str, Any]] | None:
                     tool_def["parameters"]["additionalProperties"] = False
             wire_tools.append(tool_def)
 
-    return wire_tools if wire_tools else None
+    return wire_tools
 
 
 def _output_schema_to_responses_wire(agent: Agent) -> dict[str, Any] | None:
@@ -404,6 +424,36 @@ class _BaseExecutor:
 
     _trace_prefix: str = "OpenAI"
 
+    def _dispatch(self, client: Any, agent: Agent, data: Any) -> Any:
+        """Call the API for the agent's ``apiType`` with *client*."""
+        api_type = agent.model.api_type or "chat"
+
+        if api_type == "chat":
+            return self._execute_chat(client, agent, data)
+        elif api_type == "embedding":
+            return self._execute_embedding(client, agent, data)
+        elif api_type == "image":
+            return self._execute_image(client, agent, data)
+        elif api_type == "responses":
+            return self._execute_responses(client, agent, data)
+        else:
+            raise ValueError(f"Unsupported apiType: {api_type}")
+
+    async def _dispatch_async(self, client: Any, agent: Agent, data: Any) -> Any:
+        """Async counterpart of :meth:`_dispatch`."""
+        api_type = agent.model.api_type or "chat"
+
+        if api_type == "chat":
+            return await self._execute_chat_async(client, agent, data)
+        elif api_type == "embedding":
+            return await self._execute_embedding_async(client, agent, data)
+        elif api_type == "image":
+            return await self._execute_image_async(client, agent, data)
+        elif api_type == "responses":
+            return await self._execute_responses_async(client, agent, data)
+        else:
+            raise ValueError(f"Unsupported apiType: {api_type}")
+
     # -- Chat ---------------------------------------------------------------
 
     def _execute_chat(self, client: Any, agent: Agent, messages: Any) -> Any:
@@ -479,7 +529,7 @@ class _BaseExecutor:
     def _build_chat_args(self, agent: Agent, messages: list[Message]) -> dict[str, Any]:
         """Build the full arguments dict for chat.completions.create."""
         model = agent.model.id or "gpt-4"
-        wire_messages = [_message_to_wire(m) for m in messages]
+        wire_messages = [cached_wire(m, "openai.chat", _message_to_wire) for m in messages]
         args: dict[str, Any] = {
             "model": model,
             "messages": wire_messages,
@@ -569,7 +619,7 @@ class _BaseExecutor:
             if msg.role in ("system", "developer"):
                 system_parts.append(msg.text)
             else:
-                input_messages.append(_message_to_responses_input(msg))
+                input_messages.append(cached_wire(msg, "openai.responses", _message_to_responses_input))
 
         args: dict[str, Any] = {
             "model": model,
@@ -690,34 +740,24 @@ class OpenAIExecutor(_BaseExecutor):
     @trace
     def execute(self, agent: Agent, data: Any) -> Any:
         client = self._resolve_client(agent)
-        api_type = agent.model.api_type or "chat"
-
-        if api_type == "chat":
-            return self._execute_chat(client, agent, data)
-        elif api_type == "embedding":
-            return self._execute_embedding(client, agent, data)
-        elif api_type == "image":
-            return self._execute_image(client, agent, data)
-        elif api_type == "responses":
-            return self._execute_responses(client, agent, data)
-        else:
-            raise ValueError(f"Unsupported apiType: {api_type}")
+        pool = get_client_pool()
+        try:
+            response = self._dispatch(client, agent, data)
+        except BaseException:
+            pool.release(client)
+            raise
+        return pool.release_after(client, response)
 
     @trace
     async def execute_async(self, agent: Agent, data: Any) -> Any:
         client = self._resolve_client_async(agent)
-        api_type = agent.model.api_type or "chat"
-
-        if api_type == "chat":
-            return await self._execute_chat_async(client, agent, data)
-        elif api_type == "embedding":
-            return await self._execute_embedding_async(client, agent, data)
-        elif api_type == "image":
-            return await self._execute_image_async(client, agent, data)
-        elif api_type == "responses":
-            return await self._execute_responses_async(client, agent, data)
-        else:
-            raise ValueError(f"Unsupported apiType: {api_type}")
+        pool = get_client_pool()
+        try:
+            response = await self._dispatch_async(client, agent, data)
+        except BaseException:
+            pool.release(client)
+            raise
+        return pool.release_after(client, response)
 
     def _resolve_client(self, agent: Agent) -> Any:
         """Resolve the sync OpenAI client from connection config."""
@@ -729,17 +769,28 @@ class OpenAIExecutor(_BaseExecutor):
             return get_connection(conn.name)
 
         kwargs = self._client_kwargs(agent)
-        with Tracer.start("OpenAI") as t:
-            t("type", "LLM")
-            t("signature", "OpenAI.ctor")
-            client = OpenAI(
-                default_headers={
-                    "User-Agent": f"prompty/{VERSION}",
-                    "x-ms-useragent": f"prompty/{VERSION}",
-                },
-                **kwargs,
-            )
-        return client
+
+        def build() -> Any:
+            with Tracer.start("OpenAI") as t:
+                t("type", "LLM")
+                t("signature", "OpenAI.ctor")
+                return OpenAI(
+                    default_headers={
+                        "User-Agent": f"prompty/{VERSION}",
+                        "x-ms-useragent": f"prompty/{VERSION}",
+                    },
+                    **kwargs,
+                )
+
+        return get_client_pool().get_or_create(
+            "openai",
+            OpenAI,
+            build,
+            endpoint=kwargs.get("base_url"),
+            credential=kwargs.get("api_key"),
+            is_async=False,
+            env=_CLIENT_ENV,
+        )
 
     def _resolve_client_async(self, agent: Agent) -> Any:
         """Resolve the async OpenAI client from connection config."""
@@ -751,17 +802,28 @@ class OpenAIExecutor(_BaseExecutor):
             return get_connection(conn.name)
 
         kwargs = self._client_kwargs(agent)
-        with Tracer.start("AsyncOpenAI") as t:
-            t("type", "LLM")
-            t("signature", "AsyncOpenAI.ctor")
-            client = AsyncOpenAI(
-                default_headers={
-                    "User-Agent": f"prompty/{VERSION}",
-                    "x-ms-useragent": f"prompty/{VERSION}",
-                },
-                **kwargs,
-            )
-        return client
+
+        def build() -> Any:
+            with Tracer.start("AsyncOpenAI") as t:
+                t("type", "LLM")
+                t("signature", "AsyncOpenAI.ctor")
+                return AsyncOpenAI(
+                    default_headers={
+                        "User-Agent": f"prompty/{VERSION}",
+                        "x-ms-useragent": f"prompty/{VERSION}",
+                    },
+                    **kwargs,
+                )
+
+        return get_client_pool().get_or_create(
+            "openai",
+            AsyncOpenAI,
+            build,
+            endpoint=kwargs.get("base_url"),
+            credential=kwargs.get("api_key"),
+            is_async=True,
+            env=_CLIENT_ENV,
+        )
 
     def _client_kwargs(self, agent: Agent) -> dict[str, Any]:
         """Extract client constructor kwargs from an ApiKeyConnection."""
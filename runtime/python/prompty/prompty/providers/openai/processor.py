@@ -234,16 +234,96 @@ def _process_responses_api(response: Any, agent: Agent | None = None) -> Any:
     return response
 
 
+class _PendingToolCall:
+    """A streamed tool call whose argument fragments are still arriving."""
+
+    __slots__ = ("id", "name", "chunks")
+
+    def __init__(self, id: str = "", name: str = "") -> None:
+        self.id = id
+        self.name = name
+        self.chunks: list[str] = []
+
+    def arguments_complete(self) -> bool:
+        """``True`` once the fragments so far form a complete JSON value."""
+        try:
+            json.loads("".join(self.chunks))
+        except ValueError:
+            return False
+        return True
+
+    def build(self) -> ToolCall:
+        return ToolCall(id=self.id, name=self.name, arguments="".join(self.chunks))
+
+
+class _ToolCallAssembler:
+    """Fold streamed ``delta.tool_calls`` entries into complete tool calls.
+
+    Calls normally stream one after another, so when a new index starts,
+    the pending calls before it are finished if their arguments already
+    parse as JSON. They are released in index order, stopping at the first
+    one that is not (interleaved streams then complete at end of stream).
+
+    Some OpenAI-compatible servers send a trailing empty (or id-only) delta
+    for an earlier index; those are ignored once the call is released. A
+    real argument fragment after release means the call was already handed
+    out with truncated arguments, so it raises ``ValueError`` rather than
+    dropping model output.
+    """
+
+    __slots__ = ("pending", "released")
+
+    def __init__(self) -> None:
+        self.pending: dict[int, _PendingToolCall] = {}
+        self.released: set[int] = set()
+
+    def add(self, tc_delta: Any) -> list[ToolCall]:
+        """Apply one delta; return the calls it completed."""
+        idx = tc_delta.index
+        function = tc_delta.function if hasattr(tc_delta, "function") and tc_delta.function else None
+        arguments = function.arguments if function is not None and function.arguments else ""
+        if idx in self.released:
+            if arguments.strip():
+                raise ValueError(
+                    f"Tool call at index {idx} received more arguments after it was already "
+                    f"complete JSON and had been dispatched: {arguments!r}"
+                )
+            return []
+
+        call = self.pending.get(idx)
+        completed: list[ToolCall] = []
+        if call is None:
+            for prev in list(self.pending):
+                if not self.pending[prev].arguments_complete():
+                    break
+                completed.append(self.pending.pop(prev).build())
+                self.released.add(prev)
+            call = self.pending[idx] = _PendingToolCall()
+        if tc_delta.id:
+            call.id = tc_delta.id
+        if function is not None and function.name:
+            call.name = function.name
+        if arguments:
+            call.chunks.append(arguments)
+        return completed
+
+    def finish(self) -> list[ToolCall]:
+        """Return the calls still pending at the end of the stream, in index order."""
+        return [self.pending[idx].build() for idx in sorted(self.pending)]
+
+
 def _stream_generator(response: Any) -> Iterator[str | ToolCall]:
     """Yield content chunks, tool calls, or refusals from a streaming response.
 
     Handles three types of streaming deltas:
     - ``delta.content`` — yields content strings
-    - ``delta.tool_calls`` — accumulates partial tool call chunks,
-      yields ``ToolCall`` objects when the stream ends
+    - ``delta.tool_calls`` — accumulates partial tool call chunks and yields
+      each ``ToolCall`` as soon as it is complete (see
+      :class:`_ToolCallAssembler`), so callers can start executing it
+      while the rest of the response streams; the remainder at stream end
     - ``delta.refusal`` — raises ``ValueError`` with the refusal message
     """
-    tool_call_acc: dict[int, dict[str, str]] = {}
+    tool_calls = _ToolCallAssembler()
 
     for chunk in response:
         if not hasattr(chunk, "choices") or not chunk.choices:
@@ -258,25 +338,14 @@ def _stream_generator(response: Any) -> Iterator[str | ToolCall]:
         # Tool call deltas — accumulate index-keyed partial chunks
         if hasattr(delta, "tool_calls") and delta.tool_calls:
             for tc_delta in delta.tool_calls:
-                idx = tc_delta.index
-                if idx not in tool_call_acc:
-                    tool_call_acc[idx] = {"id": "", "name": "", "arguments": ""}
-                if tc_delta.id:
-                    tool_call_acc[idx]["id"] = tc_delta.id
-                if hasattr(tc_delta, "function") and tc_delta.function:
-                    if tc_delta.function.name:
-                        tool_call_acc[idx]["name"] = tc_delta.function.name
-                    if tc_delta.function.arguments:
-                        tool_call_acc[idx]["arguments"] += tc_delta.function.arguments
+                yield from tool_calls.add(tc_delta)
 
         # Refusal
         if hasattr(delta, "refusal") and delta.refusal is not None:
             raise ValueError(f"Model refused: {delta.refusal}")
 
-    # Yield accumulated tool calls at the end of the stream
-    for idx in sorted(tool_call_acc):
-        tc = tool_call_acc[idx]
-        yield ToolCall(id=tc["id"], name=tc["name"], arguments=tc["arguments"])
+    # Yield the remaining tool calls at the end of the stream
+    yield from tool_calls.finish()
 
 
 async def _async_stream_generator(response: Any) -> AsyncIterator[str | ToolCall]:
@@ -284,7 +353,7 @@ async def _async_stream_generator(response: Any) -> AsyncIterator[str | ToolCall
 
     Async variant of :func:`_stream_generator`.
     """
-    tool_call_acc: dict[int, dict[str, str]] = {}
+    tool_calls = _ToolCallAssembler()
 
     async for chunk in response:
         if not hasattr(chunk, "choices") or not chunk.choices:
@@ -297,20 +366,11 @@ async def _async_stream_generator(response: Any) -> AsyncIterator[str | ToolCall
 
         if hasattr(delta, "tool_calls") and delta.tool_calls:
             for tc_delta in delta.tool_calls:
-                idx = tc_delta.index
-                if idx not in tool_call_acc:
-                    tool_call_acc[idx] = {"id": "", "name": "", "arguments": ""}
-                if tc_delta.id:
-                    tool_call_acc[idx]["id"] = tc_delta.id
-                if hasattr(tc_delta, "function") and tc_delta.function:
-                    if tc_delta.function.name:
-                        tool_call_acc[idx]["name"] = tc_delta.function.name
-                    if tc_delta.function.arguments:
-                        tool_call_acc[idx]["arguments"] += tc_delta.function.arguments
+                for call in tool_calls.add(tc_delta):
+                    yield call
 
         if hasattr(delta, "refusal") and delta.refusal is not None:
             raise ValueError(f"Model refused: {delta.refusal}")
 
-    for idx in sorted(tool_call_acc):
-        tc = tool_call_acc[idx]
-        yield ToolCall(id=tc["id"], name=tc["name"], arguments=tc["arguments"])
+    for call in tool_calls.finish():
+        yield call
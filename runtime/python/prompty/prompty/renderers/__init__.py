@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from ._common import THREAD_NONCE_PREFIX
 from .jinja2 import Jinja2Renderer
+from .jinja_subset import JinjaSubsetRenderer
 from .mustache import MustacheRenderer
 
-__all__ = ["Jinja2Renderer", "MustacheRenderer", "THREAD_NONCE_PREFIX"]
+__all__ = ["Jinja2Renderer", "JinjaSubsetRenderer", "MustacheRenderer", "THREAD_NONCE_PREFIX"]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 import secrets
 import threading
 from typing import Any
@@ -9,7 +10,7 @@ from typing import Any
 from ..core.types import RICH_KINDS
 from ..model import Agent
 
-__all__ = ["THREAD_NONCE_PREFIX", "_prepare_render_inputs", "_thread_nonces_local"]
+__all__ = ["THREAD_NONCE_PREFIX", "_MarkerIndex", "_prepare_render_inputs", "_thread_nonces_local"]
 
 # Prefix used to identify nonce markers in rendered output.
 THREAD_NONCE_PREFIX = "__PROMPTY_THREAD_"
@@ -52,3 +53,52 @@ def _prepare_render_inputs(
         render_inputs[name] = marker
 
     return render_inputs, nonces
+
+
+class _MarkerIndex:
+    """Finds every nonce marker of one render in a single pass over a text.
+
+    Markers made by :func:`_prepare_render_inputs` share
+    :data:`THREAD_NONCE_PREFIX` and are indexed by their
+    ``<prefix><nonce>_`` head, so a scan is ``str.find`` for the prefix plus
+    a dict lookup per hit — no per-render regex to compile. If any marker
+    has another shape, all of them are matched with one alternation regex.
+    """
+
+    __slots__ = ("_heads", "_names", "_regex")
+
+    def __init__(self, nonces: dict[str, str]) -> None:
+        self._names = nonces
+        self._heads: dict[str, list[tuple[str, str]]] = {}
+        self._regex: re.Pattern[str] | None = None
+        start = len(THREAD_NONCE_PREFIX)
+        for marker, name in nonces.items():
+            sep = marker.find("_", start) if marker.startswith(THREAD_NONCE_PREFIX) else -1
+            if sep == -1:
+                # Longest first, so a marker that prefixes another cannot shadow it
+                ordered = sorted(nonces, key=len, reverse=True)
+                self._regex = re.compile("|".join(re.escape(m) for m in ordered))
+                return
+            self._heads.setdefault(marker[: sep + 1], []).append((marker, name))
+        for candidates in self._heads.values():
+            candidates.sort(key=lambda c: len(c[0]), reverse=True)
+
+    def find(self, text: str) -> list[tuple[int, int, str]]:
+        """Return ``(start, end, input_name)`` for each marker in *text*, in order."""
+        if self._regex is not None:
+            return [(m.start(), m.end(), self._names[m.group()]) for m in self._regex.finditer(text)]
+        found: list[tuple[int, int, str]] = []
+        skip = len(THREAD_NONCE_PREFIX)
+        i = text.find(THREAD_NONCE_PREFIX)
+        while i != -1:
+            sep = text.find("_", i + skip)
+            if sep == -1:
+                break
+            nxt = i + 1
+            for marker, name in self._heads.get(text[i : sep + 1], ()):
+                if text.startswith(marker, i):
+                    found.append((i, i + len(marker), name))
+                    nxt = i + len(marker)
+                    break
+            i = text.find(THREAD_NONCE_PREFIX, nxt)
+        return found
@@ -2,18 +2,33 @@
 
 Renders Jinja2 templates in a sandboxed environment.
 Registered as ``jinja2`` in ``prompty.renderers``.
+
+Each renderer instance owns a single sandboxed environment and a bounded
+LRU of compiled templates keyed by a hash of the template source, so a
+prompt that is rendered repeatedly is only compiled once.
 """
 
 from __future__ import annotations
 
+import hashlib
+import threading
 from typing import Any
 
+from ..core.cache import CacheInfo, LRUCache
 from ..model import Agent
 from ..tracing.tracer import trace
 from ._common import _prepare_render_inputs, _thread_nonces_local
 
 __all__ = ["Jinja2Renderer"]
 
+# Default number of compiled templates kept per renderer.
+DEFAULT_TEMPLATE_CACHE_SIZE = 256
+
+
+def _template_key(template: str) -> str:
+    """Content hash used as the compiled-template cache key."""
+    return hashlib.blake2b(template.encode("utf-8"), digest_size=16).hexdigest()
+
 
 class Jinja2Renderer:
     """Renders Jinja2 templates in a sandboxed environment.
@@ -21,8 +36,20 @@ class Jinja2Renderer:
     When thread-kind inputs are present, emits nonce markers at
     the template variable positions so that ``prepare()`` can
     insert ``ThreadMarker`` objects at the correct location.
+
+    Compiled templates are cached per instance; use :meth:`cache_info`
+    to inspect hit/miss/eviction counters and :meth:`clear` to drop them.
+
+    Args:
+        cache_size: Maximum number of compiled templates to keep.
+            ``0`` disables the cache.
     """
 
+    def __init__(self, cache_size: int = DEFAULT_TEMPLATE_CACHE_SIZE) -> None:
+        self._env: Any = None
+        self._env_lock = threading.Lock()
+        self._templates: LRUCache[str, Any] = LRUCache(cache_size)
+
     @trace
     def render(
         self,
@@ -32,22 +59,30 @@ class Jinja2Renderer:
     ) -> str:
         return self._render(agent, template, inputs)
 
+    def _environment(self) -> Any:
+        """Return the shared sandboxed environment, creating it on first use."""
+        if self._env is None:
+            with self._env_lock:
+                if self._env is None:
+                    from jinja2.sandbox import ImmutableSandboxedEnvironment
+
+                    self._env = ImmutableSandboxedEnvironment(keep_trailing_newline=True)
+        return self._env
+
+    def _compile(self, template: str) -> Any:
+        """Return the compiled ``jinja2.Template`` for *template*, using the cache."""
+        env = self._environment()
+        return self._templates.get_or_create(_template_key(template), lambda: env.from_string(template))
+
     def _render(
         self,
         agent: Agent,
         template: str,
         inputs: dict[str, Any],
     ) -> str:
-        from jinja2 import DictLoader
-        from jinja2.sandbox import ImmutableSandboxedEnvironment
-
         render_inputs, thread_nonces = _prepare_render_inputs(agent, inputs)
 
-        env = ImmutableSandboxedEnvironment(
-            loader=DictLoader({"prompt": template}),
-            keep_trailing_newline=True,
-        )
-        t = env.get_template("prompt")
+        t = self._compile(template)
         rendered = t.render(**render_inputs)
 
         # Stash the nonce mapping on thread-local for prepare() to retrieve
@@ -63,3 +98,11 @@ class Jinja2Renderer:
         inputs: dict[str, Any],
     ) -> str:
         return self._render(agent, template, inputs)
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit/miss/eviction counters for the compiled-template cache."""
+        return self._templates.info()
+
+    def clear(self) -> None:
+        """Drop all compiled templates and reset the cache counters."""
+        self._templates.clear()
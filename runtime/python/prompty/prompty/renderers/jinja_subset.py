@@ -0,0 +1,100 @@
+"""Prompty Jinja subset renderer.
+
+Renders templates with the owned Jinja subset (:mod:`prompty.jinja_subset`).
+Registered as ``jinja_subset`` in ``prompty.renderers``.
+
+Besides the flat-string :meth:`~JinjaSubsetRenderer.render` every renderer
+provides, it implements :meth:`~JinjaSubsetRenderer.render_segments`, which
+returns the provenance-tagged segment list (``spec/jinja-grammar.md`` §7).
+When the parser implements ``parse_segments()`` (the built-in ``prompty``
+parser does), ``prepare()`` builds messages straight from those segments:
+no strict-mode nonce in the template, no re-split of the flat string, and no
+scan for rich-input markers afterwards.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ..core.types import RICH_KINDS
+from ..jinja_subset import Segment, compile_template
+from ..model import Agent
+from ..tracing.tracer import trace
+from ._common import THREAD_NONCE_PREFIX, _prepare_render_inputs, _thread_nonces_local
+
+__all__ = ["JinjaSubsetRenderer"]
+
+
+def _rich_placeholder(name: str) -> str:
+    # Only ever compared against interp segments whose source is ``name``, so
+    # it needs to be truthy and recognizable, not secret.
+    return f"{THREAD_NONCE_PREFIX}{name}__"
+
+
+class JinjaSubsetRenderer:
+    """Renders templates with the Prompty Jinja subset.
+
+    ``render()`` emits nonce markers for rich-kind inputs, like
+    :class:`~prompty.renderers.Jinja2Renderer`. ``render_segments()``
+    instead emits a ``rich`` segment (``source`` = input name, empty text)
+    wherever a rich input is interpolated as a bare ``{{ name }}``.
+
+    Compiled templates are shared through
+    :func:`prompty.jinja_subset.compile_template`'s LRU.
+    """
+
+    @trace
+    def render(
+        self,
+        agent: Agent,
+        template: str,
+        inputs: dict[str, Any],
+    ) -> str:
+        return self._render(agent, template, inputs)
+
+    @trace
+    async def render_async(
+        self,
+        agent: Agent,
+        template: str,
+        inputs: dict[str, Any],
+    ) -> str:
+        return self._render(agent, template, inputs)
+
+    def _render(
+        self,
+        agent: Agent,
+        template: str,
+        inputs: dict[str, Any],
+    ) -> str:
+        render_inputs, thread_nonces = _prepare_render_inputs(agent, inputs)
+        rendered = compile_template(template).render(render_inputs)
+
+        # Stash the nonce mapping on thread-local for prepare() to retrieve
+        _thread_nonces_local.nonces = thread_nonces
+
+        return rendered
+
+    @trace
+    def render_segments(
+        self,
+        agent: Agent,
+        template: str,
+        inputs: dict[str, Any],
+    ) -> list[Segment]:
+        """Render *template* to provenance-tagged segments.
+
+        Rich-kind inputs are not interpolated; each bare ``{{ name }}``
+        becomes ``Segment("rich", "", source=name)`` for the parser to turn
+        into a positional marker.
+        """
+        rich = {p.name: _rich_placeholder(p.name) for p in agent.inputs or [] if p.kind in RICH_KINDS}
+        if not rich:
+            return compile_template(template).render_segments(inputs)
+
+        render_inputs = {**inputs, **rich}
+        segments = compile_template(template).render_segments(render_inputs)
+        for i, seg in enumerate(segments):
+            if seg.kind == "interp" and seg.source in rich and seg.text == rich[seg.source]:
+                segments[i] = Segment("rich", "", source=seg.source)
+        return segments
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from .stream import StreamSummary, configure_stream_tracing
 from .tracer import (
     PromptyTracer,
     Tracer,
@@ -15,7 +16,9 @@ from .tracer import (
 
 __all__ = [
     "PromptyTracer",
+    "StreamSummary",
     "Tracer",
+    "configure_stream_tracing",
     "console_tracer",
     "sanitize",
     "to_dict",
@@ -0,0 +1,281 @@
+"""Incremental trace summary for streamed LLM responses.
+
+:class:`~prompty.core.types.PromptyStream` used to keep every raw SDK chunk
+and serialize all of them into one trace frame when the stream ended, so a
+long completion held thousands of chunk objects alive and produced huge
+``.tracy`` files. It now folds each chunk into a :class:`StreamSummary` as
+it passes through — concatenated text, tool-call deltas, usage, chunk
+count, time to first token and inter-token latency percentiles — and traces
+that compact aggregate instead.
+
+Latencies go into a fixed-size log-bucketed histogram, so the per-stream
+state does not grow with the number of chunks beyond the streamed content
+itself. Full-chunk capture is still available for debugging: set
+``PROMPTY_TRACE_STREAM_CHUNKS=1`` or call
+``configure_stream_tracing(capture_chunks=True)``.
+
+Chunks are read by shape rather than by provider: OpenAI Chat Completions
+chunks (``choices[0].delta``), OpenAI Responses events
+(``response.output_text.delta`` …), Anthropic Messages events
+(``content_block_delta`` …) and plain strings are recognized; anything
+else is counted but otherwise ignored.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from typing import Any
+
+__all__ = ["StreamSummary", "configure_stream_tracing", "stream_capture_enabled"]
+
+_capture_chunks = os.environ.get("PROMPTY_TRACE_STREAM_CHUNKS", "").lower() in ("1", "true", "yes")
+
+
+def configure_stream_tracing(*, capture_chunks: bool) -> None:
+    """Keep every raw chunk of streams created from now on (``False`` disables).
+
+    Equivalent to setting ``PROMPTY_TRACE_STREAM_CHUNKS=1``. Captured chunks
+    are available as ``stream.items`` and traced under ``items`` next to the
+    summary; memory and trace size then grow with the stream again.
+    """
+    global _capture_chunks
+    _capture_chunks = capture_chunks
+
+
+def stream_capture_enabled() -> bool:
+    """Return ``True`` when new streams keep their raw chunks."""
+    return _capture_chunks
+
+
+def _get(obj: Any, name: str) -> Any:
+    """Read *name* from an SDK object or its dict form."""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+class _LatencyHistogram:
+    """Log-bucketed latency histogram with a fixed number of buckets.
+
+    Bucket ``i`` holds samples in ``(BASE·G^(i-1), BASE·G^i]`` with
+    ``G = 2^(1/8)``, so percentiles are accurate to about ±5%; bucket 0 holds
+    everything up to ``BASE`` and the last bucket everything above ~5 min.
+    Exact count, mean, min and max are kept alongside.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    _BASE = 1e-5
+    _STEPS_PER_DOUBLING = 8
+    _BUCKETS = 200
+
+    def __init__(self) -> None:
+        self.counts = [0] * self._BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        if seconds <= self._BASE:
+            index = 0
+        else:
+            index = min(math.ceil(math.log2(seconds / self._BASE) * self._STEPS_PER_DOUBLING), self._BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Estimate the *q*-quantile (0–1) in seconds; ``count`` must be > 0."""
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                # Geometric middle of the bucket, clamped to what was observed
+                estimate = self._BASE * 2 ** ((index - 0.5) / self._STEPS_PER_DOUBLING)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+class StreamSummary:
+    """Running aggregate of one streamed response.
+
+    Call :meth:`add` with every chunk as it arrives and :meth:`to_dict` once
+    the stream ends. A "token" is a chunk carrying text or tool-call
+    arguments; usage-only and heartbeat chunks are counted but do not affect
+    the latency figures.
+
+    Args:
+        start: ``time.perf_counter()`` value the time to first token is
+            measured from. Defaults to now.
+    """
+
+    __slots__ = ("chunks", "finish_reason", "usage", "_start", "_first", "_last", "_text", "_tools", "_gaps")
+
+    def __init__(self, start: float | None = None) -> None:
+        self.chunks = 0
+        self.finish_reason: str | None = None
+        self.usage: dict[str, Any] = {}
+        self._start = time.perf_counter() if start is None else start
+        self._first: float | None = None
+        self._last = self._start
+        self._text: list[str] = []
+        # index → [id, name, argument fragments]
+        self._tools: dict[Any, list[Any]] = {}
+        self._gaps = _LatencyHistogram()
+
+    @property
+    def text(self) -> str:
+        """Concatenated text of the stream so far."""
+        return "".join(self._text)
+
+    def add(self, chunk: Any) -> None:
+        """Fold one chunk into the summary."""
+        now = time.perf_counter()
+        self.chunks += 1
+        if isinstance(chunk, str):
+            token = self._add_text(chunk)
+        else:
+            choices = _get(chunk, "choices")
+            if choices:
+                token = self._add_chat_choice(choices[0])
+            else:
+                kind = _get(chunk, "type")
+                token = self._add_event(kind, chunk) if isinstance(kind, str) else False
+            usage = _get(chunk, "usage")
+            if usage:
+                self._add_usage(usage)
+
+        if token:
+            if self._first is None:
+                self._first = now
+            else:
+                self._gaps.add(now - self._last)
+            self._last = now
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-ready summary traced for the stream."""
+        result: dict[str, Any] = {"chunks": self.chunks, "text": self.text}
+        if self._tools:
+            result["tool_calls"] = [
+                {"id": tid, "name": name, "arguments": "".join(args)} for tid, name, args in self._tools.values()
+            ]
+        if self.finish_reason is not None:
+            result["finish_reason"] = self.finish_reason
+        if self.usage:
+            result["usage"] = dict(self.usage)
+        if self._first is not None:
+            result["time_to_first_token_ms"] = _ms(self._first - self._start)
+            result["duration_ms"] = _ms(self._last - self._start)
+        gaps = self._gaps
+        if gaps.count:
+            result["inter_token_latency_ms"] = {
+                "count": gaps.count,
+                "mean": _ms(gaps.total / gaps.count),
+                "p50": _ms(gaps.percentile(0.50)),
+                "p90": _ms(gaps.percentile(0.90)),
+                "p99": _ms(gaps.percentile(0.99)),
+                "max": _ms(gaps.max),
+            }
+        return result
+
+    # -- chunk shapes -------------------------------------------------------
+
+    def _add_text(self, text: Any) -> bool:
+        if not text or not isinstance(text, str):
+            return False
+        self._text.append(text)
+        return True
+
+    def _add_tool(self, index: Any, call_id: Any = None, name: Any = None, arguments: Any = None) -> bool:
+        entry = self._tools.get(index)
+        if entry is None:
+            entry = self._tools[index] = ["", "", []]
+        if call_id and isinstance(call_id, str):
+            entry[0] = call_id
+        if name and isinstance(name, str):
+            entry[1] = name
+        if arguments and isinstance(arguments, str):
+            entry[2].append(arguments)
+            return True
+        return False
+
+    def _add_usage(self, usage: Any) -> None:
+        if not isinstance(usage, dict):
+            dump = getattr(usage, "model_dump", None)
+            usage = dump() if callable(dump) else None
+        if isinstance(usage, dict):
+            # Later chunks carry cumulative counts (Anthropic's message_delta)
+            self.usage.update((k, v) for k, v in usage.items() if v is not None)
+
+    def _add_chat_choice(self, choice: Any) -> bool:
+        """OpenAI Chat Completions: ``choices[0].delta``."""
+        finish = _get(choice, "finish_reason")
+        if isinstance(finish, str):
+            self.finish_reason = finish
+        delta = _get(choice, "delta")
+        if delta is None:
+            return False
+        token = self._add_text(_get(delta, "content"))
+        for tc in _get(delta, "tool_calls") or ():
+            function = _get(tc, "function")
+            token = (
+                self._add_tool(
+                    _get(tc, "index"),
+                    _get(tc, "id"),
+                    _get(function, "name") if function else None,
+                    _get(function, "arguments") if function else None,
+                )
+                or token
+            )
+        return token
+
+    def _add_event(self, kind: str, event: Any) -> bool:
+        """Typed events: Anthropic Messages and OpenAI Responses."""
+        if kind == "content_block_delta":
+            delta = _get(event, "delta")
+            delta_type = _get(delta, "type")
+            if delta_type == "text_delta":
+                return self._add_text(_get(delta, "text"))
+            if delta_type == "input_json_delta":
+                return self._add_tool(_get(event, "index"), arguments=_get(delta, "partial_json"))
+        elif kind == "content_block_start":
+            block = _get(event, "content_block")
+            if _get(block, "type") == "tool_use":
+                self._add_tool(_get(event, "index"), _get(block, "id"), _get(block, "name"))
+        elif kind == "message_start":
+            usage = _get(_get(event, "message"), "usage")
+            if usage:
+                self._add_usage(usage)
+        elif kind == "message_delta":
+            stop = _get(_get(event, "delta"), "stop_reason")
+            if isinstance(stop, str):
+                self.finish_reason = stop
+        elif kind == "response.output_text.delta":
+            return self._add_text(_get(event, "delta"))
+        elif kind == "response.output_item.added":
+            item = _get(event, "item")
+            if _get(item, "type") == "function_call":
+                self._add_tool(_get(event, "output_index"), _get(item, "call_id"), _get(item, "name"))
+        elif kind == "response.function_call_arguments.delta":
+            return self._add_tool(_get(event, "output_index"), arguments=_get(event, "delta"))
+        elif kind in ("response.completed", "response.incomplete", "response.failed"):
+            response = _get(event, "response")
+            status = _get(response, "status")
+            if isinstance(status, str):
+                self.finish_reason = status
+            usage = _get(response, "usage")
+            if usage:
+                self._add_usage(usage)
+        return False
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
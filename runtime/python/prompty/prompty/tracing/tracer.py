@@ -225,11 +225,20 @@ class Tracer:
         """Remove all registered trace backends."""
         cls._tracers = {}
 
+    @classmethod
+    def is_active(cls) -> bool:
+        """Return ``True`` when at least one backend is registered."""
+        return bool(cls._tracers)
+
     @classmethod
     @contextlib.contextmanager
     def start(cls, name: str, attributes: dict[str, Any] | None = None) -> Iterator[Callable[[str, Any], list[None]]]:
         """Enter all registered backends simultaneously.
 
+        Values are serialized (``to_dict`` + ``sanitize``) once per call and
+        the same result is fanned out to every backend. With no backends
+        registered the yielded callback is a no-op and nothing is serialized.
+
         Args:
             name: The span/operation name.
             attributes: Optional initial attributes to emit to all backends.
@@ -238,17 +247,29 @@ class Tracer:
             A callback ``trace(key, value)`` that fans out to all backends,
             sanitizing values before emission.
         """
+        if not cls._tracers:
+            yield _noop_emit
+            return
+
         with contextlib.ExitStack() as stack:
             traces: list[Callable[[str, Any], None]] = [
                 stack.enter_context(tracer(name)) for tracer in cls._tracers.values()
             ]
 
+            def emit(key: str, value: Any) -> list[None]:
+                serialized = sanitize(key, to_dict(value))
+                return [t(key, serialized) for t in traces]
+
             if attributes:
-                for t in traces:
-                    for key, value in attributes.items():
-                        t(key, sanitize(key, to_dict(value)))
+                for key, value in attributes.items():
+                    emit(key, value)
 
-            yield lambda key, value: [t(key, sanitize(key, to_dict(value))) for t in traces]
+            yield emit
+
+
+def _noop_emit(key: str, value: Any) -> list[None]:
+    """Trace callback used when no backends are registered."""
+    return []
 
 
 # ---------------------------------------------------------------------------
@@ -272,18 +293,71 @@ def _inputs(
     args: tuple,
     kwargs: dict,
     ignore_params: list[str] | None = None,
+    signature: inspect.Signature | None = None,
 ) -> dict:
-    """Bind and serialize function inputs, excluding ``self`` and ignored params."""
-    ba = inspect.signature(func).bind(*args, **kwargs)
+    """Bind function inputs, excluding ``self`` and ignored params.
+
+    Values are returned as-is; serialization happens in the
+    :meth:`Tracer.start` fan-out, and only when a backend is registered.
+    Pass a pre-computed *signature* to avoid re-inspecting *func*.
+    """
+    ba = (signature or inspect.signature(func)).bind(*args, **kwargs)
     ba.apply_defaults()
 
     ignore_set = set(ignore_params) if ignore_params else set()
-    return {k: to_dict(v) for k, v in ba.arguments.items() if k != "self" and k not in ignore_set}
+    return {k: v for k, v in ba.arguments.items() if k != "self" and k not in ignore_set}
 
 
-def _results(result: Any) -> Any:
-    """Serialize a function result."""
-    return to_dict(result) if result is not None else "None"
+def _exception_result(e: Exception) -> dict[str, Any]:
+    """Build the ``result`` payload recorded when a traced call raises."""
+    return {
+        "exception": {
+            "type": type(e).__name__,
+            "traceback": (traceback.format_tb(tb=e.__traceback__) if e.__traceback__ else None),
+            "message": str(e),
+            "args": e.args,
+        }
+    }
+
+
+class _TraceSpec:
+    """Per-function trace metadata, computed once at decoration time.
+
+    The ``inspect.Signature`` is resolved lazily on the first traced call
+    and reused afterwards.
+    """
+
+    __slots__ = ("func", "name", "altname", "signature", "attributes", "ignore_params", "_sig")
+
+    def __init__(self, func: Callable, ignore_params: list[str] | None, okwargs: dict[str, Any]) -> None:
+        name, signature = _name(func, ())
+        attributes = dict(okwargs)
+        altname: str | None = None
+        if "name" in attributes:
+            altname = name
+            name = attributes.pop("name")
+
+        self.func = func
+        self.name = name
+        self.altname = altname
+        self.signature = signature
+        self.attributes = attributes
+        self.ignore_params = ignore_params
+        self._sig: inspect.Signature | None = None
+
+    def begin(self, t: Callable[[str, Any], Any], args: tuple, kwargs: dict) -> None:
+        """Emit the span preamble (function, signature, attributes, inputs)."""
+        if self.altname is not None:
+            t("function", self.altname)
+
+        t("signature", self.signature)
+
+        for k, v in self.attributes.items():
+            t(k, v)
+
+        if self._sig is None:
+            self._sig = inspect.signature(self.func)
+        t("inputs", _inputs(self.func, args, kwargs, self.ignore_params, self._sig))
 
 
 def _trace_sync(
@@ -292,44 +366,22 @@ def _trace_sync(
     **okwargs: Any,
 ) -> Callable:
     """Synchronous tracing wrapper."""
+    spec = _TraceSpec(func, ignore_params, okwargs)
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        name, signature = _name(func, args)
-        altname: str | None = None
-
-        if "name" in okwargs:
-            altname = name
-            name = okwargs["name"]
-            del okwargs["name"]
-
-        with Tracer.start(name) as t:
-            if altname is not None:
-                t("function", altname)
+        # Fast path — no backends registered, nothing to bind or serialize
+        if not Tracer._tracers:
+            return func(*args, **kwargs)
 
-            t("signature", signature)
-
-            for k, v in okwargs.items():
-                t(k, to_dict(v))
-
-            inputs = _inputs(func, args, kwargs, ignore_params)
-            t("inputs", inputs)
+        with Tracer.start(spec.name) as t:
+            spec.begin(t, args, kwargs)
 
             try:
                 result = func(*args, **kwargs)
-                t("result", _results(result))
+                t("result", result if result is not None else "None")
             except Exception as e:
-                t(
-                    "result",
-                    {
-                        "exception": {
-                            "type": type(e).__name__,
-                            "traceback": (traceback.format_tb(tb=e.__traceback__) if e.__traceback__ else None),
-                            "message": str(e),
-                            "args": to_dict(e.args),
-                        }
-                    },
-                )
+                t("result", _exception_result(e))
                 raise
 
             return result
@@ -343,44 +395,22 @@ def _trace_async(
     **okwargs: Any,
 ) -> Callable:
     """Asynchronous tracing wrapper."""
+    spec = _TraceSpec(func, ignore_params, okwargs)
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        name, signature = _name(func, args)
-        altname: str | None = None
-
-        if "name" in okwargs:
-            altname = name
-            name = okwargs["name"]
-            del okwargs["name"]
-
-        with Tracer.start(name) as t:
-            if altname is not None:
-                t("function", altname)
-
-            t("signature", signature)
-
-            for k, v in okwargs.items():
-                t(k, to_dict(v))
+        # Fast path — no backends registered, nothing to bind or serialize
+        if not Tracer._tracers:
+            return await func(*args, **kwargs)
 
-            inputs = _inputs(func, args, kwargs, ignore_params)
-            t("inputs", inputs)
+        with Tracer.start(spec.name) as t:
+            spec.begin(t, args, kwargs)
 
             try:
                 result = await func(*args, **kwargs)
-                t("result", _results(result))
+                t("result", result if result is not None else "None")
             except Exception as e:
-                t(
-                    "result",
-                    {
-                        "exception": {
-                            "type": type(e).__name__,
-                            "traceback": (traceback.format_tb(tb=e.__traceback__) if e.__traceback__ else None),
-                            "message": str(e),
-                            "args": to_dict(e.args),
-                        }
-                    },
-                )
+                t("result", _exception_result(e))
                 raise
 
             return result
@@ -505,8 +535,10 @@ class PromptyTracer:
                 if key not in frame:
                     frame[key] = value
                 else:
+                    # Build a new list rather than appending in place — the
+                    # same serialized value is shared by every backend.
                     if isinstance(frame[key], list):
-                        frame[key].append(value)
+                        frame[key] = [*frame[key], value]
                     else:
                         frame[key] = [frame[key], value]
 
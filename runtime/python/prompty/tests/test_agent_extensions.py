@@ -6,6 +6,7 @@ steering, and parallel tool execution — all integrated into turn.
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -216,6 +217,55 @@ class TestContextWindow:
         assert dropped == 0
         assert dropped_msgs == []
 
+    def test_trim_matches_reference_algorithm(self):
+        """One-pass trim drops exactly what re-estimating after each pop would."""
+
+        def reference(msgs: list[Message], budget: int) -> int:
+            system = [m for m in msgs[:1] if m.role == "system"]
+            rest = msgs[len(system) :]
+            limit = budget - min(5000, int(budget * 0.05))
+            count = 0
+            while estimate_chars(system + rest) > limit and len(rest) > 2:
+                rest.pop(0)
+                count += 1
+            return count
+
+        def history() -> list[Message]:
+            msgs = [Message(role="system", parts=[TextPart(value="sys")])]
+            for i in range(40):
+                msgs.append(
+                    Message(
+                        role="assistant",
+                        parts=[TextPart(value="x" * (i * 7 % 90))],
+                        metadata={"tool_calls": [{"id": str(i), "name": "f", "arguments": "{}"}]},
+                    )
+                )
+                msgs.append(Message(role="tool", parts=[TextPart(value="r" * (i * 13 % 120))]))
+            return msgs
+
+        for budget in (100, 700, 1500, 3000, 100000):
+            msgs = history()
+            expected = reference(list(msgs), budget)
+            dropped_count, dropped = trim_to_context_window(msgs, budget)
+            assert dropped_count == expected == len(dropped)
+
+    def test_tool_call_cost_tracks_changes(self):
+        msg = Message(role="assistant", parts=[], metadata={"tool_calls": [{"name": "a"}]})
+        before = estimate_chars([msg])
+        msg.metadata["tool_calls"].append({"name": "bb"})
+        grown = estimate_chars([msg])
+        msg.metadata["tool_calls"] = [{"name": "c" * 50}]
+        replaced = estimate_chars([msg])
+        assert before < grown < replaced
+
+    def test_tool_call_cost_tracks_in_place_edits(self):
+        tool_calls = [{"id": "1", "name": "f", "arguments": "{}"}]
+        msg = Message(role="assistant", parts=[], metadata={"tool_calls": tool_calls})
+        estimate_chars([msg])
+        tool_calls[0]["arguments"] = "x" * 5000
+        fresh = Message(role="assistant", parts=[], metadata={"tool_calls": [dict(tool_calls[0])]})
+        assert estimate_chars([msg]) == estimate_chars([fresh]) > 5000
+
     def test_summarize_dropped(self):
         dropped = [Message(role="user", parts=[TextPart(value="How's the weather?")])]
         result = summarize_dropped(dropped)
@@ -951,3 +1001,171 @@ class TestContextCompaction:
             compaction=lambda dropped: "async compacted",
         )
         assert result == "async result"
+
+
+# =========================================================================
+# turn() / turn_async() event sequences — both loops must emit the same
+# events and turn_end payloads for every exit path.
+# =========================================================================
+
+_TOOL_ROUND = [
+    "llm_start",
+    "llm_complete",
+    "tool_call_start",
+    "tool_result",
+    "tool_call_complete",
+    "messages_updated",
+]
+
+
+def _run_turn(use_async: bool, exec_kwargs: dict[str, Any], **kwargs: Any) -> tuple[Any, list[tuple[str, Any]]]:
+    """Run turn()/turn_async() with a mocked pipeline; return (result or exception, events)."""
+    suffix = "_async" if use_async else ""
+    messages = kwargs.pop("messages", [Message(role="user", parts=[TextPart(value="hi")])])
+    events: list[tuple[str, Any]] = []
+    call_kwargs = {
+        "tools": {"get_weather": lambda location: "Sunny"},
+        "on_event": lambda t, d: events.append((t, d)),
+        **kwargs,
+    }
+    with (
+        patch(f"{_PIPELINE}._invoke_executor{suffix}", **exec_kwargs),
+        patch(f"{_PIPELINE}.prepare{suffix}", return_value=messages),
+        patch(f"{_PIPELINE}.process{suffix}", return_value="The weather is sunny."),
+    ):
+        try:
+            if use_async:
+                result: Any = asyncio.run(turn_async(_make_agent(), {}, **call_kwargs))
+            else:
+                result = turn(_make_agent(), {}, **call_kwargs)
+        except Exception as exc:
+            result = exc
+    return result, events
+
+
+def _payload(data: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in data.items() if k != "turnEvent"}
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+class TestTurnEventSequence:
+    """Pins the event stream and turn_end payload of turn() and turn_async()."""
+
+    def test_success(self, use_async):
+        result, events = _run_turn(use_async, {"side_effect": [_mock_tool_call_response(), _mock_final_response()]})
+        assert result == "The weather is sunny."
+        assert [t for t, _ in events] == [
+            "turn_start",
+            *_TOOL_ROUND,
+            "llm_start",
+            "llm_complete",
+            "done",
+            "turn_end",
+        ]
+        assert _payload(events[0][1]) == {"agent": "test-agent", "inputs": {}, "maxIterations": 10}
+        assert _payload(events[1][1]) == {
+            "attempt": 0,
+            "iteration": 0,
+            "messageCount": 1,
+            "modelId": "gpt-4",
+            "provider": "openai",
+        }
+        assert _payload(events[3][1]) == {"name": "get_weather", "arguments": '{"location":"NYC"}'}
+        assert _payload(events[4][1]) == {"name": "get_weather", "result": "Sunny"}
+        complete = _payload(events[5][1])
+        assert complete.pop("durationMs") >= 0
+        assert complete == {"name": "get_weather", "result": "Sunny", "success": True, "errorKind": None}
+        assert [m.role for m in events[6][1]["messages"]] == ["user", "assistant", "tool"]
+        assert _payload(events[7][1])["messageCount"] == 3
+        done = events[-2][1]
+        assert done["response"] == "The weather is sunny."
+        assert [m.role for m in done["messages"]] == ["user", "assistant", "tool"]
+        assert _payload(events[-1][1]) == {"status": "success", "iterations": 1, "response": "The weather is sunny."}
+
+    def test_input_guardrail_denied(self, use_async):
+        guardrails = Guardrails(input=lambda m: GuardrailResult(allowed=False, reason="blocked"))
+        result, events = _run_turn(use_async, {"side_effect": [_mock_final_response()]}, guardrails=guardrails)
+        assert isinstance(result, GuardrailError)
+        assert [t for t, _ in events] == ["turn_start", "error", "turn_end"]
+        assert _payload(events[1][1]) == {"message": "Input guardrail denied: blocked"}
+        assert _payload(events[-1][1]) == {"status": "error", "iterations": 0}
+
+    def test_output_guardrail_denied(self, use_async):
+        guardrails = Guardrails(output=lambda m: GuardrailResult(allowed=False, reason="toxic"))
+        result, events = _run_turn(
+            use_async,
+            {"side_effect": [_mock_tool_call_response(), _mock_final_response()]},
+            guardrails=guardrails,
+        )
+        assert isinstance(result, GuardrailError)
+        assert [t for t, _ in events] == ["turn_start", "llm_start", "llm_complete", "error", "turn_end"]
+        assert _payload(events[3][1]) == {"message": "Output guardrail denied: toxic"}
+        end = _payload(events[-1][1])
+        assert (end["status"], end["iterations"]) == ("error", 0)
+        assert "response" in end
+
+    def test_max_iterations(self, use_async):
+        result, events = _run_turn(use_async, {"return_value": _mock_tool_call_response()}, max_iterations=1)
+        assert isinstance(result, ValueError)
+        assert "max_iterations (1)" in str(result)
+        assert [t for t, _ in events] == ["turn_start", *_TOOL_ROUND, "llm_start", "llm_complete", "turn_end"]
+        assert _payload(events[-1][1]) == {"status": "error", "iterations": 2}
+
+    def test_cancelled_before_start(self, use_async):
+        token = CancellationToken()
+        token.cancel()
+        result, events = _run_turn(use_async, {"side_effect": [_mock_final_response()]}, cancel=token)
+        assert isinstance(result, CancelledError)
+        assert [t for t, _ in events] == ["turn_start", "cancelled", "turn_end"]
+        assert _payload(events[1][1]) == {}
+        assert _payload(events[-1][1]) == {"status": "cancelled", "iterations": 0}
+
+    def test_steering(self, use_async):
+        steering = Steering()
+        steering.send("use celsius")
+        result, events = _run_turn(
+            use_async,
+            {"side_effect": [_mock_tool_call_response(), _mock_final_response()]},
+            steering=steering,
+        )
+        assert result == "The weather is sunny."
+        assert [t for t, _ in events] == [
+            "turn_start",
+            "messages_updated",
+            "status",
+            *_TOOL_ROUND,
+            "llm_start",
+            "llm_complete",
+            "done",
+            "turn_end",
+        ]
+        assert [m.text for m in events[1][1]["messages"][:2]] == ["hi", "use celsius"]
+        assert _payload(events[2][1]) == {"message": "Injected 1 steering message(s)"}
+        assert _payload(events[-1][1]) == {"status": "success", "iterations": 1, "response": "The weather is sunny."}
+
+    def test_context_trim(self, use_async):
+        messages = [Message(role="system", parts=[TextPart(value="sys")])] + [
+            Message(role="user", parts=[TextPart(value="x" * 200)]) for _ in range(6)
+        ]
+        result, events = _run_turn(
+            use_async,
+            {"side_effect": [_mock_tool_call_response(), _mock_final_response()]},
+            context_budget=10,
+            messages=messages,
+        )
+        assert result == "The weather is sunny."
+        assert [t for t, _ in events] == [
+            "turn_start",
+            "messages_updated",
+            "status",
+            *_TOOL_ROUND,
+            "messages_updated",
+            "status",
+            "llm_start",
+            "llm_complete",
+            "done",
+            "turn_end",
+        ]
+        assert _payload(events[2][1]) == {"message": "Trimmed 4 messages for context budget"}
+        assert _payload(events[10][1]) == {"message": "Trimmed 3 messages for context budget"}
+        assert _payload(events[-1][1]) == {"status": "success", "iterations": 1, "response": "The weather is sunny."}
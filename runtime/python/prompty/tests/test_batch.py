@@ -0,0 +1,321 @@
+"""Tests for the batch APIs (core/batch.py, core/rate_limit.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.metadata
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from prompty.core import batch
+from prompty.core.batch import InvokeResult, PreparedItem, invoke_many_async, prepare_many
+from prompty.core.discovery import refresh_index
+from prompty.core.pipeline import prepare
+from prompty.core.rate_limit import RateLimiter, retry_after
+from prompty.model import Agent
+from prompty.tracing.tracer import Tracer
+
+
+def _agent() -> Agent:
+    return Agent.load(
+        {
+            "name": "classify",
+            "model": {"id": "gpt-4", "provider": "openai"},
+            "inputs": [
+                {"name": "text", "kind": "string", "required": True},
+                {"name": "label", "kind": "string", "default": "none"},
+            ],
+            "instructions": "system:\nClassify. Default label: {{label}}\n\nuser:\n{{text}}",
+        }
+    )
+
+
+def _exit_worker(index: int, inputs: dict[str, Any] | None) -> PreparedItem:
+    os._exit(1)
+
+
+def _texts(items: list[PreparedItem]) -> list[list[str]]:
+    return [[m.text for m in item.messages or []] for item in items]
+
+
+class TestPrepareMany:
+    def test_matches_prepare(self):
+        agent = _agent()
+        rows = [{"text": f"row {i}"} for i in range(5)]
+
+        items = list(prepare_many(agent, rows))
+
+        assert [item.index for item in items] == list(range(5))
+        assert all(item.error is None for item in items)
+        assert _texts(items) == [[m.text for m in prepare(agent, row)] for row in rows]
+
+    def test_per_item_errors_do_not_abort(self):
+        rows = [{"text": "ok"}, {}, {"text": "also ok"}]
+
+        items = list(prepare_many(_agent(), rows))
+
+        assert [item.error is None for item in items] == [True, False, True]
+        assert isinstance(items[1].error, ValueError)
+        assert "Required input 'text'" in str(items[1].error)
+        assert items[1].messages is None
+        assert items[2].messages is not None
+
+    def test_consumes_inputs_lazily(self):
+        seen: list[int] = []
+
+        def rows():
+            for i in range(3):
+                seen.append(i)
+                yield {"text": str(i)}
+
+        stream = prepare_many(_agent(), rows())
+        next(stream)
+        assert seen == [0]
+
+    def test_hoists_per_agent_work(self):
+        agent = _agent()
+        with (
+            patch("prompty.core.batch.get_renderer", wraps=batch.get_renderer) as get_renderer,
+            patch("prompty.core.batch._resolve_prepare_config", wraps=batch._resolve_prepare_config) as resolve,
+        ):
+            list(prepare_many(agent, [{"text": str(i)} for i in range(10)]))
+        assert get_renderer.call_count == 1
+        assert resolve.call_count == 1
+
+    def test_process_pool(self):
+        agent = _agent()
+        rows = [{"text": f"row {i}"} for i in range(6)] + [{}]
+
+        items = list(prepare_many(agent, rows, workers=2))
+
+        assert [item.index for item in items] == list(range(7))
+        assert _texts(items[:6]) == [[m.text for m in prepare(agent, row)] for row in rows[:6]]
+        assert isinstance(items[6].error, ValueError)
+
+    def test_process_pool_unpicklable_item(self):
+        rows = [{"text": "a"}, {"text": "b", "extra": lambda: None}, {"text": "c"}]
+
+        items = list(prepare_many(_agent(), rows, workers=1))
+
+        assert [item.index for item in items] == [0, 1, 2]
+        assert [item.error is None for item in items] == [True, False, True]
+        assert items[1].inputs is rows[1]
+        assert items[1].messages is None
+
+    def test_process_pool_broken(self):
+        with patch("prompty.core.batch._run_in_worker", _exit_worker):
+            items = list(prepare_many(_agent(), [{"text": "a"}, {"text": "b"}], workers=1))
+
+        assert [item.index for item in items] == [0, 1]
+        assert all(isinstance(item.error, BrokenProcessPool) for item in items)
+
+    def test_negative_workers_rejected(self):
+        with pytest.raises(ValueError):
+            list(prepare_many(_agent(), [], workers=-1))
+
+
+# ---------------------------------------------------------------------------
+# invoke_many_async — against a fake executor discovered via entry points
+# ---------------------------------------------------------------------------
+
+
+class _RateLimited(Exception):
+    def __init__(self, seconds: str) -> None:
+        super().__init__("429 Too Many Requests")
+        self.response = SimpleNamespace(headers={"retry-after": seconds})
+
+
+class _FakeExecutor:
+    """Echoes the user message back after a short, index-dependent delay."""
+
+    fail_first: set[str] = set()
+    calls: list[str] = []
+
+    def execute(self, agent, messages):
+        raise NotImplementedError
+
+    async def execute_async(self, agent, messages):
+        text = messages[-1].text
+        _FakeExecutor.calls.append(text)
+        if text in _FakeExecutor.fail_first:
+            _FakeExecutor.fail_first.discard(text)
+            raise _RateLimited("0.05")
+        if text == "boom":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.001 * (5 - int(text[-1]) % 5))
+        return {"echo": text}
+
+
+class _FakeProcessor:
+    def process(self, agent, response):
+        return response["echo"]
+
+    async def process_async(self, agent, response):
+        return response["echo"]
+
+
+@pytest.fixture
+def fake_provider():
+    eps = {
+        "prompty.executors": {"fake": _FakeExecutor},
+        "prompty.processors": {"fake": _FakeProcessor},
+    }
+
+    real_entry_points = importlib.metadata.entry_points()
+
+    class _EntryPoints:
+        def select(self, *, group: str) -> list[Any]:
+            fakes = []
+            for name, cls in eps.get(group, {}).items():
+                ep = MagicMock()
+                ep.name = name
+                ep.load.return_value = cls
+                fakes.append(ep)
+            return [*fakes, *real_entry_points.select(group=group)]
+
+    _FakeExecutor.fail_first = set()
+    _FakeExecutor.calls = []
+    refresh_index()
+    with patch("prompty.core.discovery.importlib.metadata.entry_points", return_value=_EntryPoints()):
+        yield
+    refresh_index()
+
+
+def _fake_agent() -> Agent:
+    return Agent.load(
+        {
+            "name": "echo",
+            "model": {"id": "fake-model", "provider": "fake"},
+            "inputs": [{"name": "text", "kind": "string", "required": True}],
+            "instructions": "user:\n{{text}}",
+        }
+    )
+
+
+async def _collect(stream) -> list[InvokeResult]:
+    return [item async for item in stream]
+
+
+@pytest.mark.usefixtures("fake_provider")
+class TestInvokeManyAsync:
+    @pytest.mark.asyncio
+    async def test_ordered_results(self):
+        rows = [{"text": f"row {i}"} for i in range(10)]
+
+        items = await _collect(invoke_many_async(_fake_agent(), rows, concurrency=4, ordered=True))
+
+        assert [item.index for item in items] == list(range(10))
+        assert [item.result for item in items] == [f"row {i}" for i in range(10)]
+        assert all(item.attempts == 1 for item in items)
+
+    @pytest.mark.asyncio
+    async def test_completion_order_covers_every_item(self):
+        rows = [{"text": f"row {i}"} for i in range(10)]
+
+        items = await _collect(invoke_many_async(_fake_agent(), rows, concurrency=10))
+
+        assert sorted(item.index for item in items) == list(range(10))
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_lazy_input(self):
+        in_flight = 0
+        peak = 0
+        original = _FakeExecutor.execute_async
+
+        async def counting(self, agent, messages):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await original(self, agent, messages)
+            finally:
+                in_flight -= 1
+
+        read: list[int] = []
+
+        async def rows():
+            for i in range(20):
+                read.append(i)
+                yield {"text": f"row {i}"}
+
+        with patch.object(_FakeExecutor, "execute_async", counting):
+            stream = invoke_many_async(_fake_agent(), rows(), concurrency=3)
+            await stream.__anext__()
+            assert len(read) <= 4
+            await stream.aclose()
+            items = await _collect(invoke_many_async(_fake_agent(), rows(), concurrency=3))
+
+        assert len(items) == 20
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_errors_and_retry_after(self):
+        _FakeExecutor.fail_first = {"row 1"}
+        rows = [{"text": "row 0"}, {"text": "row 1"}, {"text": "boom"}, {}]
+
+        with patch("prompty.core.batch._backoff", return_value=0):
+            items = await _collect(invoke_many_async(_fake_agent(), rows, max_retries=1, ordered=True))
+
+        assert items[0].error is None
+        assert items[1].error is None and items[1].attempts == 2
+        assert items[1].latency_ms >= 50
+        assert isinstance(items[2].error, RuntimeError)
+        assert items[2].attempts == 2
+        assert isinstance(items[3].error, ValueError)
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute(self):
+        limiter = RateLimiter(requests_per_minute=600, burst_seconds=0.1)
+        rows = [{"text": f"row {i}"} for i in range(4)]
+
+        start = time.perf_counter()
+        items = await _collect(invoke_many_async(_fake_agent(), rows, concurrency=4, limiter=limiter))
+
+        # One request up front, then one every 100 ms
+        assert time.perf_counter() - start >= 0.25
+        assert all(item.error is None for item in items)
+
+    @pytest.mark.asyncio
+    async def test_reports_stats_to_tracer(self):
+        spans: list[tuple[str, dict[str, Any]]] = []
+
+        @contextmanager
+        def collector(name: str):
+            frame: dict[str, Any] = {}
+            yield lambda key, value: frame.__setitem__(key, value)
+            spans.append((name, frame))
+
+        Tracer.add("test-collector", collector)
+        try:
+            rows = [{"text": f"row {i}"} for i in range(5)] + [{"text": "boom"}]
+            await _collect(invoke_many_async(_fake_agent(), rows, max_retries=0))
+        finally:
+            Tracer.remove("test-collector")
+
+        result = next(frame["result"] for name, frame in spans if name == "invoke_many")
+        assert result["count"] == 6
+        assert result["errors"] == 1
+        assert result["throughput"] > 0
+        assert 0 < result["latencyP50Ms"] <= result["latencyP95Ms"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            await _collect(invoke_many_async(_fake_agent(), [], concurrency=0))
+
+
+class TestRetryAfter:
+    def test_header_forms(self):
+        assert retry_after(_RateLimited("2")) == 2.0
+        err = _RateLimited("x")
+        err.response.headers = {"retry-after-ms": "1500"}
+        assert retry_after(err) == 1.5
+        assert retry_after(_RateLimited("not a date")) is None
+        assert retry_after(RuntimeError()) is None
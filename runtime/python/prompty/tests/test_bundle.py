@@ -0,0 +1,132 @@
+"""Tests for precompiled prompt bundles (core/bundle.py)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from prompty import compile_bundle, load, load_bundle
+from prompty.__main__ import main
+from prompty.core import bundle as bundle_module
+
+PROMPTS = Path(__file__).parent / "prompts"
+
+
+def _write_prompts(root: Path) -> None:
+    (root / "shared").mkdir()
+    (root / "shared" / "tools.json").write_text(
+        '[{"name": "lookup", "kind": "function", "description": "Look it up"}]', encoding="utf-8"
+    )
+    (root / "support").mkdir()
+    (root / "support" / "triage.prompty").write_text(
+        "---\n"
+        "name: triage\n"
+        "model:\n"
+        "  id: gpt-4o\n"
+        "  provider: openai\n"
+        "  connection:\n"
+        "    kind: key\n"
+        "    apiKey: ${env:BUNDLE_TEST_KEY}\n"
+        "tools: ${file:../shared/tools.json}\n"
+        "---\n"
+        "system:\nTriage the ticket.\n\nuser:\n{{ticket}}\n",
+        encoding="utf-8",
+    )
+    (root / "hello.prompty").write_text("---\nname: hello\n---\nuser:\nHi {{name}}\n", encoding="utf-8")
+
+
+class TestBundle:
+    def test_round_trip_equals_load(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setenv("BUNDLE_TEST_KEY", "secret")
+        _write_prompts(tmp_path)
+        out = tmp_path / "prompts.promptyb"
+
+        names = compile_bundle(tmp_path, out, allowed_file_roots=[tmp_path])
+
+        assert sorted(names) == ["hello", "support/triage"]
+        with load_bundle(out) as bundle:
+            assert len(bundle) == 2
+            for name in bundle:
+                expected = load(bundle.source(name), allowed_file_roots=[tmp_path])
+                assert bundle[name] == expected
+
+    def test_repo_prompts_equal_load(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        for var in (
+            "ANTHROPIC_API_KEY",
+            "AZURE_OPENAI_API_KEY",
+            "AZURE_OPENAI_ENDPOINT",
+            "TEST_API_KEY",
+            "TEST_ENDPOINT",
+        ):
+            monkeypatch.setenv(var, "x")
+        out = tmp_path / "repo.promptyb"
+        compile_bundle(PROMPTS, out)
+
+        bundle = load_bundle(out)
+        for name in bundle:
+            try:
+                expected = load(bundle.source(name))
+            except ValueError:
+                # e.g. a prompt that references an unset variable on purpose
+                with pytest.raises(ValueError):
+                    bundle[name]
+                continue
+            assert bundle[name] == expected, name
+
+    def test_env_resolved_at_first_access(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.delenv("BUNDLE_TEST_KEY", raising=False)
+        _write_prompts(tmp_path)
+        out = tmp_path / "prompts.promptyb"
+        compile_bundle(tmp_path, out, allowed_file_roots=[tmp_path])
+        # The include is inlined: the bundle no longer needs the file
+        (tmp_path / "shared" / "tools.json").unlink()
+
+        monkeypatch.setenv("BUNDLE_TEST_KEY", "runtime-key")
+        agent = load_bundle(out)["support/triage"]
+
+        assert agent.model.connection.api_key == "runtime-key"
+        assert agent.tools[0].name == "lookup"
+
+    def test_lazy_materialization(self, tmp_path: Path):
+        _write_prompts(tmp_path)
+        out = tmp_path / "prompts.promptyb"
+        compile_bundle(tmp_path / "hello.prompty", out)
+
+        with patch("prompty.core.bundle._build_agent", wraps=bundle_module._build_agent) as build:
+            bundle = load_bundle(out)
+            assert build.call_count == 0
+            first = bundle["hello"]
+            second = bundle["hello"]
+            assert build.call_count == 1
+            assert second is not first
+            assert second.name == first.name
+
+    def test_lookups_return_independent_copies(self, tmp_path: Path):
+        _write_prompts(tmp_path)
+        out = tmp_path / "prompts.promptyb"
+        compile_bundle(tmp_path / "hello.prompty", out)
+
+        with load_bundle(out) as bundle:
+            first = bundle["hello"]
+            first.name = "mutated"
+            first.metadata["touched"] = True
+            second = bundle["hello"]
+            assert second.name == "hello"
+            assert "touched" not in second.metadata
+
+    def test_rejects_foreign_files(self, tmp_path: Path):
+        bogus = tmp_path / "bogus.promptyb"
+        bogus.write_bytes(b"not a bundle at all")
+        with pytest.raises(ValueError, match="Not a prompty bundle"):
+            load_bundle(bogus)
+
+    def test_cli_compile(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+        _write_prompts(tmp_path)
+        out = tmp_path / "cli.promptyb"
+
+        assert main(["compile", str(tmp_path / "hello.prompty"), "-o", str(out)]) == 0
+
+        assert "Compiled 1 agent" in capsys.readouterr().out
+        assert list(load_bundle(out)) == ["hello"]
@@ -0,0 +1,299 @@
+"""Tests for the process-wide SDK client pool (core/client_pool.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from prompty.core.client_pool import ClientPool, client_pool_stats, close_all_clients, get_client_pool
+from prompty.core.types import PromptyStream
+from prompty.model import Agent
+from prompty.providers.anthropic.executor import AnthropicExecutor
+from prompty.providers.openai.executor import OpenAIExecutor
+
+
+def _factory(calls: list[MagicMock]):
+    def build() -> MagicMock:
+        client = MagicMock()
+        calls.append(client)
+        return client
+
+    return build
+
+
+class _Client:
+    """Stand-in SDK client class (only used as part of the key)."""
+
+
+class TestClientPool:
+    def test_reuses_client_for_same_key(self):
+        pool = ClientPool()
+        calls: list[MagicMock] = []
+        a = pool.get_or_create("openai", _Client, _factory(calls), endpoint="https://x", credential="k1")
+        b = pool.get_or_create("openai", _Client, _factory(calls), endpoint="https://x", credential="k1")
+        assert a is b
+        assert len(calls) == 1
+        stats = pool.stats()
+        assert (stats.created, stats.reused, stats.size) == (1, 1, 1)
+
+    def test_distinct_credentials_and_endpoints(self):
+        pool = ClientPool()
+        calls: list[MagicMock] = []
+        pool.get_or_create("openai", _Client, _factory(calls), endpoint="https://x", credential="k1")
+        pool.get_or_create("openai", _Client, _factory(calls), endpoint="https://x", credential="k2")
+        pool.get_or_create("openai", _Client, _factory(calls), endpoint="https://y", credential="k1")
+        pool.get_or_create("anthropic", _Client, _factory(calls), endpoint="https://x", credential="k1")
+        assert len(calls) == 4
+
+    def test_credentials_are_not_stored_in_key(self):
+        pool = ClientPool()
+        pool.get_or_create("openai", _Client, MagicMock, credential="sk-secret")
+        key, _ = pool._entries.items()[0]
+        assert "sk-secret" not in repr(key)
+
+    def test_lru_eviction_closes_released_client(self):
+        pool = ClientPool(max_size=1)
+        calls: list[MagicMock] = []
+        first = pool.get_or_create("openai", _Client, _factory(calls), credential="k1")
+        pool.release(first)
+        pool.get_or_create("openai", _Client, _factory(calls), credential="k2")
+        first.close.assert_called_once()
+        assert pool.stats().evicted == 1
+
+    def test_eviction_defers_close_while_held(self):
+        pool = ClientPool(max_size=1)
+        calls: list[MagicMock] = []
+        # A caller (e.g. a long stream) still holds the first client
+        first = pool.get_or_create("openai", _Client, _factory(calls), credential="k1")
+        pool.get_or_create("openai", _Client, _factory(calls), credential="k2")
+        assert pool.stats().evicted == 1
+        first.close.assert_not_called()
+        pool.release(first)
+        first.close.assert_called_once()
+        pool.release(first)
+        first.close.assert_called_once()
+
+    def test_idle_eviction(self):
+        pool = ClientPool(idle_timeout=10)
+        calls: list[MagicMock] = []
+        with patch("prompty.core.client_pool.time.monotonic", return_value=100.0):
+            first = pool.get_or_create("openai", _Client, _factory(calls))
+            pool.release(first)
+        with patch("prompty.core.client_pool.time.monotonic", return_value=200.0):
+            second = pool.get_or_create("openai", _Client, _factory(calls))
+        assert first is not second
+        first.close.assert_called_once()
+
+    def test_held_client_is_not_idle(self):
+        pool = ClientPool(idle_timeout=10)
+        calls: list[MagicMock] = []
+        with patch("prompty.core.client_pool.time.monotonic", return_value=100.0):
+            first = pool.get_or_create("openai", _Client, _factory(calls))
+        with patch("prompty.core.client_pool.time.monotonic", return_value=500.0):
+            second = pool.get_or_create("openai", _Client, _factory(calls))
+        assert first is second
+        first.close.assert_not_called()
+
+    def test_release_after_stream_end(self):
+        pool = ClientPool(max_size=1)
+        calls: list[MagicMock] = []
+        client = pool.get_or_create("openai", _Client, _factory(calls), credential="k1")
+        stream = pool.release_after(client, PromptyStream("test", iter([1, 2])))
+        pool.get_or_create("openai", _Client, _factory(calls), credential="k2")
+        assert next(stream) == 1
+        client.close.assert_not_called()
+        assert list(stream) == [2]
+        client.close.assert_called_once()
+
+    def test_release_after_abandoned_stream(self):
+        pool = ClientPool(max_size=1)
+        calls: list[MagicMock] = []
+        client = pool.get_or_create("openai", _Client, _factory(calls), credential="k1")
+        stream = pool.release_after(client, PromptyStream("test", iter([1, 2])))
+        pool.get_or_create("openai", _Client, _factory(calls), credential="k2")
+        next(stream)
+        del stream
+        gc.collect()
+        client.close.assert_called_once()
+
+    def test_release_after_plain_response(self):
+        pool = ClientPool(max_size=1)
+        calls: list[MagicMock] = []
+        client = pool.get_or_create("openai", _Client, _factory(calls), credential="k1")
+        assert pool.release_after(client, "response") == "response"
+        pool.get_or_create("openai", _Client, _factory(calls), credential="k2")
+        client.close.assert_called_once()
+
+    def test_unpooled_client_release_is_ignored(self):
+        client = MagicMock()
+        ClientPool().release(client)
+        client.close.assert_not_called()
+
+    def test_env_credentials_are_keyed(self, monkeypatch):
+        pool = ClientPool()
+        calls: list[MagicMock] = []
+        env = ("TEST_POOL_API_KEY",)
+        monkeypatch.setenv("TEST_POOL_API_KEY", "old")
+        a = pool.get_or_create("openai", _Client, _factory(calls), env=env)
+        b = pool.get_or_create("openai", _Client, _factory(calls), env=env)
+        monkeypatch.setenv("TEST_POOL_API_KEY", "rotated")
+        c = pool.get_or_create("openai", _Client, _factory(calls), env=env)
+        assert a is b
+        assert c is not a
+        key, _ = pool._entries.items()[-1]
+        assert "rotated" not in repr(key)
+
+    def test_async_client_closed_on_its_loop(self):
+        pool = ClientPool(max_size=1)
+        closed: list[asyncio.AbstractEventLoop] = []
+
+        class _AsyncClient:
+            async def close(self) -> None:
+                closed.append(asyncio.get_running_loop())
+
+        async def scenario() -> None:
+            client = pool.get_or_create("openai", _Client, _AsyncClient, is_async=True)
+            pool.release(client)
+            loop = asyncio.get_running_loop()
+            # Evicted from another thread while the owning loop is running
+            await asyncio.to_thread(pool.get_or_create, "openai", _Client, MagicMock, credential="k2")
+            await asyncio.sleep(0.05)
+            assert closed == [loop]
+
+        asyncio.run(scenario())
+
+    def test_zero_size_disables_pooling(self):
+        pool = ClientPool(max_size=0)
+        calls: list[MagicMock] = []
+        pool.get_or_create("openai", _Client, _factory(calls))
+        pool.get_or_create("openai", _Client, _factory(calls))
+        assert len(calls) == 2
+        assert pool.stats().size == 0
+
+    def test_close_all(self):
+        pool = ClientPool()
+        calls: list[MagicMock] = []
+        idle = pool.get_or_create("openai", _Client, _factory(calls), credential="k1")
+        pool.release(idle)
+        held = pool.get_or_create("openai", _Client, _factory(calls), credential="k2")
+        pool.close_all()
+        idle.close.assert_called_once()
+        held.close.assert_not_called()
+        assert pool.stats() == (0, 0, 0, 0, pool.max_size)
+        pool.release(held)
+        held.close.assert_called_once()
+
+    def test_configure_shrinks_pool(self):
+        pool = ClientPool()
+        calls: list[MagicMock] = []
+        for key in ("a", "b", "c"):
+            pool.get_or_create("openai", _Client, _factory(calls), credential=key)
+        for client in calls:
+            pool.release(client)
+        pool.configure(max_size=1)
+        assert pool.stats().size == 1
+        calls[0].close.assert_called_once()
+        calls[1].close.assert_called_once()
+
+    def test_async_clients_keyed_by_event_loop(self):
+        pool = ClientPool()
+        calls: list[MagicMock] = []
+
+        async def get() -> MagicMock:
+            return pool.get_or_create("openai", _Client, _factory(calls), is_async=True)
+
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+        assert first is not second
+        # The first loop is closed, so its client was dropped
+        assert pool.stats().size == 1
+
+
+class TestExecutorPooling:
+    def setup_method(self):
+        close_all_clients()
+
+    def teardown_method(self):
+        close_all_clients()
+
+    def test_openai_executor_reuses_client(self):
+        agent = Agent.load(
+            {
+                "name": "t",
+                "model": {
+                    "id": "gpt-4",
+                    "provider": "openai",
+                    "connection": {"kind": "key", "apiKey": "test-key"},
+                },
+            }
+        )
+        executor = OpenAIExecutor()
+        with patch("openai.OpenAI") as MockClient:
+            a = executor._resolve_client(agent)
+            b = executor._resolve_client(agent)
+        assert a is b
+        MockClient.assert_called_once()
+        assert client_pool_stats().reused == 1
+
+    def test_anthropic_executor_reuses_client(self):
+        pytest.importorskip("anthropic")
+        agent = Agent.load(
+            {
+                "name": "t",
+                "model": {
+                    "id": "claude",
+                    "provider": "anthropic",
+                    "connection": {"kind": "key", "apiKey": "test-key"},
+                },
+            }
+        )
+        executor = AnthropicExecutor()
+        with patch("anthropic.Anthropic") as MockClient:
+            executor._resolve_client(agent)
+            executor._resolve_client(agent)
+        MockClient.assert_called_once()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_openai_executor_releases_client(self, stream: bool):
+        agent = Agent.load(
+            {
+                "name": "t",
+                "model": {
+                    "id": "gpt-4",
+                    "provider": "openai",
+                    "connection": {"kind": "key", "apiKey": "test-key"},
+                    "options": {"additionalProperties": {"stream": stream}},
+                },
+            }
+        )
+        with patch("openai.OpenAI") as MockClient:
+            MockClient.return_value.chat.completions.create.return_value = iter(["chunk"])
+            response = OpenAIExecutor().execute(agent, [])
+            client = MockClient.return_value
+            entry = get_client_pool()._live[id(client)]
+            assert entry.leases == (1 if stream else 0)
+            list(response)
+            assert entry.leases == 0
+
+    def test_executor_releases_client_on_error(self):
+        agent = Agent.load(
+            {
+                "name": "t",
+                "model": {
+                    "id": "gpt-4",
+                    "provider": "openai",
+                    "apiType": "unknown",
+                    "connection": {"kind": "key", "apiKey": "test-key"},
+                },
+            }
+        )
+        with patch("openai.OpenAI") as MockClient:
+            with pytest.raises(ValueError, match="Unsupported apiType"):
+                OpenAIExecutor().execute(agent, [])
+            assert get_client_pool()._live[id(MockClient.return_value)].leases == 0
+
+    def test_global_pool_is_shared(self):
+        assert get_client_pool() is get_client_pool()
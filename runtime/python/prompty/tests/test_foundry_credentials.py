@@ -0,0 +1,180 @@
+"""Tests for the shared Entra ID token cache (providers/foundry/credentials.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import call, patch
+
+import pytest
+
+from prompty.providers.foundry.credentials import (
+    TokenProvider,
+    clear_token_providers,
+    get_credential,
+    get_token_provider,
+)
+from prompty.tracing.tracer import Tracer
+
+SCOPE = "https://ai.azure.com/.default"
+
+
+class _FakeCredential:
+    """Counts ``get_token`` calls and hands out tokens with a fixed lifetime."""
+
+    def __init__(self, lifetime: float = 3600, delay: float = 0.0) -> None:
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if self.delay:
+            time.sleep(self.delay)
+        return SimpleNamespace(token=f"tok-{n}", expires_on=time.time() + self.lifetime)
+
+
+class TestTokenProvider:
+    def test_reuses_cached_token(self):
+        cred = _FakeCredential()
+        provider = TokenProvider(cred, SCOPE)
+        assert provider() == "tok-1"
+        assert provider() == "tok-1"
+        assert cred.calls == 1
+
+    def test_concurrent_callers_share_one_fetch(self):
+        cred = _FakeCredential(delay=0.05)
+        provider = TokenProvider(cred, SCOPE)
+        results: list[str] = []
+        threads = [threading.Thread(target=lambda: results.append(provider())) for _ in range(8)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        assert cred.calls == 1
+        assert set(results) == {"tok-1"}
+
+    def test_refreshes_in_background_inside_margin(self):
+        cred = _FakeCredential(lifetime=60)
+        provider = TokenProvider(cred, SCOPE, refresh_margin=300)
+        assert provider() == "tok-1"
+        # Still valid, so the current token is returned while a refresh starts
+        assert provider() == "tok-1"
+        deadline = time.time() + 2
+        while cred.calls < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert cred.calls == 2
+
+    def test_expired_token_blocks_and_refetches(self):
+        cred = _FakeCredential(lifetime=-1)
+        provider = TokenProvider(cred, SCOPE)
+        assert provider() == "tok-1"
+        assert provider() == "tok-2"
+
+    def test_missing_token_raises(self):
+        class _Empty:
+            def get_token(self, *scopes, **kwargs):
+                return None
+
+        with pytest.raises(ValueError, match="access token"):
+            TokenProvider(_Empty(), SCOPE)()
+
+    def test_lazy_credential_factory(self):
+        cred = _FakeCredential()
+        built: list[int] = []
+
+        def factory():
+            built.append(1)
+            return cred
+
+        provider = TokenProvider(factory, SCOPE)
+        assert built == []
+        provider()
+        provider()
+        assert built == [1]
+
+    def test_async_call_uses_cache(self):
+        cred = _FakeCredential()
+        provider = TokenProvider(cred, SCOPE)
+
+        async def run() -> list[str]:
+            return [await provider.acall(), await provider.acall()]
+
+        assert asyncio.run(run()) == ["tok-1", "tok-1"]
+        assert cred.calls == 1
+
+    def test_emits_trace_span_without_token(self):
+        spans: list[tuple[str, list[tuple[str, object]]]] = []
+
+        from contextlib import contextmanager
+
+        @contextmanager
+        def collector(name: str):
+            entries: list[tuple[str, object]] = []
+            spans.append((name, entries))
+            yield lambda key, value: entries.append((key, value))
+
+        Tracer.add("test_creds", collector)
+        try:
+            TokenProvider(_FakeCredential(), SCOPE)()
+        finally:
+            Tracer.remove("test_creds")
+
+        name, entries = spans[0]
+        assert name == "EntraIdToken"
+        result = dict(entries)["result"]
+        assert "durationMs" in result
+        assert "tok-1" not in repr(entries)
+
+
+class TestTokenProviderRegistry:
+    def setup_method(self):
+        clear_token_providers()
+
+    def teardown_method(self):
+        clear_token_providers()
+
+    def test_shared_per_scope_and_tenant(self):
+        factory_calls: list[str | None] = []
+
+        def factory(tenant):
+            factory_calls.append(tenant)
+            return _FakeCredential()
+
+        a = get_token_provider(SCOPE, "t1", credential_factory=factory)
+        b = get_token_provider(SCOPE, "t1", credential_factory=factory)
+        c = get_token_provider(SCOPE, "t2", credential_factory=factory)
+        d = get_token_provider("https://cognitiveservices.azure.com/.default", "t1", credential_factory=factory)
+        assert a is b
+        assert len({id(a), id(c), id(d)}) == 3
+        # Credentials are only built once a token is requested
+        assert factory_calls == []
+        a()
+        assert factory_calls == ["t1"]
+
+    def test_distinct_factories_get_distinct_providers(self):
+        first = _FakeCredential()
+        second = _FakeCredential()
+        a = get_token_provider(SCOPE, "t1", credential_factory=lambda t: first)
+        b = get_token_provider(SCOPE, "t1", credential_factory=lambda t: second)
+        assert a is not b
+        a()
+        b()
+        assert (first.calls, second.calls) == (1, 1)
+
+    def test_credential_allows_requested_tenant(self):
+        with patch("azure.identity.DefaultAzureCredential") as credential_cls:
+            get_credential("t1")
+            get_credential("t1")
+            get_credential()
+        assert credential_cls.call_args_list == [call(additionally_allowed_tenants=["t1"]), call()]
+
+    def test_tenant_defaults_to_environment(self):
+        with patch.dict("os.environ", {"AZURE_TENANT_ID": "env-tenant"}):
+            provider = get_token_provider(SCOPE, credential_factory=lambda t: _FakeCredential())
+        assert provider.tenant_id == "env-tenant"
@@ -0,0 +1,54 @@
+"""Import-time regression checks for the lazy package exports.
+
+These are structural: which modules a bare import loads. The wall-clock cost
+is measured by ``benchmarks/bench_import.py``.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(code: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+
+class TestImportTime:
+    def test_import_is_lazy(self):
+        loaded = _run(
+            "import sys, prompty, prompty.core, prompty.model\n"
+            "print(sorted(m for m in sys.modules if m.startswith('prompty.')))"
+        ).stdout
+        for heavy in ("prompty.model._Agent", "prompty.core.pipeline", "prompty.providers", "prompty.tracing"):
+            assert f"'{heavy}" not in loaded
+
+    def test_model_package_is_lazy(self):
+        # prompty/model/__init__.py is generated; schema/scripts/normalize-typra-output.mjs
+        # rewrites it to lazy exports after every regeneration.
+        loaded = _run(
+            "import sys, prompty.model as m\n"
+            "assert callable(vars(m).get('__getattr__')), 'prompty.model lost its lazy __getattr__'\n"
+            "before = [n for n in sys.modules if n.startswith('prompty.model.')]\n"
+            "m.Agent\n"
+            "print(before, 'prompty.model._Agent' in sys.modules)"
+        ).stdout
+        assert loaded.strip() == "[] True"
+
+    @pytest.mark.parametrize("module", ["prompty", "prompty.core", "prompty.model"])
+    def test_every_export_resolves(self, module: str):
+        result = _run(
+            f"import {module} as m\n"
+            "missing = [n for n in m.__all__ if not hasattr(m, n)]\n"
+            "assert not missing, missing\n"
+            "assert set(m.__all__) <= set(dir(m))"
+        )
+        assert result.returncode == 0
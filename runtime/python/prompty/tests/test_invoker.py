@@ -20,9 +20,18 @@ from unittest import mock
 
 import pytest
 
+from prompty.core.discovery import (
+    clear_registrations,
+    configure_discovery,
+    refresh_index,
+    register_executor,
+    register_processor,
+    register_renderer,
+)
 from prompty.core.pipeline import (
     _dict_to_message,
     _expand_thread_markers,
+    _finalize_messages,
     _get_rich_input_names,
     _inject_thread_markers,
     _invoke_executor,
@@ -154,20 +163,29 @@ class MockProcessor:
 
 @pytest.fixture(autouse=True)
 def _clear_cache():
-    """Clear the invoker cache before each test."""
-    clear_cache()
+    """Clear the invoker cache and entry-point index before each test."""
+    refresh_index()
     yield
-    clear_cache()
+    refresh_index()
 
 
-def _make_entry_point(name: str, obj: Any):
+def _make_entry_point(name: str, obj: Any, group: str = ""):
     """Create a mock entry point that loads to the given object."""
     ep = mock.Mock()
     ep.name = name
+    ep.group = group
+    ep.value = f"{getattr(obj, '__module__', 'tests')}:{getattr(obj, '__qualname__', name)}"
     ep.load.return_value = obj
     return ep
 
 
+class _EntryPoints(list):
+    """Stand-in for the ``EntryPoints`` collection ``entry_points()`` returns."""
+
+    def select(self, *, group: str) -> list[Any]:
+        return [ep for ep in self if ep.group == group]
+
+
 def _patch_entry_points(**groups):
     """Patch importlib.metadata.entry_points to return mock EPs.
 
@@ -182,9 +200,11 @@ def _patch_entry_points(**groups):
         group_key = f"prompty.{group_suffix}"
         ep_map[group_key] = {}
         for name, cls in items:
-            ep_map[group_key][name] = _make_entry_point(name, cls)
+            ep_map[group_key][name] = _make_entry_point(name, cls, group_key)
 
     def fake_entry_points(group=None, name=None):
+        if group is None and name is None:
+            return _EntryPoints(ep for eps in ep_map.values() for ep in eps.values())
         if group not in ep_map:
             return []
         if name and name in ep_map[group]:
@@ -277,6 +297,84 @@ class TestDiscovery:
             assert r1 is not r2
 
 
+class TestDiscoveryIndex:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        yield
+        clear_registrations()
+        configure_discovery(cache_path=None)
+
+    def test_single_metadata_scan(self):
+        with _patch_entry_points(
+            renderers=[("jinja2", MockRenderer)],
+            parsers=[("prompty", MockParser)],
+            executors=[("openai", MockExecutor)],
+        ) as entry_points:
+            get_renderer("jinja2")
+            get_parser("prompty")
+            get_executor("openai")
+            with pytest.raises(InvokerError):
+                get_processor("missing")
+        assert entry_points.call_count == 1
+
+    def test_register_bypasses_metadata(self):
+        register_executor("custom", MockExecutor)
+        instance = MockProcessor()
+        register_processor("custom", instance)
+        with mock.patch(
+            "prompty.core.discovery.importlib.metadata.entry_points",
+            side_effect=AssertionError("metadata scanned"),
+        ):
+            assert isinstance(get_executor("custom"), MockExecutor)
+            assert get_processor("custom") is instance
+            # Registrations survive clear_cache()
+            clear_cache()
+            assert isinstance(get_executor("custom"), MockExecutor)
+
+    def test_registration_overrides_entry_point(self):
+        with _patch_entry_points(renderers=[("jinja2", MockRenderer)]):
+            assert isinstance(get_renderer("jinja2"), MockRenderer)
+            override = MockRenderer()
+            register_renderer("jinja2", override)
+            assert get_renderer("jinja2") is override
+
+    def test_disk_cache_skips_scan(self, tmp_path: Path):
+        cache = tmp_path / "discovery.json"
+        configure_discovery(cache_path=cache)
+        renderer = get_renderer("jinja2")
+        assert cache.exists()
+
+        refresh_index()
+        with mock.patch(
+            "prompty.core.discovery.importlib.metadata.entry_points",
+            side_effect=AssertionError("metadata scanned"),
+        ):
+            assert type(get_renderer("jinja2")) is type(renderer)
+
+    def test_clear_cache_keeps_index(self):
+        with _patch_entry_points(renderers=[("jinja2", MockRenderer)]) as entry_points:
+            r1 = get_renderer("jinja2")
+            clear_cache()
+            r2 = get_renderer("jinja2")
+        assert r1 is not r2
+        assert entry_points.call_count == 1
+
+    def test_refresh_index_rescans(self):
+        with _patch_entry_points(renderers=[("jinja2", MockRenderer)]) as entry_points:
+            get_renderer("jinja2")
+            refresh_index()
+            get_renderer("jinja2")
+        assert entry_points.call_count == 2
+
+    def test_disk_cache_stale_fingerprint_rescans(self, tmp_path: Path):
+        cache = tmp_path / "discovery.json"
+        cache.write_text('{"format": 1, "fingerprint": "stale", "groups": {}}', encoding="utf-8")
+        configure_discovery(cache_path=cache)
+        with _patch_entry_points(renderers=[("jinja2", MockRenderer)]) as entry_points:
+            assert isinstance(get_renderer("jinja2"), MockRenderer)
+        assert entry_points.call_count == 1
+
+
 # ---------------------------------------------------------------------------
 # Tests: Input validation
 # ---------------------------------------------------------------------------
@@ -504,6 +602,54 @@ class TestInjectThreadMarkers:
         assert result[1].name == "photo"
         assert result[1].kind == "image"
 
+    def test_multiple_markers_in_one_message(self):
+        """Every marker in a message is injected, in text order."""
+        history = "__PROMPTY_THREAD_0a1b_history__"
+        photo = "__PROMPTY_THREAD_2c3d_photo__"
+        clip = "__PROMPTY_THREAD_2c3d_photo_clip__"  # shares photo's head
+        messages = [Message(role="user", parts=[TextPart(value=f"A {photo}\nB {history} {clip} C {photo}")])]
+        nonces = {history: "history", photo: "photo", clip: "clip"}
+        rich = {"history": "thread", "photo": "image", "clip": "audio"}
+
+        result = _inject_thread_markers(messages, nonces, rich)
+        assert [r.text if isinstance(r, Message) else (r.name, r.kind) for r in result] == [
+            "A",
+            ("photo", "image"),
+            "B",
+            ("history", "thread"),
+            ("clip", "audio"),
+            "C",
+            ("photo", "image"),
+        ]
+
+    def test_markers_without_nonce_prefix(self):
+        """Hand-made markers of any shape are still found."""
+        messages = [Message(role="user", parts=[TextPart(value="x <<a>> y <<b>>")])]
+        result = _inject_thread_markers(messages, {"<<a>>": "a", "<<b>>": "b"}, {"a": "thread", "b": "thread"})
+        assert [r.text if isinstance(r, Message) else r.name for r in result] == ["x", "a", "y", "b"]
+
+    def test_finalize_matches_inject_then_expand(self):
+        """The fused pass equals injecting markers and then expanding them."""
+        marker = "__PROMPTY_THREAD_beef_history__"
+        image = "__PROMPTY_THREAD_f00d_photo__"
+        inputs = {
+            "history": [{"role": "user", "content": f"turn {i}"} for i in range(50)],
+            "photo": "https://example.com/cat.jpg",
+        }
+        rich = {"history": "thread", "photo": "image"}
+        nonces = {marker: "history", image: "photo"}
+
+        def parsed() -> list[Message]:
+            return [
+                Message(role="system", parts=[TextPart(value=f"Be brief.\n{marker}")]),
+                Message(role="user", parts=[TextPart(value=f"Look: {image} now")]),
+            ]
+
+        fused = _finalize_messages(parsed(), nonces, inputs, rich)
+        staged = _expand_thread_markers(_inject_thread_markers(parsed(), nonces, rich), inputs, rich)
+        assert fused == staged
+        assert len(fused) == 1 + 50 + 2
+
 
 # ---------------------------------------------------------------------------
 # Tests: Rich-kind nonce expansion (image, file, audio)
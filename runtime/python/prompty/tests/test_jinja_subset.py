@@ -8,6 +8,7 @@ locks the generated conformance goldens against drift, and re-runs the stock
 from __future__ import annotations
 
 import json
+from dataclasses import asdict
 from pathlib import Path
 
 import pytest
@@ -15,6 +16,8 @@ import pytest
 from prompty.jinja_subset import (
     StrictViolation,
     TemplateSyntaxError,
+    compile_template,
+    evaluator,
     parse_template,
     render,
     render_segments,
@@ -62,6 +65,47 @@ def test_corpus_jinja2_crosscheck_is_sound() -> None:
     assert problems == [], problems
 
 
+# --- compiled renderer vs. reference interpreter -----------------------------
+
+
+def test_segments_golden_matches_compiled_and_interpreter() -> None:
+    for entry in _load_golden("segments_golden.json"):
+        strict = entry.get("strict_props")
+        for impl in (render_segments, evaluator.render_segments):
+            if entry.get("throws") == "StrictViolation":
+                with pytest.raises(StrictViolation):
+                    impl(entry["template"], entry["inputs"], strict_props=strict)
+            else:
+                segs = impl(entry["template"], entry["inputs"], strict_props=strict)
+                assert [asdict(s) for s in segs] == entry["segments"], (impl.__module__, entry["name"])
+
+
+def test_interpreter_matches_render_golden() -> None:
+    for entry in _load_golden("render_golden.json"):
+        strict = entry.get("strict_props")
+        if entry.get("throws") == "StrictViolation":
+            with pytest.raises(StrictViolation):
+                evaluator.render(entry["template"], entry["inputs"], strict_props=strict)
+        else:
+            got = evaluator.render(entry["template"], entry["inputs"], strict_props=strict)
+            assert got == entry["rendered"], entry["name"]
+
+
+def test_compiled_template_is_cached_and_reusable() -> None:
+    template = "{% for x in xs %}{{ loop.index }}={{ x | upper }}{% if not loop.last %}, {% endif %}{% endfor %}"
+    compiled = compile_template(template)
+    assert compile_template(template) is compiled
+    assert compiled.render({"xs": ["a", "b"]}) == "1=A, 2=B"
+    assert compiled.render({"xs": ["c"]}) == "1=C"
+
+
+def test_compiled_for_does_not_leak_loop_scope() -> None:
+    template = "{% for x in xs %}{% for y in ys %}{{ x }}{{ y }}{{ loop.index }} {% endfor %}{{ loop.index }}|{% endfor %}[{{ x }}]"
+    inputs = {"xs": [1, 2], "ys": ["a", "b"], "x": "outer"}
+    assert render(template, inputs) == evaluator.render(template, inputs) == "1a1 1b2 1|2a1 2b2 2|[outer]"
+    assert "loop" not in inputs
+
+
 # --- tokenizer / trim --------------------------------------------------------
 
 
@@ -7,7 +7,7 @@ from pathlib import Path
 
 import pytest
 
-from prompty import load
+from prompty import agent_cache_info, clear_agent_cache, configure_agent_cache, load
 from prompty.model import (
     Agent,
     ApiKeyConnection,
@@ -519,3 +519,103 @@ class TestAsyncLoading:
 
         with pytest.raises(FileNotFoundError):
             await load_async(PROMPTS / "nonexistent.prompty")
+
+
+# ---------------------------------------------------------------------------
+# Parsed-agent cache
+# ---------------------------------------------------------------------------
+
+
+def _write(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    # Bump mtime explicitly so back-to-back writes are distinguishable
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestAgentCache:
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        clear_agent_cache()
+        yield
+        clear_agent_cache()
+
+    def test_hit_returns_independent_copy(self, tmp_path: Path):
+        prompt = tmp_path / "p.prompty"
+        _write(prompt, "---\nname: cached\nmodel: gpt-4\n---\nuser:\nhi")
+
+        first = load(prompt)
+        first.name = "mutated"
+        first.metadata["extra"] = True
+        second = load(prompt)
+
+        assert second.name == "cached"
+        assert "extra" not in second.metadata
+        info = agent_cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_file_change_invalidates(self, tmp_path: Path):
+        prompt = tmp_path / "p.prompty"
+        _write(prompt, "---\nname: v1\n---\nhello")
+        assert load(prompt).name == "v1"
+
+        _write(prompt, "---\nname: v2\n---\nhello")
+
+        assert load(prompt).name == "v2"
+        assert agent_cache_info().hits == 0
+
+    def test_included_file_change_invalidates(self, tmp_path: Path):
+        shared = tmp_path / "desc.txt"
+        _write(shared, "first")
+        prompt = tmp_path / "p.prompty"
+        _write(prompt, "---\nname: inc\ndescription: ${file:desc.txt}\n---\nhello")
+        assert load(prompt).description == "first"
+        assert load(prompt).description == "first"
+
+        _write(shared, "second")
+
+        assert load(prompt).description == "second"
+
+    def test_env_change_invalidates(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        prompt = tmp_path / "p.prompty"
+        _write(prompt, "---\nname: env\ndescription: ${env:PROMPTY_CACHE_TEST:fallback}\n---\nhello")
+        monkeypatch.delenv("PROMPTY_CACHE_TEST", raising=False)
+        assert load(prompt).description == "fallback"
+
+        monkeypatch.setenv("PROMPTY_CACHE_TEST", "set")
+
+        assert load(prompt).description == "set"
+
+    def test_keyed_by_allowed_roots(self, tmp_path: Path):
+        prompt = tmp_path / "p.prompty"
+        _write(prompt, "---\nname: roots\n---\nhello")
+
+        load(prompt)
+        agent = load(prompt, allowed_file_roots=[tmp_path / "shared"])
+
+        assert agent.metadata["__allowed_file_roots"] == [str(tmp_path / "shared")]
+        assert agent_cache_info().misses == 2
+
+    def test_disabled(self, tmp_path: Path):
+        prompt = tmp_path / "p.prompty"
+        _write(prompt, "---\nname: off\n---\nhello")
+        configure_agent_cache(max_size=0)
+        try:
+            load(prompt)
+            load(prompt)
+            assert agent_cache_info().currsize == 0
+        finally:
+            configure_agent_cache(max_size=128)
+
+    @pytest.mark.asyncio
+    async def test_shared_with_load_async(self, tmp_path: Path):
+        from prompty import load_async
+
+        prompt = tmp_path / "p.prompty"
+        _write(prompt, "---\nname: both\n---\nhello")
+
+        load(prompt)
+        agent = await load_async(prompt)
+
+        assert agent.name == "both"
+        assert agent_cache_info().hits == 1
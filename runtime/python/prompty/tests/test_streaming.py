@@ -7,6 +7,17 @@ from collections.abc import Iterator
 import pytest
 
 from prompty.core.types import AsyncPromptyStream, PromptyStream
+from prompty.tracing.stream import configure_stream_tracing, stream_capture_enabled
+
+
+@pytest.fixture
+def capture_chunks():
+    """Keep raw chunks in ``stream.items`` (off by default)."""
+    previous = stream_capture_enabled()
+    configure_stream_tracing(capture_chunks=True)
+    yield
+    configure_stream_tracing(capture_chunks=previous)
+
 
 # ---------------------------------------------------------------------------
 # PromptyStream (sync)
@@ -20,7 +31,7 @@ class TestPromptyStream:
         result = list(stream)
         assert result == [1, 2, 3]
 
-    def test_accumulates_items(self):
+    def test_accumulates_items(self, capture_chunks):
         source = iter(["a", "b", "c"])
         stream = PromptyStream("test", source)
         list(stream)  # exhaust
@@ -33,7 +44,7 @@ class TestPromptyStream:
         assert result == []
         assert stream.items == []
 
-    def test_partial_consumption(self):
+    def test_partial_consumption(self, capture_chunks):
         source = iter([1, 2, 3])
         stream = PromptyStream("test", source)
         first = next(stream)
@@ -50,7 +61,14 @@ class TestPromptyStream:
         stream = PromptyStream("my_executor", iter([]))
         assert stream.name == "my_executor"
 
-    def test_reusable_as_for_loop(self):
+    def test_chunks_not_kept_by_default(self):
+        stream = PromptyStream("test", iter(["a", "b"]))
+        assert list(stream) == ["a", "b"]
+        assert stream.items == []
+        assert stream.summary.chunks == 2
+        assert stream.summary.text == "ab"
+
+    def test_reusable_as_for_loop(self, capture_chunks):
         source = iter(range(5))
         stream = PromptyStream("test", source)
         collected = []
@@ -92,7 +110,7 @@ class TestAsyncPromptyStream:
         assert result == [10, 20, 30]
 
     @pytest.mark.asyncio
-    async def test_accumulates_items(self):
+    async def test_accumulates_items(self, capture_chunks):
         source = _AsyncIter(["x", "y"])
         stream = AsyncPromptyStream("test", source)
         _ = [item async for item in stream]
@@ -107,7 +125,7 @@ class TestAsyncPromptyStream:
         assert stream.items == []
 
     @pytest.mark.asyncio
-    async def test_partial_async_consumption(self):
+    async def test_partial_async_consumption(self, capture_chunks):
         source = _AsyncIter([1, 2, 3])
         stream = AsyncPromptyStream("test", source)
         first = await stream.__anext__()
@@ -386,3 +404,233 @@ class TestStreamingEmptyChunks:
         chunks = [_mock_empty_chunk(), _mock_empty_chunk()]
         result = list(_stream_generator(iter(chunks)))
         assert result == []
+
+
+# ---------------------------------------------------------------------------
+# Streaming: early tool-call completion
+# ---------------------------------------------------------------------------
+
+
+class TestEarlyToolCalls:
+    def test_openai_call_yielded_when_next_index_starts(self):
+        """A call is released as soon as the next index starts, before later text."""
+        from prompty.providers.openai.processor import ToolCall, _stream_generator
+
+        chunks = [
+            _mock_tool_call_chunk(0, tc_id="call_1", name="a", arguments='{"x":'),
+            _mock_tool_call_chunk(0, arguments=" 1}"),
+            _mock_tool_call_chunk(1, tc_id="call_2", name="b", arguments="{}"),
+            _mock_stream_chunk("done"),
+        ]
+        result = list(_stream_generator(iter(chunks)))
+        assert result == [
+            ToolCall(id="call_1", name="a", arguments='{"x": 1}'),
+            "done",
+            ToolCall(id="call_2", name="b", arguments="{}"),
+        ]
+
+    def test_openai_incomplete_arguments_wait_for_end(self):
+        """Interleaved calls (arguments not yet valid JSON) are held, preserving order."""
+        from prompty.providers.openai.processor import _stream_generator
+
+        chunks = [
+            _mock_tool_call_chunk(0, tc_id="call_1", name="a", arguments='{"x":'),
+            _mock_tool_call_chunk(1, tc_id="call_2", name="b", arguments="{}"),
+            _mock_tool_call_chunk(2, tc_id="call_3", name="c", arguments="{}"),
+            _mock_stream_chunk("text"),
+            _mock_tool_call_chunk(0, arguments=" 1}"),
+        ]
+        result = list(_stream_generator(iter(chunks)))
+        assert result[0] == "text"
+        assert [tc.id for tc in result[1:]] == ["call_1", "call_2", "call_3"]
+
+    def test_openai_empty_delta_after_release_ignored(self):
+        """A trailing empty or id-only delta for a released index does not abort the stream."""
+        from prompty.providers.openai.processor import ToolCall, _stream_generator
+
+        chunks = [
+            _mock_tool_call_chunk(0, tc_id="call_1", name="a", arguments='{"x":1}'),
+            _mock_tool_call_chunk(1, tc_id="call_2", name="b", arguments="{}"),
+            _mock_tool_call_chunk(0, arguments=""),
+            _mock_tool_call_chunk(0, tc_id="call_1"),
+        ]
+        result = list(_stream_generator(iter(chunks)))
+        assert result == [
+            ToolCall(id="call_1", name="a", arguments='{"x":1}'),
+            ToolCall(id="call_2", name="b", arguments="{}"),
+        ]
+
+    def test_openai_fragment_after_release_raises(self):
+        """A real fragment for an already released call fails the stream instead of being dropped."""
+        from prompty.providers.openai.processor import ToolCall, _stream_generator
+
+        chunks = [
+            _mock_tool_call_chunk(0, tc_id="call_1", name="a", arguments="{}"),
+            _mock_tool_call_chunk(1, tc_id="call_2", name="b", arguments="{}"),
+            _mock_tool_call_chunk(0, arguments='{"late": 1}'),
+            _mock_tool_call_chunk(2, tc_id="call_3", name="c", arguments="{}"),
+        ]
+        stream = _stream_generator(iter(chunks))
+        assert next(stream) == ToolCall(id="call_1", name="a", arguments="{}")
+        with pytest.raises(ValueError, match="index 0 received more arguments"):
+            next(stream)
+
+    @pytest.mark.asyncio
+    async def test_async_openai_fragment_after_release_raises(self):
+        from prompty.providers.openai.processor import _async_stream_generator
+
+        chunks = [
+            _mock_tool_call_chunk(0, tc_id="call_1", name="a", arguments="{}"),
+            _mock_tool_call_chunk(1, tc_id="call_2", name="b", arguments="{}"),
+            _mock_tool_call_chunk(0, arguments="{}"),
+        ]
+        with pytest.raises(ValueError, match="index 0 received more arguments"):
+            [item async for item in _async_stream_generator(_AsyncIter(chunks))]
+
+    def test_anthropic_call_yielded_at_block_stop(self):
+        from prompty.providers.anthropic.processor import _stream_generator
+        from prompty.providers.openai.processor import ToolCall
+
+        events = [
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "tool_use", "id": "t1", "name": "a"}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "input_json_delta", "partial_json": '{"x"'}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "input_json_delta", "partial_json": ": 1}"}},
+            {"type": "content_block_stop", "index": 0},
+            {"type": "content_block_start", "index": 1, "content_block": {"type": "tool_use", "id": "t2", "name": "b"}},
+            {"type": "content_block_delta", "index": 2, "delta": {"type": "text_delta", "text": "later"}},
+        ]
+        result = list(_stream_generator(iter(events)))
+        assert result == [
+            ToolCall(id="t1", name="a", arguments='{"x": 1}'),
+            "later",
+            ToolCall(id="t2", name="b", arguments=""),
+        ]
+
+
+def _early_agent():
+    from prompty.model import Agent
+
+    return Agent.load(
+        {
+            "name": "early",
+            "model": {"id": "gpt-4", "provider": "openai", "connection": {"kind": "key", "apiKey": "k"}},
+        }
+    )
+
+
+def _two_call_stream(first_started, seen: list[str]) -> Iterator:
+    """Stream two tool calls; before finishing, wait until the first tool has started."""
+    yield _mock_tool_call_chunk(0, tc_id="call_1", name="lookup", arguments='{"q": "a"}')
+    yield _mock_tool_call_chunk(1, tc_id="call_2", name="lookup", arguments='{"q":')
+    seen.append("started" if first_started() else "not started")
+    yield _mock_tool_call_chunk(1, arguments=' "b"}')
+
+
+class TestEarlyToolDispatch:
+    def test_turn_starts_tool_before_stream_ends(self):
+        import threading
+        from unittest.mock import patch
+
+        from prompty.core.pipeline import turn
+        from prompty.core.types import Message, TextPart
+
+        started = threading.Event()
+        seen: list[str] = []
+
+        def lookup(q: str) -> str:
+            started.set()
+            return f"result {q}"
+
+        responses = [
+            PromptyStream("s", _two_call_stream(lambda: started.wait(5), seen)),
+            PromptyStream("s", iter([_mock_stream_chunk("final")])),
+        ]
+        captured: list[list[Message]] = []
+
+        def fake_invoke(agent, messages, *args, **kwargs):
+            captured.append(list(messages))
+            return responses.pop(0)
+
+        with (
+            patch("prompty.core.pipeline.prepare", return_value=[Message(role="user", parts=[TextPart(value="q")])]),
+            patch("prompty.core.pipeline._invoke_with_retry", side_effect=fake_invoke),
+        ):
+            result = turn(_early_agent(), {}, tools={"lookup": lookup}, parallel_tool_calls=True)
+
+        assert result == "final"
+        assert seen == ["started"]
+        # Results are committed in model order
+        tool_msgs = [m for m in captured[1] if m.role == "tool"]
+        assert [m.text for m in tool_msgs] == ["result a", "result b"]
+
+    @pytest.mark.asyncio
+    async def test_turn_async_starts_tool_before_stream_ends(self):
+        import asyncio
+        from unittest.mock import patch
+
+        from prompty.core.pipeline import turn_async
+        from prompty.core.types import Message, TextPart
+
+        order: list[str] = []
+
+        async def lookup(q: str) -> str:
+            order.append(f"tool {q}")
+            return f"result {q}"
+
+        async def first_stream():
+            yield _mock_tool_call_chunk(0, tc_id="call_1", name="lookup", arguments='{"q": "a"}')
+            yield _mock_tool_call_chunk(1, tc_id="call_2", name="lookup", arguments='{"q":')
+            await asyncio.sleep(0.01)
+            order.append("stream end")
+            yield _mock_tool_call_chunk(1, arguments=' "b"}')
+
+        responses = [
+            AsyncPromptyStream("s", first_stream()),
+            AsyncPromptyStream("s", _AsyncIter([_mock_stream_chunk("final")])),
+        ]
+        captured: list[list[Message]] = []
+
+        async def fake_invoke(agent, messages, *args, **kwargs):
+            captured.append(list(messages))
+            return responses.pop(0)
+
+        with (
+            patch(
+                "prompty.core.pipeline.prepare_async", return_value=[Message(role="user", parts=[TextPart(value="q")])]
+            ),
+            patch("prompty.core.pipeline._invoke_with_retry_async", side_effect=fake_invoke),
+        ):
+            result = await turn_async(_early_agent(), {}, tools={"lookup": lookup})
+
+        assert result == "final"
+        assert order == ["tool a", "stream end", "tool b"]
+        assert [m.text for m in captured[1] if m.role == "tool"] == ["result a", "result b"]
+
+    def test_guardrails_disable_early_dispatch(self):
+        import threading
+        from unittest.mock import patch
+
+        from prompty.core.guardrails import Guardrails
+        from prompty.core.pipeline import turn
+        from prompty.core.types import Message, TextPart
+
+        started = threading.Event()
+        seen: list[str] = []
+
+        def lookup(q: str) -> str:
+            started.set()
+            return f"result {q}"
+
+        responses = [
+            PromptyStream("s", _two_call_stream(lambda: started.is_set(), seen)),
+            PromptyStream("s", iter([_mock_stream_chunk("final")])),
+        ]
+        with (
+            patch("prompty.core.pipeline.prepare", return_value=[Message(role="user", parts=[TextPart(value="q")])]),
+            patch("prompty.core.pipeline._invoke_with_retry", side_effect=lambda *a, **k: responses.pop(0)),
+        ):
+            result = turn(
+                _early_agent(), {}, tools={"lookup": lookup}, parallel_tool_calls=True, guardrails=Guardrails()
+            )
+        assert result == "final"
+        assert seen == ["not started"]
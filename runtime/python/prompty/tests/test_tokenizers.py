@@ -0,0 +1,158 @@
+"""Tests for token-based context budgets (core/tokenizers.py, core/context.py)."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from prompty.core.context import estimate_tokens, trim_to_context_window
+from prompty.core.pipeline import _resolve_context_budget, turn
+from prompty.core.tokenizers import (
+    ApproximateTokenizer,
+    TiktokenTokenizer,
+    Tokenizer,
+    context_window,
+    get_tokenizer,
+)
+from prompty.core.types import ImagePart, Message, TextPart
+from prompty.model import Agent
+
+_PIPELINE = "prompty.core.pipeline"
+
+
+class _WordTokenizer:
+    """One token per whitespace-separated word; counts its calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return len(text.split())
+
+
+def _agent(model_id: str = "gpt-4o", provider: str = "openai", **options: Any) -> Agent:
+    model: dict[str, Any] = {
+        "id": model_id,
+        "provider": provider,
+        "connection": {"kind": "key", "apiKey": "test-key"},
+    }
+    if options:
+        model["options"] = options
+    return Agent.load({"name": "t", "model": model})
+
+
+class TestTokenizers:
+    def test_approximate_counts_words_and_punctuation(self):
+        tok = ApproximateTokenizer()
+        assert tok.count("") == 0
+        assert tok.count("hello") == 2
+        assert tok.count("a, b.") == 4
+        # Punctuation-heavy content costs more than len / 4
+        assert tok.count('{"a":1,"b":2}') > len('{"a":1,"b":2}') // 4
+
+    def test_approximate_rejects_bad_ratio(self):
+        with pytest.raises(ValueError):
+            ApproximateTokenizer(chars_per_token=0)
+
+    def test_protocol(self):
+        assert isinstance(ApproximateTokenizer(), Tokenizer)
+        assert isinstance(_WordTokenizer(), Tokenizer)
+
+    def test_default_falls_back_offline(self):
+        get_tokenizer.cache_clear()
+        try:
+            with patch.dict("sys.modules", {"tiktoken": None}):
+                assert isinstance(get_tokenizer("gpt-4o", "openai"), ApproximateTokenizer)
+        finally:
+            get_tokenizer.cache_clear()
+        assert isinstance(get_tokenizer("claude-3", "anthropic"), ApproximateTokenizer)
+
+    def test_tiktoken_when_installed(self):
+        pytest.importorskip("tiktoken")
+        try:
+            tok = TiktokenTokenizer("o200k_base")
+        except Exception:  # encoding data may need a download
+            pytest.skip("tiktoken encoding data unavailable")
+        assert tok.count("hello world") == 2
+
+    def test_context_window_lookup(self):
+        assert context_window("gpt-4o-2024-08-06", "openai") == 128000
+        # Foundry deployments of OpenAI models fall back to the openai entries
+        assert context_window("gpt-4o", "foundry") == 128000
+        assert context_window("no-such-model", "openai") is None
+        assert context_window(None, "openai") is None
+
+
+class TestTokenBudget:
+    def test_estimate_tokens_uses_tokenizer_and_part_estimates(self):
+        tok = _WordTokenizer()
+        text = Message(role="user", parts=[TextPart(value="one two three")])
+        image = Message(role="user", parts=[ImagePart(source="https://x/img.png")])
+        assert estimate_tokens([text], tok) == 4 + 3
+        # Images are far more than the 200-char (~50 token) character estimate
+        assert estimate_tokens([image], tok) > 500
+
+    def test_token_counts_cached_until_content_changes(self):
+        tok = _WordTokenizer()
+        msg = Message(role="user", parts=[TextPart(value="one two")])
+        estimate_tokens([msg], tok)
+        estimate_tokens([msg], tok)
+        assert tok.calls == 1
+        msg.parts[0].value = "one two three"
+        assert estimate_tokens([msg], tok) == 4 + 3
+        assert tok.calls == 2
+        # A different tokenizer is not served from the cache
+        other = _WordTokenizer()
+        estimate_tokens([msg], other)
+        assert other.calls == 1
+
+    def test_token_counts_track_in_place_tool_call_edits(self):
+        tok = _WordTokenizer()
+        tool_calls = [{"id": "1", "name": "f", "arguments": "{}"}]
+        msg = Message(role="assistant", parts=[], metadata={"tool_calls": tool_calls})
+        before = estimate_tokens([msg], tok)
+        assert estimate_tokens([msg], tok) == before
+        tool_calls[0]["arguments"] = " ".join(["word"] * 30)
+        assert estimate_tokens([msg], tok) == before + 29
+
+    def test_trim_by_tokens(self):
+        tok = _WordTokenizer()
+        msgs = [Message(role="system", parts=[TextPart(value="sys")])]
+        msgs += [Message(role="user", parts=[TextPart(value="word " * 100)]) for _ in range(5)]
+        dropped_count, _ = trim_to_context_window(msgs, 250, tokenizer=tok)
+        assert dropped_count == 3
+        assert msgs[0].role == "system"
+        # Nothing to trim when the budget fits
+        assert trim_to_context_window(msgs, 10_000, tokenizer=tok) == (0, [])
+
+    def test_resolve_auto_budget(self):
+        budget, tok = _resolve_context_budget(_agent(maxOutputTokens=4000), "auto", None)
+        assert budget == 128000 - 4000
+        assert tok is get_tokenizer("gpt-4o", "openai")
+
+    def test_resolve_auto_keeps_explicit_tokenizer(self):
+        tok = _WordTokenizer()
+        _, resolved = _resolve_context_budget(_agent(), "auto", tok)
+        assert resolved is tok
+
+    def test_resolve_auto_unknown_model_raises(self):
+        with pytest.raises(ValueError, match="context window"):
+            _resolve_context_budget(_agent("mystery"), "auto", None)
+
+    @patch(f"{_PIPELINE}._invoke_executor")
+    @patch(f"{_PIPELINE}.process", return_value="ok")
+    def test_turn_trims_by_tokens(self, mock_process, mock_exec):
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.tool_calls = None
+        mock_exec.return_value = response
+        msgs = [Message(role="user", parts=[TextPart(value="word " * 100)]) for _ in range(5)]
+
+        with patch(f"{_PIPELINE}.prepare", return_value=msgs):
+            turn(_agent(), {}, context_budget=250, tokenizer=_WordTokenizer())
+
+        sent = mock_exec.call_args[0][1]
+        assert any("[Context summary:" in (m.text or "") for m in sent)
@@ -0,0 +1,336 @@
+"""Tests for the tool result cache (prompty.core.tool_cache).
+
+Covers:
+- Opt-in via @tool(cache_ttl=...), canonical argument keys, TTL expiry
+- Raised errors and non-serializable arguments are not cached
+- Functions sharing a tool name, closures and bound methods get separate entries
+- Hit/miss events, sync and async dispatch, bindings in the key
+- Guardrails: denied calls skip the cache, rewrites change the key
+- Custom stores and configuration
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from prompty.core.guardrails import GuardrailResult, Guardrails
+from prompty.core.pipeline import _dispatch_tools_with_extensions
+from prompty.core.tool_cache import (
+    MemoryToolCache,
+    ToolCacheStore,
+    clear_tool_cache,
+    configure_tool_cache,
+    get_tool_cache,
+    tool_cache_info,
+    tool_cache_key,
+)
+from prompty.core.tool_decorator import tool
+from prompty.core.tool_dispatch import clear_tools, dispatch_tool, dispatch_tool_async
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    clear_tools()
+    configure_tool_cache(max_size=1024)
+    yield
+    clear_tools()
+    configure_tool_cache(max_size=1024)
+
+
+class _Counter:
+    """A cacheable tool that counts how often it really runs."""
+
+    def __init__(self, ttl: float = 60) -> None:
+        self.calls = 0
+
+        @tool(cache_ttl=ttl, register=False)
+        def search(query: str, limit: int = 3) -> str:
+            self.calls += 1
+            return f"{query}:{limit}:{self.calls}"
+
+        self.fn = search
+        self.tools = {"search": search}
+
+
+def _events() -> tuple[list[tuple[str, dict]], Any]:
+    events: list[tuple[str, dict]] = []
+    return events, lambda event_type, data: events.append((event_type, data))
+
+
+class TestDispatch:
+    def test_repeat_call_hits_cache(self):
+        counter = _Counter()
+        first = dispatch_tool("search", '{"query": "q", "limit": 2}', counter.tools, None, {})
+        second = dispatch_tool("search", '{"limit": 2, "query": "q"}', counter.tools, None, {})
+        assert first == second == "q:2:1"
+        assert counter.calls == 1
+
+    def test_different_arguments_miss(self):
+        counter = _Counter()
+        dispatch_tool("search", '{"query": "a"}', counter.tools, None, {})
+        dispatch_tool("search", '{"query": "b"}', counter.tools, None, {})
+        assert counter.calls == 2
+
+    def test_not_opted_in(self):
+        calls = 0
+
+        def plain() -> str:
+            nonlocal calls
+            calls += 1
+            return "x"
+
+        dispatch_tool("plain", "{}", {"plain": plain}, None, {})
+        dispatch_tool("plain", "{}", {"plain": plain}, None, {})
+        assert calls == 2
+        assert tool_cache_info().currsize == 0
+
+    def test_errors_not_cached(self):
+        calls = 0
+
+        @tool(cache_ttl=60, register=False)
+        def flaky() -> str:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("down")
+            return "ok"
+
+        assert dispatch_tool("flaky", "{}", {"flaky": flaky}, None, {}).startswith("Error calling")
+        assert dispatch_tool("flaky", "{}", {"flaky": flaky}, None, {}) == "ok"
+        assert dispatch_tool("flaky", "{}", {"flaky": flaky}, None, {}) == "ok"
+        assert calls == 2
+
+    def test_returned_strings_cached(self):
+        """Only a raised exception marks a failure; a result that reads like one is cached."""
+        calls = 0
+
+        @tool(cache_ttl=60, register=False)
+        def codes() -> str:
+            nonlocal calls
+            calls += 1
+            return "Error codes: E1 timeout, E2 quota"
+
+        for _ in range(2):
+            assert dispatch_tool("codes", "{}", {"codes": codes}, None, {}) == "Error codes: E1 timeout, E2 quota"
+        assert calls == 1
+
+    def test_same_name_different_functions(self):
+        @tool(name="lookup", cache_ttl=60, register=False)
+        def lookup_users(id: str) -> str:
+            return f"user {id}"
+
+        @tool(name="lookup", cache_ttl=60, register=False)
+        def lookup_orders(id: str) -> str:
+            return f"order {id}"
+
+        assert dispatch_tool("lookup", '{"id": "1"}', {"lookup": lookup_users}, None, {}) == "user 1"
+        assert dispatch_tool("lookup", '{"id": "1"}', {"lookup": lookup_orders}, None, {}) == "order 1"
+
+    def test_closures_from_one_factory(self):
+        def make_tool(tenant: str):
+            @tool(name="whoami", cache_ttl=60, register=False)
+            def whoami() -> str:
+                return tenant
+
+            return whoami
+
+        acme, globex = make_tool("acme"), make_tool("globex")
+        assert dispatch_tool("whoami", "{}", {"whoami": acme}, None, {}) == "acme"
+        assert dispatch_tool("whoami", "{}", {"whoami": globex}, None, {}) == "globex"
+        assert dispatch_tool("whoami", "{}", {"whoami": acme}, None, {}) == "acme"
+
+    def test_bound_methods_of_different_instances(self):
+        class Tenant:
+            def __init__(self, name: str) -> None:
+                self.name = name
+                self.calls = 0
+
+            @tool(name="whoami", cache_ttl=60, register=False)
+            def whoami(self) -> str:
+                self.calls += 1
+                return self.name
+
+        acme, globex = Tenant("acme"), Tenant("globex")
+        assert dispatch_tool("whoami", "{}", {"whoami": acme.whoami}, None, {}) == "acme"
+        assert dispatch_tool("whoami", "{}", {"whoami": globex.whoami}, None, {}) == "globex"
+        # A fresh bound method of the same instance still hits
+        assert dispatch_tool("whoami", "{}", {"whoami": acme.whoami}, None, {}) == "acme"
+        assert (acme.calls, globex.calls) == (1, 1)
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("prompty.core.tool_cache.time.monotonic", lambda: now[0])
+        counter = _Counter(ttl=10)
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        now[0] = 109.0
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        now[0] = 111.0
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        assert counter.calls == 2
+
+    def test_registered_tool(self):
+        calls = 0
+
+        @tool(cache_ttl=60)
+        def lookup(key: str) -> str:
+            nonlocal calls
+            calls += 1
+            return key
+
+        dispatch_tool("lookup", '{"key": "k"}', {}, None, {})
+        dispatch_tool("lookup", '{"key": "k"}', {}, None, {})
+        assert calls == 1
+
+    def test_hit_miss_events(self):
+        counter = _Counter()
+        events, on_event = _events()
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {}, on_event=on_event)
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {}, on_event=on_event)
+        assert [t for t, _ in events] == ["tool_cache_miss", "tool_cache_hit"]
+        assert events[1][1]["name"] == "search"
+        assert events[1][1]["key"] == tool_cache_key("search", {"query": "q"}, counter.fn)
+
+    def test_bindings_are_part_of_key(self, monkeypatch):
+        counter = _Counter()
+        monkeypatch.setattr(
+            "prompty.core.tool_dispatch._resolve_bindings_safe",
+            lambda agent, name, args, inputs: {**args, "limit": inputs["limit"]},
+        )
+        agent = SimpleNamespace(tools=[])
+        assert dispatch_tool("search", '{"query": "q"}', counter.tools, agent, {"limit": 1}) == "q:1:1"
+        assert dispatch_tool("search", '{"query": "q"}', counter.tools, agent, {"limit": 5}) == "q:5:2"
+        assert dispatch_tool("search", '{"query": "q"}', counter.tools, agent, {"limit": 1}) == "q:1:1"
+
+    @pytest.mark.asyncio
+    async def test_async_dispatch(self):
+        counter = _Counter()
+        first = await dispatch_tool_async("search", '{"query": "q"}', counter.tools, None, {})
+        second = dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        assert first == second == "q:3:1"
+        assert counter.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_async_tool(self):
+        calls = 0
+
+        @tool(cache_ttl=60, register=False)
+        async def fetch(url: str) -> str:
+            nonlocal calls
+            calls += 1
+            return url
+
+        for _ in range(3):
+            assert await dispatch_tool_async("fetch", '{"url": "u"}', {"fetch": fetch}, None, {}) == "u"
+        assert calls == 1
+
+
+class TestGuardrails:
+    def _calls(self, *arguments: str) -> list[Any]:
+        return [SimpleNamespace(id=f"c{i}", name="search", arguments=a) for i, a in enumerate(arguments)]
+
+    def test_denied_call_skips_cache(self):
+        counter = _Counter()
+        guardrails = Guardrails(tool=lambda name, args: GuardrailResult(allowed=args["query"] != "secret", reason="no"))
+        dispatch_tool("search", '{"query": "secret"}', counter.tools, None, {})
+        events, on_event = _events()
+        results = _dispatch_tools_with_extensions(
+            self._calls('{"query": "secret"}'), counter.tools, None, {}, on_event=on_event, guardrails=guardrails
+        )
+        assert results == ["Tool denied by guardrail: no"]
+        assert "tool_cache_hit" not in [t for t, _ in events]
+
+    def test_cached_result_reported_like_fresh(self):
+        counter = _Counter()
+        guardrails = Guardrails(tool=lambda name, args: GuardrailResult(allowed=True, rewrite={"query": "safe"}))
+        events, on_event = _events()
+        results = _dispatch_tools_with_extensions(
+            self._calls('{"query": "a"}', '{"query": "b"}'),
+            counter.tools,
+            None,
+            {},
+            on_event=on_event,
+            guardrails=guardrails,
+        )
+        assert results == ["safe:3:1", "safe:3:1"]
+        assert counter.calls == 1
+        tool_results = [d["result"] for t, d in events if t == "tool_result"]
+        assert tool_results == results
+
+
+def _key_fn() -> None:
+    """Referenced by TestStore.test_key_is_canonical for its qualified name."""
+
+
+class TestStore:
+    def test_key_is_canonical(self):
+        assert tool_cache_key("t", {"b": [1, 2], "a": "é"}) == 't:{"a":"é","b":[1,2]}'
+        assert tool_cache_key("t", {"x": object()}) is None
+        key = tool_cache_key("t", {}, _key_fn)
+        assert key.startswith(f"t@{__name__}._key_fn#") and key.endswith(":{}")
+        assert tool_cache_key("t", {}, _key_fn) == key
+
+    def test_unserializable_arguments_not_cached(self, monkeypatch):
+        counter = _Counter()
+        monkeypatch.setattr(
+            "prompty.core.tool_dispatch._resolve_bindings_safe",
+            lambda agent, name, args, inputs: {**args, "limit": inputs["limit"]},
+        )
+        agent = SimpleNamespace(tools=[])
+        for _ in range(2):
+            dispatch_tool("search", '{"query": "q"}', counter.tools, agent, {"limit": object()})
+        assert counter.calls == 2
+
+    def test_lru_bound(self):
+        store = MemoryToolCache(max_size=2)
+        for key in "abc":
+            store.set(key, key, 60)
+        assert store.get("a") is None and store.get("c") == "c"
+        assert store.info().evictions == 1
+
+    def test_custom_store(self):
+        class DictStore:
+            def __init__(self) -> None:
+                self.data: dict[str, tuple[str, float]] = {}
+
+            def get(self, key: str) -> str | None:
+                entry = self.data.get(key)
+                return entry[0] if entry else None
+
+            def set(self, key: str, value: str, ttl: float) -> None:
+                self.data[key] = (value, ttl)
+
+            def clear(self) -> None:
+                self.data.clear()
+
+        store = DictStore()
+        assert isinstance(store, ToolCacheStore)
+        configure_tool_cache(store=store)
+        counter = _Counter(ttl=30)
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        assert counter.calls == 1
+        assert store.data == {tool_cache_key("search", {"query": "q"}, counter.fn): ("q:3:1", 30)}
+        assert get_tool_cache() is store and tool_cache_info() is None
+
+    def test_configure(self):
+        with pytest.raises(ValueError):
+            configure_tool_cache(store=MemoryToolCache(), max_size=1)
+        configure_tool_cache(max_size=0)
+        counter = _Counter()
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        assert counter.calls == 2
+
+    def test_clear(self):
+        counter = _Counter()
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        clear_tool_cache()
+        dispatch_tool("search", '{"query": "q"}', counter.tools, None, {})
+        assert counter.calls == 2
+
+    def test_invalid_ttl(self):
+        with pytest.raises(ValueError, match="cache_ttl"):
+            tool(cache_ttl=0)
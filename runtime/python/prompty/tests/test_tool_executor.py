@@ -0,0 +1,376 @@
+"""Tests for the shared tool executor (prompty.core.tool_executor).
+
+Covers:
+- Sync tools run off the event loop (thread pool), with contextvars
+- cpu_bound tools on the process pool
+- Per-tool timeout and max_concurrency, surfaced through dispatch_tool_async
+- turn()'s shared bounded pool: global and per-tool limits, timeouts as
+  error results, cancellation of waiting calls, tool_queue events
+- @tool options, async tools staying coroutine functions, configuration
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from prompty.core.cancellation import CancellationToken, CancelledError
+from prompty.core.pipeline import _dispatch_tools_with_extensions
+from prompty.core.tool_decorator import tool
+from prompty.core.tool_dispatch import clear_tools, dispatch_tool_async
+from prompty.core.tool_executor import (
+    ToolExecutor,
+    ToolOptions,
+    configure_tool_executor,
+    get_tool_executor,
+    get_tool_options,
+)
+
+_request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+
+@tool(cpu_bound=True, register=False)
+def _pid_tool() -> int:
+    return os.getpid()
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    clear_tools()
+    yield
+    clear_tools()
+    configure_tool_executor(offload=True)
+
+
+class TestOffload:
+    @pytest.mark.asyncio
+    async def test_sync_tool_runs_off_loop(self):
+        loop_thread = threading.get_ident()
+
+        def where() -> int:
+            return threading.get_ident()
+
+        result = await dispatch_tool_async("where", "{}", {"where": where}, None, {})
+        assert int(result) != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive(self):
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        def blocking() -> str:
+            time.sleep(0.1)
+            return "done"
+
+        task = asyncio.create_task(ticker())
+        try:
+            assert await dispatch_tool_async("blocking", "{}", {"blocking": blocking}, None, {}) == "done"
+        finally:
+            task.cancel()
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_contextvars_propagate(self):
+        _request_id.set("req-42")
+        result = await dispatch_tool_async("rid", "{}", {"rid": lambda: _request_id.get()}, None, {})
+        assert result == "req-42"
+
+    @pytest.mark.asyncio
+    async def test_offload_disabled_runs_inline(self):
+        configure_tool_executor(offload=False)
+        loop_thread = threading.get_ident()
+        result = await dispatch_tool_async("where", "{}", {"where": threading.get_ident}, None, {})
+        assert int(result) == loop_thread
+
+    @pytest.mark.asyncio
+    async def test_registry_tool_offloaded(self):
+        @tool
+        def lookup(key: str) -> str:
+            return f"{key}@{threading.get_ident()}"
+
+        result = await dispatch_tool_async("lookup", '{"key": "k"}', {}, None, {})
+        key, ident = result.split("@")
+        assert key == "k" and int(ident) != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_cpu_bound_runs_in_process_pool(self):
+        executor = ToolExecutor(max_processes=1)
+        try:
+            pid = await executor.run_async("pid", _pid_tool, {})
+        finally:
+            executor.shutdown()
+        assert pid != os.getpid()
+
+
+class TestLimits:
+    @pytest.mark.asyncio
+    async def test_sync_timeout_is_error_result(self):
+        @tool(timeout=0.05, register=False)
+        def slow() -> str:
+            time.sleep(0.3)
+            return "late"
+
+        result = await dispatch_tool_async("slow", "{}", {"slow": slow}, None, {})
+        assert result == "Error calling 'slow': ToolTimeoutError: tool 'slow' timed out after 0.05s"
+
+    @pytest.mark.asyncio
+    async def test_async_timeout(self):
+        @tool(timeout=0.05, register=False)
+        async def slow() -> str:
+            await asyncio.sleep(1)
+            return "late"
+
+        result = await dispatch_tool_async("slow", "{}", {"slow": slow}, None, {})
+        assert "TimeoutError" in result
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("is_async", [False, True], ids=["sync", "async"])
+    async def test_tool_timeout_error_is_not_a_tool_timeout(self, is_async):
+        """A tool's own TimeoutError, well inside its deadline, is not reported as ToolTimeoutError."""
+
+        def raises() -> None:
+            raise TimeoutError("from the tool")
+
+        async def raises_async() -> None:
+            raise TimeoutError("from the tool")
+
+        fn = tool(timeout=5, register=False)(raises_async if is_async else raises)
+        executor = ToolExecutor(max_workers=1)
+        try:
+            with pytest.raises(TimeoutError, match="from the tool") as info:
+                await executor.run_async("t", fn, {})
+        finally:
+            executor.shutdown()
+        assert type(info.value) is TimeoutError
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self):
+        active = peak = 0
+        lock = threading.Lock()
+
+        @tool(max_concurrency=2, register=False)
+        def work(i: int) -> int:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return i
+
+        results = await asyncio.gather(
+            *(dispatch_tool_async("work", f'{{"i": {i}}}', {"work": work}, None, {}) for i in range(6))
+        )
+        assert results == [str(i) for i in range(6)]
+        assert peak == 2
+
+
+def _calls(*specs: tuple[str, str]) -> list[SimpleNamespace]:
+    return [SimpleNamespace(id=f"c{i}", name=name, arguments=args) for i, (name, args) in enumerate(specs)]
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    """A private 2-worker executor used by turn()'s tool dispatch."""
+    ex = ToolExecutor(max_workers=2)
+    monkeypatch.setattr("prompty.core.pipeline.get_tool_executor", lambda: ex)
+    yield ex
+    ex.shutdown()
+
+
+class _Gauge:
+    """Track peak concurrency of the calls that enter it."""
+
+    def __init__(self) -> None:
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def run(self, seconds: float) -> None:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(seconds)
+        with self.lock:
+            self.active -= 1
+
+
+class TestSharedPool:
+    def test_parallel_calls_use_shared_pool(self, executor):
+        def where() -> str:
+            return threading.current_thread().name
+
+        results = _dispatch_tools_with_extensions(
+            _calls(("where", "{}"), ("where", "{}")), {"where": where}, None, {}, parallel=True
+        )
+        assert all(r.startswith("prompty-tool") for r in results)
+
+    def test_global_limit(self, executor):
+        gauge = _Gauge()
+
+        def work(i: int) -> int:
+            gauge.run(0.02)
+            return i
+
+        calls = _calls(*[("work", f'{{"i": {i}}}') for i in range(6)])
+        results = _dispatch_tools_with_extensions(calls, {"work": work}, None, {}, parallel=True)
+        assert results == [str(i) for i in range(6)]
+        assert gauge.peak == 2
+
+    def test_per_tool_limit_does_not_hold_workers(self, executor):
+        gauge = _Gauge()
+        finished: list[str] = []
+
+        @tool(max_concurrency=1, register=False)
+        def limited() -> str:
+            gauge.run(0.03)
+            finished.append("limited")
+            return "l"
+
+        def free() -> str:
+            finished.append("free")
+            return "f"
+
+        calls = _calls(("limited", "{}"), ("limited", "{}"), ("limited", "{}"), ("free", "{}"))
+        results = _dispatch_tools_with_extensions(calls, {"limited": limited, "free": free}, None, {}, parallel=True)
+        assert results == ["l", "l", "l", "f"]
+        assert gauge.peak == 1
+        # Queued "limited" calls wait without a worker, so "free" runs before they do
+        assert finished.index("free") < 2
+
+    def test_timeout_is_error_result(self, executor):
+        events: list[tuple[str, dict]] = []
+
+        @tool(timeout=0.05, register=False)
+        def slow() -> str:
+            time.sleep(0.3)
+            return "late"
+
+        results = _dispatch_tools_with_extensions(
+            _calls(("slow", "{}")), {"slow": slow}, None, {}, on_event=lambda t, d: events.append((t, d))
+        )
+        assert results == ["Error calling 'slow': ToolTimeoutError: tool 'slow' timed out after 0.05s"]
+        time.sleep(0.35)  # the abandoned call finishes; its events are dropped
+        completes = [d for t, d in events if t == "tool_call_complete"]
+        assert len(completes) == 1 and completes[0]["errorKind"] == "timeout"
+
+    def test_timeout_counts_from_start(self):
+        ex = ToolExecutor(max_workers=1)
+        try:
+            futures = [
+                ex.submit("t", lambda: time.sleep(0.1) or "ok", options=ToolOptions(timeout=0.15)) for _ in range(2)
+            ]
+            assert [ex.result("t", f, timeout=0.15) for f in futures] == ["ok", "ok"]
+        finally:
+            ex.shutdown()
+
+    def test_tool_timeout_error_propagates(self):
+        ex = ToolExecutor(max_workers=1)
+
+        def raises() -> None:
+            raise TimeoutError("from the tool")
+
+        try:
+            with pytest.raises(TimeoutError, match="from the tool"):
+                ex.result("t", ex.submit("t", raises), timeout=5)
+        finally:
+            ex.shutdown()
+
+    def test_cancel_drops_waiting_calls(self, executor):
+        token = CancellationToken()
+        ran: list[int] = []
+
+        def work(i: int) -> int:
+            ran.append(i)
+            if i == 0:
+                token.cancel()
+            time.sleep(0.05)
+            return i
+
+        calls = _calls(*[("work", f'{{"i": {i}}}') for i in range(6)])
+        with pytest.raises(CancelledError):
+            _dispatch_tools_with_extensions(calls, {"work": work}, None, {}, cancel=token, parallel=True)
+        time.sleep(0.1)
+        assert len(ran) <= 2
+
+    def test_queue_events(self, executor):
+        events: list[dict] = []
+
+        def on_event(event_type: str, data: dict) -> None:
+            if event_type == "tool_queue":
+                events.append(data)
+
+        def work() -> str:
+            time.sleep(0.02)
+            return "x"
+
+        calls = _calls(*[("work", "{}")] * 4)
+        _dispatch_tools_with_extensions(calls, {"work": work}, None, {}, on_event=on_event, parallel=True)
+        assert len(events) == 4
+        assert {"name", "waitMs", "queueDepth", "running"} <= set(events[0])
+        assert max(e["running"] for e in events) <= 2
+        # The last two calls waited for a worker
+        assert sorted(e["waitMs"] for e in events)[-1] >= 15
+
+    def test_nested_submit_runs_inline(self):
+        ex = ToolExecutor(max_workers=1)
+        try:
+            outer = ex.submit("outer", lambda: ex.result("inner", ex.submit("inner", lambda: "inner")))
+            assert ex.result("outer", outer, timeout=1) == "inner"
+        finally:
+            ex.shutdown()
+
+
+class TestToolOptions:
+    def test_defaults_for_plain_callables(self):
+        assert get_tool_options(lambda: None) == ToolOptions()
+
+    def test_decorator_sets_options(self):
+        @tool(timeout=5, max_concurrency=3, cpu_bound=True, register=False)
+        def f() -> str:
+            return ""
+
+        assert get_tool_options(f) == ToolOptions(timeout=5, max_concurrency=3, cpu_bound=True)
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError, match="timeout"):
+            tool(timeout=0)
+        with pytest.raises(ValueError, match="max_concurrency"):
+            tool(max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_async_tool_stays_coroutine_function(self):
+        @tool
+        async def fetch(url: str) -> str:
+            return f"fetched {url}"
+
+        assert asyncio.iscoroutinefunction(fetch)
+        assert await dispatch_tool_async("fetch", '{"url": "u"}', {}, None, {}) == "fetched u"
+
+
+class TestConfigure:
+    def test_resize_replaces_pool(self):
+        executor = ToolExecutor(max_workers=2)
+        first = executor._pool(False)
+        executor.configure(max_workers=4)
+        second = executor._pool(False)
+        assert second is not first and second._max_workers == 4
+        executor.shutdown()
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            configure_tool_executor(max_workers=0)
+
+    def test_process_wide_instance(self):
+        assert get_tool_executor() is get_tool_executor()
@@ -0,0 +1,132 @@
+"""Tests for the per-agent tool index (prompty.core.tool_index).
+
+Covers:
+- Name lookup and bindings (first definition wins)
+- Wire schemas built once per agent and per provider format
+- Rebuild when agent.tools changes; explicit invalidation
+- Provider wire builders and _resolve_bindings going through the index
+"""
+
+from __future__ import annotations
+
+import copy
+
+from prompty.core.pipeline import _resolve_bindings
+from prompty.core.tool_index import ToolIndex, invalidate_tool_index, tool_index
+from prompty.model import Agent, FunctionTool
+from prompty.providers.anthropic.executor import _tools_to_wire as anthropic_tools_to_wire
+from prompty.providers.openai.executor import _responses_tools_to_wire, _tools_to_wire
+
+
+def _agent(n: int = 3) -> Agent:
+    return Agent.load(
+        {
+            "name": "tools",
+            "model": "gpt-4o",
+            "tools": [
+                {
+                    "name": f"tool_{i}",
+                    "kind": "function",
+                    "description": f"Tool {i}",
+                    "parameters": [
+                        {"name": "query", "kind": "string", "required": True},
+                        {"name": "unit", "kind": "string"},
+                    ],
+                    "bindings": [{"name": "unit", "input": "preferred_unit"}],
+                }
+                for i in range(n)
+            ],
+        }
+    )
+
+
+class TestToolIndex:
+    def test_get_and_bindings(self):
+        agent = _agent()
+        index = tool_index(agent)
+        assert index.get("tool_1") is agent.tools[1]
+        assert index.get("missing") is None
+        assert [b.name for b in index.bindings("tool_2")] == ["unit"]
+        assert index.bindings("missing") == []
+
+    def test_first_definition_wins(self):
+        first, second = FunctionTool(name="dup"), FunctionTool(name="dup")
+        assert ToolIndex([first, second]).get("dup") is first
+
+    def test_reused_across_calls(self):
+        agent = _agent()
+        assert tool_index(agent) is tool_index(agent)
+
+    def test_wire_built_once(self):
+        index = ToolIndex(_agent().tools)
+        calls: list[int] = []
+
+        def build(tools):
+            calls.append(len(tools))
+            return [t.name for t in tools]
+
+        assert index.wire("k", build) == ["tool_0", "tool_1", "tool_2"]
+        assert index.wire("k", build) is index.wire("k", build)
+        assert calls == [3]
+
+    def test_rebuilt_when_tools_change(self):
+        agent = _agent()
+        index = tool_index(agent)
+        agent.tools.append(FunctionTool(name="extra"))
+        rebuilt = tool_index(agent)
+        assert rebuilt is not index
+        assert rebuilt.get("extra") is agent.tools[-1]
+
+        agent.tools[0] = FunctionTool(name="swapped")
+        assert tool_index(agent).get("swapped") is agent.tools[0]
+
+        agent.tools = None
+        assert tool_index(agent).tools == ()
+
+    def test_invalidate(self):
+        agent = _agent()
+        index = tool_index(agent)
+        invalidate_tool_index(agent)
+        invalidate_tool_index(agent)
+        assert tool_index(agent) is not index
+
+    def test_deepcopy_keeps_consistent_index(self):
+        agent = _agent()
+        tool_index(agent)
+        clone = copy.deepcopy(agent)
+        assert clone == agent
+        assert tool_index(clone).get("tool_0") is clone.tools[0]
+
+
+class TestCachedWireSchemas:
+    def test_openai_chat_cached(self):
+        agent = _agent()
+        first, second = _tools_to_wire(agent), _tools_to_wire(agent)
+        assert first == second
+        assert first is not second
+        assert first[0] is second[0]
+        # Bound params stay hidden from the model
+        assert list(first[0]["function"]["parameters"]["properties"]) == ["query"]
+
+    def test_formats_cached_separately(self):
+        agent = _agent()
+        chat = _tools_to_wire(agent)
+        responses = _responses_tools_to_wire(agent)
+        anthropic = anthropic_tools_to_wire(agent)
+        assert chat[0]["type"] == "function" and "function" in chat[0]
+        assert responses[0]["name"] == "tool_0"
+        assert anthropic[0]["input_schema"]["required"] == ["query"]
+
+    def test_refreshed_after_tools_change(self):
+        agent = _agent(1)
+        assert len(_tools_to_wire(agent)) == 1
+        agent.tools.append(FunctionTool(name="late"))
+        assert [t["function"]["name"] for t in _tools_to_wire(agent)] == ["tool_0", "late"]
+
+
+class TestResolveBindingsIndexed:
+    def test_large_toolset(self):
+        agent = _agent(200)
+        merged = _resolve_bindings(agent, "tool_199", {"query": "q"}, {"preferred_unit": "celsius"})
+        assert merged == {"query": "q", "unit": "celsius"}
+        assert _resolve_bindings(agent, "nope", {"query": "q"}, {"preferred_unit": "celsius"}) == {"query": "q"}
@@ -14,7 +14,6 @@ from prompty.tracing.tracer import (
     Tracer,
     _inputs,
     _name,
-    _results,
     console_tracer,
     sanitize,
     to_dict,
@@ -384,6 +383,118 @@ class TestTraceDecorator:
         assert "my_func" in sig
 
 
+class TestTraceFastPath:
+    def setup_method(self):
+        Tracer.clear()
+
+    def teardown_method(self):
+        Tracer.clear()
+
+    def test_no_backends_skips_serialization(self):
+        """With no backends, inputs and results are never serialized."""
+        calls: list[str] = []
+
+        class Spy:
+            def model_dump(self):
+                calls.append("dump")
+                return {}
+
+        @trace
+        def echo(x):
+            return x
+
+        spy = Spy()
+        assert echo(spy) is spy
+        assert calls == []
+
+    def test_backend_added_after_decoration(self):
+        log: list[str] = []
+
+        @contextlib.contextmanager
+        def capture(name):
+            yield lambda k, v: log.append(k)
+
+        @trace
+        def fn(a):
+            return a
+
+        fn(1)
+        assert log == []
+        Tracer.add("capture", capture)
+        fn(1)
+        assert "inputs" in log and "result" in log
+
+    def test_serialized_once_for_many_backends(self):
+        calls: list[str] = []
+
+        class Spy:
+            def model_dump(self):
+                calls.append("dump")
+                return {"v": 1}
+
+        received: list[Any] = []
+
+        @contextlib.contextmanager
+        def capture(name):
+            yield lambda k, v: received.append((k, v))
+
+        for i in range(3):
+            Tracer.add(f"b{i}", capture)
+
+        with Tracer.start("op") as t:
+            t("value", Spy())
+
+        assert calls == ["dump"]
+        assert received == [("value", {"v": 1})] * 3
+
+    def test_custom_name_stable_across_calls(self):
+        log: list[tuple[str, Any]] = []
+
+        @contextlib.contextmanager
+        def capture(name):
+            log.append(("__start__", name))
+            yield lambda k, v: log.append((k, v))
+
+        Tracer.add("capture", capture)
+
+        @trace(name="custom_op")
+        def my_func():
+            return 42
+
+        my_func()
+        my_func()
+        assert [v for k, v in log if k == "__start__"] == ["custom_op", "custom_op"]
+        assert [v for k, v in log if k == "function"] == ["my_func", "my_func"]
+
+    def test_signature_inspected_once(self, monkeypatch):
+        import inspect
+
+        import prompty.tracing.tracer as tracer_mod
+
+        @contextlib.contextmanager
+        def noop(name):
+            yield lambda k, v: None
+
+        Tracer.add("noop", noop)
+
+        @trace
+        def fn(a, b=2):
+            return a + b
+
+        count = 0
+        real_signature = inspect.signature
+
+        def counting_signature(obj, *args, **kwargs):
+            nonlocal count
+            count += 1
+            return real_signature(obj, *args, **kwargs)
+
+        monkeypatch.setattr(tracer_mod.inspect, "signature", counting_signature)
+        for _ in range(5):
+            fn(1)
+        assert count == 1
+
+
 # ---------------------------------------------------------------------------
 # trace_span
 # ---------------------------------------------------------------------------
@@ -568,10 +679,3 @@ class TestHelpers:
         result = _inputs(obj.method, (42,), {})
         assert "self" not in result
         assert result["x"] == 42
-
-    def test_results_none(self):
-        assert _results(None) == "None"
-
-    def test_results_value(self):
-        assert _results(42) == 42
-        assert _results("hello") == "hello"
@@ -0,0 +1,186 @@
+"""Tests for incremental stream tracing (prompty.tracing.stream).
+
+Covers:
+- Folding OpenAI chat chunks, Responses events and Anthropic events
+- Time to first token and inter-token latency percentiles
+- The traced frame: summary by default, raw chunks only when captured
+"""
+
+from __future__ import annotations
+
+import contextlib
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from prompty.core.types import AsyncPromptyStream, PromptyStream
+from prompty.tracing.stream import StreamSummary, _LatencyHistogram, configure_stream_tracing, stream_capture_enabled
+from prompty.tracing.tracer import Tracer
+
+
+def _chat_chunk(content=None, tool_calls=None, finish_reason=None, usage=None) -> Any:
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    choices = [SimpleNamespace(delta=delta, finish_reason=finish_reason)] if usage is None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def _tool_delta(index, arguments, call_id=None, name=None) -> Any:
+    return SimpleNamespace(index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+@pytest.fixture
+def frames():
+    """Register a backend that records every (span, key, value)."""
+    recorded: list[tuple[str, str, Any]] = []
+
+    @contextlib.contextmanager
+    def backend(name):
+        yield lambda key, value: recorded.append((name, key, value))
+
+    saved = dict(Tracer._tracers)
+    Tracer.clear()
+    Tracer.add("record", backend)
+    yield recorded
+    Tracer._tracers = saved
+
+
+class TestStreamSummary:
+    def test_openai_chat(self):
+        summary = StreamSummary()
+        for chunk in [
+            _chat_chunk(content="Hel"),
+            _chat_chunk(content="lo"),
+            _chat_chunk(tool_calls=[_tool_delta(0, '{"city": ', call_id="call_1", name="weather")]),
+            _chat_chunk(tool_calls=[_tool_delta(0, '"Seattle"}')]),
+            _chat_chunk(finish_reason="tool_calls"),
+            _chat_chunk(usage=SimpleNamespace(model_dump=lambda: {"prompt_tokens": 5, "completion_tokens": 7})),
+        ]:
+            summary.add(chunk)
+        result = summary.to_dict()
+        assert result["chunks"] == 6
+        assert result["text"] == "Hello"
+        assert result["tool_calls"] == [{"id": "call_1", "name": "weather", "arguments": '{"city": "Seattle"}'}]
+        assert result["finish_reason"] == "tool_calls"
+        assert result["usage"] == {"prompt_tokens": 5, "completion_tokens": 7}
+        # 4 tokens (2 text, 2 argument fragments) → 3 gaps
+        assert result["inter_token_latency_ms"]["count"] == 3
+
+    def test_anthropic_events(self):
+        events = [
+            {"type": "message_start", "message": {"usage": {"input_tokens": 12, "output_tokens": 1}}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Let me check."}},
+            {"type": "content_block_start", "index": 1, "content_block": {"type": "tool_use", "id": "t1", "name": "f"}},
+            {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": "{}"}},
+            {"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 9}},
+        ]
+        summary = StreamSummary()
+        for event in events:
+            summary.add(event)
+        result = summary.to_dict()
+        assert result["text"] == "Let me check."
+        assert result["tool_calls"] == [{"id": "t1", "name": "f", "arguments": "{}"}]
+        assert result["finish_reason"] == "tool_use"
+        assert result["usage"] == {"input_tokens": 12, "output_tokens": 9}
+
+    def test_openai_responses_events(self):
+        events = [
+            SimpleNamespace(type="response.output_text.delta", delta="Hi"),
+            SimpleNamespace(
+                type="response.output_item.added",
+                output_index=1,
+                item=SimpleNamespace(type="function_call", call_id="c1", name="lookup"),
+            ),
+            SimpleNamespace(type="response.function_call_arguments.delta", output_index=1, delta='{"q": 1}'),
+            SimpleNamespace(
+                type="response.completed",
+                response=SimpleNamespace(status="completed", usage={"input_tokens": 3, "output_tokens": 4}),
+            ),
+        ]
+        summary = StreamSummary()
+        for event in events:
+            summary.add(event)
+        result = summary.to_dict()
+        assert result["text"] == "Hi"
+        assert result["tool_calls"] == [{"id": "c1", "name": "lookup", "arguments": '{"q": 1}'}]
+        assert result["finish_reason"] == "completed"
+        assert result["usage"] == {"input_tokens": 3, "output_tokens": 4}
+
+    def test_unknown_chunks_counted_only(self):
+        summary = StreamSummary()
+        for chunk in (1, None, object(), ""):
+            summary.add(chunk)
+        assert summary.to_dict() == {"chunks": 4, "text": ""}
+
+    def test_time_to_first_token(self, monkeypatch):
+        clock = iter([10.0, 10.5, 10.6, 10.8])
+        monkeypatch.setattr("prompty.tracing.stream.time.perf_counter", lambda: next(clock))
+        summary = StreamSummary()
+        summary.add(_chat_chunk())  # heartbeat at 10.5: not a token
+        summary.add("a")
+        summary.add("b")
+        result = summary.to_dict()
+        assert result["time_to_first_token_ms"] == 600.0
+        assert result["duration_ms"] == 800.0
+        assert result["inter_token_latency_ms"]["max"] == pytest.approx(200.0)
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_bucket_resolution(self):
+        hist = _LatencyHistogram()
+        samples = [i / 1000 for i in range(1, 1001)]  # 1 ms … 1 s
+        for s in samples:
+            hist.add(s)
+        assert hist.count == 1000
+        assert hist.percentile(0.5) == pytest.approx(0.5, rel=0.05)
+        assert hist.percentile(0.99) == pytest.approx(0.99, rel=0.05)
+        assert hist.percentile(1.0) <= hist.max == 1.0
+
+    def test_single_sample_exact(self):
+        hist = _LatencyHistogram()
+        hist.add(0.0123)
+        assert hist.percentile(0.5) == 0.0123
+
+    def test_size_is_fixed(self):
+        hist = _LatencyHistogram()
+        for s in (0.0, 1e-9, 1e6):
+            hist.add(s)
+        assert len(hist.counts) == _LatencyHistogram._BUCKETS
+        assert hist.counts[0] == 2 and hist.counts[-1] == 1
+
+
+class TestStreamTraceFrame:
+    def test_traces_summary(self, frames):
+        assert list(PromptyStream("Exec", iter(["a", "b"]))) == ["a", "b"]
+        keys = {key: value for _, key, value in frames}
+        assert keys["signature"] == "Exec.PromptyStream"
+        assert keys["result"]["text"] == "ab"
+        assert keys["result"]["chunks"] == 2
+        assert "items" not in keys
+
+    def test_capture_traces_items(self, frames):
+        previous = stream_capture_enabled()
+        configure_stream_tracing(capture_chunks=True)
+        try:
+            stream = PromptyStream("Exec", iter(["a", "b"]))
+            list(stream)
+        finally:
+            configure_stream_tracing(capture_chunks=previous)
+        keys = {key: value for _, key, value in frames}
+        assert stream.items == ["a", "b"]
+        assert keys["items"] == ["a", "b"]
+        assert keys["result"]["text"] == "ab"
+
+    def test_empty_stream_not_traced(self, frames):
+        list(PromptyStream("Exec", iter([])))
+        assert frames == []
+
+    @pytest.mark.asyncio
+    async def test_async_traces_summary(self, frames):
+        async def source():
+            yield "x"
+            yield "y"
+
+        assert [c async for c in AsyncPromptyStream("Exec", source())] == ["x", "y"]
+        keys = {key: value for span, key, value in frames if span == "AsyncPromptyStream"}
+        assert keys["result"]["text"] == "xy"
@@ -0,0 +1,267 @@
+"""Tests for the streaming-first agent loop (core/turn_stream.py)."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from prompty.core.guardrails import GuardrailError, GuardrailResult, Guardrails
+from prompty.core.turn_stream import (
+    ResultChunk,
+    ToolCallCompleteChunk,
+    ToolCallStartChunk,
+    ToolResultChunk,
+    turn_stream,
+    turn_stream_async,
+)
+from prompty.core.types import AsyncPromptyStream, Message, PromptyStream, TextPart
+from prompty.model import Agent, TextChunk
+
+_MODULE = "prompty.core.turn_stream"
+
+
+def _agent() -> Agent:
+    return Agent.load(
+        {
+            "name": "stream-agent",
+            "model": {
+                "id": "gpt-4",
+                "provider": "openai",
+                "connection": {"kind": "key", "apiKey": "test-key"},
+            },
+        }
+    )
+
+
+def _text_chunk(content: str) -> MagicMock:
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = content
+    chunk.choices[0].delta.tool_calls = None
+    chunk.choices[0].delta.refusal = None
+    return chunk
+
+
+def _tool_chunk(call_id: str, name: str, arguments: str) -> MagicMock:
+    tc = MagicMock()
+    tc.index = 0
+    tc.id = call_id
+    tc.function.name = name
+    tc.function.arguments = arguments
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = None
+    chunk.choices[0].delta.tool_calls = [tc]
+    chunk.choices[0].delta.refusal = None
+    return chunk
+
+
+class _AsyncIter:
+    def __init__(self, items: list[Any]) -> None:
+        self._items = iter(items)
+
+    def __aiter__(self) -> _AsyncIter:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+def _plain_response() -> MagicMock:
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.tool_calls = None
+    return response
+
+
+_PREPARED = [Message(role="user", parts=[TextPart(value="weather?")])]
+
+
+class TestTurnStream:
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_yields_text_then_result(self, mock_invoke, _prepare):
+        mock_invoke.return_value = PromptyStream("test", iter([_text_chunk("Hello"), _text_chunk(" world")]))
+
+        chunks = list(turn_stream(_agent()))
+
+        assert chunks[:2] == [TextChunk(value="Hello"), TextChunk(value=" world")]
+        assert chunks[-1] == ResultChunk(value="Hello world", iterations=0)
+
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_forces_streaming_without_mutating_agent(self, mock_invoke, _prepare):
+        mock_invoke.return_value = PromptyStream("test", iter([_text_chunk("ok")]))
+        agent = _agent()
+
+        list(turn_stream(agent))
+
+        sent_agent = mock_invoke.call_args[0][0]
+        assert sent_agent.model.options.additional_properties["stream"] is True
+        assert agent.model.options is None or not (agent.model.options.additional_properties or {}).get("stream")
+
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_tool_loop_chunks(self, mock_invoke, _prepare):
+        mock_invoke.side_effect = [
+            PromptyStream("test", iter([_tool_chunk("call_1", "get_weather", '{"city": "Paris"}')])),
+            PromptyStream("test", iter([_text_chunk("Sunny")])),
+        ]
+        calls: list[str] = []
+
+        def get_weather(city: str) -> str:
+            calls.append(city)
+            return "sunny"
+
+        chunks = list(turn_stream(_agent(), tools={"get_weather": get_weather}))
+
+        assert [c.kind for c in chunks] == [
+            "tool_call_start",
+            "tool_call_complete",
+            "tool_result",
+            "text",
+            "result",
+        ]
+        assert chunks[0] == ToolCallStartChunk(id="call_1", name="get_weather")
+        assert chunks[1] == ToolCallCompleteChunk(id="call_1", name="get_weather", arguments='{"city": "Paris"}')
+        assert chunks[2] == ToolResultChunk(id="call_1", name="get_weather", result="sunny")
+        assert chunks[-1] == ResultChunk(value="Sunny", iterations=1)
+        assert calls == ["Paris"]
+        # The tool result went back to the model on the second call
+        second_messages = mock_invoke.call_args_list[1][0][1]
+        assert any(m.role == "tool" for m in second_messages)
+
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_nothing_runs_ahead_of_consumer(self, mock_invoke, _prepare):
+        mock_invoke.side_effect = [
+            PromptyStream("test", iter([_tool_chunk("call_1", "noop", "{}")])),
+            PromptyStream("test", iter([_text_chunk("done")])),
+        ]
+        tool = MagicMock(return_value="ok")
+
+        stream = turn_stream(_agent(), tools={"noop": tool})
+        assert mock_invoke.call_count == 0
+        assert next(stream).kind == "tool_call_start"
+        assert mock_invoke.call_count == 1
+        tool.assert_not_called()
+        stream.close()
+        assert mock_invoke.call_count == 1
+
+    @patch(f"{_MODULE}.process", return_value="plain answer")
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_non_streaming_response(self, mock_invoke, _prepare, _process):
+        mock_invoke.return_value = _plain_response()
+
+        chunks = list(turn_stream(_agent()))
+
+        assert chunks == [TextChunk(value="plain answer"), ResultChunk(value="plain answer", iterations=0)]
+
+    @patch(f"{_MODULE}.process", return_value="secret")
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_non_streaming_output_guardrail_denies(self, mock_invoke, _prepare, _process):
+        mock_invoke.return_value = _plain_response()
+        guardrails = Guardrails(output=lambda msg: GuardrailResult(allowed=False, reason="leak"))
+        events: list[tuple[str, Any]] = []
+        chunks: list[Any] = []
+
+        with pytest.raises(GuardrailError, match="leak"):
+            for chunk in turn_stream(_agent(), guardrails=guardrails, on_event=lambda t, d: events.append((t, d))):
+                chunks.append(chunk)
+
+        assert chunks == []
+        assert [t for t, _ in events].count("turn_end") == 1
+        assert events[-1][1]["status"] == "error"
+
+    @patch(f"{_MODULE}.process", return_value="draft")
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_non_streaming_output_guardrail_rewrite(self, mock_invoke, _prepare, _process):
+        mock_invoke.return_value = _plain_response()
+        guardrails = Guardrails(output=lambda msg: GuardrailResult(allowed=True, rewrite="final"))
+
+        chunks = list(turn_stream(_agent(), guardrails=guardrails))
+
+        assert chunks == [TextChunk(value="final"), ResultChunk(value="final", iterations=0)]
+
+    @patch(f"{_MODULE}.prepare", return_value=list(_PREPARED))
+    @patch(f"{_MODULE}._invoke_with_retry")
+    def test_max_iterations_emits_failed_turn_end(self, mock_invoke, _prepare):
+        mock_invoke.side_effect = lambda *a, **k: PromptyStream("test", iter([_tool_chunk("c", "noop", "{}")]))
+        events: list[tuple[str, Any]] = []
+
+        with pytest.raises(ValueError, match="max_iterations"):
+            list(
+                turn_stream(
+                    _agent(),
+                    tools={"noop": lambda: "ok"},
+                    max_iterations=1,
+                    on_event=lambda t, d: events.append((t, d)),
+                )
+            )
+
+        assert events[-1][0] == "turn_end"
+        assert events[-1][1]["status"] == "error"
+
+
+class TestTurnStreamAsync:
+    @pytest.mark.asyncio
+    async def test_tool_loop_chunks(self):
+        async def fake_prepare(agent, inputs):
+            return list(_PREPARED)
+
+        streams = [
+            AsyncPromptyStream("test", _AsyncIter([_tool_chunk("call_1", "get_weather", '{"city": "Oslo"}')])),
+            AsyncPromptyStream("test", _AsyncIter([_text_chunk("Cold"), _text_chunk("!")])),
+        ]
+
+        async def fake_invoke(*args, **kwargs):
+            return streams.pop(0)
+
+        with (
+            patch(f"{_MODULE}.prepare_async", side_effect=fake_prepare),
+            patch(f"{_MODULE}._invoke_with_retry_async", side_effect=fake_invoke),
+        ):
+            chunks = [c async for c in turn_stream_async(_agent(), tools={"get_weather": lambda city: "cold"})]
+
+        assert [c.kind for c in chunks] == [
+            "tool_call_start",
+            "tool_call_complete",
+            "tool_result",
+            "text",
+            "text",
+            "result",
+        ]
+        assert chunks[2].result == "cold"
+        assert chunks[-1] == ResultChunk(value="Cold!", iterations=1)
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_output_guardrail_denies(self):
+        async def fake_prepare(agent, inputs):
+            return list(_PREPARED)
+
+        async def fake_invoke(*args, **kwargs):
+            return _plain_response()
+
+        async def fake_process(agent, response):
+            return "secret"
+
+        guardrails = Guardrails(output=lambda msg: GuardrailResult(allowed=False, reason="leak"))
+        chunks: list[Any] = []
+        with (
+            patch(f"{_MODULE}.prepare_async", side_effect=fake_prepare),
+            patch(f"{_MODULE}._invoke_with_retry_async", side_effect=fake_invoke),
+            patch(f"{_MODULE}.process_async", side_effect=fake_process),
+            pytest.raises(GuardrailError, match="leak"),
+        ):
+            async for chunk in turn_stream_async(_agent(), guardrails=guardrails):
+                chunks.append(chunk)
+
+        assert chunks == []
@@ -0,0 +1,105 @@
+"""Tests for the per-message wire memo (prompty.core.wire_cache).
+
+Covers:
+- Converted dicts reused across calls, separately per wire format
+- Invalidation on in-place edits: replaced parts, metadata, grown tool_calls
+- Executors converting only new messages across agent-loop rounds
+"""
+
+from __future__ import annotations
+
+from prompty.core.types import ImagePart, Message, TextPart
+from prompty.core.wire_cache import cached_wire
+from prompty.model import Agent
+from prompty.providers.anthropic.executor import _build_chat_args as anthropic_chat_args
+from prompty.providers.openai.executor import OpenAIExecutor, _message_to_wire
+
+
+def _counting(convert):
+    calls: list[Message] = []
+
+    def wrapped(msg):
+        calls.append(msg)
+        return convert(msg)
+
+    return wrapped, calls
+
+
+def _msg(text: str = "hello", **metadata) -> Message:
+    return Message(role="user", parts=[TextPart(value=text)], metadata=metadata)
+
+
+class TestCachedWire:
+    def test_reused(self):
+        convert, calls = _counting(_message_to_wire)
+        msg = _msg()
+        first = cached_wire(msg, "openai.chat", convert)
+        assert cached_wire(msg, "openai.chat", convert) is first
+        assert first == {"role": "user", "content": "hello"}
+        assert len(calls) == 1
+
+    def test_keys_are_independent(self):
+        msg = _msg()
+        a = cached_wire(msg, "a", lambda m: {"fmt": "a"})
+        b = cached_wire(msg, "b", lambda m: {"fmt": "b"})
+        assert (a, b) == ({"fmt": "a"}, {"fmt": "b"})
+        assert cached_wire(msg, "a", lambda m: {"fmt": "stale"}) is a
+
+    def test_replaced_part_invalidates(self):
+        msg = _msg()
+        cached_wire(msg, "openai.chat", _message_to_wire)
+        msg.parts[0] = TextPart(value="rewritten")
+        assert cached_wire(msg, "openai.chat", _message_to_wire)["content"] == "rewritten"
+
+    def test_parts_change_invalidates(self):
+        msg = _msg()
+        cached_wire(msg, "openai.chat", _message_to_wire)
+        msg.parts.append(ImagePart(source="https://example.com/a.png"))
+        content = cached_wire(msg, "openai.chat", _message_to_wire)["content"]
+        assert [p["type"] for p in content] == ["text", "image_url"]
+
+        msg.parts = [msg.parts[0], ImagePart(source="https://example.com/b.png")]
+        content = cached_wire(msg, "openai.chat", _message_to_wire)["content"]
+        assert content[1]["image_url"]["url"] == "https://example.com/b.png"
+
+    def test_metadata_change_invalidates(self):
+        msg = _msg(tool_calls=[{"id": "1"}])
+        cached_wire(msg, "openai.chat", _message_to_wire)
+        msg.metadata["name"] = "alice"
+        assert cached_wire(msg, "openai.chat", _message_to_wire)["name"] == "alice"
+        msg.metadata["tool_calls"].append({"id": "2"})
+        assert len(cached_wire(msg, "openai.chat", _message_to_wire)["tool_calls"]) == 2
+
+    def test_equal_messages_not_shared(self):
+        a, b = _msg(), _msg()
+        assert cached_wire(a, "k", lambda m: {}) is not cached_wire(b, "k", lambda m: {})
+
+
+class TestExecutorsConvertNewMessagesOnly:
+    def _agent(self, provider: str) -> Agent:
+        return Agent.load({"name": "t", "model": {"id": "m", "provider": provider}})
+
+    def test_openai_chat_rounds(self):
+        executor = OpenAIExecutor()
+        agent = self._agent("openai")
+        messages = [Message(role="system", parts=[TextPart(value="sys")]), _msg("q")]
+        first = executor._build_chat_args(agent, messages)["messages"]
+        messages.append(Message(role="assistant", parts=[TextPart(value="a")]))
+        second = executor._build_chat_args(agent, messages)["messages"]
+        assert second[0] is first[0] and second[1] is first[1]
+        assert second[2] == {"role": "assistant", "content": "a"}
+
+        # A rewritten list (guardrails, trimming) keeps memos of surviving messages
+        rewritten = [messages[0], _msg("replaced")]
+        third = executor._build_chat_args(agent, rewritten)["messages"]
+        assert third[0] is first[0]
+        assert third[1]["content"] == "replaced"
+
+    def test_anthropic_rounds(self):
+        agent = self._agent("anthropic")
+        messages = [_msg("q")]
+        first = anthropic_chat_args(agent, messages)["messages"]
+        messages.append(Message(role="assistant", parts=[TextPart(value="a")]))
+        second = anthropic_chat_args(agent, messages)["messages"]
+        assert second[0] is first[0]
+        assert second[1]["content"] == [{"type": "text", "text": "a"}]
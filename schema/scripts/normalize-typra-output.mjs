@@ -11,6 +11,7 @@ if (existsSync(manifestPath)) {
 }
 
 trimEmptyPythonGeneratedTests(join("..", "runtime", "python", "prompty", "tests", "model"));
+lazyPythonModelExports(join("..", "runtime", "python", "prompty", "prompty", "model", "__init__.py"));
 trimTrailingWhitespace(join("..", "runtime", "go", "prompty", "model"));
 restoreGoModelImport(join("..", "runtime", "go", "prompty", "model"));
 restoreSwiftPackageResources(join("..", "runtime", "swift", "prompty-model", "Package.swift"));
@@ -39,6 +40,68 @@ function trimEmptyPythonGeneratedTests(root) {
   }
 }
 
+// The emitter writes prompty/model/__init__.py as eager re-exports, so
+// `from prompty.model import Agent` imports every generated contract module.
+// Rewrite it to PEP 562 lazy exports (prompty._lazy.lazy_exports): the import
+// statements become a {module: names} table plus a TYPE_CHECKING block, and
+// __all__ is kept verbatim. tests/test_import_time.py fails if the rewrite is
+// lost. Remove this once the emitter can emit lazy Python exports natively.
+function lazyPythonModelExports(initPath) {
+  if (!existsSync(initPath)) {
+    return;
+  }
+  const content = readFileSync(initPath, "utf8");
+  if (content.includes("lazy_exports")) {
+    return;
+  }
+  const match = content.match(/^((?:#.*\n)+)((?:from [\s\S]*?\n)+)\n(__all__ = \[[\s\S]*)$/u);
+  if (!match) {
+    return;
+  }
+  const [, header, importBlock, all] = match;
+  const imports = [...importBlock.matchAll(/^from (\S+) import (?:\(([^)]*)\)|(.+))$/gmu)].map((m) => ({
+    module: m[1],
+    names: (m[2] ?? m[3])
+      .split(",")
+      .map((name) => name.trim())
+      .filter(Boolean),
+  }));
+  const entries = imports.map(({ module, names }) => {
+    const quoted = names.map((name) => `"${name}"`);
+    const inline = `    "${module}": (${quoted.join(", ")}${quoted.length === 1 ? "," : ""}),`;
+    if (inline.length <= 120) {
+      return inline;
+    }
+    return [`    "${module}": (`, ...quoted.map((name) => `        ${name},`), "    ),"].join("\n");
+  });
+  const typeChecking = importBlock
+    .trimEnd()
+    .split("\n")
+    .map((line) => (line ? `    ${line}` : line))
+    .join("\n");
+  const lazy = [
+    header.trimEnd(),
+    "from typing import TYPE_CHECKING",
+    "",
+    "from .._lazy import lazy_exports",
+    "",
+    all.trimEnd(),
+    "",
+    "# Exports load on first access (PEP 562): importing one model type does not",
+    "# import every generated contract module.",
+    "_LAZY_IMPORTS: dict[str, tuple[str, ...]] = {",
+    ...entries,
+    "}",
+    "",
+    "__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)",
+    "",
+    "if TYPE_CHECKING:",
+    typeChecking,
+    "",
+  ].join("\n");
+  writeFileSync(initPath, lazy);
+}
+
 function trimTrailingWhitespace(root) {
   if (!existsSync(root)) {
     return;